@@ -23,6 +23,14 @@ import pysftp
 import names
 from numpy import random
 #
+#    The *_query helpers read through the data-access layer of ProductionSubroutinesInPython — pooled connections,
+#    prepared statements, per-query latencies — when it is on the Python path.  Otherwise they query through a
+#    SQLAlchemy engine, as before.
+try:
+	from DATA_ACCESS_LAYER import open_data_access, dal_query, db2_connection_string
+except ImportError:
+	open_data_access = None
+#
 ##################################################################################################################################
 #⚠️🚸🛑🆗🔔🖼💻⚠️🚸🛑🆗🔔🖼💻⚠️🚸🛑🆗🔔🖼💻⚠️🚸🛑🆗🔔🖼💻⚠️🚸🛑🆗🔔🖼💻⚠️🚸🛑🆗🔔🖼💻⚠️🚸🛑🆗🔔🖼💻⚠️🚸🛑🆗🔔🖼💻#
 ##################⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇ RUN-TIME PLATFORM-CONFIGURATIONS ⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇##############
@@ -127,11 +135,36 @@ def derive_tenant_config(tenant_config_dir_args, work_dir, session_attributes):
 
 
 
+#    One data-access layer per tenant database, keyed by (host, port, database), shared by all of the *_query helpers.
+TENANT_DATA_ACCESS = {}
+
+def tenant_sql_query(tenant_config, work_dir, sql_file, params, columns):
+	sql_text = ' '.join([sql_line 
+						for sql_line in open(file = os.path.abspath(os.path.join(work_dir, 
+																			sql_file)) )])
+	if open_data_access is None:
+		return pd.DataFrame(data = list(create_engine(URL(**tenant_config)).execute(text(sql_text),
+																					**params)),
+							columns = columns)
+	tenant_key = (tenant_config.get('host'),
+				  str(tenant_config.get('port')),
+				  tenant_config.get('database'))
+	if tenant_key not in TENANT_DATA_ACCESS:
+		TENANT_DATA_ACCESS.update({tenant_key : open_data_access(connect = lambda: ibm_db.connect(db2_connection_string(**tenant_config), '', ''),
+																 driver = 'IBM_DB')})
+	return pd.DataFrame(data = dal_query(dal = TENANT_DATA_ACCESS.get(tenant_key),
+										 query_name = sql_file,
+										 sql = sql_text,
+										 params = params,
+										 coerce_numeric = False).values,
+						columns = columns)
+
+
 def sst_query(session_attributes, tenant_config, work_dir):
-	return pd.DataFrame(data = list(create_engine(URL(**tenant_config)).execute(text(' '.join([sql_line 
-																										for sql_line in open(file = os.path.abspath(os.path.join(work_dir, 
-																															'STUDENT_STANDARDIZED_TEST.sql')) )])),
-																						tenant_id = session_attributes.get('TENANT_ID')      )),
+	return tenant_sql_query(tenant_config = tenant_config,
+						work_dir = work_dir,
+						sql_file = 'STUDENT_STANDARDIZED_TEST.sql',
+						params = {'tenant_id' : session_attributes.get('TENANT_ID')},
 										columns = ['STUDENT_ID',
 													'SUBJECT',
 													'LEARNING_STANDARD_CD',
@@ -152,10 +185,10 @@ def sst_query(session_attributes, tenant_config, work_dir):
 
 
 def evid_algmt_query(session_attributes, tenant_config, work_dir):
-	evid_algmt = pd.DataFrame(data = list(create_engine(URL(**tenant_config)).execute(text(' '.join([sql_line 
-																							   for sql_line in open(file = os.path.abspath(os.path.join(work_dir, 
-																														   'ALGMT_ANALYSIS—BODY_OF_EVIDENCE_ALIGNMENT_DETAIL.sql')) )])),
-																				 tenant_id = session_attributes.get('TENANT_ID')      )),
+	evid_algmt = tenant_sql_query(tenant_config = tenant_config,
+						work_dir = work_dir,
+						sql_file = 'ALGMT_ANALYSIS—BODY_OF_EVIDENCE_ALIGNMENT_DETAIL.sql',
+						params = {'tenant_id' : session_attributes.get('TENANT_ID')},
 							columns = ['CAMPUS',
 										'COURSE_SUBJECTS',
 										'COURSE_GRADE_LVL',
@@ -192,10 +225,10 @@ def evid_algmt_query(session_attributes, tenant_config, work_dir):
 																				 axis = 1)[evid_algmt.columns]
 
 def skl_query(session_attributes, tenant_config, work_dir):
-	return pd.DataFrame(data = list(create_engine(URL(**tenant_config)).execute(text(' '.join([sql_line 
-																								for sql_line in open(file = os.path.abspath(os.path.join(work_dir, 
-																															'ALGMT_REPORTING—STUDENT_KNOWLEDGE_LEVEL.sql')) )])),
-																				tenant_id = session_attributes.get('TENANT_ID')      )),
+	return tenant_sql_query(tenant_config = tenant_config,
+						work_dir = work_dir,
+						sql_file = 'ALGMT_REPORTING—STUDENT_KNOWLEDGE_LEVEL.sql',
+						params = {'tenant_id' : session_attributes.get('TENANT_ID')},
 							columns = ['CAMPUS',
 									   'COURSE_SUBJECTS',
 									   'COURSE_GRADE_LVL',
@@ -231,10 +264,10 @@ def skl_query(session_attributes, tenant_config, work_dir):
 
 
 def prof_span_query(session_attributes, tenant_config, work_dir):
-	proficiency_span = pd.DataFrame(data = list(create_engine(URL(**tenant_config)).execute(text(' '.join([sql_line 
-																										for sql_line in open(file = os.path.abspath(os.path.join(work_dir, 
-																															'CAMPUS_COURSE_SECTION_PROFICIENCY_SPAN.sql')) )])),
-																							tenant_id = session_attributes.get('TENANT_ID')      )),
+	proficiency_span = tenant_sql_query(tenant_config = tenant_config,
+						work_dir = work_dir,
+						sql_file = 'CAMPUS_COURSE_SECTION_PROFICIENCY_SPAN.sql',
+						params = {'tenant_id' : session_attributes.get('TENANT_ID')},
 							columns = ['CAMPUS',
 										'COURSE_SUBJECTS',
 										'COURSE_GRADE_LVL',
@@ -271,10 +304,10 @@ def lrn_std_id_cd_query(session_attributes, tenant_config, work_dir):
 															for std_grade in ['00' if std_grade.strip() == 'K'
 																				else std_grade
 																				for std_grade in std_cd_id_bridge['GRADE_LEVEL'] ] ] )
-					for std_cd_id_bridge in [pd.DataFrame(data = list(create_engine(URL(**tenant_config)).execute(text(' '.join([sql_line 
-																																for sql_line in open(file = os.path.abspath(os.path.join(work_dir, 
-																																											'LRN_STD_ID_CD.sql')) )])),
-																																	 juris_id = session_attributes.get('JURISDICTION_ID')       )),
+					for std_cd_id_bridge in [tenant_sql_query(tenant_config = tenant_config,
+						work_dir = work_dir,
+						sql_file = 'LRN_STD_ID_CD.sql',
+						params = {'juris_id' : session_attributes.get('JURISDICTION_ID')},
 														columns = ['SUBJECT_TITLE',
 																	'GRADE_LEVEL',
 																	'LEARNING_STANDARD_ID',
@@ -289,10 +322,10 @@ def lrn_std_id_cd_query(session_attributes, tenant_config, work_dir):
 					.reset_index(drop = True)
 
 def enrollment_query(session_attributes, tenant_config, work_dir): 
-	return pd.DataFrame(data = list(create_engine(URL(**tenant_config)).execute(text(' '.join([sql_line 
-																										for sql_line in open(file = os.path.abspath(os.path.join(work_dir, 
-																															'STUDENT_CAMPUS_ENROLLMT.sql')) )])),
-																						tenant_id = session_attributes.get('TENANT_ID')      )),
+	return tenant_sql_query(tenant_config = tenant_config,
+						work_dir = work_dir,
+						sql_file = 'STUDENT_CAMPUS_ENROLLMT.sql',
+						params = {'tenant_id' : session_attributes.get('TENANT_ID')},
 									columns = ['CAMPUS',
 												'STUDENT_ID'])\
 							.drop_duplicates()\
@@ -300,10 +333,10 @@ def enrollment_query(session_attributes, tenant_config, work_dir):
 
 
 def std_graph_query(session_attributes, tenant_config, work_dir): 
-	return pd.DataFrame(data = list(create_engine(URL(**tenant_config)).execute(text(' '.join([sql_line 
-																										for sql_line in open(file = os.path.abspath(os.path.join(work_dir, 
-																															'LEARNING_STANDARD_HIERARCHY.sql')) )])),
-																						tenant_id = session_attributes.get('TENANT_ID')      )),
+	return tenant_sql_query(tenant_config = tenant_config,
+						work_dir = work_dir,
+						sql_file = 'LEARNING_STANDARD_HIERARCHY.sql',
+						params = {'tenant_id' : session_attributes.get('TENANT_ID')},
 									columns = ['CONSTITUENT_LEARNING_STD_ID',
 											   'LEARNING_STANDARD_ID',
 											   'GRAPH_TYPE'])\
@@ -312,10 +345,10 @@ def std_graph_query(session_attributes, tenant_config, work_dir):
 
 
 def course_verts_query(session_attributes, tenant_config, work_dir): 
-	return pd.DataFrame(data = list(create_engine(URL(**tenant_config)).execute(text(' '.join([sql_line 
-																										for sql_line in open(file = os.path.abspath(os.path.join(work_dir, 
-																															'ALGMT_ANALYSIS—COURSE_GRAPH_VERTICES.sql')) )])),
-																						tenant_id = session_attributes.get('TENANT_ID')      )),
+	return tenant_sql_query(tenant_config = tenant_config,
+						work_dir = work_dir,
+						sql_file = 'ALGMT_ANALYSIS—COURSE_GRAPH_VERTICES.sql',
+						params = {'tenant_id' : session_attributes.get('TENANT_ID')},
 									columns = ['CAMPUS',
 											   'COURSE_SUBJECTS',
 											   'COURSE_GRADE_LVL',
@@ -336,21 +369,19 @@ def course_verts_query(session_attributes, tenant_config, work_dir):
 
 
 def course_cat_query(session_attributes, tenant_config, work_dir):
-	return pd.DataFrame(data = list(create_engine(URL(**tenant_config)).execute(text(' '.join(
-																				[sql_line 
-																				for sql_line in open(file = os.path.abspath(os.path.join(work_dir, 
-																														'REGISTERED_COURSE_CATALOGUE.sql')) )])),
-																				tenant_id =  session_attributes.get('TENANT_ID'))),
+	return tenant_sql_query(tenant_config = tenant_config,
+						work_dir = work_dir,
+						sql_file = 'REGISTERED_COURSE_CATALOGUE.sql',
+						params = {'tenant_id' : session_attributes.get('TENANT_ID')},
 								columns = ['SIH_COURSEPK_ID',
 											'COURSE_ID',
 											'COURSE_TITLE']).astype(str)
 
 def stg_course_unit_query(session_attributes, tenant_config, work_dir):
-	return pd.DataFrame(data = list(create_engine(URL(**tenant_config)).execute(text(' '.join(
-																				[sql_line 
-																				for sql_line in open(file = os.path.abspath(os.path.join(work_dir, 
-																														'STG_COURSE_UNIT.sql')) )])),
-																				tenant_id =  session_attributes.get('TENANT_ID'))),
+	return tenant_sql_query(tenant_config = tenant_config,
+						work_dir = work_dir,
+						sql_file = 'STG_COURSE_UNIT.sql',
+						params = {'tenant_id' : session_attributes.get('TENANT_ID')},
 								columns = ['COURSE_ID',
 											'COURSE_TITLE',
 											'UNIT_NM',
@@ -364,21 +395,19 @@ def stg_course_unit_query(session_attributes, tenant_config, work_dir):
 											'TENANT_ID']).astype(str)
 
 def acad_yr_start_end_query(session_attributes, tenant_config, work_dir):
-	return pd.DataFrame(data = list(create_engine(URL(**tenant_config)).execute(text(' '.join(
-																				[sql_line 
-																				for sql_line in open(file = os.path.abspath(os.path.join(work_dir, 
-																														'ACADEMIC_YEAR_LOOKUP.sql')) )])),
-																				tenant_id =  session_attributes.get('TENANT_ID'))),
+	return tenant_sql_query(tenant_config = tenant_config,
+						work_dir = work_dir,
+						sql_file = 'ACADEMIC_YEAR_LOOKUP.sql',
+						params = {'tenant_id' : session_attributes.get('TENANT_ID')},
 								columns = ['ACADEMIC_YEAR',
 											'ACADEMIC_YEAR_START',
 											'ACADMEMIC_YEAR_END']).astype(str)
 
 def cpt_query(session_attributes, tenant_config, work_dir):
-	return pd.DataFrame(data = list(create_engine(URL(**tenant_config)).execute(text(' '.join(
-																				[sql_line 
-																				for sql_line in open(file = os.path.abspath(os.path.join(work_dir, 
-																														'CPT_QUERY.sql')) )])),
-																				tenant_id =  session_attributes.get('TENANT_ID'))),
+	return tenant_sql_query(tenant_config = tenant_config,
+						work_dir = work_dir,
+						sql_file = 'CPT_QUERY.sql',
+						params = {'tenant_id' : session_attributes.get('TENANT_ID')},
 								columns = ['CONSTITUENT_COUNT',
 										   'CPT_CELL_IDX',
 										   'MEAS',
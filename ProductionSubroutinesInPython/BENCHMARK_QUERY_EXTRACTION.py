@@ -0,0 +1,75 @@
+# coding: utf-8
+## PURPOSE:  MICRO-BENCHMARK THE EXTRACTION OF POMEGRANATE BAYESIAN-NETWORK QUERY RESULTS.  extract_bayesnet_query_array
+## in ONBOARD_LEARNER_KNOW_STATE replaced a to_json/json.loads round trip per vertex of every query.  This script keeps
+## the former extraction as a reference, outside of the production worker, and times the two against each other.
+##
+## MAJOR STEPS IN THE ALGORITHM LOGIC.
+## ① Construct synthetic predict_proba results of pomegranate DiscreteDistribution objects.
+## ② Extract them both ways, checking that both produce the same marginal probabilities.
+## ③ Report the elapsed times.  Run as a script, we benchmark the four measurable knowledge levels of MASTERY_LEVEL_CAT.
+##
+import timeit as tit
+import json
+from datetime import datetime
+import pandas as pd
+import numpy as np
+from pomegranate import DiscreteDistribution
+from ONBOARD_LEARNER_KNOW_STATE import extract_bayesnet_query_array
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓐ MICRO-BENCHMARK BAYESIAN-NETWORK QUERY EXTRACTION.  We time the former to_json/json.loads extraction — reproduced
+#    here as the reference — against extract_bayesnet_query_array for query_count synthetic predict_proba results of
+#    vert_count pomegranate DiscreteDistribution objects.  Both must produce the same marginal probabilities.  We report
+#    and return the elapsed times.
+def benchmark_extract_bayesnet_query(var_states, vert_count=20, query_count=1000, seed=0):
+    #    ⑴ Construct the synthetic query results.  Distribution keys are strings, as in our CPT-derived distributions.
+    level_labels = var_states.iloc[:-1]['CAT_LEVEL_IDX'].tolist()
+    rand_state = np.random.RandomState(seed)
+    graph_node_order = ['VERT_' + str(vert_idx) for vert_idx in range(vert_count)]
+    pred_proba_results = [[DiscreteDistribution(dict(zip([str(level) for level in level_labels],
+                                                         rand_state.dirichlet(np.ones(len(level_labels))))))
+                           for vert_idx in range(vert_count)]
+                          for query_idx in range(query_count)]
+    #
+    #    ⑵ The former extraction: serialize, parse, re-key, and build a dataframe per query.
+    start_time = tit.default_timer()
+    json_resp = list()
+    for pred_proba_result in pred_proba_results:
+        pred_proba_result_dict = dict(zip(graph_node_order, pred_proba_result))
+        for dict_key in list(pred_proba_result_dict.keys()):
+            pred_proba_result_dict.update({dict_key:
+                                               dict((int(float(str(key))), value) for key, value in
+                                                    json.loads(pred_proba_result_dict.get(dict_key).to_json())
+                                                    ['parameters'][0].items())})
+        json_resp.append(pd.DataFrame.from_dict(data=pred_proba_result_dict,
+                                                orient='index').loc[graph_node_order, level_labels].values)
+    json_time = tit.default_timer() - start_time
+    #
+    #    ⑶ Direct extraction into one preallocated array, and a single dataframe for the whole batch.
+    start_time = tit.default_timer()
+    level_idx = dict((level, col_idx) for (col_idx, level) in enumerate(level_labels))
+    marg_prob_array = np.zeros((query_count * vert_count, len(level_labels)))
+    for (query_idx, pred_proba_result) in enumerate(pred_proba_results):
+        extract_bayesnet_query_array(pred_proba_result=pred_proba_result,
+                                     level_idx=level_idx,
+                                     marg_prob_array=marg_prob_array[query_idx * vert_count:(query_idx + 1) * vert_count])
+    direct_resp = pd.DataFrame(data=marg_prob_array,
+                               index=graph_node_order * query_count,
+                               columns=level_labels)
+    direct_time = tit.default_timer() - start_time
+    #
+    #    ⑷ Check agreement and report.
+    max_abs_diff = np.max(np.abs(np.vstack(json_resp) - direct_resp.values))
+    print('JSON extraction ' + str(json_time) + ' s, direct extraction ' + str(direct_time) + ' s, speed-up ' +
+          str(json_time / direct_time) + ', maximum absolute difference ' + str(max_abs_diff) +
+          ' at time ' + str(datetime.now().time()))
+    return {'JSON_TIME': json_time,
+            'DIRECT_TIME': direct_time,
+            'MAX_ABS_DIFF': max_abs_diff}
+
+
+if __name__ == '__main__':
+    benchmark_extract_bayesnet_query(var_states=pd.DataFrame(data={'CAT_LEVEL_IDX': [0, 1, 2, 3, 4]},
+                                                             index=['L0', 'L1', 'L2', 'L3', 'UNMEASURED']))
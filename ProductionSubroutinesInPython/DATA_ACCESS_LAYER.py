@@ -0,0 +1,305 @@
+# coding: utf-8
+## PURPOSE:  READ FROM THE DATABASE THROUGH POOLED CONNECTIONS AND REUSED PREPARED STATEMENTS, MEASURING EACH QUERY'S
+## LATENCY.  worker formerly sent every per-course query — COURSE_LEARNING_STANDARD, COURSE_ENROLLEES, the
+## COURSE_MAP_EDGE common-table expression, VERTEX_LIST, THRES_CHECK, CPT_LIST, MASTERY_COLOR_LIST — as a fresh SQL text
+## with tenant, course, subject, and identifier lists pasted in as literals.  Each text was distinct, so DB2 compiled
+## an access plan for every course, and nothing reported which queries cost what.
+##
+## The data-access layer is a dictionary holding:
+## ⧐ a pool of at most POOL_SIZE connections, opened on demand by a connect function and handed out one query at a time;
+## ⧐ for each connection, the statements prepared on it, keyed by SQL text; and
+## ⧐ for each named query, its call count, row count, and latencies.
+##
+## Queries name their parameters — ":tenant_id" — as in the .sql files the CurriculumAlignmentAnalaysisReporting
+## *_query helpers read.  A scalar parameter binds to one marker.  A list parameter, written "IN :course_stds", binds to
+## a parenthesized list of markers whose length is the next power of two no less than the list's, padded by repeating its
+## last value.  A course's query text therefore depends on the logarithm of its list sizes only, and a handful of
+## prepared statements serve every course.  An empty list binds to (NULL), which matches nothing.
+##
+## Two drivers are supported.
+## ⧐ IBM_DB prepares statements with ibm_db.prepare, and fetches with ibm_db.fetch_tuple.
+## ⧐ DBAPI uses any qmark DB-API 2.0 connection — e.g., ibm_db_dbi, or SQLite during testing.  It keeps a cursor per
+##   statement, so that drivers which cache a cursor's last statement skip re-preparing it.
+##
+## MAJOR STEPS IN THE ALGORITHM LOGIC.
+## ① Open.  open_data_access returns the data-access dictionary.  Connections are opened as queries need them.
+## ② Query.  dal_query binds a named-parameter statement, executes it on a pooled connection, and returns a dataframe.
+##    dal_execute does the same for statements returning no rows.
+## ③ Report.  dal_latency_summary tabulates per-query latencies.  close_data_access closes the pool.
+##
+import re
+import threading
+import timeit as tit
+from datetime import datetime
+import numpy as np
+import pandas as pd
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+try:
+    import ibm_db
+except ImportError:
+    ibm_db = None
+
+
+#
+#    DAL_POOL_SIZE is the default number of pooled connections.  The optional Read_pool_size item of Mastery_config.txt
+#    overrides it in worker.  DAL_ACQUIRE_TIMEOUT is the number of seconds a query waits for a busy pool.
+DAL_POOL_SIZE = 2
+DAL_ACQUIRE_TIMEOUT = 300
+DAL_DRIVERS = ['IBM_DB', 'DBAPI']
+#
+#    ibm_db returns DECIMAL and floating columns as strings or Decimals.  We convert columns of these field types to
+#    floats, as pd.read_sql does.
+DAL_NUMERIC_FIELD_TYPES = ['decimal', 'real', 'float', 'double']
+#
+#    Named parameter markers, outside single-quoted literals.  The look-behind excludes "::" casts.
+DAL_PARAM_PATTERN = re.compile(r'(?<![:\w]):([A-Za-z_]\w*)')
+DAL_LITERAL_PATTERN = re.compile(r"('(?:[^']|'')*')")
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓐ CONSTRUCT A DB2 CONNECTION STRING for ibm_db.connect, from the arguments the *_query helpers pass to
+#    sqlalchemy.engine.url.URL.
+def db2_connection_string(host, port, database, username, password, **url_args):
+    return 'DATABASE=' + str(database) + ';HOSTNAME=' + str(host) + ';PORT=' + str(port) + \
+           ';PROTOCOL=TCPIP;UID=' + str(username) + ';PWD=' + str(password) + ';'
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓑ OPEN A DATA-ACCESS LAYER.  Our inputs are:
+#    ⧐ connect, a function of no arguments returning a new connection — e.g., a lambda wrapping ibm_db.connect;
+#    ⧐ driver, one of DAL_DRIVERS; and
+#    ⧐ pool_size, the most connections held open at once.
+#    We return the data-access dictionary.  No connection is opened until the first query.
+def open_data_access(connect, driver, pool_size=DAL_POOL_SIZE):
+    if driver not in DAL_DRIVERS:
+        raise ValueError('Unknown driver ' + str(driver) + '; expected one of ' + ', '.join(DAL_DRIVERS))
+    if (driver == 'IBM_DB') and (ibm_db is None):
+        raise ImportError('The IBM_DB driver requires the ibm_db package')
+    return {'CONNECT': connect,
+            'DRIVER': driver,
+            'POOL_SIZE': int(pool_size),
+            'IDLE_CONNECTIONS': queue.Queue(),
+            'OPEN_CONNECTIONS': list(),
+            'POOL_LOCK': threading.Lock(),
+            'PREPARED': dict(),
+            'QUERY_STATS': dict()}
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓒ ACQUIRE AND RELEASE POOLED CONNECTIONS.  We hand out an idle connection if there is one, open a new one if the pool
+#    is not full, and otherwise wait for one to be released.  A connection whose query failed may be broken.  We
+#    release it with discard=True, closing it and forgetting its prepared statements, rather than returning it to the pool.
+def acquire_connection(dal):
+    try:
+        return dal.get('IDLE_CONNECTIONS').get_nowait()
+    except queue.Empty:
+        pass
+    with dal.get('POOL_LOCK'):
+        if len(dal.get('OPEN_CONNECTIONS')) < dal.get('POOL_SIZE'):
+            connection = dal.get('CONNECT')()
+            dal.get('OPEN_CONNECTIONS').append(connection)
+            dal.get('PREPARED')[id(connection)] = dict()
+            return connection
+    return dal.get('IDLE_CONNECTIONS').get(timeout=DAL_ACQUIRE_TIMEOUT)
+
+
+def release_connection(dal, connection, discard=False):
+    if not discard:
+        dal.get('IDLE_CONNECTIONS').put(connection)
+        return
+    with dal.get('POOL_LOCK'):
+        dal.get('OPEN_CONNECTIONS').remove(connection)
+        dal.get('PREPARED').pop(id(connection), None)
+    try:
+        if dal.get('DRIVER') == 'IBM_DB':
+            ibm_db.close(connection)
+        else:
+            connection.close()
+    except Exception:
+        pass
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓓ BIND NAMED PARAMETERS.  We replace each :name marker outside quoted literals by "?" — or, for a list-valued
+#    parameter, by "(?, …, ?)" of power-of-two length — and return the qmark statement and its positional values.
+def in_list_bucket(list_len):
+    return 1 if list_len <= 1 else 2 ** int(np.ceil(np.log2(list_len)))
+
+
+def bind_named_params(sql, params):
+    bound_values = list()
+
+    def bind_marker(marker_match):
+        param_value = params[marker_match.group(1)]
+        if not isinstance(param_value, (list, tuple, set, np.ndarray, pd.Series, pd.Index)):
+            bound_values.append(param_value)
+            return '?'
+        param_list = list(param_value)
+        if len(param_list) == 0:
+            return '(NULL)'
+        param_list = param_list + [param_list[-1]] * (in_list_bucket(len(param_list)) - len(param_list))
+        bound_values.extend(param_list)
+        return '(' + ', '.join(['?'] * len(param_list)) + ')'
+
+    sql_pieces = DAL_LITERAL_PATTERN.split(sql)
+    qmark_sql = ''.join([DAL_PARAM_PATTERN.sub(bind_marker, sql_piece) if piece_idx % 2 == 0 else sql_piece
+                         for (piece_idx, sql_piece) in enumerate(sql_pieces)])
+    return qmark_sql, [bound_value.item() if isinstance(bound_value, np.generic) else bound_value
+                       for bound_value in bound_values]
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓔ EXECUTE A BOUND STATEMENT on a connection, reusing its prepared statement — on DB2 — or its cursor — otherwise —
+#    for the same SQL text.  We return the executed statement or cursor.
+def execute_prepared(dal, connection, qmark_sql, bound_values):
+    prepared = dal.get('PREPARED').get(id(connection))
+    if dal.get('DRIVER') == 'IBM_DB':
+        if qmark_sql not in prepared:
+            prepared[qmark_sql] = ibm_db.prepare(connection, qmark_sql)
+        ibm_db.execute(prepared.get(qmark_sql), tuple(bound_values))
+        return prepared.get(qmark_sql)
+    if qmark_sql not in prepared:
+        prepared[qmark_sql] = connection.cursor()
+    prepared.get(qmark_sql).execute(qmark_sql, tuple(bound_values))
+    return prepared.get(qmark_sql)
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓕ FETCH A RESULT SET INTO A DATAFRAME.  Column names are upper-cased.  If coerce_numeric, decimal and floating columns
+#    are converted to floats.  Otherwise they are left as the driver returns them — e.g., for callers that render every
+#    column as a string.
+def fetch_result_frame(dal, executed, coerce_numeric):
+    if dal.get('DRIVER') == 'IBM_DB':
+        field_count = ibm_db.num_fields(executed)
+        columns = [ibm_db.field_name(executed, field_idx).upper() for field_idx in range(field_count)]
+        numeric_cols = [columns[field_idx] for field_idx in range(field_count)
+                        if coerce_numeric and (str(ibm_db.field_type(executed, field_idx)).lower() in DAL_NUMERIC_FIELD_TYPES)]
+        records = list()
+        record = ibm_db.fetch_tuple(executed)
+        while record:
+            records.append(record)
+            record = ibm_db.fetch_tuple(executed)
+    else:
+        columns = [col_desc[0].upper() for col_desc in executed.description]
+        numeric_cols = list()
+        records = executed.fetchall()
+    result_frame = pd.DataFrame.from_records(data=list(records),
+                                             columns=columns,
+                                             coerce_float=coerce_numeric)
+    for col_idx in numeric_cols:
+        result_frame[col_idx] = pd.to_numeric(result_frame[col_idx], errors='coerce')
+    return result_frame
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓖ RECORD A QUERY'S LATENCY under its name.
+def record_query_latency(dal, query_name, elapsed_time, row_count):
+    query_stats = dal.get('QUERY_STATS').setdefault(query_name, {'CALLS': 0,
+                                                                  'ROWS': 0,
+                                                                  'LATENCIES': list()})
+    query_stats['CALLS'] += 1
+    query_stats['ROWS'] += row_count
+    query_stats.get('LATENCIES').append(elapsed_time)
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓗ QUERY.  Our inputs are:
+#    ⧐ dal, from open_data_access;
+#    ⧐ query_name, under which latencies are recorded — e.g., COURSE_ENROLLEES;
+#    ⧐ sql, a statement with :name parameter markers; and
+#    ⧐ params, a dictionary of parameter values, scalars or lists; and
+#    ⧐ coerce_numeric, whether to convert decimal and floating columns to floats, as pd.read_sql does.
+#    We return the result set as a dataframe.  dal_execute runs statements returning no rows, and returns the number of
+#    rows affected.
+def dal_query(dal, query_name, sql, params=None, coerce_numeric=True):
+    return run_statement(dal=dal,
+                         query_name=query_name,
+                         sql=sql,
+                         params=params,
+                         fetch=True,
+                         coerce_numeric=coerce_numeric)
+
+
+def dal_execute(dal, query_name, sql, params=None):
+    return run_statement(dal=dal,
+                         query_name=query_name,
+                         sql=sql,
+                         params=params,
+                         fetch=False,
+                         coerce_numeric=False)
+
+
+def run_statement(dal, query_name, sql, params, fetch, coerce_numeric):
+    start_time = tit.default_timer()
+    qmark_sql, bound_values = bind_named_params(sql=sql,
+                                                params=params if params is not None else dict())
+    connection = acquire_connection(dal=dal)
+    try:
+        executed = execute_prepared(dal=dal,
+                                    connection=connection,
+                                    qmark_sql=qmark_sql,
+                                    bound_values=bound_values)
+        if fetch:
+            result = fetch_result_frame(dal=dal,
+                                        executed=executed,
+                                        coerce_numeric=coerce_numeric)
+            row_count = len(result)
+        else:
+            result = row_count = ibm_db.num_rows(executed) if dal.get('DRIVER') == 'IBM_DB' else executed.rowcount
+            if dal.get('DRIVER') == 'DBAPI':
+                connection.commit()
+    except Exception:
+        release_connection(dal=dal,
+                           connection=connection,
+                           discard=True)
+        raise
+    release_connection(dal=dal,
+                       connection=connection)
+    record_query_latency(dal=dal,
+                         query_name=query_name,
+                         elapsed_time=tit.default_timer() - start_time,
+                         row_count=row_count)
+    return result
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓘ SUMMARIZE QUERY LATENCIES.  We return a dataframe indexed by QUERY_NAME of CALLS, ROWS, TOTAL_SEC, MEAN_MS, P95_MS,
+#    and MAX_MS, in decreasing order of TOTAL_SEC.
+def dal_latency_summary(dal):
+    summary_cols = ['CALLS', 'ROWS', 'TOTAL_SEC', 'MEAN_MS', 'P95_MS', 'MAX_MS']
+    if len(dal.get('QUERY_STATS')) == 0:
+        return pd.DataFrame(columns=summary_cols)
+    return pd.DataFrame(data=[[query_stats.get('CALLS'),
+                               query_stats.get('ROWS'),
+                               np.sum(query_stats.get('LATENCIES')),
+                               1000. * np.mean(query_stats.get('LATENCIES')),
+                               1000. * np.percentile(query_stats.get('LATENCIES'), 95),
+                               1000. * np.max(query_stats.get('LATENCIES'))]
+                              for query_stats in dal.get('QUERY_STATS').values()],
+                        columns=summary_cols,
+                        index=pd.Index(list(dal.get('QUERY_STATS').keys()), name='QUERY_NAME'))\
+             .sort_values(by='TOTAL_SEC', ascending=False)
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓙ CLOSE THE DATA-ACCESS LAYER, closing every pooled connection.  Connections out on loan at the time are closed too.
+def close_data_access(dal):
+    for connection in list(dal.get('OPEN_CONNECTIONS')):
+        release_connection(dal=dal,
+                           connection=connection,
+                           discard=True)
+    dal['IDLE_CONNECTIONS'] = queue.Queue()
+    print('Closed data-access pool at time ' + str(datetime.now().time()))
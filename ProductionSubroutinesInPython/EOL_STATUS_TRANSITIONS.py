@@ -0,0 +1,181 @@
+# coding: utf-8
+## PURPOSE:  MOVE EOL_MEAS MEASUREMENTS THROUGH THEIR STATUS TRANSITIONS WITH SET-BASED, PARAMETERIZED UPDATES.  worker
+## formerly built each UPDATE of IBMSIH.EOL_MEAS by concatenating tuples of student, learning-standard, and
+## evidence-of-learning identifiers into IN (...) lists.  Those statements grow with the course, every one is distinct
+## text — so the database cannot reuse its access plan — and an empty tuple yields invalid SQL.
+##
+## We instead bulk-insert the keys into a session-scoped staging table.  Each key belongs to a named KEY_SET:  the
+## course's students, its learning standards, and the students and standards of processed and not-processed
+## measurements.  Each transition — PENDING → RUNNING → DONE, ERROR, or NOTPROCESSED — is then a single UPDATE
+## joined to the staging table through EXISTS predicates, with the statuses and tenant as bound parameters.  The
+## statement text depends only on the transition's scope, so a handful of prepared statements serve every course.
+##
+## The staging table is a declared global temporary table on DB2 and a TEMP table on SQLite, against which the
+## component can be exercised locally.
+##
+## MAJOR STEPS IN THE ALGORITHM LOGIC.
+## ① Open.  open_eol_status_transitioner creates the staging table, and returns a dictionary holding the connection,
+##    its prepared statements, and a bulk sink into the staging table.
+## ② Stage.  stage_eol_keys replaces the contents of one KEY_SET.
+## ③ Transition.  transition_eol_status updates the status of measurements in a tenant and a scope — a conjunction of
+##    disjunctions of KEY_SETs, defined in EOL_STATUS_SCOPES — and returns the number of rows updated.
+##
+import timeit as tit
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from KNOW_STATE_SINK import SINK_BATCH_ROWS, open_bulk_sink, bulk_write_frame
+try:
+    import ibm_db
+except ImportError:
+    ibm_db = None
+
+
+#
+#    Each scope is a list of conditions, all of which must hold.  Each condition is a list of (KEY_SET, EOL_MEAS
+#    column) pairs, any one of which must match.
+#    ⧐ COURSE:  the course's enrollees and the learning standards of its graphical neighborhood.
+#    ⧐ PROCESSED:  students and learning standards with processed measurements.
+#    ⧐ PROCESSED_ERROR:  students with processed or not-processed measurements, and learning standards with both.
+EOL_STATUS_SCOPES = {'COURSE': [[('COURSE_STUDENT', 'SIHPERSON_PKID')],
+                                [('COURSE_STANDARD', 'LEARNING_STANDARD_ID')]],
+                     'PROCESSED': [[('PROCESSED_STUDENT', 'SIHPERSON_PKID')],
+                                   [('PROCESSED_STANDARD', 'LEARNING_STANDARD_ID')]],
+                     'PROCESSED_ERROR': [[('PROCESSED_STUDENT', 'SIHPERSON_PKID'),
+                                          ('UNPROCESSED_STUDENT', 'SIHPERSON_PKID')],
+                                         [('PROCESSED_STANDARD', 'LEARNING_STANDARD_ID')],
+                                         [('UNPROCESSED_STANDARD', 'LEARNING_STANDARD_ID')]]}
+EOL_KEY_STAGE = 'EOL_KEY_STAGE'
+EOL_STAGE_DDL = {'DB2': ['DECLARE GLOBAL TEMPORARY TABLE SESSION.' + EOL_KEY_STAGE +
+                         ' (KEY_SET VARCHAR(32) NOT NULL, KEY_VALUE BIGINT NOT NULL)'
+                         ' ON COMMIT PRESERVE ROWS NOT LOGGED WITH REPLACE',
+                         'CREATE INDEX SESSION.' + EOL_KEY_STAGE + '_IDX ON SESSION.' + EOL_KEY_STAGE +
+                         ' (KEY_SET, KEY_VALUE)'],
+                 'DBAPI': ['CREATE TEMP TABLE IF NOT EXISTS ' + EOL_KEY_STAGE +
+                           ' (KEY_SET VARCHAR(32) NOT NULL, KEY_VALUE BIGINT NOT NULL)',
+                           'CREATE INDEX IF NOT EXISTS temp.' + EOL_KEY_STAGE + '_IDX ON ' + EOL_KEY_STAGE +
+                           ' (KEY_SET, KEY_VALUE)']}
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓐ OPEN A STATUS TRANSITIONER.  Our inputs are:
+#    ⧐ connection, an ibm_db connection for DB2, or a DB-API 2.0 connection — e.g., SQLite — for DBAPI;
+#    ⧐ connection_type, DB2 or DBAPI;
+#    ⧐ eol_table, the qualified name of the measurement table; and
+#    ⧐ batch_rows, the number of keys bound per staging insert.
+#    We create — or, on DB2, replace — the staging table, and return the transitioner dictionary.  The staging table
+#    lives as long as the connection's session.
+def open_eol_status_transitioner(connection, connection_type, eol_table='IBMSIH.EOL_MEAS', batch_rows=SINK_BATCH_ROWS):
+    if connection_type not in EOL_STAGE_DDL:
+        raise ValueError('Unknown connection type ' + str(connection_type) + '; expected DB2 or DBAPI')
+    transitioner = {'CONNECTION': connection,
+                    'CONNECTION_TYPE': connection_type,
+                    'EOL_TABLE': eol_table,
+                    'STAGE_TABLE': 'SESSION.' + EOL_KEY_STAGE if connection_type == 'DB2' else EOL_KEY_STAGE,
+                    'KEY_SINK': open_bulk_sink(connection=connection,
+                                               sink_type='DB2_ARRAY' if connection_type == 'DB2' else 'DBAPI',
+                                               schema_name='SESSION' if connection_type == 'DB2' else None,
+                                               batch_rows=batch_rows),
+                    'PREPARED': dict(),
+                    'TRANSITION_STATS': list()}
+    for ddl_statement in EOL_STAGE_DDL.get(connection_type):
+        execute_eol_statement(transitioner=transitioner,
+                              statement=ddl_statement,
+                              params=tuple())
+    return transitioner
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓑ EXECUTE A PARAMETERIZED STATEMENT, and commit it.  On DB2 we prepare each distinct statement text once per
+#    transitioner, and reuse the prepared statement thereafter.  We return the number of rows affected.
+def execute_eol_statement(transitioner, statement, params):
+    connection = transitioner.get('CONNECTION')
+    if transitioner.get('CONNECTION_TYPE') == 'DB2':
+        if statement not in transitioner.get('PREPARED'):
+            transitioner.get('PREPARED')[statement] = ibm_db.prepare(connection, statement)
+        prepared_stmt = transitioner.get('PREPARED').get(statement)
+        ibm_db.execute(prepared_stmt, tuple(params))
+        return ibm_db.num_rows(prepared_stmt)
+    cursor = connection.cursor()
+    cursor.execute(statement, tuple(params))
+    row_count = cursor.rowcount
+    cursor.close()
+    connection.commit()
+    return row_count
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓒ STAGE A KEY SET.  The distinct, non-null key_values replace whatever key_set previously held.  Keys are integer
+#    identifiers, which worker carries as strings.  A key that is not an integer would match no EOL_MEAS row, leaving
+#    its measurements unmoved without notice.  We raise a ValueError instead, before the key set is touched.  We return
+#    the number of keys staged.
+def stage_eol_keys(transitioner, key_set, key_values):
+    key_values = pd.Series(list(key_values), dtype=object)
+    key_values = key_values.loc[key_values.notnull()]
+    key_numbers = pd.to_numeric(key_values, errors='coerce')
+    key_invalid = key_numbers.isnull().values | (key_numbers.fillna(0) % 1 != 0).values
+    if key_invalid.any():
+        raise ValueError(str(int(key_invalid.sum())) + ' ' + key_set + ' keys are not integers, e.g. ' +
+                         ', '.join(repr(key_value) for key_value in key_values.loc[key_invalid].unique()[:5]))
+    key_values = key_numbers.astype(np.int64).unique()
+    execute_eol_statement(transitioner=transitioner,
+                          statement='DELETE FROM ' + transitioner.get('STAGE_TABLE') + ' WHERE KEY_SET = ?',
+                          params=(key_set,))
+    bulk_write_frame(sink=transitioner.get('KEY_SINK'),
+                     frame=pd.DataFrame({'KEY_SET': [key_set] * len(key_values),
+                                         'KEY_VALUE': key_values},
+                                        columns=['KEY_SET', 'KEY_VALUE']),
+                     table_name=EOL_KEY_STAGE)
+    return len(key_values)
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓓ RENDER A SCOPE AS A PREDICATE on the EOL_MEAS correlation name em.  Each condition becomes a parenthesized
+#    disjunction of EXISTS subqueries against the staging table.  KEY_SET names are constants of EOL_STATUS_SCOPES, so
+#    the predicate's text is fixed for each scope.
+def eol_scope_predicate(transitioner, scope):
+    if scope is None:
+        return ''
+    return ''.join([' AND (' + ' OR '.join(['EXISTS (SELECT 1 FROM ' + transitioner.get('STAGE_TABLE') + ' ks' +
+                                            " WHERE ks.KEY_SET = '" + key_set + "'" +
+                                            ' AND ks.KEY_VALUE = em.' + eol_column + ')'
+                                            for (key_set, eol_column) in scope_condition]) + ')'
+                    for scope_condition in EOL_STATUS_SCOPES.get(scope)])
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓔ TRANSITION MEASUREMENT STATUSES.  Our inputs are:
+#    ⧐ transitioner, from open_eol_status_transitioner;
+#    ⧐ from_status and to_status, e.g., RUNNING and DONE;
+#    ⧐ tenant_id, restricting the update to one tenant, or None for all tenants;
+#    ⧐ scope, a key of EOL_STATUS_SCOPES, or None for all measurements in from_status; and
+#    ⧐ from_lock and to_lock, optionally the IS_LOCK value required and the value set.
+#    We return the number of measurements updated.
+def transition_eol_status(transitioner, from_status, to_status, tenant_id=None, scope=None, from_lock=None,
+                          to_lock=None):
+    start_time = tit.default_timer()
+    set_clause = ' SET STATUS = ?' + (', IS_LOCK = ?' if to_lock is not None else '')
+    where_clause = ' WHERE em.STATUS = ?' + \
+                   (' AND em.IS_LOCK = ?' if from_lock is not None else '') + \
+                   (' AND em.TENANT_ID = ?' if tenant_id is not None else '') + \
+                   eol_scope_predicate(transitioner=transitioner,
+                                       scope=scope)
+    params = [to_status] + ([to_lock] if to_lock is not None else []) + [from_status] + \
+             ([from_lock] if from_lock is not None else []) + ([tenant_id] if tenant_id is not None else [])
+    row_count = execute_eol_statement(transitioner=transitioner,
+                                      statement='UPDATE ' + transitioner.get('EOL_TABLE') + ' AS em' + set_clause +
+                                                where_clause,
+                                      params=params)
+    transitioner.get('TRANSITION_STATS').append({'FROM_STATUS': from_status,
+                                                 'TO_STATUS': to_status,
+                                                 'SCOPE': scope,
+                                                 'ROW_COUNT': row_count,
+                                                 'ELAPSED_TIME': tit.default_timer() - start_time})
+    print('EOL_MEAS ' + str(from_status) + ' → ' + str(to_status) + ' for ' + str(row_count) + ' measurements in scope ' +
+          str(scope) + ' at time ' + str(datetime.now().time()))
+    return row_count
@@ -136,6 +136,7 @@
 																														 list(prof_val.get('IN_RANGE_DIGRAPH').nodes())],
 																				evid_prof_conformees = prof_val.get('STUDENT_ID'),
 																				var_states = var_states,
+																				cpt_list = CPT_LIST,
 																				clust_idx = subgraph_key),
 																	prof_val]
 												for (key, val) in dict_comp.items()}
@@ -153,6 +154,7 @@
 																														 list(prof_val.get('IN_RANGE_DIGRAPH').nodes())],
 																				evid_prof_conformees = prof_val.get('STUDENT_ID'),
 																				var_states = var_states,
+																				cpt_list = CPT_LIST,
 																				clust_idx = subgraph_key),
 																	prof_val]
 												for (key, val) in dict_comp.items()}
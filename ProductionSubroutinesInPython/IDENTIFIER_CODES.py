@@ -0,0 +1,94 @@
+# coding: utf-8
+## PURPOSE:  INTERN LEARNING-STANDARD AND STUDENT IDENTIFIERS AS DENSE INTEGER CODES.  LEARNING_STANDARD_ID and
+## STUDENT_ID arrive from the database as strings.  Every stage of our inference pipeline — graph construction, grouping
+## by evidentiary profile, subgraph decomposition, inference, and aggregation — hashes and compares them, over and over.
+## String hashing and comparison dominate the object-dtype joins and the networkx bookkeeping.  We instead map each
+## distinct identifier to a dense int32 code once per course run.  The pipeline runs on codes.  We decode back to the
+## identifiers only at the STUDENT_KNOWLEDGE_LEVEL write boundary.
+##
+## Codes are positions in an index of identifiers.  The compiled-network cache and the posterior memo key subgraphs by
+## their code-labeled structure, so a learning standard must carry the same code in every course and run of its tenant.
+## Learning-standard codes are therefore drawn from the tenant's STANDARD_CODES, held by REFERENCE_DATA_CACHE.  That
+## index begins as the sorted learning standards of the tenant's progression hierarchy, and is only ever appended to.
+## Student codes appear in no cache key.  They are positions in the sorted list of the run's distinct students.
+##
+## MAJOR STEPS IN THE ALGORITHM LOGIC.
+## ① Build.  identifier_code_book collects the distinct learning standards — from the course-neighborhood edge list and
+##    the body of evidence — and the distinct students.  It returns a dictionary of identifier indices, one per
+##    identifier kind.  extend_code_index appends unseen identifiers to an index, leaving existing codes unchanged.
+## ② Encode.  encode_identifiers replaces identifier columns of a dataframe with their codes.
+## ③ Decode.  decode_identifiers replaces code columns with their identifiers.
+##
+import numpy as np
+import pandas as pd
+
+
+#
+#    The identifier kind of each column carrying identifiers.  Columns not listed here are not interned.
+IDENTIFIER_KIND = {'LEARNING_STANDARD_ID': 'LEARNING_STANDARD_ID',
+                   'CONSTITUENT_LEARNING_STD_ID': 'LEARNING_STANDARD_ID',
+                   'STUDENT_ID': 'STUDENT_ID',
+                   'SIH_PERSONPK_ID_ST': 'STUDENT_ID'}
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓐ EXTEND A CODE INDEX.  Identifiers absent from code_index — None for an empty index — are appended in sorted order.
+#    Identifiers already present keep their positions, and so their codes.  We return the extended pd.Index.
+def extend_code_index(code_index, identifiers):
+    if code_index is None:
+        code_index = pd.Index([], dtype=object)
+    new_identifiers = sorted(set(str(identifier) for identifier in identifiers).difference(set(code_index)))
+    if len(new_identifiers) == 0:
+        return code_index
+    return code_index.append(pd.Index(new_identifiers, dtype=object))
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓑ BUILD A CODE BOOK.  Our inputs are:
+#    ⧐ vert_list, the long-table body of evidence, with STUDENT_ID and LEARNING_STANDARD_ID columns;
+#    ⧐ digraph_edge_list, the course-neighborhood edge list; and
+#    ⧐ standard_codes, the tenant's STANDARD_CODES, or None.
+#    Null identifiers — e.g., from enrollees without evidence — are ignored.  Identifiers are compared as strings, the
+#    form in which assemble_knowledge_state_table writes them.  We return a dictionary with, for each identifier kind,
+#    a pd.Index of identifiers.  An identifier's code is its position in that index.  Learning standards are coded by
+#    standard_codes, extended by any it lacks.  Without standard_codes, and for students, the index is sorted.
+def identifier_code_book(vert_list, digraph_edge_list, standard_codes=None):
+    learning_stds = set(digraph_edge_list['LEARNING_STANDARD_ID'].astype(str)) \
+        .union(set(digraph_edge_list['CONSTITUENT_LEARNING_STD_ID'].astype(str))) \
+        .union(set(vert_list['LEARNING_STANDARD_ID'].dropna().astype(str)))
+    students = set(vert_list['STUDENT_ID'].dropna().astype(str))
+    return {'LEARNING_STANDARD_ID': extend_code_index(code_index=standard_codes,
+                                                      identifiers=learning_stds),
+            'STUDENT_ID': pd.Index(sorted(students), dtype=object)}
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓒ ENCODE IDENTIFIER COLUMNS.  Every identifier column of frame — those named in IDENTIFIER_KIND — is replaced by its
+#    int32 codes.  Rows with a null identifier — e.g., VERTEX_LIST rows for enrollee–standard pairs without evidence —
+#    have no code, and are dropped, as identifier_code_book ignores them.  A non-null identifier absent from code_book
+#    indicates that the code book was built from different data than that being encoded.  We raise a ValueError rather
+#    than silently coding it as missing.  We return a new dataframe.
+def encode_identifiers(frame, code_book):
+    id_cols = [col_idx for col_idx in frame.columns if col_idx in IDENTIFIER_KIND]
+    frame = frame.dropna(subset=id_cols).copy()
+    for col_idx in id_cols:
+        codes = code_book.get(IDENTIFIER_KIND.get(col_idx)).get_indexer(frame[col_idx].astype(str))
+        if (codes < 0).any():
+            raise ValueError('Identifier code book lacks ' + str((codes < 0).sum()) + ' ' + col_idx + ' values')
+        frame[col_idx] = codes.astype(np.int32)
+    return frame
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓓ DECODE IDENTIFIER COLUMNS.  The inverse of encode_identifiers.  Every code column of frame named in IDENTIFIER_KIND
+#    is replaced by its identifiers.  We return a new dataframe.
+def decode_identifiers(frame, code_book):
+    frame = frame.copy()
+    for col_idx in [col_idx for col_idx in frame.columns if col_idx in IDENTIFIER_KIND]:
+        frame[col_idx] = code_book.get(IDENTIFIER_KIND.get(col_idx)).values \
+            .take(frame[col_idx].values.astype(np.int64))
+    return frame
@@ -0,0 +1,183 @@
+# coding: utf-8
+## PURPOSE:  CHOOSE AN INFERENCE ENGINE FOR EACH SUBGRAPH FROM A FITTED COST MODEL.  We formerly chose how to query
+## each subgraph by fixed rules:  star graphs were star-reduced, and build_factor_bayesnet chose exact inference whenever
+## the largest elimination clique fit within EXACT_CELL_BUDGET.  Those rules ignore how many evidentiary states the
+## subgraph must answer and how the engines actually perform on our hosts.  We instead predict the cost of each
+## admissible engine and dispatch to the cheapest.
+##
+## MAJOR STEPS IN THE ALGORITHM LOGIC.
+## ① Describe.  Extract cost features from the subgraph:  graph order, in-degree profile, moral-graph treewidth —
+##    and therefore the largest-clique cell count — factor cell count, measured-vertex count, and evidentiary-state
+##    count.
+## ② Predict.  Each engine's per-state cost is linear in a single engine-specific feature.  We multiply by the number
+##    of evidentiary states.
+## ③ Route.  Fully-measured subgraphs need no inference.  Otherwise we choose the cheapest admissible engine, favoring
+##    the exact engines — variable elimination, the junction tree, and the closed-form star engine — by
+##    EXACT_PREFERENCE because they are exact.  Star graphs not answered by the star engine are star-reduced before the
+##    chosen engine is applied.
+## ④ Fit.  The intercept and slope for each engine are least-squares fits to the CLUSTER_EXEC_TIME history — one row
+##    per evidentiary-state query — which records each query's INFERENCE_APPROACH, cost features, and ELAPSED_TIME.
+##
+import os
+import re
+from datetime import datetime
+import pandas as pd
+import numpy as np
+from NUMPY_SUM_PRODUCT_INFERENCE import moral_graph_treewidth, star_graph_center, BATCH_LABEL, EXACT_CELL_BUDGET
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓐ COST MODEL.  INFERENCE_COST_MODEL holds for each engine the intercept and slope — seconds per evidentiary state —
+#    of its per-state cost, and the cost feature to which the slope applies.  The defaults are rough figures from
+#    our development hosts.  fit_inference_cost_model replaces them for each engine with at least COST_FIT_MIN_ROWS
+#    rows of history.
+#    ⧐ NONE applies to fully-measured subgraphs, and costs nothing.
+#    ⧐ EXACT — variable elimination — contracts one largest-clique-sized intermediate per estimated vertex.
+#    ⧐ JUNCTION_TREE calibrates every clique — at most one per vertex — twice per evidentiary state.
+#    ⧐ STAR — star graphs only — touches every factor cell about once per evidentiary state.
+#    ⧐ LOOPY — loopy message passing — touches every factor cell once per iteration per scope vertex.
+EXACT_PREFERENCE = 4.
+EXACT_APPROACHES = ['EXACT', 'JUNCTION_TREE', 'STAR']
+COST_FIT_MIN_ROWS = 20
+INFERENCE_COST_MODEL = {'NONE': {'INTERCEPT': 0., 'SLOPE': 0., 'COST_FEATURE': 'EST_VERT_COUNT'},
+                        'EXACT': {'INTERCEPT': 2e-5, 'SLOPE': 2e-8, 'COST_FEATURE': 'EXACT_COST_FEATURE'},
+                        'JUNCTION_TREE': {'INTERCEPT': 1e-5, 'SLOPE': 2e-9, 'COST_FEATURE': 'JUNCTION_TREE_COST_FEATURE'},
+                        'STAR': {'INTERCEPT': 2e-6, 'SLOPE': 8e-9, 'COST_FEATURE': 'FACTOR_CELL_COUNT'},
+                        'LOOPY': {'INTERCEPT': 2e-4, 'SLOPE': 5e-7, 'COST_FEATURE': 'FACTOR_CELL_COUNT'}}
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓑ SUBGRAPH COST FEATURES.  Our inputs are a networkx DiGraph, the list of vertices measured for the evidentiary
+#    profile, the number of evidentiary states to be answered, and var_card, the number of knowledge levels.  We
+#    return a dictionary of cost features.  Its keys coincide with the CLUSTER_EXEC_TIME attributes from which the
+#    cost model is fitted.  Callers that already know the moral-graph treewidth — decompose_digraph records it for each
+#    subgraph — may pass it rather than have it estimated again.
+def subgraph_cost_features(directed_graph, measured_verts, state_count, var_card, treewidth=None):
+    in_degrees = [in_degree for (vert, in_degree) in directed_graph.in_degree()]
+    meas_vert_count = len(set(measured_verts).intersection(set(directed_graph.nodes())))
+    if treewidth is None:
+        treewidth = moral_graph_treewidth(directed_graph)
+    cost_features = {'GRAPH_ORDER': len(directed_graph.nodes()),
+                     'EDGE_COUNT': len(directed_graph.edges()),
+                     'MAX_IN_DEGREE': max(in_degrees) if len(in_degrees) > 0 else 0,
+                     'MEAS_VERT_COUNT': meas_vert_count,
+                     'EST_VERT_COUNT': len(directed_graph.nodes()) - meas_vert_count,
+                     'STATE_COUNT': state_count,
+                     'TREEWIDTH': treewidth,
+                     'CLIQUE_CELL_COUNT': var_card ** (treewidth + 1),
+                     'FACTOR_CELL_COUNT': sum((in_degree + 1) * var_card ** (in_degree + 1) for in_degree in in_degrees)}
+    cost_features.update({'EXACT_COST_FEATURE': cost_features.get('EST_VERT_COUNT') *
+                                                cost_features.get('CLIQUE_CELL_COUNT'),
+                          'JUNCTION_TREE_COST_FEATURE': cost_features.get('GRAPH_ORDER') *
+                                                        cost_features.get('CLIQUE_CELL_COUNT')})
+    return cost_features
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓒ PREDICT ENGINE COST.  Predicted seconds for an engine to answer all of the evidentiary states of a subgraph.
+def predict_inference_cost(inference_approach, cost_features):
+    engine_model = INFERENCE_COST_MODEL.get(inference_approach)
+    return cost_features.get('STATE_COUNT') * (engine_model.get('INTERCEPT') +
+                                               engine_model.get('SLOPE') *
+                                               cost_features.get(engine_model.get('COST_FEATURE')))
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓓ ROUTE SUBGRAPH INFERENCE.  Our inputs are those of subgraph_cost_features, plus is_star_graph, the IS_STAR_GRAPH
+#    flag from decompose_digraph.  We return a dictionary containing:
+#    ⧐ INFERENCE_APPROACH, the chosen engine — NONE, EXACT, JUNCTION_TREE, STAR, or LOOPY;
+#    ⧐ STAR_REDUCTION, whether to star-reduce the subgraph before querying it.  Subgraphs answered by the STAR engine
+#      need no reduction;
+#    ⧐ PREDICTED_COST, a dictionary of predicted seconds for each admissible engine; and
+#    ⧐ COST_FEATURES, the dictionary from subgraph_cost_features.
+#    The exact engines are admissible only within the einsum label limit and EXACT_CELL_BUDGET, the memory bound on
+#    their largest intermediate factor or clique.  The STAR engine is admissible only for star graphs, whose every edge
+#    meets a single hub.
+def route_subgraph_inference(directed_graph, measured_verts, state_count, var_card, is_star_graph=False,
+                             treewidth=None):
+    cost_features = subgraph_cost_features(directed_graph=directed_graph,
+                                           measured_verts=measured_verts,
+                                           state_count=state_count,
+                                           var_card=var_card,
+                                           treewidth=treewidth)
+    if cost_features.get('EST_VERT_COUNT') == 0:
+        admissible_approaches = ['NONE']
+    elif ((cost_features.get('GRAPH_ORDER') <= BATCH_LABEL) and
+          (cost_features.get('CLIQUE_CELL_COUNT') <= EXACT_CELL_BUDGET)):
+        admissible_approaches = [inference_approach for inference_approach in EXACT_APPROACHES
+                                 if inference_approach != 'STAR' or star_graph_center(directed_graph) is not None] + \
+                                ['LOOPY']
+    else:
+        admissible_approaches = ['LOOPY']
+    predicted_cost = dict((inference_approach, predict_inference_cost(inference_approach=inference_approach,
+                                                                      cost_features=cost_features))
+                          for inference_approach in admissible_approaches)
+    #
+    #    Exact inference wins unless it is predicted to cost more than EXACT_PREFERENCE times as much as the cheapest
+    #    alternative.
+    inference_approach = min(admissible_approaches,
+                             key=lambda inference_approach: predicted_cost.get(inference_approach) /
+                                                            (EXACT_PREFERENCE if inference_approach in EXACT_APPROACHES
+                                                             else 1.))
+    return {'INFERENCE_APPROACH': inference_approach,
+            'STAR_REDUCTION': bool(is_star_graph) and inference_approach not in ['NONE', 'STAR'],
+            'PREDICTED_COST': predicted_cost,
+            'COST_FEATURES': cost_features}
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓔ FIT THE COST MODEL FROM CLUSTER_EXEC_TIME HISTORY.  Our input is a CLUSTER_EXEC_TIME dataframe — one row per
+#    evidentiary-state query.  Star-reduced and soft-separated queries are recorded with a STAR_ or SOFTSEP_ prefix —
+#    STAR_EXACT or SOFTSEP_JUNCTION_TREE, for instance; they inform the model of the engine that answered them.  Rows
+#    written before the cost features were recorded are ignored.  For each engine with at least COST_FIT_MIN_ROWS rows,
+#    we fit ELAPSED_TIME = INTERCEPT + SLOPE × COST_FEATURE by least squares.  Fits yielding a negative intercept or
+#    slope are rejected.  We update INFERENCE_COST_MODEL in place and return it.
+def fit_inference_cost_model(cluster_exec_time):
+    required_attrs = ['INFERENCE_APPROACH', 'ELAPSED_TIME', 'GRAPH_ORDER', 'EST_VERT_COUNT', 'CLIQUE_CELL_COUNT',
+                      'FACTOR_CELL_COUNT']
+    if len(cluster_exec_time) == 0 or not set(required_attrs).issubset(set(cluster_exec_time.columns)):
+        return INFERENCE_COST_MODEL
+    exec_history = cluster_exec_time[required_attrs].dropna()
+    exec_history = exec_history.assign(INFERENCE_APPROACH=exec_history['INFERENCE_APPROACH'].astype(str)
+                                       .str.replace('^(STAR|SOFTSEP)_', '', regex=True),
+                                       EXACT_COST_FEATURE=exec_history['EST_VERT_COUNT'].astype(float) *
+                                                          exec_history['CLIQUE_CELL_COUNT'].astype(float),
+                                       JUNCTION_TREE_COST_FEATURE=exec_history['GRAPH_ORDER'].astype(float) *
+                                                                  exec_history['CLIQUE_CELL_COUNT'].astype(float))
+    for inference_approach in EXACT_APPROACHES + ['LOOPY']:
+        engine_history = exec_history.loc[exec_history['INFERENCE_APPROACH'] == inference_approach]
+        if len(engine_history) < COST_FIT_MIN_ROWS:
+            continue
+        cost_feature = engine_history[INFERENCE_COST_MODEL.get(inference_approach).get('COST_FEATURE')] \
+            .values.astype(float)
+        (intercept, slope) = np.linalg.lstsq(np.column_stack([np.ones(len(cost_feature)), cost_feature]),
+                                             engine_history['ELAPSED_TIME'].values.astype(float),
+                                             rcond=None)[0]
+        if intercept >= 0 and slope >= 0:
+            INFERENCE_COST_MODEL.get(inference_approach).update({'INTERCEPT': intercept,
+                                                                 'SLOPE': slope})
+            print('Cost model for ' + inference_approach + ' inference fitted from ' + str(len(engine_history)) +
+                  ' queries at time ' + str(datetime.now().time()))
+    return INFERENCE_COST_MODEL
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓕ FIT THE COST MODEL FROM A DIRECTORY OF CLUSTER_EXEC_TIME FILES.  diagnose_group_know_state writes
+#    CLUSTER_EXEC_TIME.csv, and archived runs are kept as *_CLUSTER_EXEC_TIME.csv.  We concatenate every such file in
+#    directory_path and fit the cost model to the result.
+def fit_inference_cost_model_from_dir(directory_path):
+    if not os.path.isdir(directory_path):
+        return INFERENCE_COST_MODEL
+    exec_time_files = [file_name for file_name in os.listdir(directory_path)
+                       if bool(re.search('CLUSTER_EXEC_TIME.csv$', file_name))]
+    if len(exec_time_files) == 0:
+        return INFERENCE_COST_MODEL
+    return fit_inference_cost_model(cluster_exec_time=pd.concat([pd.read_csv(os.path.join(directory_path, file_name))
+                                                                 for file_name in exec_time_files],
+                                                                sort=False))
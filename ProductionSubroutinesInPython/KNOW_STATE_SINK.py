@@ -0,0 +1,190 @@
+# coding: utf-8
+## PURPOSE:  BULK-LOAD KNOWLEDGE-STATE ROWS INTO STUDENT_KNOWLEDGE_LEVEL.  worker formerly wrote each course's knowledge
+## states with DataFrame.to_sql(chunksize=1000) through SQLAlchemy.  That issues row-level parameterized inserts, each a
+## round trip, and commits as it goes.  Write time had become a visible share of each course iteration.  We instead
+## write through a bulk sink.  A sink binds whole batches of rows to a single prepared INSERT, and writes each frame
+## within one transaction:  a course's knowledge states are written entirely or not at all.
+##
+## The sink is pluggable.  Its SINK_TYPE selects the write path.
+## ⧐ DB2_ARRAY binds batches of rows as parameter arrays to an ibm_db prepared statement, using ibm_db.execute_many.
+## ⧐ DBAPI uses cursor.executemany of any DB-API 2.0 connection — e.g., a local SQLite stand-in during testing.
+## ⧐ POSTGRES_COPY streams the frame as CSV through COPY FROM STDIN on a psycopg2 connection.
+## We do not use DB2's LOAD or IMPORT utilities.  Both commit independently of the caller's unit of work, and both read
+## their input file on the database server, so neither can honor the per-course transaction.
+##
+## MAJOR STEPS IN THE ALGORITHM LOGIC.
+## ① Open.  open_bulk_sink returns a dictionary describing the connection, the write path, and the batch size.
+## ② Marshal.  sink_records converts a dataframe into tuples of Python scalars, with None for NaN and NaT.
+## ③ Write.  bulk_write_frame writes a dataframe within a single transaction, rolling back on failure.  It returns —
+##    and appends to the sink's WRITE_STATS — the row count, elapsed time, and rows per second.
+##
+import io
+import timeit as tit
+from datetime import datetime
+import numpy as np
+import pandas as pd
+try:
+    import ibm_db
+except ImportError:
+    ibm_db = None
+
+
+#
+#    SINK_BATCH_ROWS is the number of rows bound to each execution of the prepared INSERT.  The optional
+#    Write_batch_rows item of Mastery_config.txt overrides it in worker.
+SINK_BATCH_ROWS = 5000
+SINK_TYPES = ['DB2_ARRAY', 'DBAPI', 'POSTGRES_COPY']
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓐ OPEN A BULK SINK.  Our inputs are:
+#    ⧐ connection, an ibm_db connection for DB2_ARRAY, or a DB-API 2.0 connection otherwise;
+#    ⧐ sink_type, one of SINK_TYPES;
+#    ⧐ schema_name, optionally qualifying table names;
+#    ⧐ batch_rows, the number of rows bound per execution; and
+#    ⧐ placeholder, the DB-API parameter marker — "?" for SQLite and DB2, "%s" for psycopg2.
+#    We return the sink dictionary.
+def open_bulk_sink(connection, sink_type, schema_name=None, batch_rows=SINK_BATCH_ROWS, placeholder='?'):
+    if sink_type not in SINK_TYPES:
+        raise ValueError('Unknown sink type ' + str(sink_type) + '; expected one of ' + ', '.join(SINK_TYPES))
+    if (sink_type == 'DB2_ARRAY') and (ibm_db is None):
+        raise ImportError('The DB2_ARRAY sink requires the ibm_db package')
+    return {'CONNECTION': connection,
+            'SINK_TYPE': sink_type,
+            'SCHEMA_NAME': schema_name,
+            'BATCH_ROWS': int(batch_rows),
+            'PLACEHOLDER': placeholder,
+            'WRITE_STATS': list()}
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓑ MARSHAL A DATAFRAME INTO PARAMETER TUPLES.  Database drivers bind Python scalars, not NumPy scalars or pandas
+#    Timestamps.  We convert each column once — datetime64 columns to datetime objects, others to objects — and replace
+#    NaN and NaT by None, which the drivers bind as NULL.  We return a list of row tuples.
+def sink_records(frame):
+    column_values = list()
+    for col_idx in frame.columns:
+        col_series = frame[col_idx]
+        if np.issubdtype(col_series.dtype, np.datetime64):
+            col_array = np.array(col_series.dt.to_pydatetime(), dtype=object)
+        else:
+            col_array = col_series.values.astype(object)
+        col_array[pd.isnull(col_series).values] = None
+        column_values.append(col_array.tolist())
+    return list(zip(*column_values))
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓒ QUALIFY A TABLE NAME with the sink's schema, if any.
+def qualified_table_name(sink, table_name):
+    return table_name if sink.get('SCHEMA_NAME') is None else sink.get('SCHEMA_NAME') + '.' + table_name
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓓ CONSTRUCT THE PARAMETERIZED INSERT STATEMENT for the columns of a frame.
+def insert_statement(sink, table_name, columns):
+    return 'INSERT INTO ' + qualified_table_name(sink=sink, table_name=table_name) + \
+           ' (' + ', '.join(columns) + ') VALUES (' + ', '.join([sink.get('PLACEHOLDER')] * len(columns)) + ')'
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓔ WRITE PATHS.  Each writes all of frame's rows without committing.  bulk_write_frame owns the transaction.
+#    ⑴ DB2_ARRAY.  Prepare the INSERT once, and bind batch_rows rows per ibm_db.execute_many call.
+def write_db2_array(sink, frame, table_name):
+    insert_stmt = ibm_db.prepare(sink.get('CONNECTION'),
+                                 insert_statement(sink=sink,
+                                                  table_name=table_name,
+                                                  columns=list(frame.columns)))
+    records = sink_records(frame=frame)
+    for batch_start in range(0, len(records), sink.get('BATCH_ROWS')):
+        ibm_db.execute_many(insert_stmt, tuple(records[batch_start:batch_start + sink.get('BATCH_ROWS')]))
+
+
+#
+#    ⑵ DBAPI.  cursor.executemany of batch_rows rows at a time.
+def write_dbapi(sink, frame, table_name):
+    cursor = sink.get('CONNECTION').cursor()
+    insert_stmt = insert_statement(sink=sink,
+                                   table_name=table_name,
+                                   columns=list(frame.columns))
+    records = sink_records(frame=frame)
+    for batch_start in range(0, len(records), sink.get('BATCH_ROWS')):
+        cursor.executemany(insert_stmt, records[batch_start:batch_start + sink.get('BATCH_ROWS')])
+    cursor.close()
+
+
+#
+#    ⑶ POSTGRES_COPY.  Render the frame as CSV — empty fields are NULL — and stream it through COPY FROM STDIN.
+def write_postgres_copy(sink, frame, table_name):
+    csv_text = frame.to_csv(header=False,
+                            index=False,
+                            date_format='%Y-%m-%d %H:%M:%S')
+    csv_buffer = io.StringIO(csv_text if isinstance(csv_text, type(u'')) else csv_text.decode('utf-8'))
+    cursor = sink.get('CONNECTION').cursor()
+    cursor.copy_expert('COPY ' + qualified_table_name(sink=sink, table_name=table_name) +
+                       ' (' + ', '.join(frame.columns) + ") FROM STDIN WITH (FORMAT csv)",
+                       csv_buffer)
+    cursor.close()
+
+
+SINK_WRITERS = {'DB2_ARRAY': write_db2_array,
+                'DBAPI': write_dbapi,
+                'POSTGRES_COPY': write_postgres_copy}
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓕ WRITE A DATAFRAME IN ONE TRANSACTION.  Our procedure:
+#    ⑴ For DB2, suspend autocommit, so that the batches share one unit of work.  DB-API connections begin a
+#       transaction implicitly.
+#    ⑵ Write through the sink's write path.  Commit on success.  On failure, roll back and re-raise, so that the caller
+#       marks the course's measurements in error and no partial course is left behind.
+#    ⑶ Restore DB2 autocommit, on which worker's other statements rely.
+#    ⑷ Record and report the throughput.
+#    We return a dictionary of TABLE_NAME, ROW_COUNT, ELAPSED_TIME, and ROWS_PER_SEC.
+def bulk_write_frame(sink, frame, table_name):
+    connection = sink.get('CONNECTION')
+    start_time = tit.default_timer()
+    #
+    #    ⑴ Suspend DB2 autocommit.
+    if sink.get('SINK_TYPE') == 'DB2_ARRAY':
+        ibm_db.autocommit(connection, ibm_db.SQL_AUTOCOMMIT_OFF)
+    #
+    #    ⑵ Write, and commit or roll back.
+    try:
+        if len(frame) > 0:
+            SINK_WRITERS.get(sink.get('SINK_TYPE'))(sink=sink,
+                                                    frame=frame,
+                                                    table_name=table_name)
+        if sink.get('SINK_TYPE') == 'DB2_ARRAY':
+            ibm_db.commit(connection)
+        else:
+            connection.commit()
+    except Exception:
+        if sink.get('SINK_TYPE') == 'DB2_ARRAY':
+            ibm_db.rollback(connection)
+        else:
+            connection.rollback()
+        raise
+    #
+    #    ⑶ Restore DB2 autocommit.
+    finally:
+        if sink.get('SINK_TYPE') == 'DB2_ARRAY':
+            ibm_db.autocommit(connection, ibm_db.SQL_AUTOCOMMIT_ON)
+    #
+    #    ⑷ Record and report the throughput.
+    elapsed_time = tit.default_timer() - start_time
+    write_stats = {'TABLE_NAME': table_name,
+                   'ROW_COUNT': len(frame),
+                   'ELAPSED_TIME': elapsed_time,
+                   'ROWS_PER_SEC': len(frame) / elapsed_time if elapsed_time > 0 else np.nan}
+    sink.get('WRITE_STATS').append(write_stats)
+    print('Bulk-wrote ' + str(len(frame)) + ' rows to ' + qualified_table_name(sink=sink, table_name=table_name) +
+          ' in ' + str(round(elapsed_time, 3)) + ' s, ' + str(round(write_stats.get('ROWS_PER_SEC'), 1)) +
+          ' rows/s, at time ' + str(datetime.now().time()))
+    return write_stats
@@ -0,0 +1,889 @@
+# coding: utf-8
+## PURPOSE:  QUERY A BAYESIAN NETWORK USING DENSE NUMPY FACTOR ARRAYS.  The Pomegranate Bayesian network rebuilds
+## python-object conditional-probability tables for each subgraph and then runs loopy belief propagation (LBP)
+## for each evidentiary state.  Our subgraphs are small — typically six to twelve vertices — and all of our
+## conditional-probability tables derive from a single long-table CPT_LIST keyed by in-degree.  We therefore
+## "compile" each subgraph once into a set of dense NumPy factor arrays and answer each evidentiary-state query
+## with vectorized einsum contractions.
+##
+## MAJOR STEPS IN THE ALGORITHM LOGIC.
+## ① Compile.  Translate a networkx DiGraph and CPT_LIST into one factor array per vertex.  The factor for a vertex
+##    with k immediate predecessors is the CPT_LIST MEAS column for CONSTITUENT_COUNT = k reshaped into a
+##    k + 1-dimensional array.  Its axes are the predecessors — in DiGraph predecessor order — followed by the vertex
+##    itself.  This is exactly the layout implied by the order = 'F' reshape in exact_infer_group_know_state and
+##    by the cartesian-product variable-state table in pom_cond_probs.
+## ② Select an inference approach.  We estimate the treewidth of the moral graph using networkx' min-fill-in
+##    heuristic.  Small-treewidth graphs are queried by exact variable elimination.  Others are queried by
+##    loopy sum-product message passing.  Callers may instead request a junction tree, which is triangulated and
+##    compiled once per subgraph and then calibrated by a single two-pass sweep per evidentiary state.  Star graphs
+##    may be queried in closed form about their hub.
+## ③ Query.  Apply evidentiary states — rows of an (n_states × n_measured) matrix of CAT_LEVEL_IDX values — as
+##    one-hot likelihood vectors and return the marginal, conditional probability for every vertex and every state
+##    in a single vectorized pass.  The returned dataframes coincide with those from query_pom_bayesnet so that the
+##    rest of the pipeline is unchanged.
+## ④ Cache.  Compiled networks depend only on the graph, CPT_LIST, and the number of knowledge levels.  Many
+##    evidentiary profiles produce identical spanning subgraphs.  We therefore keep a process-wide, size-bounded
+##    LRU cache of compiled networks keyed by a canonical edge-list signature and a CPT_LIST fingerprint.
+## ⑤ Memoize.  Posteriors depend only on the compiled network and the evidence assignment.  query_factor_bayesnet_group
+##    optionally consults a POSTERIOR_MEMO for each evidentiary state and only infers the states it does not hold.
+##
+import timeit as tit
+import hashlib
+from collections import OrderedDict
+from datetime import datetime
+import pandas as pd
+import numpy as np
+import networkx as nx
+from networkx.algorithms.approximation import treewidth_min_fill_in
+from POSTERIOR_MEMO import lookup_posterior_memo, store_posterior_memo
+from RESULT_ACCUMULATOR import result_accumulator, accumulate_columns, accumulated_dataframe
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓐ EXACT-INFERENCE LIMITS.  The einsum sublist interface labels axes with integers below 52.  We reserve the last
+#    label, BATCH_LABEL, for the evidentiary-state axis of a batched query.  We therefore cannot contract graphs of
+#    more than 51 vertices in a single einsum.  We also bound the largest intermediate factor — in cells — that exact
+#    variable elimination is permitted to produce.  Graphs exceeding either limit are queried by loopy message passing.
+EINSUM_LABEL_LIMIT = 52
+BATCH_LABEL = EINSUM_LABEL_LIMIT - 1
+EXACT_CELL_BUDGET = 2 ** 18
+#
+#    A junction-tree calibration holds every clique belief for every evidentiary state of a batch.  We split batches so
+#    that the largest clique belief holds no more than JUNCTION_TREE_BATCH_CELLS cells.
+JUNCTION_TREE_BATCH_CELLS = 2 ** 22
+LOOPY_MAX_ITER = 100
+LOOPY_TOLERANCE = 1e-6
+#
+#    The compiled-network cache holds at most FACTOR_BAYESNET_CACHE_SIZE networks.  Its hit, miss, and eviction
+#    counters are reported by factor_bayesnet_cache_stats.
+FACTOR_BAYESNET_CACHE_SIZE = 512
+FACTOR_BAYESNET_CACHE = OrderedDict()
+FACTOR_BAYESNET_CACHE_COUNTS = {'HITS': 0, 'MISSES': 0, 'EVICTIONS': 0}
+#
+#    Every query reports execution-time statistics with these attributes.  TREEWIDTH, CLIQUE_CELL_COUNT, and
+#    FACTOR_CELL_COUNT are the features to which the inference router fits its cost model.
+CLUSTER_EXEC_TIME_COLUMNS = ['EVID_STATE_SIG',
+                             'GRAPH_ORDER',
+                             'EDGE_COUNT',
+                             'MEAS_VERT_COUNT',
+                             'EST_VERT_COUNT',
+                             'TREEWIDTH',
+                             'CLIQUE_CELL_COUNT',
+                             'FACTOR_CELL_COUNT',
+                             'TIME_NOW',
+                             'ELAPSED_TIME']
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓑ DENSE CONDITIONAL-PROBABILITY FACTOR.  Extract from cpt_list the conditional-probability measures for a vertex of
+#    a specified in-degree.  Reshape them into a dense array with one axis per predecessor and a final axis for the
+#    vertex itself.  CPT_LIST rows are keyed by CONSTITUENT_COUNT, so all vertices of identical in-degree share
+#    a single factor.  cpt_meas_by_count parses the MEAS column of each CONSTITUENT_COUNT into a float array.  We keep
+#    no memo of its arrays.  REFERENCE_DATA_CACHE parses them once per tenant load, alongside CPT_LIST, as CPT_ARRAYS,
+#    and callers pass them down as cpt_arrays.  cpt_factor_array reads a vertex's factor from them.
+def cpt_meas_by_count(cpt_list):
+    return dict((str(count_idx), count_rows['MEAS'].values.astype(float))
+                for (count_idx, count_rows) in cpt_list.groupby(by='CONSTITUENT_COUNT',
+                                                                sort=False))
+
+
+def cpt_factor_array(cpt_arrays, in_degree, var_card):
+    cpt_meas = cpt_arrays.get(str(in_degree), np.zeros(shape=0))
+    if len(cpt_meas) != var_card ** (in_degree + 1):
+        raise ValueError('CPT_LIST contains ' + str(len(cpt_meas)) + ' MEAS values for CONSTITUENT_COUNT ' +
+                         str(in_degree) + '; ' + str(var_card ** (in_degree + 1)) + ' are required.')
+    return cpt_meas.reshape(tuple(np.repeat(a=var_card,
+                                            repeats=in_degree + 1)))
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓒ ESTIMATE ELIMINATION WIDTH.  The cost of exact inference grows exponentially with the treewidth of the moral
+#    graph — the undirected graph obtained by "marrying" the co-parents of each vertex.  We use networkx' min-fill-in
+#    heuristic to get an upper bound on that treewidth.
+def moral_graph_treewidth(directed_graph):
+    moral_graph = nx.moral_graph(directed_graph)
+    if len(moral_graph.edges()) == 0:
+        return 0
+    return treewidth_min_fill_in(moral_graph)[0]
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓓ COMPILE A FACTOR-ARRAY BAYESIAN NETWORK.  This is our counterpart to build_pom_bayesnet.  Our inputs are:
+#    ⧐ directed_graph, a networkx DiGraph object on which the Bayesian network is based;
+#    ⧐ var_states, the MASTERY_LEVEL_CAT dataframe, whose last row is the 'UNMEASURED' category;
+#    ⧐ cpt_list, the long-table conditional-probability measures; and
+#    ⧐ bayesnet_label, a label used in execution-time reporting.
+#
+#    We return a dictionary containing:
+#    ⧐ DiGraph_Vert_Order, the vertex labels in the sequence corresponding to the rows of each query response;
+#    ⧐ FACTORS, a list of (scope, array) tuples, one per vertex, in which scope lists integer vertex indices;
+#    ⧐ VERT_FACTORS, for each vertex index the indices of the factors in whose scope it appears;
+#    ⧐ INFERENCE_APPROACH, 'EXACT', 'JUNCTION_TREE', 'STAR', 'LOOPY', or — for subgraphs in which every vertex is
+#      measured — 'NONE';
+#    ⧐ JUNCTION_TREE, the clique tree compiled by build_junction_tree, when INFERENCE_APPROACH is 'JUNCTION_TREE';
+#    ⧐ STAR_HUB, the index of the hub vertex found by star_graph_center, when INFERENCE_APPROACH is 'STAR';
+#    ⧐ CLIQUE_CELL_COUNT and FACTOR_CELL_COUNT, the cell counts of the largest elimination clique and of all factors
+#      — weighted by scope size — by which the inference router predicts query cost;
+#    ⧐ GRAPH_SIGNATURE and CPT_FINGERPRINT, which identify the network in posterior-memo keys.  CPT_FINGERPRINT is
+#      cpt_fingerprint, when the caller holds cpt_list's fingerprint, and is computed from cpt_list otherwise.
+#      Likewise, the factors are read from cpt_arrays, cpt_list's cpt_meas_by_count arrays, when the caller holds
+#      them; and
+#    ⧐ EINSUM_PATHS, an initially-empty cache of contraction paths for exact inference.  Every conformee to an
+#      evidentiary profile presents the same measured vertices, so a single path serves all of their queries.
+#    Passing inference_approach overrides the treewidth-based selection.  'STAR' is honored only for star graphs.
+#    'EXACT' and 'JUNCTION_TREE' label einsum axes by vertex index, so they are honored only for graphs within the
+#    einsum label limit.  Larger graphs fall back to 'LOOPY'.
+def build_factor_bayesnet(directed_graph, var_states, cpt_list, bayesnet_label, inference_approach=None,
+                          cpt_fingerprint=None, cpt_arrays=None):
+    #    ⑴ Derive "utility" variables about the graph.  We index the vertices by integers for use as einsum labels.
+    var_card = len(var_states) - 1
+    vert_order = list(directed_graph.nodes())
+    vert_idx = dict((vert, idx) for (idx, vert) in enumerate(vert_order))
+    if cpt_arrays is None:
+        cpt_arrays = cpt_meas_by_count(cpt_list)
+    #
+    #    ⑵ Build one factor per vertex.  The scope is the predecessor indices followed by the vertex index itself.
+    #       We reuse a single array for all vertices of a given in-degree.
+    factor_by_degree = dict()
+    factors = list()
+    for vert in vert_order:
+        predecessors = list(directed_graph.predecessors(vert))
+        if len(predecessors) not in factor_by_degree:
+            factor_by_degree[len(predecessors)] = cpt_factor_array(cpt_arrays=cpt_arrays,
+                                                                   in_degree=len(predecessors),
+                                                                   var_card=var_card)
+        factors.append(([vert_idx.get(pred) for pred in predecessors] + [vert_idx.get(vert)],
+                        factor_by_degree.get(len(predecessors))))
+    vert_factors = [[factor_idx for (factor_idx, (scope, factor)) in enumerate(factors) if idx in scope]
+                    for idx in range(len(vert_order))]
+    #
+    #    ⑶ Select the inference approach, unless the caller specified one.  Exact inference is used when the graph fits
+    #       within the einsum label limit and the largest clique of the min-fill-in elimination fits within
+    #       EXACT_CELL_BUDGET.
+    treewidth = moral_graph_treewidth(directed_graph)
+    star_hub = star_graph_center(directed_graph) if inference_approach == 'STAR' else None
+    if inference_approach == 'STAR' and star_hub is None:
+        inference_approach = None
+    if inference_approach in ['EXACT', 'JUNCTION_TREE'] and len(vert_order) > BATCH_LABEL:
+        inference_approach = 'LOOPY'
+    if inference_approach is None:
+        inference_approach = 'EXACT' if ((len(vert_order) <= BATCH_LABEL) and
+                                         (var_card ** (treewidth + 1) <= EXACT_CELL_BUDGET)) else 'LOOPY'
+    junction_tree = None
+    if inference_approach == 'JUNCTION_TREE':
+        junction_tree = build_junction_tree(factors=factors,
+                                            vert_count=len(vert_order),
+                                            var_card=var_card)
+    #
+    return {'BAYESNET_LABEL': bayesnet_label,
+            'DiGraph_Vert_Order': vert_order,
+            'VERT_IDX': vert_idx,
+            'VAR_CARD': var_card,
+            'FACTORS': factors,
+            'VERT_FACTORS': vert_factors,
+            'EDGE_COUNT': len(directed_graph.edges()),
+            'TREEWIDTH': treewidth,
+            'CLIQUE_CELL_COUNT': var_card ** (treewidth + 1),
+            'FACTOR_CELL_COUNT': sum(len(scope) * factor.size for (scope, factor) in factors),
+            'INFERENCE_APPROACH': inference_approach,
+            'JUNCTION_TREE': junction_tree,
+            'STAR_HUB': vert_idx.get(star_hub),
+            'GRAPH_SIGNATURE': canonical_graph_signature(directed_graph),
+            'CPT_FINGERPRINT': cpt_fingerprint if cpt_fingerprint is not None else cpt_list_fingerprint(cpt_list),
+            'EINSUM_PATHS': dict()}
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓔ EVIDENTIARY-STATE MATRICES.  Translate the dictionary produced by groupby_evid_state into integer evidence
+#    matrices.  Each matrix has a row per evidentiary state and a column per measured vertex, and holds CAT_LEVEL_IDX
+#    values.  All conformees to an evidentiary profile ordinarily share the same measured vertices, so we ordinarily
+#    produce a single matrix.  We nonetheless group states by measured-vertex set so that mixed inputs are handled.
+#    We return a list of dictionaries, each containing:
+#    ⧐ EVID_STATE_SIG, the evidentiary-state signatures corresponding to the matrix rows;
+#    ⧐ MEAS_VERTS, the measured vertices corresponding to the matrix columns; and
+#    ⧐ EVID_MATRIX, the (n_states × n_measured) integer evidence matrix.
+def evid_state_matrices(evid_state_by_subj, factor_bayesnet):
+    vert_idx = factor_bayesnet.get('VERT_IDX')
+    meas_vert_groups = dict()
+    for state_idx in evid_state_by_subj.get('EVID_STATE_SIG'):
+        meas_verts = tuple(sorted(evid_state_by_subj.get(state_idx).get('EVID_STATE').keys(),
+                                  key=lambda vert: vert_idx.get(vert)))
+        meas_vert_groups.setdefault(meas_verts, list()).append(state_idx)
+    return [{'EVID_STATE_SIG': state_sigs,
+             'MEAS_VERTS': list(meas_verts),
+             'EVID_MATRIX': np.array([[evid_state_by_subj.get(state_idx).get('EVID_STATE').get(vert)
+                                       for vert in meas_verts]
+                                      for state_idx in state_sigs], dtype=int).reshape(len(state_sigs),
+                                                                                       len(meas_verts))}
+            for (meas_verts, state_sigs) in meas_vert_groups.items()]
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓕ EVIDENCE LIKELIHOOD TENSOR.  Translate an evidence matrix into an (n_states × n_vertices × n_levels) likelihood
+#    tensor.  Measured vertices get one-hot rows.  Unmeasured vertices get rows of ones.
+def evid_likelihood(evid_matrix, meas_idx, factor_bayesnet):
+    likelihood = np.ones(shape=(len(evid_matrix),
+                                len(factor_bayesnet.get('DiGraph_Vert_Order')),
+                                factor_bayesnet.get('VAR_CARD')))
+    if len(meas_idx) > 0:
+        likelihood[:, meas_idx, :] = np.eye(factor_bayesnet.get('VAR_CARD'))[evid_matrix]
+    return likelihood
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓖ EXACT MARGINALS BY VARIABLE ELIMINATION.  We contract all of the factors together with the measured-vertex
+#    likelihood vectors, leaving open only the evidentiary-state axis and the axis of each target vertex in turn.
+#    Contraction paths depend only on which vertices are measured.  We cache them in the EINSUM_PATHS item of
+#    factor_bayesnet.  Absent any measured vertex, the batch axis appears in no operand; we then contract the prior
+#    once and repeat it for every state.
+def exact_marginals(likelihood, meas_idx, factor_bayesnet):
+    operands = list()
+    for (scope, factor) in factor_bayesnet.get('FACTORS'):
+        operands.extend([factor, scope])
+    for idx in meas_idx:
+        operands.extend([likelihood[:, idx, :], [BATCH_LABEL, idx]])
+    #
+    marginals = likelihood.copy()
+    for target_idx in range(likelihood.shape[1]):
+        if target_idx in meas_idx:
+            continue
+        output = [BATCH_LABEL, target_idx] if len(meas_idx) > 0 else [target_idx]
+        path_key = (tuple(meas_idx), target_idx)
+        if path_key not in factor_bayesnet.get('EINSUM_PATHS'):
+            factor_bayesnet.get('EINSUM_PATHS')[path_key] = np.einsum_path(*(operands + [output]),
+                                                                           optimize='greedy')[0]
+        marginals[:, target_idx, :] = np.einsum(*(operands + [output]),
+                                                optimize=factor_bayesnet.get('EINSUM_PATHS').get(path_key))
+    return marginals / marginals.sum(axis=2, keepdims=True)
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓗ APPROXIMATE MARGINALS BY LOOPY SUM-PRODUCT MESSAGE PASSING.  We pass messages on the factor graph — one factor
+#    per vertex — with a flooding schedule.  Every message carries a leading evidentiary-state axis, so all states
+#    are iterated together.  Each factor-to-vertex message is a single einsum over the factor's local scope, so
+#    labels never exceed the einsum limit irrespective of graph order.
+#    ⑴ Initialize all factor-to-vertex messages to uniform.
+#    ⑵ Iterate.
+#       ⒜ Vertex-to-factor messages are the vertex likelihood times all other incoming factor-to-vertex messages.
+#       ⒝ Factor-to-vertex messages contract the factor with all other incoming vertex-to-factor messages.
+#       ⒞ Stop once the largest message change over all states falls below LOOPY_TOLERANCE.
+#    ⑶ Beliefs are the vertex likelihood times all incoming factor-to-vertex messages.
+def loopy_marginals(likelihood, factor_bayesnet):
+    factors = factor_bayesnet.get('FACTORS')
+    vert_factors = factor_bayesnet.get('VERT_FACTORS')
+    #
+    #    ⑴ Initialize all factor-to-vertex messages to uniform.
+    uniform = np.full(shape=(likelihood.shape[0], likelihood.shape[2]),
+                      fill_value=1. / likelihood.shape[2])
+    factor_to_vert = dict(((factor_idx, idx), uniform)
+                          for (factor_idx, (scope, factor)) in enumerate(factors) for idx in scope)
+    #
+    #    ⑵ Iterate.
+    for iter_idx in range(LOOPY_MAX_ITER):
+        #    ⒜ Vertex-to-factor messages.
+        vert_to_factor = dict()
+        for (factor_idx, (scope, factor)) in enumerate(factors):
+            for idx in scope:
+                message = likelihood[:, idx, :].copy()
+                for other_factor_idx in vert_factors[idx]:
+                    if other_factor_idx != factor_idx:
+                        message = message * factor_to_vert.get((other_factor_idx, idx))
+                vert_to_factor[(factor_idx, idx)] = message / message.sum(axis=1, keepdims=True)
+        #
+        #    ⒝ Factor-to-vertex messages.  Relabel the scope locally from zero, with the state axis labelled last.
+        max_delta = 0.
+        for (factor_idx, (scope, factor)) in enumerate(factors):
+            local_labels = list(range(len(scope)))
+            for (label, idx) in zip(local_labels, scope):
+                operands = [factor, local_labels]
+                for (other_label, other_idx) in zip(local_labels, scope):
+                    if other_idx != idx:
+                        operands.extend([vert_to_factor.get((factor_idx, other_idx)), [len(scope), other_label]])
+                message = np.einsum(*(operands + [[len(scope), label] if len(scope) > 1 else [label]]))
+                message = np.broadcast_to(message / message.sum(axis=-1, keepdims=True), uniform.shape)
+                max_delta = max(max_delta, np.abs(message - factor_to_vert.get((factor_idx, idx))).max())
+                factor_to_vert[(factor_idx, idx)] = message
+        #
+        #    ⒞ Test for convergence.
+        if max_delta < LOOPY_TOLERANCE:
+            break
+    #
+    #    ⑶ Beliefs.
+    marginals = likelihood.copy()
+    for idx in range(likelihood.shape[1]):
+        for factor_idx in vert_factors[idx]:
+            marginals[:, idx, :] = marginals[:, idx, :] * factor_to_vert.get((factor_idx, idx))
+    return marginals / marginals.sum(axis=2, keepdims=True)
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓘ BATCHED QUERY OF A FACTOR-ARRAY BAYESIAN NETWORK.  Our inputs are:
+#    ⧐ evid_matrix, an (n_states × n_measured) integer matrix of CAT_LEVEL_IDX values;
+#    ⧐ meas_verts, the measured vertices corresponding to the columns of evid_matrix; and
+#    ⧐ factor_bayesnet, the dictionary returned by build_factor_bayesnet.
+#    We return an (n_states × n_vertices × n_levels) posterior tensor.  Its vertex axis follows DiGraph_Vert_Order.
+#    Measured vertices carry their one-hot evidence.  An INFERENCE_APPROACH of 'NONE' returns the evidence alone.
+#    factor_bayesnet_marginals dispatches a likelihood tensor to the engine named by INFERENCE_APPROACH.  Networks
+#    compiled by soft_separate_bayesnet carry a REDUCED_BAYESNET, and are answered by soft_separated_marginals.
+def query_factor_bayesnet_batch(evid_matrix, meas_verts, factor_bayesnet):
+    meas_idx = [factor_bayesnet.get('VERT_IDX').get(vert) for vert in meas_verts]
+    likelihood = evid_likelihood(evid_matrix=np.asarray(evid_matrix, dtype=int),
+                                 meas_idx=meas_idx,
+                                 factor_bayesnet=factor_bayesnet)
+    return factor_bayesnet_marginals(likelihood=likelihood,
+                                     meas_idx=meas_idx,
+                                     factor_bayesnet=factor_bayesnet)
+
+
+def factor_bayesnet_marginals(likelihood, meas_idx, factor_bayesnet):
+    if factor_bayesnet.get('REDUCED_BAYESNET') is not None:
+        return soft_separated_marginals(likelihood=likelihood,
+                                        meas_idx=meas_idx,
+                                        factor_bayesnet=factor_bayesnet)
+    if factor_bayesnet.get('INFERENCE_APPROACH') == 'NONE':
+        return likelihood / likelihood.sum(axis=2, keepdims=True)
+    if factor_bayesnet.get('INFERENCE_APPROACH') == 'JUNCTION_TREE':
+        return junction_tree_marginals(likelihood=likelihood,
+                                       meas_idx=meas_idx,
+                                       factor_bayesnet=factor_bayesnet)
+    if factor_bayesnet.get('INFERENCE_APPROACH') == 'STAR':
+        return star_marginals(likelihood=likelihood,
+                              meas_idx=meas_idx,
+                              factor_bayesnet=factor_bayesnet)
+    if factor_bayesnet.get('INFERENCE_APPROACH') == 'EXACT':
+        return exact_marginals(likelihood=likelihood,
+                               meas_idx=meas_idx,
+                               factor_bayesnet=factor_bayesnet)
+    return loopy_marginals(likelihood=likelihood,
+                           factor_bayesnet=factor_bayesnet)
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓙ QUERY FACTOR-ARRAY BAYESIAN NETWORK FOR ALL EVIDENTIARY STATES OF A PROFILE.  This replaces the per-state loop
+#    over query_pom_bayesnet in approx_infer_group_know_state and over VariableElimination.query in
+#    exact_infer_group_know_state.  Our inputs are the groupby_evid_state dictionary, the compiled factor_bayesnet,
+#    and var_states.  We return a dictionary containing:
+#    ⧐ BAYESNET_QUERY_RESP, a long-table dataframe with EVID_STATE_SIG, LEARNING_STANDARD_ID, KNOWLEDGE_LVL_TYPE, and
+#      one column per CAT_LEVEL_IDX, with a row for every (evidentiary state, vertex) pair; and
+#    ⧐ CLUSTER_EXEC_TIME, a dataframe with a row for each evidentiary state.  ELAPSED_TIME is the batch elapsed time
+#      apportioned equally among the states of the batch.
+#    Passing posterior_memo — the dictionary returned by open_posterior_memo — answers previously-seen evidentiary
+#    states from the memo and only infers the others.
+def query_factor_bayesnet_group(evid_state_by_subj, factor_bayesnet, var_states, posterior_memo=None):
+    vert_order = factor_bayesnet.get('DiGraph_Vert_Order')
+    cat_level_idx = var_states.iloc[:-1]['CAT_LEVEL_IDX'].tolist()
+    bayesnet_query_acc = result_accumulator(columns=['EVID_STATE_SIG',
+                                                     'LEARNING_STANDARD_ID',
+                                                     'KNOWLEDGE_LVL_TYPE'] + cat_level_idx)
+    clust_exec_time_acc = result_accumulator(columns=CLUSTER_EXEC_TIME_COLUMNS)
+    for evid_batch in evid_state_matrices(evid_state_by_subj=evid_state_by_subj,
+                                          factor_bayesnet=factor_bayesnet):
+        #    ⑴ Query the Bayesian network for all of the states in the batch.
+        start_time_batch = tit.default_timer()
+        state_count = len(evid_batch.get('EVID_STATE_SIG'))
+        if posterior_memo is None:
+            posterior = query_factor_bayesnet_batch(evid_matrix=evid_batch.get('EVID_MATRIX'),
+                                                    meas_verts=evid_batch.get('MEAS_VERTS'),
+                                                    factor_bayesnet=factor_bayesnet)
+            memo_hit_count = 0
+        else:
+            memo_query_resp = memoized_query_factor_bayesnet_batch(evid_matrix=evid_batch.get('EVID_MATRIX'),
+                                                                   meas_verts=evid_batch.get('MEAS_VERTS'),
+                                                                   factor_bayesnet=factor_bayesnet,
+                                                                   posterior_memo=posterior_memo)
+            posterior = memo_query_resp.get('POSTERIOR')
+            memo_hit_count = memo_query_resp.get('MEMO_HIT_COUNT')
+        #
+        #    ⑵ Flatten the posterior tensor into long-table format, state-major, and append its columns to the
+        #       result accumulator.
+        flat_posterior = posterior.reshape(state_count * len(vert_order),
+                                           len(cat_level_idx))
+        batch_query_resp = dict((level_idx, flat_posterior[:, level_pos])
+                                for (level_pos, level_idx) in enumerate(cat_level_idx))
+        batch_query_resp['EVID_STATE_SIG'] = np.repeat(a=np.array(evid_batch.get('EVID_STATE_SIG'), dtype=object),
+                                                       repeats=len(vert_order))
+        batch_query_resp['LEARNING_STANDARD_ID'] = np.tile(A=np.array(vert_order, dtype=object),
+                                                           reps=state_count)
+        batch_query_resp['KNOWLEDGE_LVL_TYPE'] = np.tile(A=np.array(['MEASURED' if vert in evid_batch.get('MEAS_VERTS')
+                                                                     else 'ESTIMATED' for vert in vert_order],
+                                                                    dtype=object),
+                                                         reps=state_count)
+        accumulate_columns(accumulator=bayesnet_query_acc,
+                           column_values=batch_query_resp,
+                           row_count=state_count * len(vert_order))
+        #
+        #    ⑶ Record and report execution-time statistics.
+        batch_elapsed_time = tit.default_timer() - start_time_batch
+        accumulate_columns(accumulator=clust_exec_time_acc,
+                           column_values={'EVID_STATE_SIG': np.array(evid_batch.get('EVID_STATE_SIG'), dtype=object),
+                                          'GRAPH_ORDER': len(vert_order),
+                                          'EDGE_COUNT': factor_bayesnet.get('EDGE_COUNT'),
+                                          'MEAS_VERT_COUNT': len(evid_batch.get('MEAS_VERTS')),
+                                          'EST_VERT_COUNT': len(vert_order) - len(evid_batch.get('MEAS_VERTS')),
+                                          'TREEWIDTH': factor_bayesnet.get('TREEWIDTH'),
+                                          'CLIQUE_CELL_COUNT': factor_bayesnet.get('CLIQUE_CELL_COUNT'),
+                                          'FACTOR_CELL_COUNT': factor_bayesnet.get('FACTOR_CELL_COUNT'),
+                                          'TIME_NOW': str(datetime.now().time()),
+                                          'ELAPSED_TIME': batch_elapsed_time / state_count},
+                           row_count=state_count,
+                           index=np.array(evid_batch.get('EVID_STATE_SIG'), dtype=object))
+        print(str(state_count) + ' evidentiary states queried in ' + str(batch_elapsed_time) +
+              ' seconds by ' + factor_bayesnet.get('INFERENCE_APPROACH') + ' inference, ' + str(memo_hit_count) +
+              ' from the posterior memo, at time ' + str(datetime.now().time()))
+    #
+    #    ⑷ Materialize the accumulated results.  The response is indexed by position.
+    bayesnet_query_resp = accumulated_dataframe(accumulator=bayesnet_query_acc)
+    bayesnet_query_resp.index = np.arange(len(bayesnet_query_resp))
+    return {'BAYESNET_QUERY_RESP': bayesnet_query_resp,
+            'CLUSTER_EXEC_TIME': accumulated_dataframe(accumulator=clust_exec_time_acc)}
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓚ QUERY FACTOR-ARRAY BAYESIAN NETWORK GIVEN A SPECIFIC EVIDENTIARY STATE.  This is our counterpart to
+#    query_pom_bayesnet for a single evidentiary state.  Its inputs and outputs are identical, except that factor_bayesnet
+#    is the dictionary returned by build_factor_bayesnet.  It is a batch of one.
+def query_factor_bayesnet(evid_state, factor_bayesnet, var_states, state_idx):
+    start_time_state_idx = tit.default_timer()
+    meas_verts = list(evid_state.keys())
+    posterior = query_factor_bayesnet_batch(evid_matrix=[[evid_state.get(vert) for vert in meas_verts]],
+                                            meas_verts=meas_verts,
+                                            factor_bayesnet=factor_bayesnet)
+    #
+    bayesnet_query_resp = pd.DataFrame(data=posterior[0],
+                                       index=factor_bayesnet.get('DiGraph_Vert_Order'),
+                                       columns=var_states.iloc[:-1]['CAT_LEVEL_IDX'].tolist())
+    bayesnet_query_resp['EVID_STATE_SIG'] = state_idx
+    bayesnet_query_resp['LEARNING_STANDARD_ID'] = bayesnet_query_resp.index.values.tolist()
+    bayesnet_query_resp['KNOWLEDGE_LVL_TYPE'] = ['MEASURED' if vert in evid_state else 'ESTIMATED'
+                                                 for vert in factor_bayesnet.get('DiGraph_Vert_Order')]
+    #
+    CLUST_EXEC_TIME_state_idx = pd.DataFrame(data=[[state_idx,
+                                                    len(factor_bayesnet.get('DiGraph_Vert_Order')),
+                                                    factor_bayesnet.get('EDGE_COUNT'),
+                                                    len(evid_state),
+                                                    len(factor_bayesnet.get('DiGraph_Vert_Order')) - len(evid_state),
+                                                    factor_bayesnet.get('TREEWIDTH'),
+                                                    factor_bayesnet.get('CLIQUE_CELL_COUNT'),
+                                                    factor_bayesnet.get('FACTOR_CELL_COUNT'),
+                                                    str(datetime.now().time()),
+                                                    tit.default_timer() - start_time_state_idx]],
+                                             columns=CLUSTER_EXEC_TIME_COLUMNS,
+                                             index=[state_idx])
+    #
+    return {'BAYESNET_QUERY_RESP': bayesnet_query_resp,
+            'CLUSTER_EXEC_TIME': CLUST_EXEC_TIME_state_idx}
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓛ CANONICAL GRAPH SIGNATURE.  Produce a signature that is identical for any two DiGraphs having the same vertex
+#    labels and the same edges, irrespective of insertion order.  We use a sha1 digest rather than python's hash
+#    function, which is salted per process, so that signatures are comparable across worker processes and runs.
+def canonical_graph_signature(directed_graph):
+    canonical_graph = repr((sorted(str(vert) for vert in directed_graph.nodes()),
+                            sorted((str(edge[0]), str(edge[1])) for edge in directed_graph.edges())))
+    return hashlib.sha1(canonical_graph.encode('utf-8')).hexdigest()
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓜ CPT_LIST FINGERPRINT.  Produce a sha1 digest of the CONSTITUENT_COUNT, CPT_CELL_IDX, and MEAS attributes of
+#    CPT_LIST in row order.  Row order matters because build_factor_bayesnet reshapes MEAS in row order.  We keep no
+#    memo of fingerprints.  The owner of a CPT_LIST — REFERENCE_DATA_CACHE, which loads one per tenant — computes its
+#    fingerprint once, alongside it, and passes it down as cpt_fingerprint.  Its lifetime is thereby that of the
+#    CPT_LIST, and a refreshed CPT_LIST comes with a fresh fingerprint.
+def cpt_list_fingerprint(cpt_list):
+    cpt_digest = hashlib.sha1()
+    for cpt_attr in ['CONSTITUENT_COUNT', 'CPT_CELL_IDX', 'MEAS']:
+        cpt_digest.update(repr(cpt_list[cpt_attr].astype(str).tolist()).encode('utf-8'))
+    return cpt_digest.hexdigest()
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓝ CACHED COMPILATION OF A FACTOR-ARRAY BAYESIAN NETWORK.  Our inputs and outputs are identical to those of
+#    build_factor_bayesnet.  We look up the compiled network by (graph signature, CPT_LIST fingerprint, number of
+#    knowledge levels, requested inference approach).  On a miss we compile it and insert it, evicting the
+#    least-recently-used network if the cache is full.  On a hit we return a copy relabelled with bayesnet_label.
+#    The copy shares the factor arrays and the EINSUM_PATHS cache with the cached network, so contraction
+#    paths found for one profile serve all others.  Callers should pass cpt_fingerprint, cpt_list's fingerprint.
+#    Without it, cpt_list is fingerprinted on every lookup.  cpt_arrays, if passed, spares each miss from parsing it.
+def cached_factor_bayesnet(directed_graph, var_states, cpt_list, bayesnet_label, inference_approach=None,
+                           cpt_fingerprint=None, cpt_arrays=None):
+    if cpt_fingerprint is None:
+        cpt_fingerprint = cpt_list_fingerprint(cpt_list)
+    cache_key = (canonical_graph_signature(directed_graph),
+                 cpt_fingerprint,
+                 len(var_states) - 1,
+                 inference_approach)
+    if cache_key in FACTOR_BAYESNET_CACHE:
+        FACTOR_BAYESNET_CACHE_COUNTS['HITS'] += 1
+        FACTOR_BAYESNET_CACHE[cache_key] = FACTOR_BAYESNET_CACHE.pop(cache_key)
+    else:
+        FACTOR_BAYESNET_CACHE_COUNTS['MISSES'] += 1
+        FACTOR_BAYESNET_CACHE[cache_key] = build_factor_bayesnet(directed_graph=directed_graph,
+                                                                 var_states=var_states,
+                                                                 cpt_list=cpt_list,
+                                                                 bayesnet_label=bayesnet_label,
+                                                                 inference_approach=inference_approach,
+                                                                 cpt_fingerprint=cpt_fingerprint,
+                                                                 cpt_arrays=cpt_arrays)
+        while len(FACTOR_BAYESNET_CACHE) > FACTOR_BAYESNET_CACHE_SIZE:
+            FACTOR_BAYESNET_CACHE.popitem(last=False)
+            FACTOR_BAYESNET_CACHE_COUNTS['EVICTIONS'] += 1
+    factor_bayesnet = dict(FACTOR_BAYESNET_CACHE.get(cache_key))
+    factor_bayesnet.update({'BAYESNET_LABEL': bayesnet_label})
+    return factor_bayesnet
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓞ COMPILED-NETWORK CACHE STATISTICS.  Report the hit, miss, eviction counts and the current size of the cache.
+#    clear_factor_bayesnet_cache empties the cache and resets the counters, for instance between tenants.
+def factor_bayesnet_cache_stats():
+    cache_stats = dict(FACTOR_BAYESNET_CACHE_COUNTS)
+    cache_stats.update({'SIZE': len(FACTOR_BAYESNET_CACHE)})
+    return cache_stats
+
+
+def clear_factor_bayesnet_cache():
+    FACTOR_BAYESNET_CACHE.clear()
+    for count_key in list(FACTOR_BAYESNET_CACHE_COUNTS.keys()):
+        FACTOR_BAYESNET_CACHE_COUNTS[count_key] = 0
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓟ MASTERY-LEVEL FINGERPRINT.  Produce a sha1 digest of the knowledge-level categories and thresholds of var_states,
+#    the MASTERY_LEVEL_CAT dataframe derived from MASTERY_COLOR_LIST.  Together with cpt_list_fingerprint, it
+#    identifies the reference data from which a tenant's posteriors are computed.
+def var_states_fingerprint(var_states):
+    return hashlib.sha1(repr([var_states.index.astype(str).tolist()] +
+                             [var_states[state_attr].astype(str).tolist()
+                              for state_attr in ['LOW_BOUND', 'UP_BOUND', 'CAT_LEVEL_IDX']]).encode('utf-8')).hexdigest()
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓠ POSTERIOR-MEMO KEYS.  Produce one memo key for each row of an evidence matrix.  A key digests the memo's
+#    reference-data digest, the network's graph signature, CPT_LIST fingerprint, and inference approach, and the
+#    evidence assignment sorted by vertex label.  Two evidentiary states from different profiles, courses, or runs
+#    therefore share a key exactly when they share a posterior.
+def posterior_memo_keys(evid_matrix, meas_verts, factor_bayesnet, posterior_memo):
+    key_prefix = repr((posterior_memo.get('REF_DIGEST'),
+                       factor_bayesnet.get('GRAPH_SIGNATURE'),
+                       factor_bayesnet.get('CPT_FINGERPRINT'),
+                       factor_bayesnet.get('INFERENCE_APPROACH')))
+    meas_vert_order = sorted(range(len(meas_verts)), key=lambda col_idx: str(meas_verts[col_idx]))
+    return [hashlib.sha1((key_prefix + repr([(str(meas_verts[col_idx]), int(evid_row[col_idx]))
+                                             for col_idx in meas_vert_order])).encode('utf-8')).hexdigest()
+            for evid_row in np.asarray(evid_matrix, dtype=int)]
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓡ MEMOIZED BATCHED QUERY.  Our inputs and output are those of query_factor_bayesnet_batch, plus posterior_memo, the
+#    dictionary returned by open_posterior_memo.  We return also the number of states answered from the memo.
+#    ⑴ Look up every state in the memo.  Stored posteriors have their vertices in canonical — label-sorted — order,
+#       since DiGraph_Vert_Order depends on edge-insertion order.
+#    ⑵ Query the Bayesian network for the states the memo does not hold, and store their posteriors.
+#    ⑶ Fill in the remaining states from the memo.
+def memoized_query_factor_bayesnet_batch(evid_matrix, meas_verts, factor_bayesnet, posterior_memo):
+    vert_order = factor_bayesnet.get('DiGraph_Vert_Order')
+    canonical_vert_perm = np.argsort(np.array([str(vert) for vert in vert_order], dtype=object), kind='mergesort')
+    evid_matrix = np.asarray(evid_matrix, dtype=int).reshape(-1, len(meas_verts))
+    posterior = np.empty(shape=(len(evid_matrix), len(vert_order), factor_bayesnet.get('VAR_CARD')))
+    #
+    #    ⑴ Look up every state in the memo.
+    memo_keys = posterior_memo_keys(evid_matrix=evid_matrix,
+                                    meas_verts=meas_verts,
+                                    factor_bayesnet=factor_bayesnet,
+                                    posterior_memo=posterior_memo)
+    memo_hits = lookup_posterior_memo(posterior_memo=posterior_memo,
+                                      memo_keys=memo_keys)
+    #
+    #    ⑵ Query and store the misses.
+    miss_rows = [row_idx for (row_idx, memo_key) in enumerate(memo_keys) if memo_key not in memo_hits]
+    if len(miss_rows) > 0:
+        posterior[miss_rows] = query_factor_bayesnet_batch(evid_matrix=evid_matrix[miss_rows],
+                                                           meas_verts=meas_verts,
+                                                           factor_bayesnet=factor_bayesnet)
+        store_posterior_memo(posterior_memo=posterior_memo,
+                             memo_keys=[memo_keys[row_idx] for row_idx in miss_rows],
+                             posteriors=posterior[miss_rows][:, canonical_vert_perm, :])
+    #
+    #    ⑶ Fill in the hits.
+    for (row_idx, memo_key) in enumerate(memo_keys):
+        if memo_key in memo_hits:
+            posterior[row_idx, canonical_vert_perm, :] = memo_hits.get(memo_key).reshape(len(vert_order),
+                                                                                         factor_bayesnet.get('VAR_CARD'))
+    return {'POSTERIOR': posterior,
+            'MEMO_HIT_COUNT': len(memo_keys) - len(miss_rows)}
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓢ COMPILE A JUNCTION TREE.  exact_marginals contracts the whole network once per estimated vertex and per
+#    measured-vertex set.  A junction tree instead triangulates the moral graph once per subgraph.  Each evidentiary
+#    state then costs a single two-pass message sweep, after which every marginal is read off a calibrated clique.
+#    Our inputs are the FACTORS of a factor-array Bayesian network, the number of vertices, and var_card.  We return
+#    a dictionary containing:
+#    ⧐ CLIQUES, a list of clique scopes — sorted lists of integer vertex indices;
+#    ⧐ CLIQUE_POTENTIALS, for each clique the product of the factors assigned to it;
+#    ⧐ VERT_CLIQUE, for each vertex the smallest clique containing it, into which its evidence is entered and from
+#      which its marginal is read; and
+#    ⧐ SCHEDULE, a list of (child clique, parent clique, separator) tuples in breadth-first order from clique 0.
+#      The collect pass traverses it in reverse; the distribute pass traverses it forward.
+#    ⑴ Triangulate.  The bags of networkx' min-fill-in tree decomposition of the moral graph form a clique tree with
+#       the running-intersection property.  Every factor scope is a clique of the moral graph and therefore lies
+#       within some bag.
+#    ⑵ Assign each factor to the smallest clique containing its scope, and multiply the assignments into potentials.
+#    ⑶ Root the clique tree and record the message schedule.
+def build_junction_tree(factors, vert_count, var_card):
+    #    ⑴ Triangulate.
+    moral_graph = nx.Graph()
+    moral_graph.add_nodes_from(range(vert_count))
+    for (scope, factor) in factors:
+        moral_graph.add_edges_from([(scope[first_pos], scope[second_pos])
+                                    for first_pos in range(len(scope)) for second_pos in range(first_pos)])
+    clique_tree = treewidth_min_fill_in(moral_graph)[1]
+    cliques = [sorted(bag) for bag in clique_tree.nodes()]
+    clique_idx = dict((frozenset(clique), idx) for (idx, clique) in enumerate(cliques))
+    #
+    #    ⑵ Assign factors and form clique potentials.
+    clique_factors = [list() for clique in cliques]
+    for (scope, factor) in factors:
+        containing_cliques = [idx for (idx, clique) in enumerate(cliques) if set(scope).issubset(clique)]
+        clique_factors[min(containing_cliques, key=lambda idx: len(cliques[idx]))].extend([factor, scope])
+    clique_potentials = [np.einsum(*(clique_factors[idx] + [np.ones(shape=(var_card,) * len(clique)), clique, clique]))
+                         for (idx, clique) in enumerate(cliques)]
+    vert_clique = [min([idx for (idx, clique) in enumerate(cliques) if vert_idx in clique],
+                       key=lambda idx: len(cliques[idx]))
+                   for vert_idx in range(vert_count)]
+    #
+    #    ⑶ Root the clique tree at clique 0 and record the breadth-first message schedule.
+    schedule = [(clique_idx.get(child), clique_idx.get(parent), sorted(parent.intersection(child)))
+                for (parent, child) in nx.bfs_edges(clique_tree, source=list(clique_tree.nodes())[0])]
+    return {'CLIQUES': cliques,
+            'CLIQUE_POTENTIALS': clique_potentials,
+            'VERT_CLIQUE': vert_clique,
+            'SCHEDULE': schedule}
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓣ EXACT MARGINALS BY JUNCTION-TREE CALIBRATION.  Our inputs are those of exact_marginals.  The factor_bayesnet must
+#    contain the JUNCTION_TREE compiled by build_junction_tree.  Every clique belief carries a leading
+#    evidentiary-state axis, so all states are calibrated together.  We use Hugin-style separator updates.
+#    ⑴ Enter evidence.  Each measured vertex's likelihood multiplies the potential of its VERT_CLIQUE.  Other cliques
+#       keep their compiled potentials, broadcast across the states.
+#    ⑵ Collect.  From the leaves toward the root, each clique sends its separator marginal to its parent.  Messages
+#       are rescaled to unit sum per state, which leaves the normalized marginals unchanged.
+#    ⑶ Distribute.  From the root toward the leaves, each parent sends its separator marginal divided by the
+#       message it received in the collect pass.  Zero-probability separator cells stay zero.
+#    ⑷ Read every vertex's marginal off its VERT_CLIQUE.
+#    Batches whose largest clique belief would exceed JUNCTION_TREE_BATCH_CELLS are calibrated in slices.
+def junction_tree_marginals(likelihood, meas_idx, factor_bayesnet):
+    junction_tree = factor_bayesnet.get('JUNCTION_TREE')
+    cliques = junction_tree.get('CLIQUES')
+    state_chunk = max(1, JUNCTION_TREE_BATCH_CELLS // max(potential.size
+                                                         for potential in junction_tree.get('CLIQUE_POTENTIALS')))
+    if likelihood.shape[0] > state_chunk:
+        return np.concatenate([junction_tree_marginals(likelihood=likelihood[chunk_start:chunk_start + state_chunk],
+                                                       meas_idx=meas_idx,
+                                                       factor_bayesnet=factor_bayesnet)
+                               for chunk_start in range(0, likelihood.shape[0], state_chunk)])
+    state_ones = np.ones(shape=likelihood.shape[0])
+    #
+    #    ⑴ Enter evidence.
+    clique_evid = [list() for clique in cliques]
+    for idx in meas_idx:
+        clique_evid[junction_tree.get('VERT_CLIQUE')[idx]].extend([likelihood[:, idx, :], [BATCH_LABEL, idx]])
+    beliefs = [np.einsum(*([potential, clique, state_ones, [BATCH_LABEL]] + clique_evid[clique_idx] +
+                           [[BATCH_LABEL] + clique]))
+               for (clique_idx, (clique, potential)) in enumerate(zip(cliques, junction_tree.get('CLIQUE_POTENTIALS')))]
+    #
+    #    ⑵ Collect.
+    collect_messages = dict()
+    for (child_idx, parent_idx, separator) in reversed(junction_tree.get('SCHEDULE')):
+        message = np.einsum(beliefs[child_idx], [BATCH_LABEL] + cliques[child_idx], [BATCH_LABEL] + separator)
+        message = message / message.reshape(len(message), -1).sum(axis=1).reshape((-1,) + (1,) * len(separator))
+        collect_messages[child_idx] = message
+        beliefs[parent_idx] = np.einsum(beliefs[parent_idx], [BATCH_LABEL] + cliques[parent_idx],
+                                        message, [BATCH_LABEL] + separator,
+                                        [BATCH_LABEL] + cliques[parent_idx])
+    #
+    #    ⑶ Distribute.
+    for (child_idx, parent_idx, separator) in junction_tree.get('SCHEDULE'):
+        separator_marginal = np.einsum(beliefs[parent_idx], [BATCH_LABEL] + cliques[parent_idx],
+                                       [BATCH_LABEL] + separator)
+        message = np.divide(separator_marginal, collect_messages.get(child_idx),
+                            out=np.zeros_like(separator_marginal),
+                            where=collect_messages.get(child_idx) > 0)
+        beliefs[child_idx] = np.einsum(beliefs[child_idx], [BATCH_LABEL] + cliques[child_idx],
+                                       message, [BATCH_LABEL] + separator,
+                                       [BATCH_LABEL] + cliques[child_idx])
+    #
+    #    ⑷ Read off the marginals.
+    marginals = likelihood.copy()
+    for target_idx in range(likelihood.shape[1]):
+        if target_idx in meas_idx:
+            continue
+        clique_idx = junction_tree.get('VERT_CLIQUE')[target_idx]
+        marginals[:, target_idx, :] = np.einsum(beliefs[clique_idx], [BATCH_LABEL] + cliques[clique_idx],
+                                                [BATCH_LABEL, target_idx])
+    return marginals / marginals.sum(axis=2, keepdims=True)
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓤ STAR-GRAPH HUB.  A DiGraph is a star graph when a single vertex — its hub — is an endpoint of every edge, and
+#    every other vertex is adjacent to the hub.  The hub's predecessors are then roots and its successors leaves, each
+#    of unit valency.  We return the hub, or None if directed_graph is not a star graph.
+def star_graph_center(directed_graph):
+    if len(directed_graph.edges()) == 0:
+        return None
+    (hub_vert, hub_degree) = max(dict(directed_graph.degree()).items(), key=lambda vert_degree: vert_degree[1])
+    if hub_degree != len(directed_graph.edges()) or hub_degree != len(directed_graph.nodes()) - 1:
+        return None
+    return hub_vert
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓥ EXACT MARGINALS OF A STAR GRAPH IN CLOSED FORM.  Our inputs are those of exact_marginals.  The factor_bayesnet must
+#    contain STAR_HUB, the index of the hub vertex found by star_graph_center.  The hub separates every spoke from every
+#    other, so the posterior factorizes about the hub.  Each step carries a leading evidentiary-state axis, so all
+#    states are answered together.  A hub with k child spokes costs O(k × levels²) per state, plus a few passes over
+#    the hub's own factor.  Batches whose hub-clique belief would exceed JUNCTION_TREE_BATCH_CELLS are answered in
+#    slices.
+#    ⑴ Child spokes.  Each child sends the hub the message Σₓ CPT[h, x]·λ(x).  Messages are rescaled to unit sum per
+#       state, which leaves the normalized marginals unchanged.  Each child also needs the product of all other
+#       children's messages, which we get from exclusive prefix and suffix products.
+#    ⑵ Hub clique.  Multiply the hub factor by the hub likelihood and by each parent's prior times its likelihood.
+#       Summing out the parents gives hub_prior, the hub belief before any child message.
+#    ⑶ Hub and parents.  Multiply the hub clique by the product of the child messages, and sum out all but the hub or
+#       one parent at a time.
+#    ⑷ Children.  Each child's marginal is its likelihood times Σₕ CPT[h, x] times hub_prior and the other children's
+#       messages.
+def star_marginals(likelihood, meas_idx, factor_bayesnet):
+    factors = factor_bayesnet.get('FACTORS')
+    hub_idx = factor_bayesnet.get('STAR_HUB')
+    (hub_scope, hub_factor) = factors[hub_idx]
+    state_chunk = max(1, JUNCTION_TREE_BATCH_CELLS // hub_factor.size)
+    if likelihood.shape[0] > state_chunk:
+        return np.concatenate([star_marginals(likelihood=likelihood[chunk_start:chunk_start + state_chunk],
+                                              meas_idx=meas_idx,
+                                              factor_bayesnet=factor_bayesnet)
+                               for chunk_start in range(0, likelihood.shape[0], state_chunk)])
+    parent_idx = hub_scope[:-1]
+    child_idx = [idx for idx in range(likelihood.shape[1]) if idx != hub_idx and idx not in parent_idx]
+    state_ones = np.ones(shape=(likelihood.shape[0], 1, likelihood.shape[2]))
+    #
+    #    ⑴ Child spokes.
+    child_messages = np.ones(shape=(likelihood.shape[0], 0, likelihood.shape[2]))
+    if len(child_idx) > 0:
+        child_cpts = np.stack([factors[idx][1] for idx in child_idx])
+        child_messages = np.einsum('chx,scx->sch', child_cpts, likelihood[:, child_idx, :])
+        child_messages = child_messages / child_messages.sum(axis=2, keepdims=True)
+    prefix_products = np.cumprod(np.concatenate([state_ones, child_messages], axis=1), axis=1)
+    suffix_products = np.cumprod(np.concatenate([state_ones, child_messages[:, ::-1, :]], axis=1),
+                                 axis=1)[:, ::-1, :]
+    #
+    #    ⑵ Hub clique.  Label the parents 0 … k - 1 and the hub k, as in the hub factor's own axis order, and the
+    #       states BATCH_LABEL.
+    clique_labels = [BATCH_LABEL] + list(range(len(hub_scope)))
+    operands = [hub_factor, clique_labels[1:], likelihood[:, hub_idx, :], [BATCH_LABEL, len(parent_idx)]]
+    for (label, idx) in enumerate(parent_idx):
+        operands.extend([factors[idx][1] * likelihood[:, idx, :], [BATCH_LABEL, label]])
+    hub_clique = np.einsum(*(operands + [clique_labels]))
+    hub_prior = hub_clique.reshape((likelihood.shape[0], -1, likelihood.shape[2])).sum(axis=1)
+    #
+    #    ⑶ Hub and parents.
+    hub_clique = hub_clique * prefix_products[:, -1, :].reshape((likelihood.shape[0],) +
+                                                                (1,) * len(parent_idx) +
+                                                                (likelihood.shape[2],))
+    marginals = likelihood.copy()
+    for (label, idx) in enumerate(hub_scope):
+        marginals[:, idx, :] = np.einsum(hub_clique, clique_labels, [BATCH_LABEL, label])
+    #
+    #    ⑷ Children.
+    if len(child_idx) > 0:
+        marginals[:, child_idx, :] = likelihood[:, child_idx, :] * \
+                                     np.einsum('chx,sch->scx', child_cpts,
+                                               hub_prior[:, np.newaxis, :] *
+                                               prefix_products[:, :-1, :] * suffix_products[:, 1:, :])
+    marginals[:, meas_idx, :] = likelihood[:, meas_idx, :]
+    return marginals / marginals.sum(axis=2, keepdims=True)
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓦ MARGINAL OVER A SCOPE.  Our inputs are those of exact_marginals, plus scope, a list of vertex indices.  We contract
+#    all of the factors with the measured-vertex likelihood vectors, leaving open the evidentiary-state axis and the
+#    axes of scope.  The result is the unnormalized joint of scope and the evidence, with shape
+#    (n_states,) + (n_levels,) * len(scope).  Contraction paths are cached in EINSUM_PATHS, as in exact_marginals.
+def scope_marginals(likelihood, meas_idx, factor_bayesnet, scope):
+    operands = list()
+    for (factor_scope, factor) in factor_bayesnet.get('FACTORS'):
+        operands.extend([factor, factor_scope])
+    for idx in meas_idx:
+        operands.extend([likelihood[:, idx, :], [BATCH_LABEL, idx]])
+    if len(meas_idx) == 0:
+        operands.extend([np.ones(shape=likelihood.shape[0]), [BATCH_LABEL]])
+    path_key = ('SCOPE', tuple(meas_idx), tuple(scope))
+    if path_key not in factor_bayesnet.get('EINSUM_PATHS'):
+        factor_bayesnet.get('EINSUM_PATHS')[path_key] = np.einsum_path(*(operands + [[BATCH_LABEL] + list(scope)]),
+                                                                       optimize='greedy')[0]
+    return np.einsum(*(operands + [[BATCH_LABEL] + list(scope)]),
+                     optimize=factor_bayesnet.get('EINSUM_PATHS').get(path_key))
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓧ MARGINALS OF A SOFT-SEPARATED NETWORK.  Our inputs are those of exact_marginals.  The factor_bayesnet is one compiled
+#    by soft_separate_bayesnet in SOFTSEP_INFER_GROUP_KNOW_STATE.  Its identically-distributed (ID) root vertices have
+#    been summed out of the factors of their shared successors.  It carries:
+#    ⧐ REDUCED_BAYESNET, the factor-array network on the remaining vertices;
+#    ⧐ REDUCED_VERT_IDX, the index in the full vertex order of each vertex of REDUCED_BAYESNET; and
+#    ⧐ SOFTSEP_GROUPS, for each group of eliminated ID roots, ELIMINATED_IDX — their indices in the full vertex order —
+#      SCOPE — the indices in REDUCED_BAYESNET of their successors and the successors' other parents — and
+#      ROOT_CONDITIONALS, an array holding P(root | SCOPE) for each eliminated root.
+#    ⑴ Query the reduced network on the likelihood of its own vertices.
+#    ⑵ Reconstruct each group's ID-root posteriors.  The successors and co-parents separate the ID roots from every other
+#       vertex.  Each root's posterior is therefore its conditional given SCOPE, summed against the posterior of SCOPE.
+def soft_separated_marginals(likelihood, meas_idx, factor_bayesnet):
+    reduced_bayesnet = factor_bayesnet.get('REDUCED_BAYESNET')
+    reduced_vert_idx = factor_bayesnet.get('REDUCED_VERT_IDX')
+    reduced_pos = dict((idx, pos) for (pos, idx) in enumerate(reduced_vert_idx))
+    reduced_likelihood = likelihood[:, reduced_vert_idx, :]
+    reduced_meas_idx = [reduced_pos.get(idx) for idx in meas_idx]
+    #
+    #    ⑴ Query the reduced network.
+    marginals = likelihood.copy()
+    marginals[:, reduced_vert_idx, :] = factor_bayesnet_marginals(likelihood=reduced_likelihood,
+                                                                  meas_idx=reduced_meas_idx,
+                                                                  factor_bayesnet=reduced_bayesnet)
+    #
+    #    ⑵ Reconstruct the ID-root posteriors.  Label the scope axes 0 … s - 1, the roots s, their levels s + 1.
+    for softsep_group in factor_bayesnet.get('SOFTSEP_GROUPS'):
+        scope_labels = list(range(len(softsep_group.get('SCOPE'))))
+        marginals[:, softsep_group.get('ELIMINATED_IDX'), :] = np.einsum(
+            scope_marginals(likelihood=reduced_likelihood,
+                            meas_idx=reduced_meas_idx,
+                            factor_bayesnet=reduced_bayesnet,
+                            scope=softsep_group.get('SCOPE')), [BATCH_LABEL] + scope_labels,
+            softsep_group.get('ROOT_CONDITIONALS'), scope_labels + [len(scope_labels), len(scope_labels) + 1],
+            [BATCH_LABEL, len(scope_labels), len(scope_labels) + 1])
+    return marginals / marginals.sum(axis=2, keepdims=True)
@@ -43,6 +43,7 @@
 import time
 import csv
 import timeit as tit
+import hashlib
 from datetime import datetime
 import pandas as pd
 import numpy as np
@@ -58,11 +59,55 @@ import logging
 import multiprocessing
 import subprocess
 import os
-from pgmpy.models import BayesianModel
-from pgmpy.factors.discrete.CPD import TabularCPD
-from pgmpy.inference import VariableElimination
 from collections import Counter
 from logging.handlers import TimedRotatingFileHandler
+from NUMPY_SUM_PRODUCT_INFERENCE import cached_factor_bayesnet, factor_bayesnet_cache_stats, query_factor_bayesnet_group
+from NUMPY_SUM_PRODUCT_INFERENCE import cpt_list_fingerprint, cpt_meas_by_count, var_states_fingerprint
+from POSTERIOR_MEMO import open_posterior_memo, reopen_posterior_memo, posterior_memo_spec, posterior_memo_stats
+from INFERENCE_ROUTER import route_subgraph_inference, fit_inference_cost_model_from_dir
+from RESULT_ACCUMULATOR import result_accumulator, accumulate_frame, accumulate_row, accumulated_dataframe
+from IDENTIFIER_CODES import identifier_code_book, encode_identifiers, decode_identifiers
+from KNOW_STATE_SINK import SINK_BATCH_ROWS, open_bulk_sink, bulk_write_frame
+from EOL_STATUS_TRANSITIONS import open_eol_status_transitioner, stage_eol_keys, transition_eol_status
+from DATA_ACCESS_LAYER import DAL_POOL_SIZE, open_data_access, dal_query, dal_latency_summary
+from REFERENCE_DATA_CACHE import REF_CACHE_TTL, open_reference_cache, tenant_reference, reference_cache_stats
+from REFERENCE_DATA_CACHE import course_neighborhood_edges, sc_map_courses, mastery_partition_bins
+from REFERENCE_DATA_CACHE import tenant_standard_codes
+from STANDARD_GRAPH_INDEX import build_graph_index, khop_vertices
+from SUBGRAPH_DECOMPOSITION import CLIQUE_SIZE_BUDGET, decompose_digraph, decomposition_memo_stats
+from SOFTSEP_INFER_GROUP_KNOW_STATE import route_soft_separation, cached_softsep_bayesnet, softsep_bayesnet_cache_stats
+#
+# POSTERIOR_MEMO, like CPT_LIST, is designated global when a tenant's reference data are loaded.  It remains None —
+# and every evidentiary state is inferred — until then.  KNOW_STATE_PROCESS_COUNT is the number of worker processes
+# across which evaluate_group_know_state spreads evidentiary profiles.  The optional Process_count item of
+# Mastery_config.txt overrides it.  KNOW_STATE_WORKER_ARGS holds the inputs shared by all profiles within a worker process.
+POSTERIOR_MEMO = None
+KNOW_STATE_PROCESS_COUNT = 1
+KNOW_STATE_WORKER_ARGS = None
+#
+# stream_wide_evid_state reads the long body of evidence EVID_STREAM_CHUNK_ROWS rows at a time.  Its int8 evidentiary-state
+# matrix holds the position of each measurement's knowledge-level category, or EVID_UNMEASURED_CODE.
+EVID_STREAM_CHUNK_ROWS = 250000
+EVID_UNMEASURED_CODE = -1
+#
+# INCREMENTAL_KNOW_STATE selects, in worker, onboard_update_student_know_state — which re-infers only the learning standards
+# within EVID_RADIUS of each learner's new measurements — over onboard_initialize_student_know_state.  The optional
+# Incremental_update item of Mastery_config.txt overrides it.
+INCREMENTAL_KNOW_STATE = False
+EVID_RADIUS = 2
+#
+# DECOMPOSITION_CLIQUE_SIZE is the clique-size budget — in vertices — within which decompose_digraph keeps each estimation
+# subgraph.  The optional Decomposition_clique_size item of Mastery_config.txt overrides it.
+DECOMPOSITION_CLIQUE_SIZE = CLIQUE_SIZE_BUDGET
+#
+# SOFT_SEPARATION lets est_know_state_for_evid_prof sum groups of unmeasured, identically-distributed root vertices out of a
+# subgraph when route_soft_separation predicts the reduced network to be cheaper.  The optional Soft_separation item of
+# Mastery_config.txt overrides it.
+SOFT_SEPARATION = True
+#
+# COURSE_NHBD_DIGRAPH holds the course-neighborhood digraph and its CSR graph index for the most recent digraph_edge_list,
+# so that evidentiary profiles of the same course share them.
+COURSE_NHBD_DIGRAPH = dict()
 
 
 #################################################################################################################################
@@ -74,13 +119,13 @@ from logging.handlers import TimedRotatingFileHandler
 #    associated with each conditional-probability measure. Our CPT_LONG input table handles this implicitly.  We infer the
 #    conditioning-, target-variable states by knowing the assumed structure employed in construction of CPT_LING.
 #
-#    Constructing explicit variable-state tables occurs through recursive cartesin products of the variable states.
-#    We accomplish this in two stages.  First, state_df consntructs a dataframe containing the variable states for a specified
-#    variable, as well as a constant-value join key.
-def state_df(state_var, var_states):
-    return pd.DataFrame(data={state_var: var_states,
-                              'join_key': list(np.repeat(a=1,
-                                                         repeats=len(var_states)))})
+#    Constructing explicit variable-state tables occurs through the cartesian product of the variable states.  We formerly
+#    built it by recursive merges of single-variable dataframes on a constant-value join key.  state_grid instead indexes
+#    var_cat_indices by np.indices, giving an array with a row per joint state and a column per variable.  The first
+#    variable varies slowest and the last fastest, as in the merged dataframe.
+def state_grid(var_count, var_cat_indices):
+    return np.asarray(var_cat_indices)[np.indices(tuple(np.repeat(a=len(var_cat_indices),
+                                                                  repeats=var_count))).reshape(var_count, -1).T]
 
 
 #
@@ -143,20 +188,18 @@ def pom_cond_probs(cond_dependence, var_cat_indices):
         cond_probs[vert_idx] = cond_prob_vert_idx
     #
     #   ⅲ. Next handle the non-root vertices. These nodes are specified by conditional-probability tables. We must build an exhaustive
-    #      list variable states.  This results from a cartesian-product recursion.  Once finished with the recursion, enforce column
-    #      sequence and drop the join_key attribute.  Also, add the MEAS value from cpt_list.
+    #      list variable states — the vertex itself followed by its constituents — from state_grid, and add the MEAS value from
+    #      cpt_list.  The table depends only on CONSTITUENT_COUNT, so we build one array per count and list it for each vertex.
+    cond_prob_arrays = dict()
     for vert_idx in nonroot_verts:  ## vert_idx = nonroot_verts[0]
         cond_prob_vert_idx = dict()
-        var_state_list_vert_idx = state_df(vert_idx, var_cat_indices)
-        for const_idx in cond_dependence.get(vert_idx).get('CONSTITUENT_LEARNING_STD_ID'):
-            var_state_list_vert_idx = pd.merge(left=var_state_list_vert_idx,
-                                               right=state_df(const_idx, var_cat_indices))
-        var_state_list_vert_idx = var_state_list_vert_idx[
-            [vert_idx] + cond_dependence.get(vert_idx).get('CONSTITUENT_LEARNING_STD_ID')]
-        var_state_list_vert_idx['MEAS'] = \
-        CPT_LIST.loc[CPT_LIST['CONSTITUENT_COUNT'] == str(int(cond_dependence.get(vert_idx).get('CONSTITUENT_COUNT')))][
-            'MEAS'].values.tolist()
-        cond_prob_vert_idx.update({'COND_PROB': var_state_list_vert_idx.values.tolist()})
+        constituent_count = int(cond_dependence.get(vert_idx).get('CONSTITUENT_COUNT'))
+        if constituent_count not in cond_prob_arrays:
+            cond_prob_arrays[constituent_count] = np.column_stack(
+                [state_grid(var_count=constituent_count + 1,
+                            var_cat_indices=var_cat_indices),
+                 CPT_LIST.loc[CPT_LIST['CONSTITUENT_COUNT'] == str(constituent_count)]['MEAS'].values])
+        cond_prob_vert_idx.update({'COND_PROB': cond_prob_arrays.get(constituent_count).tolist()})
         cond_prob_vert_idx.update({'NODE_TYPE': 'conditional'})
         cond_prob_vert_idx.update(
             {'CONSTITUENT_LIST': cond_dependence.get(vert_idx).get('CONSTITUENT_LEARNING_STD_ID')})
@@ -271,14 +314,22 @@ def merge_ready(merged_vert, constit_vert_dict):
 #    has a "IS_STAR_GRAPH" flag set as "True".  If so, this subroutine gets invoked. Otherwise, the algorithm directly
 #    invokes approx_infer_group_know_state.
 #
+#    Pure star graphs — those in which every edge meets the hub — ordinarily no longer reach this subroutine.  Their
+#    posterior factorizes about the hub, and route_subgraph_inference sends them to the closed-form STAR engine in
+#    NUMPY_SUM_PRODUCT_INFERENCE, which answers every evidentiary state exactly in a few matrix products.  We star-reduce
+#    quasi-star graphs, and pure star graphs whose hub has too many parents for exact inference.
+#
 #    This logic branch performs some pre- and post-processing around invocation of the approx_infer_group_know_state
 #    subroutine.  Its input and outputs are identical.  Its inputs include:
 #    ⧐ A SUBGRAPH dictionary object containing a digraph on which to base a Bayesian network;
 #    ⧐ A dataframe containing subject (aka "student") evidentiary states for variables contained within
 #      the digraph object;
-#    ⧐ A list of admissible variable states; and
+#    ⧐ A list of admissible variable states;
+#    ⧐ cpt_list, the long-table conditional-probability measures;
 #    ⧐ A clust_idx label for the subgraph used to associate execution-time statistics with the configuration
-#      of the queried Bayesian network.
+#      of the queried Bayesian network; and
+#    ⧐ inference_approach, the engine chosen for the subgraph by route_subgraph_inference.  Execution-time
+#      statistics record it with a STAR_ prefix.
 #
 #    Our output consists of a two-item dictionary object:
 #    ⧐ A dataframe reporting the knowledge — in terms of marginalized, conditional probabilities —
@@ -294,7 +345,8 @@ def merge_ready(merged_vert, constit_vert_dict):
 #    ⑸ Append onto our BAYESNET_QUERY_RESP dataframe output marginalized CPDs associated with the
 #       redundant boundary vertices removed in step ⑶ above.
 #
-def query_star_graph_Bayesnet(bayesnet_digraph, wide_evid_dataframe, evid_prof_conformees, var_states, clust_idx):
+def query_star_graph_Bayesnet(bayesnet_digraph, wide_evid_dataframe, evid_prof_conformees, var_states, cpt_list, clust_idx,
+                              inference_approach=None, cpt_fingerprint=None, cpt_arrays=None):
     #    First, define the graph. Bayesian-network
     #    ⑴ Create a copy of our Bayesian-network DAG.  Extract an edge list as a dataframe. We subsequently require this
     #       to classify vertices as roots, leafs using internally-defined graph_vert_class. Function.
@@ -366,7 +418,13 @@ def query_star_graph_Bayesnet(bayesnet_digraph, wide_evid_dataframe, evid_prof_c
                                                            wide_evid_dataframe=wide_evid_dataframe,
                                                            evid_prof_conformees=evid_prof_conformees,
                                                            var_states=var_states,
-                                                           clust_idx=clust_idx)
+                                                           cpt_list=cpt_list,
+                                                           clust_idx=clust_idx,
+                                                           inference_approach=inference_approach,
+                                                           cpt_fingerprint=cpt_fingerprint,
+                                                           cpt_arrays=cpt_arrays)
+    cluster_bayesnet_query.get('CLUSTER_EXEC_TIME')['INFERENCE_APPROACH'] = \
+        'STAR_' + cluster_bayesnet_query.get('CLUSTER_EXEC_TIME')['INFERENCE_APPROACH'].astype(str)
     #
     #    ⑸ Append onto our BAYESNET_QUERY_RESP dataframe output marginalized CPDs associated with the
     #       redundant boundary vertices removed in step ⑶ above.  This again is executed conditionally for each case.
@@ -409,44 +467,109 @@ def query_star_graph_Bayesnet(bayesnet_digraph, wide_evid_dataframe, evid_prof_c
 # ⓗ Build an induced-inrange graphical neighborhood for vertices for which evidence is available.  We limit our analysis
 #    to measurements within a specified radius, evid_radius.  Our meas_list contains a list of vertices for which
 #    evidence is available. The course_nhbd graph is the overall graphical neighborhood to which we are limited.
-#    We build our overal graph by composing ego grpahs for each vertex specified in meas_list.
-def build_induced_inrange_graph(meas_list, evid_radius, course_nhbd_graph):
-    induced_inrange_graph = nx.ego_graph(G=course_nhbd_graph,
-                                         n=meas_list[0],
-                                         radius=evid_radius,
-                                         undirected=True)
-    for vert_idx in meas_list[1:]:
-        induced_inrange_graph = nx.compose(G=induced_inrange_graph,
-                                           H=nx.ego_graph(G=course_nhbd_graph,
-                                                          n=vert_idx,
-                                                          radius=evid_radius,
-                                                          undirected=True))
+#    We formerly composed an undirected ego graph for each vertex specified in meas_list, copying the accumulating
+#    graph at every step.  We instead run one multi-source breadth-first search, seeded by all of meas_list at once,
+#    over the undirected adjacency of graph_index — the CSR index of course_nhbd_graph.  It is built here if the caller
+#    does not supply one.  The induced subgraph on the in-range vertices is then built once, in vertex-label order.
+#    A vertex of meas_list absent from course_nhbd_graph raises networkx' NodeNotFound, as the ego graph did.
+def build_induced_inrange_graph(meas_list, evid_radius, course_nhbd_graph, graph_index=None):
+    #    ⑴ Index course_nhbd_graph, unless our caller already has.
+    if graph_index is None:
+        course_nhbd_edges = list(course_nhbd_graph.edges())
+        graph_index = build_graph_index(edge_from=[edge[0] for edge in course_nhbd_edges],
+                                        edge_to=[edge[1] for edge in course_nhbd_edges],
+                                        vertices=list(course_nhbd_graph.nodes()))
+    #
+    #    ⑵ Find the vertices within evid_radius undirected hops of any measured vertex.  get_indexer marks vertices
+    #       it cannot find by position -1, which khop_vertices must not receive.
+    meas_pos = graph_index.get('VERTICES').get_indexer(list(meas_list))
+    if (meas_pos < 0).any():
+        raise nx.NodeNotFound('Measured vertices ' +
+                              str([vert for (vert, vert_pos) in zip(meas_list, meas_pos) if vert_pos < 0]) +
+                              ' are not in course_nhbd_graph.')
+    in_range_pos = khop_vertices(graph_index=graph_index,
+                                 seed_pos=meas_pos,
+                                 hops=evid_radius,
+                                 direction='BOTH')[0]
+    in_range_mask = np.zeros(shape=len(graph_index.get('VERTICES')), dtype=bool)
+    in_range_mask[in_range_pos] = True
+    in_range_edges = in_range_mask[graph_index.get('EDGE_FROM')] & in_range_mask[graph_index.get('EDGE_TO')]
+    #
+    #    ⑶ Build the induced subgraph.
+    induced_inrange_graph = nx.DiGraph()
+    induced_inrange_graph.add_nodes_from(graph_index.get('VERTICES')[np.sort(in_range_pos)].tolist())
+    induced_inrange_graph.add_edges_from(
+        zip(graph_index.get('VERTICES')[graph_index.get('EDGE_FROM')[in_range_edges]].tolist(),
+            graph_index.get('VERTICES')[graph_index.get('EDGE_TO')[in_range_edges]].tolist()))
     return induced_inrange_graph
 
 
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓗ COURSE-NEIGHBORHOOD DIGRAPH.  Every evidentiary profile of a course is evaluated against the same digraph_edge_list.
+#    We build its networkx digraph and CSR graph index once, and hold them in COURSE_NHBD_DIGRAPH — keyed by the
+#    identity of digraph_edge_list — until a different course's edge list arrives.  We return the dictionary with
+#    items EDGE_LIST, GRAPH, and GRAPH_INDEX.
+def course_nhbd_digraph(digraph_edge_list):
+    if COURSE_NHBD_DIGRAPH.get('EDGE_LIST') is not digraph_edge_list:
+        course_nhbd_graph = nx.DiGraph()
+        course_nhbd_graph.add_nodes_from(list(set(digraph_edge_list['LEARNING_STANDARD_ID']). \
+                                              union(set(digraph_edge_list['CONSTITUENT_LEARNING_STD_ID']))))
+        course_nhbd_graph.add_edges_from(
+            tuple(digraph_edge_list[['CONSTITUENT_LEARNING_STD_ID', 'LEARNING_STANDARD_ID']].itertuples(index=False)))
+        COURSE_NHBD_DIGRAPH.clear()
+        COURSE_NHBD_DIGRAPH.update({'EDGE_LIST': digraph_edge_list,
+                                    'GRAPH': course_nhbd_graph,
+                                    'GRAPH_INDEX': build_graph_index(
+                                        edge_from=digraph_edge_list['CONSTITUENT_LEARNING_STD_ID'],
+                                        edge_to=digraph_edge_list['LEARNING_STANDARD_ID'])})
+    return COURSE_NHBD_DIGRAPH
+
+
 #
 #
 # |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
-# ⓗ EXTRACT BAYESIAN-NETWORK QUERY RESULTS.  The pomegranate bayesian-network query returns results on a json-like format. We want
-#    them in an array.
-def extract_bayesnet_query(pred_proba_result, graph_node_order):
-    #    First, zip the query-response result pred_proba_result into a dictionary.  Initialize a blank dataframe within which
-    #    to store in a structured format.
-    pred_proba_result_dict = dict(zip(graph_node_order,
-                                      pred_proba_result.tolist()))
-    #
-    #    Loop through the elements of pred_proba_result_dict, extracting the 'parameters' object from the json object.
-    #    Extract each object into a dataframe row.
-    for dict_key in list(pred_proba_result_dict.keys()):  # dict_key = list(pred_proba_result_dict.keys())[0]
-        pred_proba_result_dict.update({dict_key:
-                                           json.loads(pred_proba_result_dict.get(dict_key).to_json())['parameters'][0]})
-        pred_proba_result_dict.update({dict_key:
-                                           dict((int(float(str(key))), value) for key, value in
-                                                pred_proba_result_dict.get(dict_key).items())})
-    #
-    #   Return the result as a list of lists.
-    return pd.DataFrame.from_dict(data=pred_proba_result_dict,
-                                  orient='index')
+# ⓗ EXTRACT BAYESIAN-NETWORK QUERY RESULTS.  The pomegranate bayesian-network query returns one distribution object per
+#    vertex.  We want them in an array.  We formerly serialized each distribution with to_json, parsed it back with
+#    json.loads, re-keyed it, and built a dataframe from the resulting dictionary of dictionaries — for every vertex of every
+#    query.  We now read each distribution's parameter dictionary directly into rows of a preallocated array.  Our inputs:
+#    ⧐ pred_proba_result, the pomegranate predict_proba result, in DiGraph_Vert_Order;
+#    ⧐ level_idx, a dictionary mapping distribution keys to array columns.  A key is translated — as int(float(str(key)))
+#      — to its CAT_LEVEL_IDX the first time it is seen, and looked up thereafter; and
+#    ⧐ marg_prob_array, the vertex-count × level-count array slice into which we write.
+#    An observed vertex for which pomegranate returns the observed value rather than a distribution gets unit probability
+#    on that value.  A key that translates to no CAT_LEVEL_IDX in level_idx raises KeyError, as the former label-based
+#    dataframe lookup did.  We return marg_prob_array.
+def extract_bayesnet_query_array(pred_proba_result, level_idx, marg_prob_array):
+    for (vert_idx, vert_dist) in enumerate(pred_proba_result):
+        if hasattr(vert_dist, 'parameters'):
+            vert_dist = vert_dist.parameters[0]
+        else:
+            vert_dist = {vert_dist: 1.}
+        for (key, value) in vert_dist.items():
+            if key not in level_idx:
+                if int(float(str(key))) not in level_idx:
+                    raise KeyError('Distribution key ' + str(key) + ' of vertex ' + str(vert_idx) +
+                                   ' matches no CAT_LEVEL_IDX in level_idx.')
+                level_idx[key] = level_idx.get(int(float(str(key))))
+            marg_prob_array[vert_idx, level_idx.get(key)] = value
+    return marg_prob_array
+
+
+#
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓗ EXTRACT BAYESIAN-NETWORK QUERY RESULTS FOR A SINGLE QUERY.  We return a dataframe indexed by graph_node_order whose
+#    columns are the CAT_LEVEL_IDX values of the measurable knowledge states in var_states.
+def extract_bayesnet_query(pred_proba_result, graph_node_order, var_states):
+    level_labels = var_states.iloc[:-1]['CAT_LEVEL_IDX'].tolist()
+    return pd.DataFrame(data=extract_bayesnet_query_array(pred_proba_result=pred_proba_result,
+                                                          level_idx=dict((level, col_idx) for (col_idx, level)
+                                                                         in enumerate(level_labels)),
+                                                          marg_prob_array=np.zeros((len(graph_node_order),
+                                                                                    len(level_labels)))),
+                        index=list(graph_node_order),
+                        columns=level_labels)
 
 
 #
@@ -613,61 +736,43 @@ def build_pom_bayesnet(directed_graph, var_states, bayesnet_label):
 #
 #
 # |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
-# ⓚ INFER GROUP KNOWLEDGE STATE BY EXACT INFERENCE.  Use pgmpy's exact-inference calculation to estimate group knowledge state.
-#    We use Pomegranate's loopy belief-propagation (LBP) except by exception.  Exact inference is limited to cases of relatively
-#    small graphs. We use it in degernate cases for which Pomegranate's convergence is slow.  Star graphs represent a noteworkty exception.
-#
-#    Our logic here follows that of the Pomegranate. We perform the following steps.
-#    ⑴ Construct a pgmpy Bayesian-network object.
+# ⓚ INFER GROUP KNOWLEDGE STATE BY EXACT INFERENCE.  Use exact variable elimination to estimate group knowledge state.
+#    We use loopy message passing except by exception.  Exact inference is limited to cases of relatively
+#    small graphs. We use it in degernate cases for which loopy convergence is slow.  Star graphs represent a noteworkty exception.
+#
+#    Our logic here follows that of approx_infer_group_know_state.  We formerly constructed a pgmpy Bayesian network
+#    and issued one VariableElimination query per evidentiary state, re-eliminating from scratch each time.  We now
+#    compile a factor-array Bayesian network together with its junction tree.  Triangulation and clique-potential
+#    construction happen once per subgraph — and, through the compiled-network cache, once per run.  Each evidentiary
+#    state then costs one evidence entry and one two-pass calibration, after which all of its marginals are read off the
+#    calibrated cliques.  All evidentiary states are calibrated in a single batch.
+#
+#    The einsum engines label axes by vertex index.  A subgraph of more than BATCH_LABEL vertices therefore cannot be
+#    calibrated as a junction tree, and build_factor_bayesnet falls back to loopy message passing for it.  The
+#    posteriors so returned are approximate.  The INFERENCE_APPROACH column of CLUSTER_EXEC_TIME records the engine
+#    actually used — JUNCTION_TREE or LOOPY — for each cluster.  We perform the following steps.
+#    ⑴ Construct a factor-array Bayesian-network object.
 #    ⑵ Prepare the evidence for application to the Bayesian Network.
 #    ⑶ Apply evidence to query the Baysesian network.
 #    ⑷ Assemble and return the results.
-def exact_infer_group_know_state(bayesnet_digraph, wide_evid_dataframe, evid_prof_conformees, var_states, clust_idx):
-    #    ⑴ Construct a pgmpy Bayesian-network object.
-    #       ⒜ First declare the Bayesian model itself.  This directly follows from the edges of our Bayesian-network
-    #          DiGraph.
+def exact_infer_group_know_state(bayesnet_digraph, wide_evid_dataframe, evid_prof_conformees, var_states, clust_idx,
+                                 cpt_list=None, cpt_fingerprint=None, cpt_arrays=None):
+    #    ⑴ Construct a factor-array Bayesian-network object.  The conditional probabilities for each vertex follow
+    #       from cpt_list — the global CPT_LIST, with its CPT_FINGERPRINT and CPT_ARRAYS, unless our caller passes
+    #       one — according to the in-degree of the vertex.  Identical subgraphs recur across evidentiary profiles, so we fetch the
+    #       compiled network from the process-wide cache when we can.  Subgraphs beyond the einsum label limit come
+    #       back as loopy networks.
+    if cpt_list is None:
+        (cpt_list, cpt_fingerprint, cpt_arrays) = (CPT_LIST, CPT_FINGERPRINT, CPT_ARRAYS)
     start_time_state_idx = tit.default_timer()
-    pgmpy_bayesnet = BayesianModel(bayesnet_digraph.edges())
-    #
-    #	    ⒝ We now specify conditional-probabilities for each vertex in the graph.
-    #           ⅰ. We first need to identify  the immediate successors for each vertex. We identify the root and non-root vertices. We identify
-    #              the immediate predecessors for the non-root vertices.
-    vertex_in_degree = dict(pgmpy_bayesnet.in_degree())
-    root_verts = [vert for (vert, degree) in vertex_in_degree.items() if degree == 0]
-    non_root_verts = list(set(pgmpy_bayesnet.nodes()) - set(root_verts))
-    non_root_predecessors = dict([(vert, list(nx.ego_graph(G=bayesnet_digraph.reverse(copy=True),
-                                                           n=vert,
-                                                           radius=1,
-                                                           center=False,
-                                                           undirected=False).nodes()))
-                                  for vert in non_root_verts])  # vert = non_root_verts[0]
-    #
-    #           ⅱ. Now add tabular CPDs for the root vertices.
-    var_state_cardinality = len(var_states) - 1
-    for vert_idx in root_verts:
-        pgmpy_bayesnet.add_cpds(TabularCPD(variable=vert_idx,
-                                           variable_card=var_state_cardinality,
-                                           values=np.reshape(
-                                               a=CPT_LIST.loc[CPT_LIST['CONSTITUENT_COUNT'] == str(0)]['MEAS'].tolist(),
-                                               newshape=(var_state_cardinality, 1))))
-    for vert_idx in non_root_verts:  ## vert_idx = non_root_verts[0]
-        pgmpy_bayesnet.add_cpds(TabularCPD(variable=vert_idx,
-                                           variable_card=var_state_cardinality,
-                                           evidence_card=list(np.repeat(a=var_state_cardinality,
-                                                                        repeats=vertex_in_degree.get(vert_idx))),
-                                           values=np.reshape(a=CPT_LIST.loc[
-                                               CPT_LIST['CONSTITUENT_COUNT'] == str(vertex_in_degree.get(vert_idx))][
-                                               'MEAS'].tolist(),
-                                                             newshape=(var_state_cardinality,
-                                                                       var_state_cardinality ** vertex_in_degree.get(
-                                                                           vert_idx)),
-                                                             order='F'),
-                                           evidence=non_root_predecessors.get(vert_idx)))
-    pgmpy_bayesnet_compiled = VariableElimination(pgmpy_bayesnet)
-    #	pgmpy_bayesnet_compiled = BeliefPropagation(pgmpy_bayesnet)
-    #	pgmpy_bayesnet_compiled._calibrate_junction_tree(operation = 'marginalize')
-    #	pgmpy_bayesnet_compiled.calibrate()
-    pgmpy_baysenet_build_time = tit.default_timer() - start_time_state_idx
+    exact_bayesnet = cached_factor_bayesnet(directed_graph=bayesnet_digraph,
+                                            var_states=var_states,
+                                            cpt_list=cpt_list,
+                                            bayesnet_label=clust_idx,
+                                            inference_approach='JUNCTION_TREE',
+                                            cpt_fingerprint=cpt_fingerprint,
+                                            cpt_arrays=cpt_arrays)
+    exact_baysenet_build_time = tit.default_timer() - start_time_state_idx
     #
     #    ⑵ Group subjects according to evidentiary states.  We employ here our locally-defined groupby_evid_state
     #       subroutine. We use wide_evid_datarame, evid_state_cats as our function arguements.
@@ -677,86 +782,20 @@ def exact_infer_group_know_state(bayesnet_digraph, wide_evid_dataframe, evid_pro
                                             evid_prof_conformees=evid_prof_conformees,
                                             evid_state_cat_map=var_states.iloc[:-1]['CAT_LEVEL_IDX'])
     #
-    #    ⑶ Berore uerying the Bayesian network for each evidentiary state, we require dataframes into which to
-    #       collect the results.  One dataframe contains the Bayesian-network response variables. The other
-    #       stores execution-time statistics.
-    cluster_knowledge_state = pd.DataFrame(columns=['EVID_STATE_SIG', 'LEARNING_STANDARD_ID', 'KNOWLEDGE_LVL_TYPE'] + \
-                                                   list(var_states['CAT_LEVEL_IDX'])[:-1])
-    clust_exec_time = pd.DataFrame(columns=['EVID_STATE_SIG',
-                                            'GRAPH_ORDER',
-                                            'EDGE_COUNT',
-                                            'MEAS_VERT_COUNT',
-                                            'EST_VERT_COUNT',
-                                            'TIME_NOW',
-                                            'ELAPSED_TIME'],
-                                   index=evid_state_by_subj.get('EVID_STATE_SIG'))
-    clust_exec_time = clust_exec_time.assign(EDGE_COUNT=len(bayesnet_digraph.edges()))
-    clust_exec_time = clust_exec_time.assign(GRAPH_ORDER=len(bayesnet_digraph.nodes()))
+    #    ⑶ Query the Bayesian network for all evidentiary states in one vectorized pass.  Measured vertices are returned
+    #       with unit probability on their measured knowledge-level categories and KNOWLEDGE_LVL_TYPE 'MEASURED'.
+    #       States already in the tenant's POSTERIOR_MEMO are answered from it rather than inferred.
+    bayesnet_query_resp = query_factor_bayesnet_group(evid_state_by_subj=evid_state_by_subj,
+                                                      factor_bayesnet=exact_bayesnet,
+                                                      var_states=var_states,
+                                                      posterior_memo=POSTERIOR_MEMO)
+    cluster_knowledge_state = bayesnet_query_resp.get('BAYESNET_QUERY_RESP')
+    clust_exec_time = bayesnet_query_resp.get('CLUSTER_EXEC_TIME')
     clust_exec_time = clust_exec_time.assign(CLUSTER=clust_idx)
-    clust_exec_time = clust_exec_time.assign(INFERENCE_APPROACH='EXACT')
-    #
-    #    ⑷ Now cycle through the evidentiary states. For each, invoke the locally-defined function query_pom_bayesnet.
-    #       Concatenate each of the two items onto the cluster dataframe objects.
-    for state_idx in evid_state_by_subj.get(
-            'EVID_STATE_SIG'):  # state_idx = evid_state_by_subj.get('EVID_STATE_SIG')[0]
-        print('Evidentiary state ' + str(state_idx) + ', ' + str(
-            evid_state_by_subj.get('EVID_STATE_SIG').index(state_idx) + 1) + \
-              ' of ' + str(
-            len(evid_state_by_subj.get('EVID_STATE_SIG'))) + ' evidentiary states for subgraph at time ' + \
-              str(datetime.now().time()))
-        start_time_state_idx = tit.default_timer()
-        #
-        #        ⅰ. Query the pgmpy Bayesian network. The EVID_STATE objects in our evid_state_by_subj dictionary contain the applied
-        #           evidence. We must specify the return variables. We seek marginalized conditional probabilities for all non-measured
-        #           vertices.
-        bayesnet_query_resp = pgmpy_bayesnet_compiled.query(variables=list(set(bayesnet_digraph.nodes()) - \
-                                                                           set(evid_state_by_subj.get(state_idx).get(
-                                                                               'EVID_STATE').keys())),
-                                                            evidence=evid_state_by_subj.get(state_idx).get(
-                                                                'EVID_STATE'))
-        #
-        #        ⅱ. The pgmpy Bayesian-network query returns a dictionary of discrete factor objects in which the marginalized CPDs
-        #           are stored. Convert this to a dataframe.
-        know_state_state_idx = pd.DataFrame.from_dict(data=dict([(lrn_std, marg_cpd.values.tolist())
-                                                                 for (lrn_std, marg_cpd) in
-                                                                 bayesnet_query_resp.items()]),
-                                                      orient='index')
-        #
-        #        ⅲ. Our Bayesian-network query response only spans estimated graph vertices. Assign unity to the corresponding
-        #           learning-standard, knowledge-level categories for the measured vertices.
-        for lrn_std in list(evid_state_by_subj.get(state_idx).get('EVID_STATE').keys()):
-            know_state_state_idx.loc[lrn_std, evid_state_by_subj.get(state_idx).get('EVID_STATE').get(lrn_std)] = 1
-        know_state_state_idx.fillna(value=0, inplace=True)
-        #
-        #        ⅳ. Fill out other attributes in our dataframe so that it coincides exactly with the information contained in
-        #           the returned dataframe from a Pomegranate Bayesian-network query.
-        know_state_state_idx = know_state_state_idx.assign(EVID_STATE_SIG=state_idx)
-        know_state_state_idx = know_state_state_idx.assign(LEARNING_STANDARD_ID=know_state_state_idx.index.tolist())
-        know_state_state_idx = know_state_state_idx.assign(KNOWLEDGE_LVL_TYPE='ESTIMATED')
-        know_state_state_idx.loc[
-            list(evid_state_by_subj.get(state_idx).get('EVID_STATE').keys()), 'KNOWLEDGE_LVL_TYPE'] = 'MEASURED'
-        #
-        #        ⅳ. Concatenate the query response onto our return variable.
-        cluster_knowledge_state = pd.concat([cluster_knowledge_state,
-                                             know_state_state_idx])
-        #
-        #        ⅳ. Assign values to the cluster-execution time dataframe.
-        clust_exec_time.loc[state_idx,
-                            ['EVID_STATE_SIG',
-                             'TIME_NOW',
-                             'ELAPSED_TIME',
-                             'EST_VERT_COUNT',
-                             'MEAS_VERT_COUNT']] = [state_idx,
-                                                    str(datetime.now().time()),
-                                                    tit.default_timer() - start_time_state_idx,
-                                                    len(list(set(bayesnet_digraph.nodes()) - \
-                                                             set(evid_state_by_subj.get(state_idx).get(
-                                                                 'EVID_STATE').keys()))),
-                                                    len(evid_state_by_subj.get(state_idx).get('EVID_STATE').keys())]
-        print(clust_exec_time.loc[state_idx].T.squeeze())
+    clust_exec_time = clust_exec_time.assign(INFERENCE_APPROACH=exact_bayesnet.get('INFERENCE_APPROACH'))
     #
     #    ⑷ Fill out cluster-execution time values.
-    clust_exec_time = clust_exec_time.assign(BAYESNET_BUILD_TIME=pgmpy_baysenet_build_time)
+    clust_exec_time = clust_exec_time.assign(BAYESNET_BUILD_TIME=exact_baysenet_build_time)
     #
     #    ⑸ Introduce STUDENT_ID by merging the EVID_STATE_CONFORMEES dictionary object from evid_state_by_subj
     #       with our cluster_know_state object.
@@ -772,6 +811,41 @@ def exact_infer_group_know_state(bayesnet_digraph, wide_evid_dataframe, evid_pro
 #
 #
 # |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓛ STABLE EVIDENTIARY SIGNATURE.  Python's hash function is salted per interpreter, so signatures derived from it
+#    differ between worker processes and between runs.  We instead take the leading 60 bits of a sha1 digest of
+#    the sorted (LEARNING_STANDARD_ID, value) pairs for the measured variables.  The signature remains a
+#    non-negative integer, as were the hash-function signatures it replaces.
+def evid_signature(evid_items):
+    return int(hashlib.sha1(repr(sorted((str(evid_var), str(evid_val))
+                                        for (evid_var, evid_val) in evid_items)).encode('utf-8')).hexdigest()[:15], 16)
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓛ GROUP IDENTICAL ROWS OF AN INTEGER MATRIX.  We view each row of a contiguous small-integer matrix as a single
+#    opaque byte string, so that np.unique groups whole rows in one sort.  We return a dictionary containing:
+#    ⧐ FIRST_ROW, for each distinct row, the index of its first occurrence; and
+#    ⧐ ROW_MEMBERS, for each distinct row, the indices of all of its occurrences, in their original order.
+def group_matrix_rows(code_matrix):
+    code_matrix = np.ascontiguousarray(code_matrix)
+    if code_matrix.shape[0] == 0:
+        return {'FIRST_ROW': [],
+                'ROW_MEMBERS': []}
+    if code_matrix.shape[1] == 0:
+        return {'FIRST_ROW': [0],
+                'ROW_MEMBERS': [np.arange(code_matrix.shape[0])]}
+    row_view = code_matrix.view(np.dtype((np.void, code_matrix.dtype.itemsize * code_matrix.shape[1]))).ravel()
+    (unique_rows, first_row, row_inverse) = np.unique(row_view,
+                                                      return_index=True,
+                                                      return_inverse=True)
+    row_inverse = row_inverse.ravel()
+    return {'FIRST_ROW': first_row.tolist(),
+            'ROW_MEMBERS': np.split(np.argsort(row_inverse, kind='mergesort'),
+                                    np.cumsum(np.bincount(row_inverse))[:-1])}
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
 # ⓛ GROUP SUBJECTS BY EVIDENTIARY PROFILE.  Evidentiary profile refers to varibales for which evidentiary
 #    measurements are available.  Our input variable is a wide-table-format dataframe
 #    whose indices are subject ids and whose columns are evidentairy variables. When no evidence is
@@ -781,42 +855,27 @@ def exact_infer_group_know_state(bayesnet_digraph, wide_evid_dataframe, evid_pro
 #    a list of measured evidentiary variables and a list of subject id's for for which
 #    the evidentiary-varaible list exactly coincides with the set for which the subject has measurements.
 def groupby_evid_profile(wide_evid_dataframe):
-    #    We create an "indicator-function" table containing values of False for cells containing "UNMEASURED"
-    #    and True otherwise.
-    indicator_evid_table = wide_evid_dataframe != 'UNMEASURED'
-    #
-    #    Next assign an evidentiary-profile hash signature by calculating a hash function across the
-    #    rows of indicator_evid_table, our evidentiary indicator table.  Also assign values to column STUDENT_ID
-    #    based on row indices of indicator_evid_table.
-    indicator_evid_table['EVID_PROF_SIG'] = list(indicator_evid_table.apply(lambda x: hash(tuple(x)), axis=1))
-    indicator_evid_table['STUDENT_ID'] = indicator_evid_table.index.values.tolist()
-    #
-    #    Group STUDENT_ID by EVID_PROF_SIG.  Organize the result as a dictionary.  Use the orient = 'index' specification
-    #    in the to_dict function in order to produce dictionary items comprised of lists of STUDENT_IDs.
-    evid_prof = indicator_evid_table[['EVID_PROF_SIG', 'STUDENT_ID']].groupby(by='EVID_PROF_SIG',
-                                                                              as_index=True).agg(
-        lambda x: list(x)).to_dict(orient='index')
-    #
-    #    We now nee to extract from indicator_evid_table a list of the evidentiary profiles for each evidentiary-profile
-    #    signature.  This requires us to reindex indicator_evid_table by EVID_PROF_SIG and to drop the STUDENT_ID column.  We then
-    #    drop duplicate rows.
-    indicator_evid_table = indicator_evid_table.drop(labels='STUDENT_ID',
-                                                     axis=1,
-                                                     inplace=False).drop_duplicates().set_index(keys='EVID_PROF_SIG')
-    #
-    #     Finally, loop through each row of indicator_evid_table, updating its corresponding dictionary
-    #     item in evid_prof with a list of measured variables.
-    for dict_idx in list(evid_prof.keys()):  ## dict_idx = list(evid_prof.keys())[0]
-        evid_prof.get(dict_idx).update({'LEARNING_STANDARD_ID':
-                                            list(indicator_evid_table.columns.values[
-                                                     np.where(indicator_evid_table.loc[dict_idx])])})
-        #
-        #      Delete the dict_idxᵗʰ if the corresponding evidentiary profile contains measured variables.
-        if len(evid_prof.get(dict_idx).get('LEARNING_STANDARD_ID')) == 0: del evid_prof[dict_idx]
-
+    #    We create an "indicator-function" matrix containing values of False for cells containing "UNMEASURED"
+    #    and True otherwise.  We pack each row of indicators into a bitset of one bit per variable, so that a
+    #    profile across three hundred variables occupies under forty bytes.
+    indicator_evid_matrix = wide_evid_dataframe.values != 'UNMEASURED'
+    profile_rows = group_matrix_rows(code_matrix=np.packbits(indicator_evid_matrix, axis=1))
+    student_ids = np.array(wide_evid_dataframe.index.values.tolist(), dtype=object)
+    evid_vars = np.array(wide_evid_dataframe.columns.values.tolist(), dtype=object)
+    #
+    #    Each distinct bitset is an evidentiary profile.  Its measured variables follow from the indicators of its
+    #    first conformee.  Profiles without measured variables are dropped.  We assign the profile's stable signature
+    #    and key the dictionary items in signature order.
+    evid_prof = dict()
+    for (first_row, row_members) in zip(profile_rows.get('FIRST_ROW'), profile_rows.get('ROW_MEMBERS')):
+        meas_vars = evid_vars[indicator_evid_matrix[first_row]].tolist()
+        if len(meas_vars) == 0: continue
+        evid_prof[evid_signature(evid_items=[(meas_var, True) for meas_var in meas_vars])] = \
+            {'STUDENT_ID': student_ids[row_members].tolist(),
+             'LEARNING_STANDARD_ID': meas_vars}
     #
     #     Our dictionary evid_prof is now our returned value.
-    return evid_prof
+    return dict((prof_sig, evid_prof.get(prof_sig)) for prof_sig in sorted(evid_prof.keys()))
 
 
 #
@@ -829,41 +888,37 @@ def groupby_evid_profile(wide_evid_dataframe):
 #    very similar in logical flow to groupby_evid_profileile prodices a dictionary of evidentiary states
 #    and of subject ID's for conformees to that state.
 def groupby_evid_state(evid_states_to_be_grouped, evid_prof_conformees, evid_state_cat_map):
-    #    Begin by creating a hash-function state signature derived from the values of each row
-    #    in wide_evid_dataframe.  Also, assign a STUDENT_ID column based on the indices of
-    #    our group_by_evid_state dataframe.
+    #    Begin by encoding the conformees' evidentiary states as a small-integer matrix of CAT_LEVEL_IDX values.
+    #    "UNMEASURED" cells are encoded as -1.
     evid_states_to_be_grouped = evid_states_to_be_grouped.loc[evid_prof_conformees]
-    evid_state_sig_hash = evid_states_to_be_grouped.apply(lambda x: hash(tuple(x)), axis=1)
-    evid_states_to_be_grouped = evid_states_to_be_grouped.assign(EVID_STATE_SIG=list(evid_state_sig_hash))
-    evid_states_to_be_grouped = evid_states_to_be_grouped.assign(STUDENT_ID=evid_states_to_be_grouped.index.tolist())
-    #
-    #    Group STUDENT_ID by EVID_STATE_SIG.  Organize the result as a dictionary.  Use the orient = 'index' specification
-    #    in the to_dict function in order to produce dictionary items comprised of lists of STUDENT_IDs.
-    evid_state = evid_states_to_be_grouped[['EVID_STATE_SIG', 'STUDENT_ID']].groupby(by='EVID_STATE_SIG',
-                                                                                     as_index=True).agg(
-        lambda x: list(x)).to_dict(orient='index')
-    evid_state_conformees = evid_states_to_be_grouped[['EVID_STATE_SIG', 'STUDENT_ID']]
-    #    We now nee to extract from wide_evid_dataframe a list of the evidentiary states for each evidentiary-state
-    #    signature.  This requires us to reindex wide_evid_dataframe by EVID_STATE_SIG and to drop the STUDENT_ID column.  We then
-    #    drop duplicate rows.
-    evid_states_to_be_grouped = evid_states_to_be_grouped.drop(labels='STUDENT_ID',
-                                                               axis=1,
-                                                               inplace=False).drop_duplicates().set_index(
-        keys='EVID_STATE_SIG')
-    #
-    #    Now work through the wide_evid_dataframe one row at a time.  For each row, create a dictionary of
-    #    all measured variables, excluding those for which the state is "UNMEASURED". Update the corresponding entry in evid_state
-    #    with the dictionary of LEARNING_STANDARD_IDs and their observed state from wide_evid_dataframe.
-    for dict_idx in list(evid_state.keys()):  ## dict_idx = list(evid_state.keys())[0]
-        #    The corresponding evidentiary state is the dict_idxʰ row of wide_evid_dataframe.  We exclude the columns
-        #    for which the value is "UNMEASURED".
-        evid_state_dict_idx = evid_states_to_be_grouped.loc[
-            dict_idx, list(evid_states_to_be_grouped.loc[dict_idx,] != 'UNMEASURED')].map(arg=evid_state_cat_map)
-        evid_state.get(dict_idx).update({'EVID_STATE': evid_state_dict_idx.to_dict()})
+    evid_vars = evid_states_to_be_grouped.columns.values.tolist()
+    student_ids = np.array(evid_states_to_be_grouped.index.values.tolist(), dtype=object)
+    evid_state_codes = pd.Series(evid_states_to_be_grouped.values.ravel()).map(arg=evid_state_cat_map) \
+        .fillna(-1).values.astype(np.int8).reshape(evid_states_to_be_grouped.shape)
+    state_rows = group_matrix_rows(code_matrix=evid_state_codes)
+    #
+    #    Each distinct row is an evidentiary state.  Assign its stable signature, and build the dictionary of its
+    #    measured variables and their CAT_LEVEL_IDX values from its first conformee.  Every conformee's STUDENT_ID and
+    #    EVID_STATE_SIG goes into evid_state_conformees, including conformees to states with no measurements.
+    evid_state = dict()
+    evid_state_sig = np.zeros(shape=len(student_ids), dtype=np.int64)
+    for (first_row, row_members) in zip(state_rows.get('FIRST_ROW'), state_rows.get('ROW_MEMBERS')):
+        evid_state_dict_idx = dict((evid_var, int(evid_code))
+                                   for (evid_var, evid_code) in zip(evid_vars, evid_state_codes[first_row])
+                                   if evid_code >= 0)
+        state_sig = evid_signature(evid_items=list(evid_state_dict_idx.items()))
+        evid_state_sig[row_members] = state_sig
         #
-        #    If the evidentiary-state contains no evidentiary measurements, delete it.
-        if len(evid_state.get(dict_idx).get('EVID_STATE')) == 0: del evid_state[dict_idx]
-    #
+        #    If the evidentiary-state contains no evidentiary measurements, omit it.
+        if len(evid_state_dict_idx) == 0: continue
+        evid_state[state_sig] = {'STUDENT_ID': student_ids[row_members].tolist(),
+                                 'EVID_STATE': evid_state_dict_idx}
+    evid_state_conformees = pd.DataFrame(data={'EVID_STATE_SIG': evid_state_sig,
+                                               'STUDENT_ID': student_ids},
+                                         index=evid_states_to_be_grouped.index,
+                                         columns=['EVID_STATE_SIG', 'STUDENT_ID'])
+    #
+    evid_state = dict((state_sig, evid_state.get(state_sig)) for state_sig in sorted(evid_state.keys()))
     evid_state.update({'EVID_STATE_SIG': list(evid_state.keys())})
     evid_state.update({'EVID_STATE_CONFORMEES': evid_state_conformees})
     #
@@ -889,29 +944,16 @@ def groupby_evid_state(evid_states_to_be_grouped, evid_prof_conformees, evid_sta
 def query_pom_bayesnet(evid_state, pom_bayesnet, var_states, state_idx):
     #    ⑴ Keeping track of execution time is particular important at this juncture.  So we begin with
     #       our execution-time statistics.
+    #       We record the statistics in a dictionary, and append them as a single row to a result accumulator
+    #       once the query is complete.
     start_time_state_idx = tit.default_timer()
-    CLUST_EXEC_TIME_state_idx = pd.DataFrame(columns=['EVID_STATE_SIG',
-                                                      'GRAPH_ORDER',
-                                                      'EDGE_COUNT',
-                                                      'MEAS_VERT_COUNT',
-                                                      'EST_VERT_COUNT',
-                                                      'TIME_NOW',
-                                                      'ELAPSED_TIME'],
-                                             index=[state_idx])
-    CLUST_EXEC_TIME_state_idx.loc[state_idx, ['EVID_STATE_SIG',
-                                              'GRAPH_ORDER',
-                                              'EDGE_COUNT',
-                                              'MEAS_VERT_COUNT',
-                                              'EST_VERT_COUNT',
-                                              'TIME_NOW']] = [state_idx,
-                                                              pom_bayesnet.get('Pomegranate_Bayesnet').node_count(),
-                                                              pom_bayesnet.get('Pomegranate_Bayesnet').edge_count(),
-                                                              len(evid_state),
-                                                              pom_bayesnet.get(
-                                                                  'Pomegranate_Bayesnet').node_count() - len(
-                                                                  evid_state),
-                                                              str(datetime.now().time())]
-    print(CLUST_EXEC_TIME_state_idx.T.squeeze())
+    exec_time_state_idx = {'EVID_STATE_SIG': state_idx,
+                           'GRAPH_ORDER': pom_bayesnet.get('Pomegranate_Bayesnet').node_count(),
+                           'EDGE_COUNT': pom_bayesnet.get('Pomegranate_Bayesnet').edge_count(),
+                           'MEAS_VERT_COUNT': len(evid_state),
+                           'EST_VERT_COUNT': pom_bayesnet.get('Pomegranate_Bayesnet').node_count() - len(evid_state),
+                           'TIME_NOW': str(datetime.now().time())}
+    print(pd.Series(exec_time_state_idx))
     #
     #    ⑵ Now, query the Bayesian network.	  We use the Pomegranate predict_proba funciton to caluclate a set of marginalized conditional
     #       probability variables.  We apply the returned value as an argument to our locally-defined extract_bayesnet_query
@@ -920,8 +962,8 @@ def query_pom_bayesnet(evid_state, pom_bayesnet, var_states, state_idx):
     #       distinguish between measured and estimated vertices. This attribute is stored in the KNOWLEDGE_LVL_TYPE attribute.
     bayesnet_query_resp = \
     extract_bayesnet_query(pred_proba_result=pom_bayesnet.get('Pomegranate_Bayesnet').predict_proba(evid_state),
-                           graph_node_order=pom_bayesnet.get('DiGraph_Vert_Order')) \
-        [var_states.iloc[:-1]['CAT_LEVEL_IDX'].tolist()]
+                           graph_node_order=pom_bayesnet.get('DiGraph_Vert_Order'),
+                           var_states=var_states)
     #
     bayesnet_query_resp['EVID_STATE_SIG'] = state_idx
     bayesnet_query_resp['LEARNING_STANDARD_ID'] = bayesnet_query_resp.index.values.tolist()
@@ -929,9 +971,18 @@ def query_pom_bayesnet(evid_state, pom_bayesnet, var_states, state_idx):
     bayesnet_query_resp.loc[pd.isnull(bayesnet_query_resp['KNOWLEDGE_LVL_TYPE']), 'KNOWLEDGE_LVL_TYPE'] = 'ESTIMATED'
     #
     #     ⑶ Record and report the elapsed time for calcuiation of the Bayesnet Query.
-    CLUST_EXEC_TIME_state_idx.loc[state_idx, ['TIME_NOW', 'ELAPSED_TIME']] = \
-        [str(datetime.now().time()),
-         tit.default_timer() - start_time_state_idx]
+    exec_time_state_idx.update({'TIME_NOW': str(datetime.now().time()),
+                                'ELAPSED_TIME': tit.default_timer() - start_time_state_idx})
+    CLUST_EXEC_TIME_state_idx = accumulated_dataframe(accumulator=accumulate_row(
+        accumulator=result_accumulator(columns=['EVID_STATE_SIG',
+                                                'GRAPH_ORDER',
+                                                'EDGE_COUNT',
+                                                'MEAS_VERT_COUNT',
+                                                'EST_VERT_COUNT',
+                                                'TIME_NOW',
+                                                'ELAPSED_TIME']),
+        row=exec_time_state_idx,
+        index=state_idx))
     print(CLUST_EXEC_TIME_state_idx.T.squeeze())
     #
     #     ⑷ Build up and return the query result.
@@ -939,12 +990,71 @@ def query_pom_bayesnet(evid_state, pom_bayesnet, var_states, state_idx):
             'CLUSTER_EXEC_TIME': CLUST_EXEC_TIME_state_idx}
 
 
+#
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓝ QUERY THE POMEGRANATE BAYESIAN NETWORK FOR A BATCH OF EVIDENTIARY STATES.  query_pom_bayesnet builds two dataframes
+#    per evidentiary state.  Here we query the network for every evidentiary state in evid_states — a dictionary of
+#    evid_state objects keyed by EVID_STATE_SIG — writing marginal probabilities into a single preallocated
+#    (state count × vertex count) × level-count array in DiGraph_Vert_Order.  We construct the BAYESNET_QUERY_RESP and
+#    CLUSTER_EXEC_TIME dataframes once, at the end of the batch.  They have the form of those from query_pom_bayesnet.
+#    Neither has a caller in the worker, which queries the factor-array networks of NUMPY_SUM_PRODUCT_INFERENCE.  Both
+#    remain for the pomegranate engine.  BENCHMARK_QUERY_EXTRACTION.py times extract_bayesnet_query_array, on which
+#    they rely, against the former JSON extraction.
+def query_pom_bayesnet_group(evid_states, pom_bayesnet, var_states):
+    #    ⑴ Preallocate the marginal-probability array and the execution-time records.
+    graph_node_order = list(pom_bayesnet.get('DiGraph_Vert_Order'))
+    vert_count = len(graph_node_order)
+    level_labels = var_states.iloc[:-1]['CAT_LEVEL_IDX'].tolist()
+    level_idx = dict((level, col_idx) for (col_idx, level) in enumerate(level_labels))
+    state_sigs = list(evid_states.keys())
+    marg_prob_array = np.zeros((len(state_sigs) * vert_count, len(level_labels)))
+    is_measured = np.zeros(len(state_sigs) * vert_count, dtype=bool)
+    vert_pos = dict((vert_idx, vert_pos_idx) for (vert_pos_idx, vert_idx) in enumerate(graph_node_order))
+    exec_time_acc = result_accumulator(columns=['EVID_STATE_SIG',
+                                                'GRAPH_ORDER',
+                                                'EDGE_COUNT',
+                                                'MEAS_VERT_COUNT',
+                                                'EST_VERT_COUNT',
+                                                'TIME_NOW',
+                                                'ELAPSED_TIME'])
+    #
+    #    ⑵ Query the network for each evidentiary state, extracting directly into its slice of marg_prob_array.
+    for (state_pos, state_idx) in enumerate(state_sigs):
+        start_time_state_idx = tit.default_timer()
+        evid_state = evid_states.get(state_idx)
+        extract_bayesnet_query_array(
+            pred_proba_result=pom_bayesnet.get('Pomegranate_Bayesnet').predict_proba(evid_state),
+            level_idx=level_idx,
+            marg_prob_array=marg_prob_array[state_pos * vert_count:(state_pos + 1) * vert_count])
+        is_measured[[state_pos * vert_count + vert_pos.get(vert_idx) for vert_idx in evid_state.keys()]] = True
+        accumulate_row(accumulator=exec_time_acc,
+                       row={'EVID_STATE_SIG': state_idx,
+                            'GRAPH_ORDER': pom_bayesnet.get('Pomegranate_Bayesnet').node_count(),
+                            'EDGE_COUNT': pom_bayesnet.get('Pomegranate_Bayesnet').edge_count(),
+                            'MEAS_VERT_COUNT': len(evid_state),
+                            'EST_VERT_COUNT': vert_count - len(evid_state),
+                            'TIME_NOW': str(datetime.now().time()),
+                            'ELAPSED_TIME': tit.default_timer() - start_time_state_idx},
+                       index=state_idx)
+    #
+    #    ⑶ Construct the result dataframes once.
+    bayesnet_query_resp = pd.DataFrame(data=marg_prob_array,
+                                       index=graph_node_order * len(state_sigs),
+                                       columns=level_labels)
+    bayesnet_query_resp['EVID_STATE_SIG'] = np.repeat(np.array(state_sigs, dtype=object), vert_count)
+    bayesnet_query_resp['LEARNING_STANDARD_ID'] = graph_node_order * len(state_sigs)
+    bayesnet_query_resp['KNOWLEDGE_LVL_TYPE'] = np.where(is_measured, 'MEASURED', 'ESTIMATED')
+    return {'BAYESNET_QUERY_RESP': bayesnet_query_resp,
+            'CLUSTER_EXEC_TIME': accumulated_dataframe(accumulator=exec_time_acc)}
+
+
 #
 #
 #
 # |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
 # ⓞ BUILD KNOWLEDGE-STATE DATAFRAME FOR ALL VARIABLES IN A SUBGRAPH FOR ALL CONFORMEES TO AN EVIDENTIARY PROFILE.
-#    This subroutine controls the query_pom_bayesnet subroutine defined above. We require for this purpose:
+#    This subroutine controls the query_factor_bayesnet_group subroutine. We require for this purpose:
 #    ⧐ A SUBGRAPH dictionary object containing a digraph on which to base a Bayesian network;
 #    ⧐ A dataframe containing subject (aka "student") evidentiary states for variables contained within
 #      the digraph object;
@@ -957,16 +1067,28 @@ def query_pom_bayesnet(evid_state, pom_bayesnet, var_states, state_idx):
 #    ⧐ A dataframe reporting execution-time statistics for each query of the Bayesian network.
 #
 #    The subroutine performs the following activities.
-#    ⑴ Construct the Pomegranate bayesian-network dictionary object.
+#    ⑴ Compile the factor-array bayesian-network dictionary object.  We formerly built a Pomegranate Bayesian
+#       network here and queried it by loopy belief propagation.  The NUMPY_SUM_PRODUCT_INFERENCE module instead
+#       compiles the subgraph once into dense NumPy factors and selects exact or loopy message passing according
+#       to the treewidth of the subgraph.
 #    ⑵ Group subjects according to evidentiary state with respect to all of the learning targets
 #       (aka learning standards) wthin the span of the digrap.
-#    ⑶ Query the Bayesian network for each evidentiary state.
+#    ⑶ Query the Bayesian network for all evidentiary states in a single batch.
 #    ⑷ Assemble the results and return them to the next-higher hieraarchical work-unit level.
 #
-def approx_infer_group_know_state(bayesnet_digraph, wide_evid_dataframe, evid_prof_conformees, var_states, clust_idx):
-    #    ⑴ Construct the Pomegranate bayesian-network dictionary object.  This occurs from straighforard invocation
-    #       of our locally-defined build_pom_bayesnet function.  We apply our bayesnet_digraph and clust-idx
-    #       as function arguments.
+def approx_infer_group_know_state(bayesnet_digraph, wide_evid_dataframe, evid_prof_conformees, var_states, clust_idx,
+                                  cpt_list=None, inference_approach=None, softsep_groups=None, cpt_fingerprint=None,
+                                  cpt_arrays=None):
+    #    ⑴ Compile the factor-array bayesian-network dictionary object.  This occurs from straighforard invocation
+    #       of cached_factor_bayesnet.  We apply our bayesnet_digraph, cpt_list, and clust-idx as function arguments.
+    #       cpt_list defaults to the global CPT_LIST, and cpt_fingerprint and cpt_arrays to its CPT_FINGERPRINT and
+    #       CPT_ARRAYS.
+    #       Subgraphs already compiled for an earlier evidentiary profile come from the cache.  An inference_approach
+    #       chosen by route_subgraph_inference overrides the treewidth-based selection in build_factor_bayesnet.  Given
+    #       softsep_groups from route_soft_separation, we instead compile — or fetch from its own cache — the network with
+    #       those ID-root groups summed out, and query the reduced network by inference_approach.
+    if cpt_list is None:
+        (cpt_list, cpt_fingerprint, cpt_arrays) = (CPT_LIST, CPT_FINGERPRINT, CPT_ARRAYS)
     start_time_state_idx = tit.default_timer()
     #   ≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈
     #   ⛔⛔⛔⛔⛔⛔⛔⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇ DIAGNOSTIC FOR DEVELOPMENT ONLY ⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⛔⛔⛔⛔⛔⛔⛔
@@ -978,9 +1100,23 @@ def approx_infer_group_know_state(bayesnet_digraph, wide_evid_dataframe, evid_pr
     #	agraph_for_plot.draw(os.path.abspath(os.path.join(graph_plot_dir,dict_key + str(evid_prof_conformees) + '_SUSPCIOUS_GRAPH.png')))
     #   ⛔⛔⛔⛔⛔⛔⛔⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆ SHORTCUT FOR DEVELOPMENT ONLY ⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⛔⛔⛔⛔⛔⛔⛔
     #   ≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈
-    cluster_bayesnet = build_pom_bayesnet(directed_graph=bayesnet_digraph,
-                                          var_states=var_states,
-                                          bayesnet_label=clust_idx)
+    if softsep_groups:
+        cluster_bayesnet = cached_softsep_bayesnet(directed_graph=bayesnet_digraph,
+                                                   var_states=var_states,
+                                                   cpt_list=cpt_list,
+                                                   bayesnet_label=clust_idx,
+                                                   softsep_groups=softsep_groups,
+                                                   inference_approach=inference_approach,
+                                                   cpt_fingerprint=cpt_fingerprint,
+                                                   cpt_arrays=cpt_arrays)
+    else:
+        cluster_bayesnet = cached_factor_bayesnet(directed_graph=bayesnet_digraph,
+                                                  var_states=var_states,
+                                                  cpt_list=cpt_list,
+                                                  bayesnet_label=clust_idx,
+                                                  inference_approach=inference_approach,
+                                                  cpt_fingerprint=cpt_fingerprint,
+                                                  cpt_arrays=cpt_arrays)
     pom_baysenet_build_time = tit.default_timer() - start_time_state_idx
     #	plt.figure(figsize = (14,10))
     #	cluster_bayesnet.get('Pomegranate_Bayesnet').plot()
@@ -995,39 +1131,18 @@ def approx_infer_group_know_state(bayesnet_digraph, wide_evid_dataframe, evid_pr
                                             evid_prof_conformees=evid_prof_conformees,
                                             evid_state_cat_map=var_states.iloc[:-1]['CAT_LEVEL_IDX'])
     #
-    #    ⑶ Berore uerying the Bayesian network for each evidentiary state, we require dataframes into which to
-    #       collect the results.  One dataframe contains the Bayesian-network response variables. The other
-    #       stores execution-time statistics.
-    cluster_knowledge_state = pd.DataFrame(columns=['EVID_STATE_SIG', 'LEARNING_STANDARD_ID', 'KNOWLEDGE_LVL_TYPE'] + \
-                                                   list(var_states['CAT_LEVEL_IDX'])[:-1])
-    clust_exec_time = pd.DataFrame(columns=['EVID_STATE_SIG',
-                                            'GRAPH_ORDER',
-                                            'EDGE_COUNT',
-                                            'MEAS_VERT_COUNT',
-                                            'EST_VERT_COUNT',
-                                            'TIME_NOW',
-                                            'ELAPSED_TIME'])
-    #
-    #    ⑷ Now cycle through the evidentiary states. For each, invoke the locally-defined function query_pom_bayesnet.
-    #       Concatenate each of the two items onto the cluster dataframe objects.
-    for state_idx in evid_state_by_subj.get(
-            'EVID_STATE_SIG'):  # state_idx = evid_state_by_subj.get('EVID_STATE_SIG')[0]
-        print('Evidentiary state ' + str(state_idx) + ', ' + str(
-            evid_state_by_subj.get('EVID_STATE_SIG').index(state_idx) + 1) + \
-              ' of ' + str(
-            len(evid_state_by_subj.get('EVID_STATE_SIG'))) + ' evidentiary states for subgraph at time ' + \
-              str(datetime.now().time()))
-        bayesnet_query_resp = query_pom_bayesnet(evid_state=evid_state_by_subj.get(state_idx).get('EVID_STATE'),
-                                                 pom_bayesnet=cluster_bayesnet,
-                                                 var_states=var_states,
-                                                 state_idx=state_idx)
-        #
-        cluster_knowledge_state = pd.concat([cluster_knowledge_state,
-                                             bayesnet_query_resp.get('BAYESNET_QUERY_RESP')])
-        clust_exec_time = pd.concat([clust_exec_time,
-                                     bayesnet_query_resp.get('CLUSTER_EXEC_TIME')])
-    #
-    #    ⑸ Introduce STUDENT_ID attribute to  cluster_knowledge_state by joining with the
+    #    ⑶ Query the Bayesian network for all evidentiary states in one vectorized pass.  query_factor_bayesnet_group
+    #       assembles the evidentiary states into an (n_states × n_measured) evidence matrix and returns the
+    #       Bayesian-network response variables and execution-time statistics as dataframes.  Evidentiary states
+    #       seen before — in this or an earlier profile, course, or run — come from POSTERIOR_MEMO.
+    bayesnet_query_resp = query_factor_bayesnet_group(evid_state_by_subj=evid_state_by_subj,
+                                                      factor_bayesnet=cluster_bayesnet,
+                                                      var_states=var_states,
+                                                      posterior_memo=POSTERIOR_MEMO)
+    cluster_knowledge_state = bayesnet_query_resp.get('BAYESNET_QUERY_RESP')
+    clust_exec_time = bayesnet_query_resp.get('CLUSTER_EXEC_TIME')
+    #
+    #    ⑷ Introduce STUDENT_ID attribute to  cluster_knowledge_state by joining with the
     #       EVID_STATE_CONFORMEES item from evid_state_by_subj.
     cluster_knowledge_state = pd.merge(left=cluster_knowledge_state,
                                        right=evid_state_by_subj.get('EVID_STATE_CONFORMEES')) \
@@ -1036,8 +1151,9 @@ def approx_infer_group_know_state(bayesnet_digraph, wide_evid_dataframe, evid_pr
                      axis=0)
     clust_exec_time['CLUSTER'] = clust_idx
     clust_exec_time['BAYESNET_BUILD_TIME'] = pom_baysenet_build_time
+    clust_exec_time['INFERENCE_APPROACH'] = cluster_bayesnet.get('INFERENCE_APPROACH')
     #
-    #    ⑹ Package and return the results.
+    #    ⑸ Package and return the results.
     # os.system('say "Another one bites the dust!"')
     return {'BAYESNET_QUERY_RESP': cluster_knowledge_state,
             'CLUSTER_EXEC_TIME': clust_exec_time}
@@ -1066,88 +1182,143 @@ def approx_infer_group_know_state(bayesnet_digraph, wide_evid_dataframe, evid_pr
 #    ⧐ evid_prof_dict_item is a the prof_idxᵗʰ dictionary item resulting from applying the
 #      groupby_evid_profile subroutine to wide_evid_dataframe;
 #    ⧐ wide_evid_dataframe contains the the evidentiary states for all subjects (aka students)
-#      with respect to learning standards in the digraph_edge_list; and
-#    ⧐ var_states, a list of admissible variable states for all variables in the digraph.
+#      with respect to learning standards in the digraph_edge_list;
+#    ⧐ var_states, a list of admissible variable states for all variables in the digraph; and
+#    ⧐ cpt_list, the long-table conditional-probability measures from which Bayesian networks are compiled;
+#    ⧐ cpt_fingerprint, the cpt_list_fingerprint of cpt_list; and
+#    ⧐ cpt_arrays, the cpt_meas_by_count arrays of cpt_list.
 #
 #    The subroutine returns a dictionary object containing two dataframe items:
 #    ⧐ The knowledge state for all subjects with respect to variables within range of
 #      those measured as indicated by the evidentiary profile;
 #    ⧐ An aggregation of execution-time statistics for each
-def est_know_state_for_evid_prof(digraph_edge_list, evid_prof_dict_item, wide_evid_dataframe, var_states, prof_idx):
-    #    ⑴ First build the digraph for from the edge list.
-    course_nhbd_graph = nx.DiGraph()
-    course_nhbd_graph.add_nodes_from(list(set(digraph_edge_list['LEARNING_STANDARD_ID']). \
-                                          union(set(digraph_edge_list['CONSTITUENT_LEARNING_STD_ID']))))
-    course_nhbd_graph.add_edges_from(
-        tuple(digraph_edge_list[['CONSTITUENT_LEARNING_STD_ID', 'LEARNING_STANDARD_ID']].itertuples(index=False)))
+def est_know_state_for_evid_prof(digraph_edge_list, evid_prof_dict_item, wide_evid_dataframe, var_states, cpt_list,
+                                 prof_idx, cpt_fingerprint=None, cpt_arrays=None):
+    #    ⑴ First get the digraph for from the edge list.  course_nhbd_digraph builds it — and its graph index — once
+    #       per course.
+    course_nhbd = course_nhbd_digraph(digraph_edge_list=digraph_edge_list)
     #
     #    ⑵ Ascertains the evidentiary range of the course evidentiary neighborhood. We apply the build_induced_inrange_graph
-    #       to a networkx digraph object derived from digraph_edge_list.  This is the composition of radius-two ego subgraphs
-    #       centered on the variables measured in the evidentiary profile.
+    #       to a networkx digraph object derived from digraph_edge_list.  This is the induced subgraph on the vertices
+    #       within radius two of the variables measured in the evidentiary profile.
     in_range_digraph = build_induced_inrange_graph(meas_list=evid_prof_dict_item.get('LEARNING_STANDARD_ID'),
-                                                   evid_radius=2,
-                                                   course_nhbd_graph=course_nhbd_graph)
+                                                   evid_radius=EVID_RADIUS,
+                                                   course_nhbd_graph=course_nhbd.get('GRAPH'),
+                                                   graph_index=course_nhbd.get('GRAPH_INDEX'))
     #
     #    ⑶ Decompose the in_range_digraph object into subgraphs. Use the decompose_digraph to produce a dictionary
-    #       of graph objects and metadata.
+    #       of graph objects and metadata.  Each subgraph is kept within the DECOMPOSITION_CLIQUE_SIZE budget.
     evid_prof_subgraphs = decompose_digraph(composite_digraph=in_range_digraph,
                                             measured_verts=evid_prof_dict_item.get('LEARNING_STANDARD_ID'),
-                                            prof_idx=prof_idx)
+                                            prof_idx=prof_idx,
+                                            clique_budget=DECOMPOSITION_CLIQUE_SIZE,
+                                            var_card=len(var_states) - 1)
     #
     #   ≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈
     #   ⛔⛔⛔⛔⛔⛔⛔⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇ DIAGNOSTIC FOR DEVELOPMENT ONLY ⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⛔⛔⛔⛔⛔⛔⛔
     #   ⛔⛔⛔⛔⛔⛔⛔⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆ SHORTCUT FOR DEVELOPMENT ONLY ⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⛔⛔⛔⛔⛔⛔⛔
     #   ≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈
     #
-    #    ⑷ Before we loop through each subgraph applying the evidentiary states, we first need to initialize dataframes
-    #       within which we aggregate results.
-    bayesnet_query_resp = pd.DataFrame(
+    #    ⑷ Before we loop through each subgraph applying the evidentiary states, we first need to initialize the
+    #       result accumulators within which we aggregate results.
+    bayesnet_query_acc = result_accumulator(
         columns=['EVID_STATE_SIG', 'STUDENT_ID', 'LEARNING_STANDARD_ID', 'KNOWLEDGE_LVL_TYPE']
                 + var_states[:-1]['CAT_LEVEL_IDX'].tolist())
-    evid_prof_exec_time = pd.DataFrame(columns=['GRAPH_ORDER',
-                                                'EDGE_COUNT',
-                                                'MEAS_VERT_COUNT',
-                                                'EST_VERT_COUNT',
-                                                'TIME_NOW',
-                                                'ELAPSED_TIME'])
+    evid_prof_exec_time_acc = result_accumulator(columns=['GRAPH_ORDER',
+                                                          'EDGE_COUNT',
+                                                          'MEAS_VERT_COUNT',
+                                                          'EST_VERT_COUNT',
+                                                          'TIME_NOW',
+                                                          'ELAPSED_TIME'])
     subgraph_keys = list(evid_prof_subgraphs.keys())
     #
+    #       In incremental mode — onboard_update_student_know_state — the profile carries FOCUS_VERTS, the learning standards
+    #       within evidentiary range of its conformees' new measurements.  Subgraphs not touching FOCUS_VERTS cannot
+    #       contribute to the estimates we intend to rewrite, so we skip them.
+    if evid_prof_dict_item.get('FOCUS_VERTS') is not None:
+        focus_verts = set(evid_prof_dict_item.get('FOCUS_VERTS'))
+        subgraph_keys = [subgraph_idx for subgraph_idx in subgraph_keys
+                         if not focus_verts.isdisjoint(evid_prof_subgraphs.get(subgraph_idx).get('SPANNING_SUBGRAPH').nodes())]
+    #
     #   ≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈
     #   ⛔⛔⛔⛔⛔⛔⛔⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇ SHORTCUT FOR DEVELOPMENT ONLY ⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⛔⛔⛔⛔⛔⛔⛔
     #   ⛔⛔⛔⛔⛔⛔⛔⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆ SHORTCUT FOR DEVELOPMENT ONLY ⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⛔⛔⛔⛔⛔⛔⛔
     #   ≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈
     #
-    #   ⑸ Loop through the subgraphs, invoking approx_infer_group_know_state for each.
+    #   ⑸ Loop through the subgraphs, invoking approx_infer_group_know_state for each.  route_subgraph_inference
+    #      chooses for each subgraph the inference engine — and whether to star-reduce — that our cost model,
+    #      fitted to the CLUSTER_EXEC_TIME history, predicts to be cheapest for the conformees' evidentiary states.
     for subgraph_idx in subgraph_keys:  ## subgraph_idx = 'SUBGRAPH_121700'
         print('Subgraph ' + str(subgraph_idx) + ', ' + str(subgraph_keys.index(subgraph_idx) + 1) + \
               ' of ' + str(len(subgraph_keys)) + ' subgraphs in evidentiary-profile estimation range at time ' + \
               str(datetime.now().time()))
-        #      ⒜ Invoke approx_infer_group_know_state to get the knowledge-state estimates associated with subgraph_idxᵗʰ
-        #         subgraph in  evid_prof_subgraphs.  Our logic here branches depending on whether  or not the subgraph is a
-        #         star graph.
-        if evid_prof_subgraphs.get(subgraph_idx).get('IS_STAR_GRAPH'):
+        #      ⒜ Route the subgraph.  The evidentiary-state count bounds the number of distinct queries by the
+        #         number of conformees.
+        subgraph_route = route_subgraph_inference(
+            directed_graph=evid_prof_subgraphs.get(subgraph_idx).get('SPANNING_SUBGRAPH'),
+            measured_verts=evid_prof_dict_item.get('LEARNING_STANDARD_ID'),
+            state_count=len(evid_prof_dict_item.get('STUDENT_ID')),
+            var_card=len(var_states) - 1,
+            is_star_graph=evid_prof_subgraphs.get(subgraph_idx).get('IS_STAR_GRAPH'),
+            treewidth=evid_prof_subgraphs.get(subgraph_idx).get('TREEWIDTH'))
+        #         With SOFT_SEPARATION on, route_soft_separation looks for groups of unmeasured ID-root vertices and decides
+        #         whether summing them out of the subgraph beats the route chosen above.
+        softsep_route = {'SOFT_SEPARATION': False}
+        if SOFT_SEPARATION:
+            softsep_route = route_soft_separation(
+                directed_graph=evid_prof_subgraphs.get(subgraph_idx).get('SPANNING_SUBGRAPH'),
+                measured_verts=evid_prof_dict_item.get('LEARNING_STANDARD_ID'),
+                state_count=len(evid_prof_dict_item.get('STUDENT_ID')),
+                var_card=len(var_states) - 1,
+                subgraph_route=subgraph_route)
+        #
+        #      ⒝ Invoke approx_infer_group_know_state to get the knowledge-state estimates associated with subgraph_idxᵗʰ
+        #         subgraph in  evid_prof_subgraphs.  Our logic here branches depending on whether  or not the router
+        #         star-reduces or soft-separates the subgraph.  Star graphs routed to the STAR engine are queried directly.
+        if softsep_route.get('SOFT_SEPARATION'):
+            cluster_bayesnet_query = approx_infer_group_know_state(
+                bayesnet_digraph=evid_prof_subgraphs.get(subgraph_idx).get('SPANNING_SUBGRAPH'),
+                wide_evid_dataframe=wide_evid_dataframe,
+                evid_prof_conformees=evid_prof_dict_item.get('STUDENT_ID'),
+                var_states=var_states,
+                cpt_list=cpt_list,
+                clust_idx=subgraph_idx,
+                inference_approach=softsep_route.get('INFERENCE_APPROACH'),
+                softsep_groups=softsep_route.get('SOFTSEP_GROUPS'),
+                cpt_fingerprint=cpt_fingerprint,
+                cpt_arrays=cpt_arrays)
+        elif subgraph_route.get('STAR_REDUCTION'):
             cluster_bayesnet_query = query_star_graph_Bayesnet(
                 bayesnet_digraph=evid_prof_subgraphs.get(subgraph_idx).get('SPANNING_SUBGRAPH'),
                 wide_evid_dataframe=wide_evid_dataframe,
                 evid_prof_conformees=evid_prof_dict_item.get('STUDENT_ID'),
                 var_states=var_states,
-                clust_idx=subgraph_idx)
+                cpt_list=cpt_list,
+                clust_idx=subgraph_idx,
+                inference_approach=subgraph_route.get('INFERENCE_APPROACH'),
+                cpt_fingerprint=cpt_fingerprint,
+                cpt_arrays=cpt_arrays)
         else:
             cluster_bayesnet_query = approx_infer_group_know_state(
                 bayesnet_digraph=evid_prof_subgraphs.get(subgraph_idx).get('SPANNING_SUBGRAPH'),
                 wide_evid_dataframe=wide_evid_dataframe,
                 evid_prof_conformees=evid_prof_dict_item.get('STUDENT_ID'),
                 var_states=var_states,
-                clust_idx=subgraph_idx)
+                cpt_list=cpt_list,
+                clust_idx=subgraph_idx,
+                inference_approach=subgraph_route.get('INFERENCE_APPROACH'),
+                cpt_fingerprint=cpt_fingerprint,
+                cpt_arrays=cpt_arrays)
         #
-        #      ⒝ The cluster_bayesnet_query dictionary object contains two dataframe items:  BAYESNET_QUERY_RESP contains the
+        #      ⒞ The cluster_bayesnet_query dictionary object contains two dataframe items:  BAYESNET_QUERY_RESP contains the
         #         estimated knowledge state and CLUSTER_EXEC_TIME contains exection-time satistics for each Bayesian-network
-        #         query.  Extract these and concatenate onto bayesnet_query_resp and clust_exec_time, respectively.
-
-        bayesnet_query_resp = pd.concat([bayesnet_query_resp,
-                                         cluster_bayesnet_query.get('BAYESNET_QUERY_RESP')])
-        evid_prof_exec_time = pd.concat([evid_prof_exec_time,
-                                         cluster_bayesnet_query.get('CLUSTER_EXEC_TIME')])
+        #         query.  Extract these and append them to bayesnet_query_acc and evid_prof_exec_time_acc, respectively.
+        accumulate_frame(accumulator=bayesnet_query_acc,
+                         frame=cluster_bayesnet_query.get('BAYESNET_QUERY_RESP'))
+        accumulate_frame(accumulator=evid_prof_exec_time_acc,
+                         frame=cluster_bayesnet_query.get('CLUSTER_EXEC_TIME'))
+    bayesnet_query_resp = accumulated_dataframe(accumulator=bayesnet_query_acc)
+    evid_prof_exec_time = accumulated_dataframe(accumulator=evid_prof_exec_time_acc)
     #
     #    ⑹ Aggregates the results for subsequent processing.
     #       ⒜ Now, bayesnet_query_resp can contain multiple estimates for a LEARNING_STANDARD_ID × STUDENT_ID
@@ -1194,160 +1365,134 @@ def est_know_state_for_evid_prof(digraph_edge_list, evid_prof_dict_item, wide_ev
 #    ⧐ wide_evid_dataframe (EoL_WIDE, here) our comprehensive evidentiary-state
 #      wide-table-format dataframe; and
 #    ⧐ var_states is a dataframe — derived from MASTERY_LEVEL_CAT — containing the
-#      correspondance between variable-state category-level indices and labels.
+#      correspondance between variable-state category-level indices and labels; and
+#    ⧐ code_book, the identifier code book from identifier_code_book when the pipeline ran on integer-coded
+#      identifiers.  We decode STUDENT_ID and LEARNING_STANDARD_ID once the table is complete.
 #    We produce a single dataframe KNOWLEDGE_STATE as an output.
 #
+#    Columns keep their natural types throughout:  identifiers and labels are strings, dates are datetime64 — NaT
+#    where unmeasured — and DEVIATION and PREVISION are floats.  Every step is a whole-column operation; no step
+#    iterates over rows.
+#
 #    This subroutine performs the following procedure.
 #    ⑴ Concatenate all of the KNOWLEDGE_STATE items from each dictionary entry in evid_prof_dict
 #       into a single dataframe.
-#    ⑵ Calculate the entropy of the marginalized conditional probabilities and write
-#       the results into a DEVIATION.
-#    ⑶ Expand this dataframe by left-outer-joining it onto a cartesian product of all
-#       LEARNING_STANDARD_IDs, STUDENT_IDs in wide_evid_dataframe.
-#    ⑷ Conditionally fill in appropriate values for missing values resulting from
-#       the join with the cartesian product.
-#    ⑸ Rename the variable-state columns with their adjective-descriptive
-#       knowledge-state labels as opposed to the numeric ones used by
-#       the Pomegranate Bayesian network.
-#    ⑹ Return the result as a dataframe for subsequent serial operations.
+#    ⑵ Calculate the entropy and prevision of the marginalized conditional probabilities.
+#    ⑶ In one grouped pass over the body of evidence, find for each STUDENT_ID × LEARNING_STANDARD_ID the
+#       latest measurement — its date, lowest RAW_SCORE, and WORK_PRODUCT_TITLE — and join it onto the estimates.
+#    ⑷ Assign knowledge-state categories.
+#    ⑸ Expand this dataframe by left-outer-joining it onto a cartesian product of all
+#       LEARNING_STANDARD_IDs, STUDENT_IDs, and fill in values missing from the join.
+#    ⑹ Contrive a hash key, and return the result.
 def assemble_knowledge_state_table(evid_prof_dict,
                                    vert_list,
                                    digraph_edge_list,
                                    admiss_score_partitions,
-                                   analysis_case_parameters):
+                                   analysis_case_parameters,
+                                   code_book=None):
     #    ⑴ Concatenate all of the KNOWLEDGE_STATE items.  Construct a list of dictionary keys
-    #       to use as control-loop index variables.  First extract the first. Then get the rest
-    #       by looping through.
+    #       to use as control-loop index variables.  Append each profile's estimates to a result
+    #       accumulator, and materialize the concatenation once.
     evid_prof_keys = list(evid_prof_dict.keys())
-    know_state = evid_prof_dict.get(evid_prof_keys[0]).get('KNOWLEDGE_STATE_ESTIMATE')
-    for prof_idx in evid_prof_keys[1:]:
-        know_state = pd.concat([know_state,
-                                evid_prof_dict.get(prof_idx).get('KNOWLEDGE_STATE_ESTIMATE')])
+    know_state_acc = result_accumulator()
+    for prof_idx in evid_prof_keys:
+        accumulate_frame(accumulator=know_state_acc,
+                         frame=evid_prof_dict.get(prof_idx).get('KNOWLEDGE_STATE_ESTIMATE'))
+    know_state = accumulated_dataframe(accumulator=know_state_acc)
     #
-    #    ⑵ Calculate the entropy and prevision of the marginalized conditional probabilities and write into
-    #       DEVIATION column.
+    #    ⑵ Calculate the entropy and prevision of the marginalized conditional probabilities.
     #       ⒜ For convenience, create a var_state_indecies attribute from the CAT_LVL_IDX
     #          values in var_states. Exclude the final.
     var_state_indces = admiss_score_partitions['CAT_LEVEL_IDX'].tolist()[:-1]
     #
-    #       ⒝ Extract the conditional probabilities, the columns of know_state corresponding
-    #          to var_state_indces.  Add a negilible offset to the marginal-conditional probabilities
-    #          to avoid subsequent divide-by-zero warnings.  Calculate the entropy, as ussual,
-    #          as the expected logarithm of the probability. Use a logarithm of base corresponding
-    #          length of the var_state_indces list.
-    marg_cond_probs = know_state[var_state_indces].as_matrix(columns=var_state_indces) \
-                      + np.ones_like(know_state[var_state_indces].as_matrix(columns=var_state_indces)) / 10 ** 12
-    entropy = -np.sum(a=np.multiply(marg_cond_probs, np.log(marg_cond_probs)),
-                      axis=1) / np.log(len(var_state_indces))
-    #
-    #       ⒞ Assign etropy as the DEVIATION attribute of know_state.
-    know_state['KNOWLEDGE_LVL_DEVIATION'] = entropy
-    #
-    #       ⒟ Associate each record with a prevision.  Our prevision is the conditional-probability
-    #          weighted sum of the knowledge-state partition midpoints.  Construction a prevision
-    #          vector and calculate the inner product between that and the conditional probabilities.
-    prevision_vector = np.reshape(a=np.asmatrix(np.mean(a=admiss_score_partitions.iloc[0:-1][['LOW_BOUND', 'UP_BOUND']],
-                                                        axis=1)),
-                                  newshape=(len(admiss_score_partitions) - 1, 1))
-    know_state['KNOWLEDGE_LVL_PREVISION'] = know_state[
-        admiss_score_partitions.iloc[0:-1]['CAT_LEVEL_IDX'].values.tolist()] \
-        .dot(prevision_vector)
-    #
-    #    ⑶ Associate knowledge state with datestamps based on dates of evidentiary measurements and
-    #       knowledge-state estimation.
-    #       ⒜ We first associate each proficiency-target (aka "learning standard") knowledge state with
-    #          the date on which the measurement was taken. This logic resembles that in build_wide_evid_state_table.
-    #          We group our body-of-evidence long-table vert_list by STUDENT_ID, LEARNING_STANDARD_ID, retaining
-    #          the most-recent ASSESSMENT_DATE attribute. This gives us the date of evidentiary measurement
-    #          for each STUDENT_ID × LEARNING_STANDARD_ID tuple.
-    evident_meas_date = vert_list[['STUDENT_ID',
-                                   'LEARNING_STANDARD_ID',
-                                   'ASSESSMENT_DATE']].groupby(by=['STUDENT_ID',
-                                                                   'LEARNING_STANDARD_ID'],
-                                                               as_index=False)['ASSESSMENT_DATE'].max()
+    #       ⒝ Extract the conditional probabilities as a float matrix.  Add a negilible offset to avoid subsequent
+    #          divide-by-zero warnings.  The entropy is the expected logarithm of the probability, in base equal to
+    #          the number of knowledge-state categories.  It is our KNOWLEDGE_LVL_DEVIATION.
+    marg_cond_probs = know_state[var_state_indces].values.astype(float) + 1. / 10 ** 12
+    know_state['KNOWLEDGE_LVL_DEVIATION'] = -np.sum(a=marg_cond_probs * np.log(marg_cond_probs),
+                                                    axis=1) / np.log(len(var_state_indces))
+    #
+    #       ⒞ Our prevision is the conditional-probability weighted sum of the knowledge-state partition midpoints.
+    prevision_vector = admiss_score_partitions.iloc[0:-1][['LOW_BOUND', 'UP_BOUND']].values.astype(float).mean(axis=1)
+    know_state['KNOWLEDGE_LVL_PREVISION'] = know_state[var_state_indces].values.astype(float).dot(prevision_vector)
+    #
+    #    ⑶ Associate each knowledge state with its evidentiary measurement, in a single grouped pass over vert_list.
+    #       ⒜ Retain the measurements made on the most-recent ASSESSMENT_DATE for each STUDENT_ID ×
+    #          LEARNING_STANDARD_ID, and among those the lowest RAW_SCORE — that which was employed in
+    #          evaluate_group_know_state.  Ties keep all of their WORK_PRODUCT_TITLEs.
+    latest_meas = vert_list[['STUDENT_ID',
+                             'LEARNING_STANDARD_ID',
+                             'ASSESSMENT_DATE',
+                             'RAW_SCORE',
+                             'WORK_PRODUCT_TITLE']].assign(
+        ASSESSMENT_DATE=lambda x: pd.to_datetime(x['ASSESSMENT_DATE'], errors='coerce'),
+        RAW_SCORE=lambda x: pd.to_numeric(x['RAW_SCORE'], errors='coerce'))
+    meas_group = latest_meas.groupby(by=['STUDENT_ID', 'LEARNING_STANDARD_ID'])
+    latest_meas = latest_meas.loc[latest_meas['ASSESSMENT_DATE'].values ==
+                                  meas_group['ASSESSMENT_DATE'].transform('max').values]
+    latest_meas = latest_meas.loc[latest_meas['RAW_SCORE'].values ==
+                                  latest_meas.groupby(by=['STUDENT_ID', 'LEARNING_STANDARD_ID'])['RAW_SCORE']
+                                  .transform('min').values].drop_duplicates()
+    latest_meas = latest_meas.rename(columns={'ASSESSMENT_DATE': 'KNOWLEDGE_LVL_EVIDENCE_DATE'})
+    #
+    #       ⒝ The knowledge-state effectivity, KNOWLEDGE_LVL_ASOF_DATE, is the date of the most-recent of any
+    #          evidentiary measurement for each subject.
+    asof_date = meas_group['ASSESSMENT_DATE'].max().groupby(level='STUDENT_ID').max()
+    #
+    #       ⒞ Join the latest measurements and effectivity dates onto know_state.  Measured knowledge states take the
+    #          observed RAW_SCORE as their prevision.
     know_state = pd.merge(left=know_state,
-                          right=evident_meas_date.rename(columns={'ASSESSMENT_DATE': 'KNOWLEDGE_LVL_EVIDENCE_DATE'}),
+                          right=latest_meas,
+                          on=['STUDENT_ID', 'LEARNING_STANDARD_ID'],
                           how='left')
-    #
-    #        ⒝ A subsequent, similar operation yields the KNOWLEDGE_LVL_ASOF_DATE attribute. The knowledge state
-    #           effectivity is based on the date of the most-recent of any evidentiary measurements for each subject.
-    know_state_date = evident_meas_date.groupby(by=['STUDENT_ID'],
-                                                as_index=False)['ASSESSMENT_DATE'].max()
-    know_state = pd.merge(left=know_state,
-                          right=know_state_date.rename(columns={'ASSESSMENT_DATE': 'KNOWLEDGE_LVL_ASOF_DATE'}),
+    know_state['KNOWLEDGE_LVL_ASOF_DATE'] = know_state['STUDENT_ID'].map(asof_date)
+    know_state['KNOWLEDGE_LVL_PREVISION'] = know_state['RAW_SCORE'].where(cond=pd.notnull(know_state['RAW_SCORE']),
+                                                                          other=know_state['KNOWLEDGE_LVL_PREVISION'])
+    #
+    #    ⑷ Assign each knowledge state — whether measured or estimated — to a knowledge-state category, as in
+    #       numeric0_100_to_cat:  left-closed intervals between successive LOW_BOUNDs, the last closed just above the
+    #       final UP_BOUND.
+    partition_boundaries = mastery_partition_bins(admiss_score_partitions)
+    level_cats = np.array(list(admiss_score_partitions['MASTERY_LEVEL_CAT'])[:-1], dtype=object)
+    level_pos = np.searchsorted(partition_boundaries, know_state['KNOWLEDGE_LVL_PREVISION'].values, side='right') - 1
+    know_state['KNOWLEDGE_LEVEL'] = np.where((level_pos >= 0) & (level_pos < len(level_cats)),
+                                             level_cats[level_pos.clip(0, len(level_cats) - 1)],
+                                             'UNMEASURED')
+    #
+    #    ⑸ Expand this dataframe by left-outer-joining it onto a cartesian product of all STUDENT_IDs in know_state and
+    #       all LEARNING_STANDARD_IDs in the proficiency-model scope coinciding with the vertex span of the
+    #       Bayesian-network digraph.
+    proficiency_model_scope = pd.unique(np.concatenate([digraph_edge_list['LEARNING_STANDARD_ID'].values,
+                                                        digraph_edge_list['CONSTITUENT_LEARNING_STD_ID'].values]))
+    know_state = pd.merge(left=pd.MultiIndex.from_product([pd.unique(know_state['STUDENT_ID']),
+                                                           proficiency_model_scope],
+                                                          names=['STUDENT_ID', 'LEARNING_STANDARD_ID'])
+                          .to_frame(index=False),
+                          right=know_state,
                           how='left')
     #
-    #    ⑷ Replace the observed RAW_SCORE attribute from our long-table body-of-evidence vert_idx as the
-    #       KNOWLEDGE_LVL_PREVISION value for measured variables. Identify these by inner-joining
-    #       vert_list with evident_meas_date and retaining the lowest value — that which was employed in
-    #       evaluate_group_know_state. Left-outer-join the result onto know_state, and overwrite the
-    #       KNOWLEDGE_LVL_PREVISION with RAW_SCORE for instances in which the latter is non-null.
-    #       Then overwrite all RAW_SCORE values with KNOWLEDGE_LVL_PREVISION, as subsequently required by
-    #       for purposes of associating prevision values with a knowledge-state category.
-    evid_meas_raw_score = pd.merge(left=vert_list[list(evident_meas_date.columns)
-                                                  + ['RAW_SCORE']],
-                                   right=evident_meas_date).groupby(by=list(evident_meas_date.columns),
-                                                                    as_index=False)['RAW_SCORE'].min()
-    #
-    #       Join back onto vert_list to get WORK_PRODUCT_TITLE attribute.
-    evid_meas_raw_score = pd.merge(left=evid_meas_raw_score,
-                                   right=vert_list[list(evid_meas_raw_score.columns) + ['WORK_PRODUCT_TITLE']])
-    know_state = pd.merge(left=know_state,
-                          right=evid_meas_raw_score,
-                          how='left')
-    know_state.loc[pd.notnull(know_state['RAW_SCORE']), 'KNOWLEDGE_LVL_PREVISION'] \
-        = know_state.loc[pd.notnull(know_state['RAW_SCORE']), 'RAW_SCORE']
-    know_state['RAW_SCORE'] = know_state['KNOWLEDGE_LVL_PREVISION']
-    #
-    #    ⑸ Use internall-defined function numeric0_100_to_cat to assign each knowledge state —
-    #       whether measured or observed — to a knowledge-state category.
-    know_state = numeric0_100_to_cat(long_evid_dataframe=know_state,
-                                     admiss_score_partitions=admiss_score_partitions) \
-        .rename(columns={'MASTERY_LEVEL_CAT': 'KNOWLEDGE_LEVEL'})
-    #
-    #    ⑹ Expand this dataframe by left-outer-joining it onto a cartesian product of all
-    #       LEARNING_STANDARD_IDs, STUDENT_IDs in the proficiency-model scope coinciding with the
-    #       vertex span of the Bayesian-network digraph.
-    proficiency_model_scope = list(set(digraph_edge_list['LEARNING_STANDARD_ID']) \
-                                   .union(set(digraph_edge_list['CONSTITUENT_LEARNING_STD_ID'])))
-    know_state = pd.merge(right=know_state,
-                          left=pd.DataFrame(data=list(it.product(list(set(know_state['STUDENT_ID'])),
-                                                                 proficiency_model_scope)),
-                                            columns=['STUDENT_ID', 'LEARNING_STANDARD_ID']),
-                          how='left')
+    #       ⒜ Null-values of KNOWLEDGE_LEVEL become "UNMEASURED".  KNOWLEDGE_LVL_PREVISION and KNOWLEDGE_LVL_DEVIATION
+    #          become negative one and unity, respectively.  Dates, KNOWLEDGE_LVL_TYPE, and WORK_PRODUCT_TITLE stay null.
+    know_state['KNOWLEDGE_LEVEL'] = know_state['KNOWLEDGE_LEVEL'].fillna('UNMEASURED')
+    know_state['KNOWLEDGE_LVL_PREVISION'] = know_state['KNOWLEDGE_LVL_PREVISION'].fillna(-1.0)
+    know_state['KNOWLEDGE_LVL_DEVIATION'] = know_state['KNOWLEDGE_LVL_DEVIATION'].fillna(1.0)
     #
-    #    ⑺ Conditionally fill in appropriate values for missing values resulting from
-    #       the join with the cartesian product.
-    #       ⒜ Null-values of KNOWLEDGE_LEVEL become "UNMEASURED".
-    know_state.loc[pd.isnull(know_state['KNOWLEDGE_LEVEL']), 'KNOWLEDGE_LEVEL'] = 'UNMEASURED'
-    #
-    #       ⒝ KNOWLEDGE_LVL_PREVISION and KNOWLEDGE_LVL_DEVIATION become negative one and unity, respectively.
-    know_state.loc[pd.isnull(know_state['KNOWLEDGE_LVL_PREVISION']), 'KNOWLEDGE_LVL_PREVISION'] = -1.0
-    know_state.loc[pd.isnull(know_state['KNOWLEDGE_LVL_DEVIATION']), 'KNOWLEDGE_LVL_DEVIATION'] = 1.0
-    know_state = know_state.astype(str)
-    #
-    #       ⒞ A variety of other columns get populated with NULL.
-    for col_idx in ['KNOWLEDGE_LVL_EVIDENCE_DATE',
-                    'KNOWLEDGE_LVL_ASOF_DATE',
-                    'KNOWLEDGE_LVL_TYPE',
-                    'WORK_PRODUCT_TITLE']:
-        know_state.loc[pd.isnull(know_state[col_idx]), col_idx] = 'NULL'
+    #       ⒝ Decode integer-coded identifiers.  Identifiers are written as strings.
+    if code_book is not None:
+        know_state = decode_identifiers(frame=know_state,
+                                        code_book=code_book)
+    know_state['STUDENT_ID'] = know_state['STUDENT_ID'].astype(str)
+    know_state['LEARNING_STANDARD_ID'] = know_state['LEARNING_STANDARD_ID'].astype(str)
+    #
+    #       ⒞ A variety of other columns get populated with constants.
     know_state['STDNT_KNWLDG_LVL_COMMENT'] = 'NULL'
     know_state['BASED_ON_MEASUREMENT_YN'] = '1'
     know_state['TENANT_ID'] = analysis_case_parameters.loc['TENANT_ID']['VALUE']
     #
-    #    ⑻ Contrive a unique hash-key STUDENT_KNOWLEDGE_LVL_SID attribute.
-    know_state['STUDENT_KNOWLEDGE_LVL_SID'] = list(know_state.apply(lambda x: hash(tuple(x)), axis=1))
-    #
-    #    ⑼ Assign system-administration attributes.
-    know_state['LAST_UPDATE_DT'] = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
-    know_state['LAST_UPDATE_USER'] = Last_Upd_Usr
-    know_state['LAST_UPDATE_TX_ID'] = Last_Upd_Trans
-    #
-    #    ⑼ Reduce the columns to those specified in the data dictionary. Coerce all attributes to string.  Return
-    #       the final result.
-    know_state = know_state[['STUDENT_KNOWLEDGE_LVL_SID',
-                             'LEARNING_STANDARD_ID',
+    #    ⑹ Contrive a unique hash-key STUDENT_KNOWLEDGE_LVL_SID attribute.  We hash the content columns column-wise with
+    #       pd.util.hash_pandas_object.  Unlike Python's hash, the result does not vary from one process to the next.
+    #       Reinterpret the unsigned hash as a signed 64-bit integer.
+    know_state = know_state[['LEARNING_STANDARD_ID',
                              'KNOWLEDGE_LVL_ASOF_DATE',
                              'TENANT_ID',
                              'KNOWLEDGE_LEVEL',
@@ -1358,13 +1503,52 @@ def assemble_knowledge_state_table(evid_prof_dict,
                              'KNOWLEDGE_LVL_DEVIATION',
                              'KNOWLEDGE_LVL_PREVISION',
                              'STUDENT_ID',
-                             'WORK_PRODUCT_TITLE',
-                             'LAST_UPDATE_DT',
-                             'LAST_UPDATE_TX_ID',
-                             'LAST_UPDATE_USER']].drop_duplicates()
+                             'WORK_PRODUCT_TITLE']].drop_duplicates()
+    know_state.insert(loc=0,
+                      column='STUDENT_KNOWLEDGE_LVL_SID',
+                      value=pd.util.hash_pandas_object(obj=know_state, index=False).values.view(np.int64))
+    #
+    #       Assign system-administration attributes, and return the final result.
+    know_state['LAST_UPDATE_DT'] = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+    know_state['LAST_UPDATE_TX_ID'] = Last_Upd_Trans
+    know_state['LAST_UPDATE_USER'] = Last_Upd_Usr
     return know_state
 
 
+#
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓡ INITIALIZE A KNOWLEDGE-STATE WORKER PROCESS.  Parallel evaluation of evidentiary profiles fans profiles out to a
+#    multiprocessing pool.  The inputs common to every profile — the wide evidentiary-state table, the edge list,
+#    var_states, and cpt_list — are large.  We hand them to each worker process once, through this pool initializer,
+#    rather than with every profile.  SQLite connections must not cross a fork, so each worker also reopens its own
+#    connection to the tenant's posterior memo.
+def init_know_state_worker(know_state_worker_args, posterior_memo):
+    global KNOW_STATE_WORKER_ARGS
+    global POSTERIOR_MEMO
+    KNOW_STATE_WORKER_ARGS = know_state_worker_args
+    POSTERIOR_MEMO = reopen_posterior_memo(posterior_memo=posterior_memo) if posterior_memo is not None else None
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓡ ESTIMATE KNOWLEDGE STATE FOR ONE EVIDENTIARY-PROFILE WORK UNIT.  This is the function the pool maps over work
+#    units.  A work unit is a (prof_idx, evid_prof_dict_item) tuple.  We return prof_idx along with the two-item
+#    dictionary from est_know_state_for_evid_prof, so that results may be merged irrespective of completion order.
+def est_know_state_for_work_unit(work_unit):
+    (prof_idx, evid_prof_dict_item) = work_unit
+    print('Evidentiary profile ' + str(prof_idx) + ' started by process ' + str(os.getpid()) +
+          ' at time ' + str(datetime.now().time()))
+    return (prof_idx, est_know_state_for_evid_prof(digraph_edge_list=KNOW_STATE_WORKER_ARGS.get('DIGRAPH_EDGE_LIST'),
+                                                   evid_prof_dict_item=evid_prof_dict_item,
+                                                   wide_evid_dataframe=KNOW_STATE_WORKER_ARGS.get('WIDE_EVID_DATAFRAME'),
+                                                   var_states=KNOW_STATE_WORKER_ARGS.get('VAR_STATES'),
+                                                   cpt_list=KNOW_STATE_WORKER_ARGS.get('CPT_LIST'),
+                                                   prof_idx=prof_idx,
+                                                   cpt_fingerprint=KNOW_STATE_WORKER_ARGS.get('CPT_FINGERPRINT'),
+                                                   cpt_arrays=KNOW_STATE_WORKER_ARGS.get('CPT_ARRAYS')))
+
+
 #
 #
 # |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
@@ -1377,8 +1561,13 @@ def assemble_knowledge_state_table(evid_prof_dict,
 #    ⧐ wide_evid_dataframe, a wide-format dataframe for which columns corresponding to learning standards,
 #      rows correspond to learner identities, and values represent individual=learner evidentiary states
 #      for distinct learning standards;
-#    ⧐ digraph_edge_list contains a list of edges on which the Bayesian network is based; and
-#    ⧐ var_states, a variable-state-label indexed set of integer indices for the variable states.
+#    ⧐ digraph_edge_list contains a list of edges on which the Bayesian network is based;
+#    ⧐ var_states, a variable-state-label indexed set of integer indices for the variable states;
+#    ⧐ cpt_list, the long-table conditional-probability measures — CPT_LIST — passed explicitly, so that worker
+#      processes need not rely on a global variable;
+#    ⧐ process_count, the number of worker processes.  A process_count of one evaluates profiles serially; and
+#    ⧐ cpt_fingerprint and cpt_arrays, the cpt_list_fingerprint and cpt_meas_by_count arrays of cpt_list —
+#      CPT_FINGERPRINT and CPT_ARRAYS.  Those not passed we compute once here, rather than once per subgraph.
 #    The evid_prof_dict is produced by the internally defined subroutine groupby_evid_profileile.
 #
 #    The subroutine returns an update evid_prof_dict to two dataframes are added:
@@ -1390,32 +1579,74 @@ def assemble_knowledge_state_table(evid_prof_dict,
 #    The subroutine logic passes its one evididentiary-proficiency object at a time to another
 #    subroutine est_know_state_for_evid_prof.  It returns dictionary objects that are added as
 #    updates to evid_prof_dict.  The subroutine returns the updated evid_prof_dict.
-def evaluate_group_know_state(evid_prof_dict, wide_evid_dataframe, digraph_edge_list, var_states):
-    #    Begin loo;ing through the keys for evid_prof_dict, invoking est_know_state_for_evid_prof to obtain the
-    #    dictionary updates.
-    #   ≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈
-    #   ⛔⛔⛔⛔⛔⛔⛔⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇ SHORTCUT FOR DEVELOPMENT ONLY ⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⛔⛔⛔⛔⛔⛔⛔
-    #   ⛔⛔⛔⛔⛔⛔⛔⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆ SHORTCUT FOR DEVELOPMENT ONLY ⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⛔⛔⛔⛔⛔⛔⛔
-    #   ≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈
-    for key_idx in list(evid_prof_dict.keys()):  # [0:4]:				# key_idx = list(evid_prof_dict.keys())[0]
-        print('Evidentiary profile ' + str(key_idx) + ', ' + str(list(evid_prof_dict.keys()).index(key_idx) + 1) + \
-              ' of ' + str(len(evid_prof_dict)) + ' evidentiary profiles at time ' + str(datetime.now().time()))
-        #
-        #    Invoke est_know_state_for_evid_prof in order to get the two-item dictionary resulting from querying the
-        #    Bayesian network given the evidentiary states corresponding to the profile specified by the
-        #    key_idxᵗʰ member of evid_prof_dict.
-        evid_prof_update_key_idx = est_know_state_for_evid_prof(digraph_edge_list=digraph_edge_list,
-                                                                evid_prof_dict_item=evid_prof_dict.get(key_idx),
-                                                                wide_evid_dataframe=wide_evid_dataframe,
-                                                                var_states=var_states,
-                                                                prof_idx=key_idx)
-        # os.system('say "Here we go again!"')
-        #
-        #    Now update the key_idxᵗʰ element of evid_prof_dict individually with each item returned with evid_prof_update_key_idx.
-        for item_idx in list(evid_prof_update_key_idx.keys()):  ## item_idx = list(evid_prof_update_key_idx.keys())[0]
-            evid_prof_dict.get(key_idx).update({item_idx: evid_prof_update_key_idx.get(item_idx)})
-            #
-            #    Return the updated dictionary object.
+#
+#    In parallel mode, we submit profiles in decreasing order of estimated work — conformee count times measured
+#    learning-standard count — so that the longest-running profiles do not start last and leave the other worker
+#    processes idle.  We merge results back into evid_prof_dict in its own key order, so that the output does not
+#    depend on which process finishes first.
+def evaluate_group_know_state(evid_prof_dict, wide_evid_dataframe, digraph_edge_list, var_states, cpt_list,
+                              process_count=1, cpt_fingerprint=None, cpt_arrays=None):
+    #    ⑴ Order the work units, largest first.
+    if cpt_fingerprint is None:
+        cpt_fingerprint = cpt_list_fingerprint(cpt_list)
+    if cpt_arrays is None:
+        cpt_arrays = cpt_meas_by_count(cpt_list)
+    prof_keys = list(evid_prof_dict.keys())
+    work_units = sorted([(key_idx, evid_prof_dict.get(key_idx)) for key_idx in prof_keys],
+                        key=lambda work_unit: (-len(work_unit[1].get('STUDENT_ID')) *
+                                               len(work_unit[1].get('LEARNING_STANDARD_ID')),
+                                               prof_keys.index(work_unit[0])))
+    #
+    #    ⑵ Estimate knowledge states for each work unit.  Serially, we invoke est_know_state_for_evid_prof directly.
+    #       In parallel, we map est_know_state_for_work_unit over a process pool.  imap with a chunksize of one
+    #       dispatches work units in our largest-first order.
+    evid_prof_updates = dict()
+    if process_count <= 1 or len(work_units) <= 1:
+        for (key_idx, evid_prof_dict_item) in work_units:
+            print('Evidentiary profile ' + str(key_idx) + ', ' + str(len(evid_prof_updates) + 1) + \
+                  ' of ' + str(len(evid_prof_dict)) + ' evidentiary profiles at time ' + str(datetime.now().time()))
+            evid_prof_updates[key_idx] = est_know_state_for_evid_prof(digraph_edge_list=digraph_edge_list,
+                                                                      evid_prof_dict_item=evid_prof_dict_item,
+                                                                      wide_evid_dataframe=wide_evid_dataframe,
+                                                                      var_states=var_states,
+                                                                      cpt_list=cpt_list,
+                                                                      prof_idx=key_idx,
+                                                                      cpt_fingerprint=cpt_fingerprint,
+                                                                      cpt_arrays=cpt_arrays)
+    else:
+        know_state_pool = multiprocessing.Pool(processes=min(process_count, len(work_units)),
+                                               initializer=init_know_state_worker,
+                                               initargs=({'DIGRAPH_EDGE_LIST': digraph_edge_list,
+                                                          'WIDE_EVID_DATAFRAME': wide_evid_dataframe,
+                                                          'VAR_STATES': var_states,
+                                                          'CPT_LIST': cpt_list,
+                                                          'CPT_FINGERPRINT': cpt_fingerprint,
+                                                          'CPT_ARRAYS': cpt_arrays},
+                                                         posterior_memo_spec(posterior_memo=POSTERIOR_MEMO)))
+        try:
+            for (key_idx, evid_prof_update_key_idx) in know_state_pool.imap(est_know_state_for_work_unit,
+                                                                            work_units,
+                                                                            chunksize=1):
+                print('Evidentiary profile ' + str(key_idx) + ', ' + str(len(evid_prof_updates) + 1) + \
+                      ' of ' + str(len(evid_prof_dict)) + ' evidentiary profiles completed at time ' +
+                      str(datetime.now().time()))
+                evid_prof_updates[key_idx] = evid_prof_update_key_idx
+        finally:
+            know_state_pool.close()
+            know_state_pool.join()
+    #
+    #    ⑶ Now update each element of evid_prof_dict, in key order, individually with each item returned for it.
+    for key_idx in prof_keys:
+        for item_idx in list(evid_prof_updates.get(key_idx).keys()):
+            evid_prof_dict.get(key_idx).update({item_idx: evid_prof_updates.get(key_idx).get(item_idx)})
+    #
+    #    Report the compiled-network cache, decomposition-memo, and posterior-memo statistics.  Return the updated
+    #    dictionary object.  In parallel mode these reflect only this process; each worker process keeps its own cache.
+    print('Compiled-network cache ' + str(factor_bayesnet_cache_stats()) + ' at time ' + str(datetime.now().time()))
+    print('Decomposition memo ' + str(decomposition_memo_stats()) + ' at time ' + str(datetime.now().time()))
+    print('Soft-separated-network cache ' + str(softsep_bayesnet_cache_stats()) + ' at time ' + str(datetime.now().time()))
+    if POSTERIOR_MEMO is not None:
+        print('Posterior memo ' + str(posterior_memo_stats(POSTERIOR_MEMO)) + ' at time ' + str(datetime.now().time()))
     return evid_prof_dict
 
 
@@ -1436,19 +1667,15 @@ def assemble_exec_time_states(evid_prof_dict):
     #    signature hash keys EVID_PROFILE.
     dict_keys = list(evid_prof_dict.keys())
     #
-    #    Get the first cluster-execution time table. Add to it the EVID_PROF_SIG object.
-    clust_exec_time = evid_prof_dict.get(dict_keys[0]).get('CLUSTER_EXEC_TIME')
-    clust_exec_time['PROF_IDX'] = dict_keys[0]
-    #
-    #    Now repeat this for each remaining item, concatenating onto clust_exec_time.
-    for key_idx in dict_keys[1:]:
-        clust_exec_key_idx = evid_prof_dict.get(key_idx).get('CLUSTER_EXEC_TIME')
-        clust_exec_key_idx['PROF_IDX'] = key_idx
-        clust_exec_time = pd.concat([clust_exec_time,
-                                     clust_exec_key_idx])
+    #    Append each cluster-execution time table, with its PROF_IDX, to a result accumulator.
+    clust_exec_time_acc = result_accumulator()
+    for key_idx in dict_keys:
+        accumulate_frame(accumulator=clust_exec_time_acc,
+                         frame=evid_prof_dict.get(key_idx).get('CLUSTER_EXEC_TIME'),
+                         const_columns={'PROF_IDX': key_idx})
     #
     #    Return the result.
-    return clust_exec_time
+    return accumulated_dataframe(accumulator=clust_exec_time_acc)
 
 
 #
@@ -1469,8 +1696,7 @@ def assemble_exec_time_states(evid_prof_dict):
 def numeric0_100_to_cat(long_evid_dataframe, admiss_score_partitions):
     #    ⑴ Begin by extracting from admiss_score_partitions the partino boundaries by which our knowledge-state
     #       categories are specified.
-    partion_boundaries = list(admiss_score_partitions['LOW_BOUND'])[0:-1] + \
-                         [admiss_score_partitions['UP_BOUND'][-2] + 1. / 10 ** 12]
+    partion_boundaries = mastery_partition_bins(admiss_score_partitions).tolist()
     #
     #    ⑵ Associate each value of the RAW_SCORE attribute with partions based it position with respect to the
     #       partiion boundaries. First, ensure that RAW_SCORE is numeric.
@@ -1501,6 +1727,114 @@ def numeric0_100_to_cat(long_evid_dataframe, admiss_score_partitions):
     return long_evid_dataframe
 
 
+#
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓤ STREAM THE LONG EVIDENCE OF LEARNING TABLE INTO A COMPACT EVIDENTIARY-STATE MATRIX.  build_wide_evid_state_table
+#    formerly joined the body of evidence onto the cartesian product of all enrollees and all learning standards, and
+#    pivoted the result into a table of strings.  On district-wide onboarding that is tens of millions of cells.  We
+#    instead read the body of evidence in chunks and keep, in a dictionary keyed by subject × learning-target pair, the
+#    single measurement that build_wide_evid_state_table would retain — the most-recent, and among those the weakest.
+#    Our working memory therefore scales with the number of measurements, not with enrollees × learning standards.
+#
+#    Our inputs are those of build_wide_evid_state_table, except that vert_list may be either a dataframe or an
+#    iterable of dataframe chunks — pd.read_csv with a chunksize, for instance.  A dataframe is read in chunks of
+#    chunk_rows rows.
+#
+#    We return a dictionary containing:
+#    ⧐ EVID_CODES, an int8 (subject × learning-target) matrix.  Measured cells hold the position within
+#      admiss_score_partitions of the measurement's knowledge-level category.  Others hold EVID_UNMEASURED_CODE;
+#    ⧐ STUDENT_ID and LEARNING_STANDARD_ID, arrays of the sorted row and column labels of EVID_CODES;
+#    ⧐ MASTERY_LEVEL_CAT, the knowledge-level categories corresponding to the codes; and
+#    ⧐ MEAS_COUNT, the number of subject × learning-target pairs measured.
+#
+#    The logic follows that of build_wide_evid_state_table.
+#    ⑴ Index the subjects of interest and the learning targets within the proficiency model.
+#    ⑵ Read the body of evidence chunk by chunk.
+#       ⒜ Retain only in-scope subjects and learning targets, identified by their row and column positions.
+#       ⒝ Reduce the chunk to one measurement per pair — most-recent date, then least integer raw score, then first
+#          occurrence — by a stable sort.
+#       ⒞ Merge the chunk's measurements into the dictionary, replacing a stored measurement only if the chunk's
+#          is more recent, or equally recent and weaker.
+#    ⑶ Map each retained RAW_SCORE to a knowledge-level category using the partitions of numeric0_100_to_cat, and
+#       write the codes into the matrix.
+def stream_wide_evid_state(vert_list, digraph_edge_list, enrollees, admiss_score_partitions,
+                           chunk_rows=EVID_STREAM_CHUNK_ROWS):
+    #    ⑴ Index the subjects of interest and the learning targets within the proficiency model.
+    student_ids = pd.Index(sorted(set(enrollees['STUDENT_ID'])))
+    learning_stds = pd.Index(sorted(set(digraph_edge_list['LEARNING_STANDARD_ID']) \
+                                    .union(set(digraph_edge_list['CONSTITUENT_LEARNING_STD_ID']))))
+    #
+    #    ⑵ Read the body of evidence chunk by chunk.  The dictionary latest_meas is keyed by the flat matrix position
+    #       of each pair.  Its values are (ASSESSMENT_DATE, integer RAW_SCORE, RAW_SCORE) tuples.
+    vert_chunks = vert_list
+    if isinstance(vert_list, pd.DataFrame):
+        vert_chunks = (vert_list.iloc[chunk_start:chunk_start + chunk_rows]
+                       for chunk_start in range(0, len(vert_list), chunk_rows))
+    latest_meas = dict()
+    for vert_chunk in vert_chunks:
+        #    ⒜ Retain only in-scope subjects and learning targets.
+        student_pos = student_ids.get_indexer(vert_chunk['STUDENT_ID'])
+        std_pos = learning_stds.get_indexer(vert_chunk['LEARNING_STANDARD_ID'])
+        in_scope = (student_pos >= 0) & (std_pos >= 0)
+        if not in_scope.any(): continue
+        raw_score = vert_chunk['RAW_SCORE'].values[in_scope].astype(float)
+        chunk_meas = pd.DataFrame(data={'PAIR_POS': student_pos[in_scope].astype(np.int64) * len(learning_stds) +
+                                                    std_pos[in_scope],
+                                        'ASSESSMENT_DATE': pd.to_datetime(arg=vert_chunk['ASSESSMENT_DATE'].values[in_scope],
+                                                                          infer_datetime_format=True).values \
+                                            .astype('datetime64[ns]').astype(np.int64),
+                                        'RAW_SCORE_int': raw_score.astype(int),
+                                        'RAW_SCORE': raw_score})
+        #
+        #    ⒝ Reduce the chunk to one measurement per pair.
+        chunk_meas = chunk_meas.sort_values(by=['PAIR_POS', 'ASSESSMENT_DATE', 'RAW_SCORE_int'],
+                                            ascending=[True, False, True],
+                                            kind='mergesort').drop_duplicates(subset=['PAIR_POS'],
+                                                                              keep='first')
+        #
+        #    ⒞ Merge the chunk's measurements into the dictionary.
+        for (pair_pos, meas_date, meas_score_int, meas_score) in chunk_meas.itertuples(index=False):
+            stored_meas = latest_meas.get(pair_pos)
+            if (stored_meas is None) or (meas_date > stored_meas[0]) or \
+                    ((meas_date == stored_meas[0]) and (meas_score_int < stored_meas[1])):
+                latest_meas[pair_pos] = (meas_date, meas_score_int, meas_score)
+    #
+    #    ⑶ Map each retained RAW_SCORE to a knowledge-level category.  Partition boundaries are those of
+    #       numeric0_100_to_cat:  left-closed intervals between successive LOW_BOUNDs, the last closed just above the
+    #       final UP_BOUND.  Scores outside all partitions remain UNMEASURED.
+    partition_boundaries = mastery_partition_bins(admiss_score_partitions)
+    evid_codes = np.full(shape=(len(student_ids), len(learning_stds)),
+                         fill_value=EVID_UNMEASURED_CODE,
+                         dtype=np.int8)
+    pair_pos = np.fromiter(latest_meas.keys(), dtype=np.int64, count=len(latest_meas))
+    meas_score = np.fromiter((stored_meas[2] for stored_meas in latest_meas.values()), dtype=float,
+                             count=len(latest_meas))
+    level_pos = np.searchsorted(partition_boundaries, meas_score, side='right') - 1
+    in_partition = (level_pos >= 0) & (level_pos < len(partition_boundaries) - 1)
+    evid_codes.ravel()[pair_pos[in_partition]] = level_pos[in_partition]
+    return {'EVID_CODES': evid_codes,
+            'STUDENT_ID': np.array(student_ids.tolist(), dtype=object),
+            'LEARNING_STANDARD_ID': np.array(learning_stds.tolist(), dtype=object),
+            'MASTERY_LEVEL_CAT': list(admiss_score_partitions['MASTERY_LEVEL_CAT'])[:-1],
+            'MEAS_COUNT': len(latest_meas)}
+
+
+#
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓤ WIDE-FORMAT VIEW OF A COMPACT EVIDENTIARY-STATE MATRIX.  Callers that still need the wide dataframe of
+#    knowledge-level category names get it here, on demand, from the dictionary returned by stream_wide_evid_state.
+#    Its rows are indexed by STUDENT_ID, its columns by LEARNING_STANDARD_ID, and unmeasured cells hold "UNMEASURED".
+#    Every cell refers to one of a handful of shared category strings.
+def wide_evid_state_dataframe(wide_evid_state):
+    cat_names = np.array(wide_evid_state.get('MASTERY_LEVEL_CAT') + ['UNMEASURED'], dtype=object)
+    evid_codes = wide_evid_state.get('EVID_CODES')
+    return pd.DataFrame(data=cat_names[np.where(evid_codes == EVID_UNMEASURED_CODE, len(cat_names) - 1, evid_codes)],
+                        index=pd.Index(wide_evid_state.get('STUDENT_ID'), name='STUDENT_ID'),
+                        columns=pd.Index(wide_evid_state.get('LEARNING_STANDARD_ID'), name='LEARNING_STANDARD_ID'))
+
+
 #
 #
 # |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
@@ -1530,80 +1864,15 @@ def numeric0_100_to_cat(long_evid_dataframe, admiss_score_partitions):
 #    ⧐ admiss_score_partitions contains the partitions into categories into which our
 #      measurement domain is decomposed.
 #
-#    The logic herein follows the following major steps.
-#    ⑴ "Filter" our body of evidence, retaining only the subjects and evidentiary-targets within
-#       the scope of interest.  We limit our subjects to those contained in enrollees and our
-#       measurement targets to the vertices in digraph_edge_list.
-#    ⑵ Further "prune" our body of evidence so that we have a single evidentiary measurement
-#       for each subject × learning-target tuple.  When duplicates occur, we retain the
-#       most-recent, weakest measurements.
-#    ⑶ Map each measurement to a knowledge-state category based the RAW_SCORE's locations
-#       with respect to the partitions.
-#    ⑷ Expand the long-table so that a distinct record each for each subject × proficiency-target
-#       pair.  Assign "UNMEASURED" resulting null-valued proficiency-state-category attributes.
-#    ⑸ Reshape the long table into a wide table, which is returned as a dataframe.
+#    We formerly filtered, pruned, and categorized the long table, joined it onto the cartesian product of
+#    enrollees and learning targets, and pivoted.  We now stream the long table into a compact evidentiary-state
+#    matrix using stream_wide_evid_state, and return its wide-format view from wide_evid_state_dataframe.  The
+#    dataframe has the same rows, columns, and values as before.
 def build_wide_evid_state_table(vert_list, digraph_edge_list, enrollees, admiss_score_partitions):
-    #    ⑴ "Filter" our body of evidence, retaining only the subjects and evidentiary-targets within
-    #       the scope of interest.  Accomplish this throught two inner-join operations.
-    prof_model_scope = pd.DataFrame(data=list(set(digraph_edge_list['LEARNING_STANDARD_ID']) \
-                                              .union(set(set(digraph_edge_list['CONSTITUENT_LEARNING_STD_ID'])))),
-                                    columns=['LEARNING_STANDARD_ID'])
-    vert_list = pd.merge(left=pd.merge(left=vert_list,
-                                       right=enrollees),
-                         right=prof_model_scope)
-    #
-    #    ⑵ Further "prune" our body of evidence so that we have a single evidentiary measurement
-    #       for each subject × learning-target tuple.
-    #       ⒜  Group measurement dates — ASSESSMENT_DATE — by subject, proficiency-measurement target, retaining
-    #           only the most-recent.  Inner-join our body of evidence vert_list by this grouping, in order to
-    #           reduce the data set.
-    vert_list['ASSESSMENT_DATE'] = pd.to_datetime(arg=vert_list['ASSESSMENT_DATE'],
-                                                  infer_datetime_format=True)
-    vert_list = pd.merge(left=vert_list,
-                         right=vert_list[['STUDENT_ID',
-                                          'LEARNING_STANDARD_ID',
-                                          'ASSESSMENT_DATE']].groupby(by=['STUDENT_ID',
-                                                                          'LEARNING_STANDARD_ID'],
-                                                                      axis=0,
-                                                                      as_index=False)['ASSESSMENT_DATE'].max())
-    #
-    #       ⒝  Perform a similar group-by operation, this time retaining the minimum raw score.  Drop duplicates upon
-    #           complietion.
-    vert_list['RAW_SCORE_int'] = vert_list['RAW_SCORE'].astype(float).astype(int)
-    vert_list = pd.merge(left=vert_list,
-                         right=vert_list[['STUDENT_ID',
-                                          'LEARNING_STANDARD_ID',
-                                          'RAW_SCORE_int']].groupby(by=['STUDENT_ID',
-                                                                        'LEARNING_STANDARD_ID'],
-                                                                    axis=0,
-                                                                    as_index=False)['RAW_SCORE_int'].min())
-    vert_list = vert_list.drop_duplicates(subset=['STUDENT_ID', 'LEARNING_STANDARD_ID'],
-                                          keep='first')
-    #
-    #    ⑶ Map each measurement to a knowledge-state category based the RAW_SCORE's locations
-    #       with respect to the partitions. We use here internall-defined function numeric0_100_to_cat.
-    vert_list = numeric0_100_to_cat(long_evid_dataframe=vert_list,
-                                    admiss_score_partitions=admiss_score_partitions)
-    #
-    #    ⑷ Expand the long-table so that a distinct record each for each subject × proficiency-target
-    #       pair.  Assign "UNMEASURED" resulting null-valued proficiency-state-category attributes.  Use
-    #       itertools.product to construct a cartesion product of STUDENT_ID from enrollees and
-    #       LEARNING_STANDARD_IDs from vert_list, onto which we join vert_list.
-    vert_list = pd.merge(left=pd.DataFrame(data=list(it.product(list(set(prof_model_scope['LEARNING_STANDARD_ID'])),
-                                                                list(set(enrollees['STUDENT_ID'])))),
-                                           columns=['LEARNING_STANDARD_ID', 'STUDENT_ID']),
-                         right=vert_list,
-                         how='left')
-    vert_list.loc[pd.isnull(vert_list['MASTERY_LEVEL_CAT']), 'MASTERY_LEVEL_CAT'] = 'UNMEASURED'
-    #
-    #    ⑸ Reshape the long table into a wide table of exhaustive evidentiary states for each subject. This dataframe
-    #       represents our returned value.
-    group_evid_state = vert_list[['STUDENT_ID',
-                                  'LEARNING_STANDARD_ID',
-                                  'MASTERY_LEVEL_CAT']].pivot(index='STUDENT_ID',
-                                                              columns='LEARNING_STANDARD_ID',
-                                                              values='MASTERY_LEVEL_CAT')
-    return group_evid_state
+    return wide_evid_state_dataframe(wide_evid_state=stream_wide_evid_state(vert_list=vert_list,
+                                                                            digraph_edge_list=digraph_edge_list,
+                                                                            enrollees=enrollees,
+                                                                            admiss_score_partitions=admiss_score_partitions))
 
 
 #
@@ -1641,9 +1910,13 @@ def acquire_local_group_analysis_data(directory_path):
                                   dtype=str)[['LEARNING_STANDARD_ID',
                                               'CONSTITUENT_LEARNING_STD_ID']]
     global CPT_LIST
+    global CPT_FINGERPRINT
+    global CPT_ARRAYS
     CPT_LIST = pd.read_csv(filepath_or_buffer=os.path.abspath(os.path.join(if_tab_dir, 'CPT_LONG.csv')),
                            dtype=str)
     CPT_LIST['MEAS'] = CPT_LIST['MEAS'].astype(float)
+    CPT_FINGERPRINT = cpt_list_fingerprint(CPT_LIST)
+    CPT_ARRAYS = cpt_meas_by_count(CPT_LIST)
     #
     #       ⒝ COURSE_ENROLL is a master table. We want to reduce it, retaining only records for our
     #          TENANT_ID, COURSE_ID, specifying our coherent subject group.
@@ -1678,6 +1951,13 @@ def acquire_local_group_analysis_data(directory_path):
     MASTERY_LEVEL_CAT.columns = ["MASTERY_LEVEL_CAT", "LOW_BOUND", "UP_BOUND"]
     MASTERY_LEVEL_CAT['CAT_LEVEL_IDX'] = range(len(MASTERY_LEVEL_CAT))
     #
+    #          Open the tenant's posterior memo.  It discards the tenant's remembered posteriors if CPT_LONG or
+    #          MASTERY_COLOR_LIST differ from those from which they were computed.  Designate POSTERIOR_MEMO as global.
+    global POSTERIOR_MEMO
+    POSTERIOR_MEMO = open_posterior_memo(tenant_id=analysis_case_parameters['VALUE']['TENANT_ID'],
+                                         ref_fingerprints={'CPT_LONG': CPT_FINGERPRINT,
+                                                           'MASTERY_COLOR_LIST': var_states_fingerprint(MASTERY_LEVEL_CAT)})
+    #
     #       ⒟ VERTEX_LIST, our body-of-evidence table is a master table. We must "filter" it so as to only contain
     #          the records of interest. These are distinguished by the TENANT_ID attribute, and by a LEARNING_STANDARDS
     #          within the scope of the profiiency model specified by COURSE_MAP_EDGE.
@@ -1728,13 +2008,26 @@ def execute_group_know_state_job(directory_path):
     #    (aka students) and learning-standard targets within the proficiency-model state represented
     #    by COURSE_MAP_EDGE, by which the Bayesian-network directed-acyclic graph is defined.
     #    These body-of-evidence structure-discovery operations are accomplished by locally-defined
-    #    subroutines build_wide_evid_state_table and groupby_evid_profile, respectively.
+    #    subroutines build_wide_evid_state_table and groupby_evid_profile, respectively.  The pipeline runs on integer-
+    #    coded identifiers, interned once here and decoded by assemble_knowledge_state_table.
+    CODE_BOOK = identifier_code_book(vert_list=pd.concat([VERTEX_LIST[['STUDENT_ID', 'LEARNING_STANDARD_ID']],
+                                                          COURSE_ENROLL[['STUDENT_ID']]]),
+                                     digraph_edge_list=COURSE_MAP_EDGE)
+    VERTEX_LIST = encode_identifiers(frame=VERTEX_LIST,
+                                     code_book=CODE_BOOK)
+    COURSE_ENROLL = encode_identifiers(frame=COURSE_ENROLL,
+                                       code_book=CODE_BOOK)
+    COURSE_MAP_EDGE = encode_identifiers(frame=COURSE_MAP_EDGE,
+                                         code_book=CODE_BOOK)
     GROUP_EVID_STATE = build_wide_evid_state_table(vert_list=VERTEX_LIST,
                                                    digraph_edge_list=COURSE_MAP_EDGE,
                                                    enrollees=COURSE_ENROLL,
                                                    admiss_score_partitions=MASTERY_LEVEL_CAT)
     GROUP_EVID_PROFILE = groupby_evid_profile(wide_evid_dataframe=GROUP_EVID_STATE)
     #
+    #    Fit the inference router's cost model to CLUSTER_EXEC_TIME files from earlier runs of this analysis case.
+    fit_inference_cost_model_from_dir(directory_path=directory_path)
+    #
     # ⑶ The group knowledge-state estimates result from the structure of the group evidentiary state.
     #    Locally-defined function evaluate_group_know_state orchestrates:
     #    ⧐ Decomposition of the directed-acyclic graph representing our proficiency model into
@@ -1755,7 +2048,11 @@ def execute_group_know_state_job(directory_path):
     GROUP_EVID_PROFILE = evaluate_group_know_state(evid_prof_dict=GROUP_EVID_PROFILE,
                                                    wide_evid_dataframe=GROUP_EVID_STATE,
                                                    digraph_edge_list=COURSE_MAP_EDGE,
-                                                   var_states=MASTERY_LEVEL_CAT)
+                                                   var_states=MASTERY_LEVEL_CAT,
+                                                   cpt_list=CPT_LIST,
+                                                   process_count=KNOW_STATE_PROCESS_COUNT,
+                                                   cpt_fingerprint=CPT_FINGERPRINT,
+                                                   cpt_arrays=CPT_ARRAYS)
     #
     # ⑷ Construct and return a dictionary comprised of the aggregated, concatenated dataframes KNOWLEDGE_STATE_ESTIMATE
     #    and CLUSTER_EXEC_TIME returned by evaluate_group_know_state.
@@ -1763,34 +2060,43 @@ def execute_group_know_state_job(directory_path):
                                                                        vert_list=VERTEX_LIST,
                                                                        digraph_edge_list=COURSE_MAP_EDGE,
                                                                        admiss_score_partitions=MASTERY_LEVEL_CAT,
-                                                                       analysis_case_parameters=SESSION_ATTRIBUTES),
+                                                                       analysis_case_parameters=SESSION_ATTRIBUTES,
+                                                                       code_book=CODE_BOOK),
             'CLUSTER_EXEC_TIME': assemble_exec_time_states(evid_prof_dict=GROUP_EVID_PROFILE)}
 
 
 #
 # |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
 # ⓨ CALCULATE KNOWLEDGE STATE FOR  SINGLE EVIDENTIARY STATE.
-def evaluate_single_evid_state(vert_list, digraph_edge_list, var_states, analysis_case_parameters):
-    wide_evid_dataframe = build_wide_evid_state_table(vert_list=vert_list.rename(columns=
-                                                                                 {'SIH_PERSONPK_ID_ST': 'STUDENT_ID',
-                                                                                  'EVIDENCE_OF_LEARNING_SID': 'WORK_PRODUCT_TITLE'}),
+def evaluate_single_evid_state(vert_list, digraph_edge_list, var_states, analysis_case_parameters, standard_codes=None):
+    vert_list = vert_list.rename(columns={'SIH_PERSONPK_ID_ST': 'STUDENT_ID',
+                                          'EVIDENCE_OF_LEARNING_SID': 'WORK_PRODUCT_TITLE'})
+    code_book = identifier_code_book(vert_list=vert_list,
+                                     digraph_edge_list=digraph_edge_list,
+                                     standard_codes=standard_codes)
+    vert_list = encode_identifiers(frame=vert_list,
+                                   code_book=code_book)
+    digraph_edge_list = encode_identifiers(frame=digraph_edge_list,
+                                           code_book=code_book)
+    wide_evid_dataframe = build_wide_evid_state_table(vert_list=vert_list,
                                                       digraph_edge_list=digraph_edge_list,
-                                                      enrollees=vert_list[['SIH_PERSONPK_ID_ST']] \
-                                                      .drop_duplicates().rename(columns={'SIH_PERSONPK_ID_ST':
-                                                                                             'STUDENT_ID'}),
+                                                      enrollees=vert_list[['STUDENT_ID']].drop_duplicates(),
                                                       admiss_score_partitions=var_states)
     group_evid_prof = groupby_evid_profile(wide_evid_dataframe=wide_evid_dataframe)
     group_evid_prof = evaluate_group_know_state(evid_prof_dict=group_evid_prof,
                                                 wide_evid_dataframe=wide_evid_dataframe,
                                                 digraph_edge_list=digraph_edge_list,
-                                                var_states=var_states)
+                                                var_states=var_states,
+                                                cpt_list=CPT_LIST,
+                                                process_count=KNOW_STATE_PROCESS_COUNT,
+                                                cpt_fingerprint=CPT_FINGERPRINT,
+                                                cpt_arrays=CPT_ARRAYS)
     know_state_estimate = assemble_knowledge_state_table(evid_prof_dict=group_evid_prof,
-                                                         vert_list=vert_list.rename(columns=
-                                                                                    {'SIH_PERSONPK_ID_ST': 'STUDENT_ID',
-                                                                                     'EVIDENCE_OF_LEARNING_SID': 'WORK_PRODUCT_TITLE'}),
+                                                         vert_list=vert_list,
                                                          digraph_edge_list=digraph_edge_list,
                                                          admiss_score_partitions=var_states,
-                                                         analysis_case_parameters=analysis_case_parameters).rename(
+                                                         analysis_case_parameters=analysis_case_parameters,
+                                                         code_book=code_book).rename(
         columns=
         {'STUDENT_ID': 'SIH_PERSONPK_ID_ST',
          'WORK_PRODUCT_TITLE': 'EVIDENCE_OF_LEARNING_SID'})
@@ -1799,27 +2105,38 @@ def evaluate_single_evid_state(vert_list, digraph_edge_list, var_states, analysi
 
 
 #
-def onboard_initialize_student_know_state(vert_list, digraph_edge_list, var_states, analysis_case_parameters):
-    wide_evid_dataframe = build_wide_evid_state_table(vert_list=vert_list.rename(columns=
-                                                                                 {'SIH_PERSONPK_ID_ST': 'STUDENT_ID',
-                                                                                  'EVIDENCE_OF_LEARNING_SID': 'WORK_PRODUCT_TITLE'}),
+#    standard_codes, the tenant's STANDARD_CODES from the reference cache, gives each learning standard the same code in
+#    every course, so that the compiled-network cache and the posterior memo are shared across courses and runs.
+def onboard_initialize_student_know_state(vert_list, digraph_edge_list, var_states, analysis_case_parameters,
+                                          standard_codes=None):
+    vert_list = vert_list.rename(columns={'SIH_PERSONPK_ID_ST': 'STUDENT_ID',
+                                          'EVIDENCE_OF_LEARNING_SID': 'WORK_PRODUCT_TITLE'})
+    code_book = identifier_code_book(vert_list=vert_list,
+                                     digraph_edge_list=digraph_edge_list,
+                                     standard_codes=standard_codes)
+    vert_list = encode_identifiers(frame=vert_list,
+                                   code_book=code_book)
+    digraph_edge_list = encode_identifiers(frame=digraph_edge_list,
+                                           code_book=code_book)
+    wide_evid_dataframe = build_wide_evid_state_table(vert_list=vert_list,
                                                       digraph_edge_list=digraph_edge_list,
-                                                      enrollees=vert_list[['SIH_PERSONPK_ID_ST']] \
-                                                      .drop_duplicates().rename(columns={'SIH_PERSONPK_ID_ST':
-                                                                                             'STUDENT_ID'}),
+                                                      enrollees=vert_list[['STUDENT_ID']].drop_duplicates(),
                                                       admiss_score_partitions=var_states)
     group_evid_prof = groupby_evid_profile(wide_evid_dataframe=wide_evid_dataframe)
     group_evid_prof = evaluate_group_know_state(evid_prof_dict=group_evid_prof,
                                                 wide_evid_dataframe=wide_evid_dataframe,
                                                 digraph_edge_list=digraph_edge_list,
-                                                var_states=var_states)
+                                                var_states=var_states,
+                                                cpt_list=CPT_LIST,
+                                                process_count=KNOW_STATE_PROCESS_COUNT,
+                                                cpt_fingerprint=CPT_FINGERPRINT,
+                                                cpt_arrays=CPT_ARRAYS)
     know_state_estimate = assemble_knowledge_state_table(evid_prof_dict=group_evid_prof,
-                                                         vert_list=vert_list.rename(columns=
-                                                                                    {'SIH_PERSONPK_ID_ST': 'STUDENT_ID',
-                                                                                     'EVIDENCE_OF_LEARNING_SID': 'WORK_PRODUCT_TITLE'}),
+                                                         vert_list=vert_list,
                                                          digraph_edge_list=digraph_edge_list,
                                                          admiss_score_partitions=var_states,
-                                                         analysis_case_parameters=analysis_case_parameters).rename(
+                                                         analysis_case_parameters=analysis_case_parameters,
+                                                         code_book=code_book).rename(
         columns=
         {'STUDENT_ID': 'SIH_PERSONPK_ID_ST',
          'WORK_PRODUCT_TITLE': 'EVIDENCE_OF_LEARNING_SID'})
@@ -1827,6 +2144,116 @@ def onboard_initialize_student_know_state(vert_list, digraph_edge_list, var_stat
     return know_state_estimate
 
 
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓩ IDENTIFY THE KNOWLEDGE STATES AFFECTED BY NEW MEASUREMENTS.  A new measurement of a learning standard can only move
+#    the knowledge-state estimates of the same learner within evidentiary range — evid_radius, undirected — of that
+#    standard.  Our inputs are:
+#    ⧐ meas_delta, the STUDENT_ID × LEARNING_STANDARD_ID pairs for which new evidence of learning arrived;
+#    ⧐ digraph_edge_list, the course-neighborhood edge list; and
+#    ⧐ evid_radius, the evidentiary radius applied by est_know_state_for_evid_prof.
+#    We return a dataframe of the STUDENT_ID × LEARNING_STANDARD_ID pairs whose knowledge states must be re-estimated.
+#    Each changed standard's in-range neighborhood is computed once, however many learners it was measured for.
+def affected_know_state_region(meas_delta, digraph_edge_list, evid_radius=EVID_RADIUS):
+    #    ⑴ Get the CSR index of the course-neighborhood digraph.
+    course_nhbd_index = course_nhbd_digraph(digraph_edge_list=digraph_edge_list).get('GRAPH_INDEX')
+    #
+    #    ⑵ Find the in-range learning standards — within evid_radius undirected hops — for each distinct changed
+    #       standard.  A standard outside the course neighborhood — a singleton vertex — is in range only of itself.
+    in_range_verts = dict()
+    for vert_idx in set(meas_delta['LEARNING_STANDARD_ID']):
+        vert_pos = course_nhbd_index.get('VERTICES').get_indexer([vert_idx])
+        if vert_pos[0] >= 0:
+            in_range_verts[vert_idx] = course_nhbd_index.get('VERTICES')[khop_vertices(graph_index=course_nhbd_index,
+                                                                                       seed_pos=vert_pos,
+                                                                                       hops=evid_radius,
+                                                                                       direction='BOTH')[0]].tolist()
+        else:
+            in_range_verts[vert_idx] = [vert_idx]
+    #
+    #    ⑶ Expand each changed STUDENT_ID × LEARNING_STANDARD_ID pair to its in-range learning standards.
+    meas_delta = meas_delta[['STUDENT_ID', 'LEARNING_STANDARD_ID']].drop_duplicates()
+    return pd.DataFrame(data=[(student_idx, in_range_idx)
+                              for (student_idx, vert_idx) in meas_delta.itertuples(index=False)
+                              for in_range_idx in in_range_verts.get(vert_idx)],
+                        columns=['STUDENT_ID', 'LEARNING_STANDARD_ID']).drop_duplicates()
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓩ INCREMENTALLY UPDATE KNOWLEDGE STATES FOR NEW MEASUREMENTS.  onboard_initialize_student_know_state re-estimates every
+#    learning standard in the course neighborhood for every learner.  Here we re-estimate only those knowledge states
+#    that new measurements — meas_delta, STUDENT_ID × LEARNING_STANDARD_ID pairs with SIH_PERSONPK_ID_ST naming — can
+#    move.  Our procedure:
+#    ⑴ Find the affected region using affected_know_state_region.  Only learners with new measurements are affected.
+#    ⑵ Build the wide evidentiary-state table for the affected learners alone.  Their estimates condition on all of their
+#       evidence, not just the new measurements, so we use each affected learner's whole body of evidence.
+#    ⑶ Group evidentiary profiles as usual.  Attach to each profile FOCUS_VERTS, the union of its conformees' affected
+#       regions.  est_know_state_for_evid_prof skips subgraphs not touching FOCUS_VERTS.
+#    ⑷ Assemble the knowledge-state table and retain only each learner's own affected region.
+#    The result has the form of that from onboard_initialize_student_know_state, restricted to the changed rows.
+def onboard_update_student_know_state(vert_list, meas_delta, digraph_edge_list, var_states, analysis_case_parameters,
+                                      standard_codes=None):
+    #    ⑴ Intern identifiers as integer codes, and find the affected region.  The code book spans the new measurements
+    #       as well as the body of evidence.  Learning standards are coded by standard_codes, as in
+    #       onboard_initialize_student_know_state.
+    vert_list = vert_list.rename(columns={'SIH_PERSONPK_ID_ST': 'STUDENT_ID',
+                                          'EVIDENCE_OF_LEARNING_SID': 'WORK_PRODUCT_TITLE'})
+    meas_delta = meas_delta.rename(columns={'SIH_PERSONPK_ID_ST': 'STUDENT_ID'})
+    code_book = identifier_code_book(vert_list=pd.concat([vert_list[['STUDENT_ID', 'LEARNING_STANDARD_ID']],
+                                                          meas_delta[['STUDENT_ID', 'LEARNING_STANDARD_ID']]]),
+                                     digraph_edge_list=digraph_edge_list,
+                                     standard_codes=standard_codes)
+    vert_list = encode_identifiers(frame=vert_list,
+                                   code_book=code_book)
+    meas_delta = encode_identifiers(frame=meas_delta,
+                                    code_book=code_book)
+    digraph_edge_list = encode_identifiers(frame=digraph_edge_list,
+                                           code_book=code_book)
+    affected_region = affected_know_state_region(meas_delta=meas_delta,
+                                                 digraph_edge_list=digraph_edge_list)
+    print('Incremental update of ' + str(len(affected_region)) + ' knowledge states for ' +
+          str(affected_region['STUDENT_ID'].nunique()) + ' learners at time ' + str(datetime.now().time()))
+    #
+    #    ⑵ Build the wide evidentiary-state table for the affected learners.
+    vert_list = vert_list.loc[vert_list['STUDENT_ID'].isin(set(affected_region['STUDENT_ID']))]
+    wide_evid_dataframe = build_wide_evid_state_table(vert_list=vert_list,
+                                                      digraph_edge_list=digraph_edge_list,
+                                                      enrollees=vert_list[['STUDENT_ID']].drop_duplicates(),
+                                                      admiss_score_partitions=var_states)
+    #
+    #    ⑶ Group by evidentiary profile, and focus each profile on its conformees' affected regions.
+    region_verts = affected_region.groupby(by='STUDENT_ID')['LEARNING_STANDARD_ID'].agg(lambda x: set(x)).to_dict()
+    group_evid_prof = groupby_evid_profile(wide_evid_dataframe=wide_evid_dataframe)
+    for prof_idx in list(group_evid_prof.keys()):
+        group_evid_prof.get(prof_idx)['FOCUS_VERTS'] = list(set().union(*[region_verts.get(student_idx, set())
+                                                                           for student_idx in
+                                                                           group_evid_prof.get(prof_idx).get('STUDENT_ID')]))
+    group_evid_prof = evaluate_group_know_state(evid_prof_dict=group_evid_prof,
+                                                wide_evid_dataframe=wide_evid_dataframe,
+                                                digraph_edge_list=digraph_edge_list,
+                                                var_states=var_states,
+                                                cpt_list=CPT_LIST,
+                                                process_count=KNOW_STATE_PROCESS_COUNT,
+                                                cpt_fingerprint=CPT_FINGERPRINT,
+                                                cpt_arrays=CPT_ARRAYS)
+    #
+    #    ⑷ Assemble the knowledge-state table, and retain the affected region.  The table's identifiers are decoded
+    #       strings, so we decode the region likewise.
+    know_state_estimate = assemble_knowledge_state_table(evid_prof_dict=group_evid_prof,
+                                                         vert_list=vert_list,
+                                                         digraph_edge_list=digraph_edge_list,
+                                                         admiss_score_partitions=var_states,
+                                                         analysis_case_parameters=analysis_case_parameters,
+                                                         code_book=code_book)
+    know_state_estimate = pd.merge(left=know_state_estimate,
+                                   right=decode_identifiers(frame=affected_region,
+                                                            code_book=code_book)).rename(columns={'STUDENT_ID': 'SIH_PERSONPK_ID_ST',
+                                                                          'WORK_PRODUCT_TITLE': 'EVIDENCE_OF_LEARNING_SID'})
+    know_state_estimate = know_state_estimate.loc[know_state_estimate['KNOWLEDGE_LVL_TYPE'] != 'UNMEASURED']
+    return know_state_estimate
+
+
 #
 def diagnose_group_know_state():
     global if_tab_dir
@@ -1850,245 +2277,6 @@ def diagnose_group_know_state():
                                                      quoting=csv.QUOTE_NONNUMERIC)
     return
 
-#
-# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
-# ⓧ DECOMPOSE GRAPH INTO SUBGRAPHS.  We must manage computational complexity associated with large graphs. We decompose them
-#    into subgraphs. Some subgraphs are connected components that are not connected to other vertices in the graph.
-#    Others are overlapping subgraphs wihtin large, complex connected components. We get these overlapping subgraphs
-#    from two appraoches:
-#    ⧐ Ego-one subgraphs centered on high-valence verttices (vertices whose degrees exceed a specific threshold); and
-#    ⧐ Connected-component subgraphs from the composite graph once the the high-valence vertices are removed.
-#    Our graphs are "overlapping" in the sesne that different subgraphs can share adjacent vertices. The overlaps
-#    occur when evidence is applied to a vertex that is outside the span of the subgraph but immediately adjacent to
-#    a boundary vertex.
-#
-#    Our function inputs include:
-#    ⧐ composite_digraph is a networkx 2.0 digraph object.  All vertices are within two graphical
-#      steps from one of the measured vertices, for which evidence is available. We know this because
-#      composite_digraph is constructed using our internally-defined build_induced_inrange_graph
-#      funtion.
-#    ⧐ measured_verts contains all of the vertices for which evidentiary measurements are available.
-#
-#    Our logic follows the major steps.
-#    🄰 Identify the high-valency vertices — degree ≥ 6 — in composite_digraph.
-#    🄱 Create a "clean copy" — composite_digraph_reduced —our baseline composite digraph. Remove
-#       these vertices from composite_digraph_reduced.
-#    🄲 Decompose composite_digraph_reduced into connected components.  Introduce them into a dictionary.
-#    🄳 Add ego-one subgraph from composite_digraph centered on each of the high-valency vertices.
-#    🄴 Extend each subgraph in voronoi_subgraph_verts to include any measured vertex within
-#       unit graphical distance from the boundary vertices. Our bounary vertex set is defined
-#       as {boundary_verts} = {root_verts} ∪ {leaf_verts}.  Accomplish this using another internally-
-#       defined subtroutine for each item in voronoi_subgraph_verts.  We add our distance-one-from-subgraph-
-#       boundary measured vertices to the vertex list for each item in voronoi_subgraph_verts.
-#    🄵 Add to each item in vornoi_subgraph_verts a networkx digraph object representing the
-#       induced subgraph from composite_digraph specified by its correspodning vertex list.
-#    This voronoi_subgraph_verts dictionary object is our returned variable.
-#
-def decompose_digraph(composite_digraph, measured_verts, prof_idx):
-    #    🄰 Identify the high-valency vertices — degree ≥ 6 — in composite_digraph.
-    comp_digraph_vert_degrees = dict(composite_digraph.degree())
-    high_degree_verts = list(dict((key, val) for key, val in comp_digraph_vert_degrees.items()
-                                  if comp_digraph_vert_degrees.get(key) >= 6).keys())
-    #    🄱 Create a "clean copy" — composite_digraph_reduced —our baseline composite digraph. Remove
-    #       high-degree vertices
-    composite_digraph_reduced = nx.DiGraph()
-    composite_digraph_reduced.add_nodes_from(list(composite_digraph.nodes()))
-    composite_digraph_reduced.add_edges_from(list(composite_digraph.edges()))
-    composite_digraph_reduced.remove_nodes_from(high_degree_verts)
-    #
-    #    🄲 Decompose composite_digraph_reduced into connected-component subgraphs.  Store the result in
-    #       a dictionary.  We have to do this in two steps.
-    #       ⑴ Convert composite_digraph_reduced to an undirected graph and use networkx' connected_components
-    #          function to get a vertex sets for each connected-component subgraph.  Some such subgraphs
-    #          will be singleton vertices.
-    subgraph_vert_sets = list(nx.connected_components(composite_digraph_reduced.to_undirected()))
-    #
-    #       ⑵ Consructed a dictionary of induced subgraphs of composite_digraph_reduced from all of
-    #          the vertex-set lists in subgraph_vert_sets.  The behavoir of the networkx DiGraph.subgraph
-    #          function is a bit messy here when the subgraph is a singleton vertex.  We apparently cannot
-    #          construct a single-node nx.DiGraph object. So under such cases we just capture the vertices.
-    digraph_subgraphs = {}
-    for subgraph_idx in list(range(len(subgraph_vert_sets))):
-        subgraph_vert_sets_subgraph_idx = subgraph_vert_sets[subgraph_idx]
-        if len(subgraph_vert_sets_subgraph_idx) == 1:
-            digraph_subgraphs['SUBGRAPH_' + str(subgraph_idx)] = {
-                'INDUCED_SUBGRAPH_VERTS': subgraph_vert_sets_subgraph_idx,
-                'MEAS_INDUCED_SUBGRAPH_VERTS': set(measured_verts) \
-                    .intersection(set(subgraph_vert_sets_subgraph_idx)),
-                'IS_STAR_GRAPH': False}
-        else:
-            digraph_subgraph_subgraph_idx = composite_digraph.subgraph(subgraph_vert_sets[subgraph_idx])
-            digraph_subgraphs['SUBGRAPH_' + str(subgraph_idx)] = {
-                'INDUCED_SUBGRAPH': digraph_subgraph_subgraph_idx,
-                'INDUCED_SUBGRAPH_VERTS': list(digraph_subgraph_subgraph_idx.nodes()),
-                'MEAS_INDUCED_SUBGRAPH_VERTS': set(measured_verts) \
-                    .intersection(set(digraph_subgraph_subgraph_idx.nodes())),
-                'IS_STAR_GRAPH': False}
-            #
-            #    🄴 Make first pass at dealing with degenrate cases.
-            #       ⑴ Discard singleton graphs.
-    digraph_subgraphs = dict((key, value) for key, value in digraph_subgraphs.items()
-                             if len(digraph_subgraphs.get(key).get('INDUCED_SUBGRAPH_VERTS')) > 1)
-    #
-    #    🄵 Update each item in digraph_subgraphs with a measurement-extended spanning subgraph.  Use internally-
-    #       defined function meas_extend_subgraph to get the update item.
-    for key_idx in list(digraph_subgraphs.keys()):
-        digraph_subgraphs.get(key_idx).update(measurement_extend_subgraph(composite_digraph=composite_digraph,
-                                                                          subgraph_dict_item=digraph_subgraphs.get(
-                                                                              key_idx),
-                                                                          measured_verts=measured_verts))
-    #
-    #    🄳 Add ego-one subgraph from composite_digraph centered on each of the high-valency vertices.
-    for vert_idx in high_degree_verts:
-        high_degree_ego_graph_vert_idx = nx.ego_graph(G=composite_digraph,
-                                                      n=vert_idx,
-                                                      radius=1,
-                                                      undirected=True)
-        digraph_subgraphs['SUBGRAPH_' + vert_idx] = {'SPANNING_SUBGRAPH': high_degree_ego_graph_vert_idx,
-                                                     'SPANNING_SUBGRAPH_VERTS': list(
-                                                         high_degree_ego_graph_vert_idx.nodes()),
-                                                     'INDUCED_SUBGRAPH': high_degree_ego_graph_vert_idx,
-                                                     'INDUCED_SUBGRAPH_VERTS': list(
-                                                         high_degree_ego_graph_vert_idx.nodes()),
-                                                     'MEAS_INDUCED_SUBGRAPH_VERTS': set(measured_verts) \
-                                                         .intersection(set(high_degree_ego_graph_vert_idx.nodes())),
-                                                     'MEAS_SPANNING_SUBGRAPH_VERTS': set(measured_verts) \
-                                                         .intersection(set(high_degree_ego_graph_vert_idx.nodes())),
-                                                     'IS_STAR_GRAPH': True}
-    #
-    #   ≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈
-    #   ⛔⛔⛔⛔⛔⛔⛔⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇ DIAGNOSTIC FOR DEVELOPMENT ONLY ⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⛔⛔⛔⛔⛔⛔⛔
-    #   ⛔⛔⛔⛔⛔⛔⛔⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆ DIAGNOSTIC FOR DEVELOPMENT ONLY ⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⛔⛔⛔⛔⛔⛔⛔
-    #   ≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈
-    #
-    #    🄴 Second Pass at Degenrate Cases:
-    #       ⑵ Discard graphs for which all vertices are measured.
-    digraph_subgraphs = dict((key, value) for key, value in digraph_subgraphs.items()
-                             if len(digraph_subgraphs.get(key).get('INDUCED_SUBGRAPH_VERTS')) !=
-                             len(set(digraph_subgraphs.get(key).get('INDUCED_SUBGRAPH_VERTS')) \
-                                 .intersection(set(measured_verts))))
-    digraph_subgraphs = dict((key, value) for key, value in digraph_subgraphs.items()
-                             if len(digraph_subgraphs.get(key).get('MEAS_SPANNING_SUBGRAPH_VERTS')) > 0)
-    digraph_subgraphs = dict((key, value) for key, value in digraph_subgraphs.items()
-                             if nx.is_directed_acyclic_graph(G=digraph_subgraphs.get(key).get('SPANNING_SUBGRAPH')))
-    for key_idx in list(digraph_subgraphs.keys()):
-        digraph_subgraphs.get(key_idx).update(
-            {'NOT_COMPLEX_GRAPH': True if len(digraph_subgraphs.get(key_idx).get('SPANNING_SUBGRAPH_VERTS')) <= 12
-            else False})
-    #
-    #
-    #
-    #   ≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈
-    #   ⛔⛔⛔⛔⛔⛔⛔⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇ DIAGNOSTIC FOR DEVELOPMENT ONLY ⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⬇⛔⛔⛔⛔⛔⛔⛔
-    #       Plot png bitmap graphics of the in-range graphical neighborhood and of each subgraph.
-    #	ad_hoc_plot_dir = '/Users/nahamlet/Box Sync/IBM-Watson ED K12/Pathway-Centric CONOPS/Darwin-Release Realization/WEDC-Schema-Aligned EoL/MASTY_ONBOARD_ARTIFACTS/260000_T004_72000/AD_HOC_SUBGRAPH_PLOTS'
-    #	for dict_key in list(digraph_subgraphs.keys()):
-    #		nx_digraph_dict_key = digraph_subgraphs.get(dict_key).get('INDUCED_SUBGRAPH').fresh_copy()
-    #		nx_digraph_dict_key.add_nodes_from(list(digraph_subgraphs.get(dict_key).get('INDUCED_SUBGRAPH').nodes()))
-    #		nx_digraph_dict_key.add_edges_from(list(digraph_subgraphs.get(dict_key).get('INDUCED_SUBGRAPH').edges()))
-    #		nx_digraph_dict_key.add_nodes_from(nodes = list(set(digraph_subgraphs.get(dict_key).get('INDUCED_SUBGRAPH_VERTS'))\
-    #														.intersection(set(measured_verts))),
-    #											style = 'filled',
-    #											fillcolor = '#d7d2cb')
-    #		agraph_dict_key = nx.nx_agraph.to_agraph(N = nx_digraph_dict_key)
-    #		agraph_dict_key.layout('dot')
-    #		agraph_dict_key.draw(os.path.abspath(os.path.join(ad_hoc_plot_dir,dict_key + '_INDUCED_SUBGRAPH.png')))
-    #
-    #		nx_digraph_dict_key = digraph_subgraphs.get(dict_key).get('SPANNING_SUBGRAPH').fresh_copy()
-    #		nx_digraph_dict_key.add_nodes_from(list(digraph_subgraphs.get(dict_key).get('SPANNING_SUBGRAPH').nodes()))
-    #		nx_digraph_dict_key.add_edges_from(list(digraph_subgraphs.get(dict_key).get('SPANNING_SUBGRAPH').edges()))
-    #		nx_digraph_dict_key.add_nodes_from(nodes = list(set(digraph_subgraphs.get(dict_key).get('SPANNING_SUBGRAPH_VERTS'))\
-    #														.intersection(set(measured_verts))),
-    #											style = 'filled',
-    #											fillcolor = '#d7d2cb')
-    #		agraph_dict_key = nx.nx_agraph.to_agraph(N = nx_digraph_dict_key)
-    #		agraph_dict_key.layout('dot')
-    #		agraph_dict_key.draw(os.path.abspath(os.path.join(ad_hoc_plot_dir,dict_key + '_MEAS_EXT_SUBGRAPH.png')))
-    #
-    #   ⛔⛔⛔⛔⛔⛔⛔⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆ DIAGNOSTIC FOR DEVELOPMENT ONLY ⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⛔⛔⛔⛔⛔⛔⛔
-    #   ≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈≈
-    #
-    return digraph_subgraphs
-
-
-#
-#
-# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
-# ⓩ EXTEND GRAPHICAL SPAN OF AN INDUCED SUBGRAPH BY ADDING MEASURED VERTICES WIITHIN ONE GRAPHICAL STEP OF BOUNDARY VERTICES.
-#    We require three input objects.
-#    ⧐ composite_digraph is the original subgraph object from which the our induced subgraph of interest is derived;
-#    ⧐ subgraph_dict_item is a dictionary item with key 'INDUCED_SUBGRAPH' for which we seek an extended span; and
-#    ⧐ measured_verts are the vertices from composite_digraph for which evidentiary measurements are available.
-#
-#    Return a dictionary item for which the key is 'SPANNING_SUBGRAPH' and the value is the networkx digraph
-#    object with measurement=-extended span.
-#
-#    The major steps in our logic
-#    🄰 Create spanning_subgraph, a fresh-copy of our graph object on which we can operate without modifying the original.
-#    🄱 Identify the boundary vertices, {root vertices} ∪ {edge vertices} resulting from internally-defined
-#       function graph_vert_class.
-#    🄲 Compose with our induced_subgraph item a radius-one ego subgraph for each boundary vertex. What results is an
-#       extended, induced subgraph.
-#    🄳 Update our boundary vertices list for the measurement-extended induced subgraph.
-#    🄴 Remove from our measurement-extended subgraph boundary vertices for which evidentiary measurements
-#       are not indicated in meas_verts.
-#    🄵 Construct and return the resulting dictionary item by associating with it the 'SPANNING_SUBGRAPH' key.
-#
-def measurement_extend_subgraph(composite_digraph, subgraph_dict_item, measured_verts):
-    #    Start with a local fresh copy of composite_digraph.
-
-    #
-    #    🄰 Create spanning_subgraph, a fresh-copy of our graph object on which we can operate without modifying the original.
-    meas_extended_spanning_subgraph = nx.DiGraph()
-    meas_extended_spanning_subgraph.add_nodes_from(list(subgraph_dict_item.get('INDUCED_SUBGRAPH').nodes()))
-    meas_extended_spanning_subgraph.add_edges_from(list(subgraph_dict_item.get('INDUCED_SUBGRAPH').edges()))
-    #
-    #    🄱 Identify the boundary vertices. We handle this conditionally.  Some of our meas_extended_spanning_subgraph
-    #       are singleton-vertex graphs, for which our sole vertex is the boundary vertex.  Otherwise our boundary
-    #       vertex is identified by the union of the root vertices and the leaf vertices resulting from
-    #       internally-defined function graph_vert_class.
-    induced_subgraph_vert_classes = graph_vert_class(
-        edge_list=pd.DataFrame(data=list(map(list, meas_extended_spanning_subgraph.edges())),
-                               columns=['CONSTITUENT_LEARNING_STD_ID',
-                                        'LEARNING_STANDARD_ID']),
-        vert_list=list(meas_extended_spanning_subgraph.nodes()))
-    induced_subgraph_boundary_verts = list(set(induced_subgraph_vert_classes.get('LEAF_VERTS')) \
-                                           .union(set(induced_subgraph_vert_classes.get('ROOT_VERTS'))))
-    #
-    #    🄲 Compose with our induced_subgraph item a radius-one ego subgraph for each boundary vertex.
-    for vert_idx in induced_subgraph_boundary_verts:
-        meas_extended_spanning_subgraph = nx.compose(G=meas_extended_spanning_subgraph,
-                                                     H=nx.ego_graph(G=composite_digraph,
-                                                                    n=vert_idx,
-                                                                    radius=1,
-                                                                    undirected=True))
-    #
-    #    🄳 Update our boundary vertices list for the measurement-extended induced subgraph.  Exclude from the boundary vertices
-    #       those already in induced_subgraph_boundary_verts.  We subsequently drop unmeasured boundary vertices and
-    #       only want to eliminate those not in our original subgraph.
-    spanning_subgraph_vert_classes = graph_vert_class(
-        edge_list=pd.DataFrame(data=list(map(list, meas_extended_spanning_subgraph.edges())),
-                               columns=['CONSTITUENT_LEARNING_STD_ID',
-                                        'LEARNING_STANDARD_ID']),
-        vert_list=list(meas_extended_spanning_subgraph.nodes()))
-    spanning_subgraph_boundary_verts = list(set(spanning_subgraph_vert_classes.get('LEAF_VERTS')) \
-                                            .union(set(spanning_subgraph_vert_classes.get('ROOT_VERTS'))) -
-                                            set(induced_subgraph_boundary_verts))
-    #
-    #    🄴 Identified the unmeasured boundary vertices. Remove them if the diameter of spanning_subgraph_boundary_verts
-    #       exceeds four.
-    unmeasured_boundary_verts = list(set(spanning_subgraph_boundary_verts) -
-                                     set(measured_verts))
-    if (nx.diameter(meas_extended_spanning_subgraph.to_undirected()) >= 4):
-        meas_extended_spanning_subgraph.remove_nodes_from(unmeasured_boundary_verts)
-    #
-    #    🄵 Construct and return our return-value dictionary item.
-    return {'SPANNING_SUBGRAPH': meas_extended_spanning_subgraph,
-            'MEAS_SPANNING_SUBGRAPH_VERTS': list(set(measured_verts) \
-                                                 .intersection(set(meas_extended_spanning_subgraph.nodes()))),
-            'SPANNING_SUBGRAPH_VERTS': list(meas_extended_spanning_subgraph.nodes())}
-
-
 #
 #
 #
@@ -2106,6 +2294,13 @@ def measurement_extend_subgraph(composite_digraph, subgraph_dict_item, measured_
 def worker(lock):
     try:
         global CPT_LIST
+        global CPT_FINGERPRINT
+        global CPT_ARRAYS
+        global POSTERIOR_MEMO
+        global KNOW_STATE_PROCESS_COUNT
+        global INCREMENTAL_KNOW_STATE
+        global DECOMPOSITION_CLIQUE_SIZE
+        global SOFT_SEPARATION
         global Last_Upd_Usr
         global Last_Upd_Trans
         # |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|         #
@@ -2144,6 +2339,13 @@ def worker(lock):
         Last_Upd_Usr = configurations["Last_Upd_Usr"]
         Last_Upd_Trans = configurations["Last_Upd_Trans"]
         row_config = configurations["Fetch_rows"]
+        KNOW_STATE_PROCESS_COUNT = int(configurations.get("Process_count", KNOW_STATE_PROCESS_COUNT))
+        INCREMENTAL_KNOW_STATE = bool(configurations.get("Incremental_update", INCREMENTAL_KNOW_STATE))
+        DECOMPOSITION_CLIQUE_SIZE = int(configurations.get("Decomposition_clique_size", DECOMPOSITION_CLIQUE_SIZE))
+        SOFT_SEPARATION = bool(configurations.get("Soft_separation", SOFT_SEPARATION))
+        sink_batch_rows = int(configurations.get("Write_batch_rows", SINK_BATCH_ROWS))
+        read_pool_size = int(configurations.get("Read_pool_size", DAL_POOL_SIZE))
+        reference_cache_ttl = float(configurations.get("Reference_cache_ttl", REF_CACHE_TTL))
         #
         # DATABASE QUERIES                                                                                                      #
         #
@@ -2157,24 +2359,95 @@ def worker(lock):
                        " ORDER BY em.EOL_MEAS_PK_ID ASC  " + \
                        " FETCH FIRST " + add_rows
         #
-        # MASTERY_LEVEL_CAT input query
-        MLC_QRY = "SELECT TENANT_ID, MASTERY_LEVEL_NAME, FROM_THRESHOLD, TO_THRESHOLD FROM IBMSIH.MASTERY_COLOR_LIST WHERE TENANT_ID IN "
+        # COURSE_LEARNING_STANDARD input query:  the course's learning standards.
+        COURSE_LS_QRY = ("SELECT DISTINCT cls.TENANT_ID,cls.SIH_COURSEPK_ID,cls.LEARNING_STANDARD_ID "
+                         "FROM IBMSIH.COURSE_LEARNING_STD_MAP cls "
+                         "JOIN IBMSIH.SIHLEARNING_STANDARD sls ON cls.LEARNING_STANDARD_ID=sls.LEARNING_STANDARD_ID "
+                         "WHERE cls.TENANT_ID = :tenant_id "
+                         " AND cls.SIH_COURSEPK_ID = :course_id "
+                         "AND sls.CLUSTER_YN=0 AND sls.DOMAIN_YN=0")
         #
-        # Default ERROR state query in case model fails.
-        EOL_UPD_ERR_QRY = "UPDATE IBMSIH.EOL_MEAS SET STATUS ='ERROR' WHERE  STATUS = 'RUNNING' "
+        # COURSE_ENROLLEES input query:  the course's students with PENDING measurements in the subject.
+        COURSE_ENROLLEES_QRY = ("SELECT DISTINCT spr.SIH_PERSONPK_ID "
+                                "FROM IBMSIH.SIHCOURSE sc  "
+                                "JOIN IBMSIH.COURSE_SECTION cs ON sc.SIH_COURSEPK_ID=cs.SIH_COURSEPK_ID AND sc.TENANT_ID=cs.TENANT_ID "
+                                "JOIN IBMSIH.COURSE_SECTION_STUDENT cs2 ON cs.COURSE_SECTION_SID=cs2.COURSE_SECTION_SID "
+                                "JOIN IBMSIH.SIHORGPERSONROLE spr ON cs2.SIH_ORG_PERSON_ROLEPK_ID=spr.SIH_ORG_PERSON_ROLEPK_ID "
+                                "WHERE sc.TENANT_ID = :tenant_id "
+                                " AND sc.SIH_COURSEPK_ID = :course_id "
+                                " AND cs.IS_ACTIVE_YN=1 AND cs2.IS_ACTIVE_YN=1 "
+                                " AND spr.SIH_PERSONPK_ID IN "
+                                " ( SELECT DISTINCT em.SIHPERSON_PKID FROM IBMSIH.EOL_MEAS em "
+                                "  WHERE em.TENANT_ID = :tenant_id "
+                                "  AND em.SUBJECT_TITLE = :subject_title "
+                                "  AND em.STATUS ='PENDING' ) ")
+        #
+        # VERTEX_LIST input query:  each enrollee's latest measurement of each learning standard in the neighborhood.
+        VERTEX_LIST_QRY = ("WITH ORDERED AS "
+                           " (SELECT lcb.TENANT_ID, sc.SUBJECT_TITLE, lcb.JURISDICTION_ID, lcb.LEARNING_STANDARD_ID, lcb.VERT_CPT_BRIDGE_IDX,  "
+                           " x.SIH_PERSONPK_ID_ST as SIH_PERSONPK_ID_ST, x.RAW_SCORE,  "
+                           " (case WHEN x.RAW_SCORE IS NULL THEN 'Yes' ELSE 'No' END ) AS IS_ESTIMATED ,  "
+                           " x.ASSESSMENT_DATE as ASSESSMENT_DATE, x.EVIDENCE_OF_LEARNING_SID as EVIDENCE_OF_LEARNING_SID,  "
+                           " ROW_NUMBER() OVER (PARTITION BY x.SIH_PERSONPK_ID_ST,lcb.LEARNING_STANDARD_ID ORDER BY  x.ASSESSMENT_DATE  DESC) AS rn  "
+                           " FROM IBMSIH.LEARN_STD_CPT_BRIDGE lcb  "
+                           " JOIN IBMSIH.SIHLEARNING_STANDARD sls ON sls.LEARNING_STANDARD_ID = lcb.LEARNING_STANDARD_ID  "
+                           " JOIN IBMSIH.SIHORGPERSONROLE spr ON 1=1  "
+                           " AND spr.SIH_PERSONPK_ID IN :course_enrollees "
+                           " JOIN IBMSIH.SIHSTANDARD_CONTENT sc ON sc.STANDARD_CONTENT_ID = sls.STANDARD_CONTENT_ID  "
+                           " LEFT JOIN "
+                           " (SELECT * FROM IBMSIH.EVIDENCE_OF_LEARNING eol  "
+                           " JOIN IBMSIH.WRK_PRDCT_LRNG_STD  wp ON  wp.WORK_PRODUCT_SID=eol.WORK_PRODUCT_SID) x  "
+                           " ON  spr.SIH_PERSONPK_ID=x.SIH_PERSONPK_ID_ST  AND sls.LEARNING_STANDARD_ID=x.LEARNING_STANDARD_ID  "
+                           " WHERE lcb.TENANT_ID = :tenant_id "
+                           " AND sls.LEARNING_STANDARD_ID IN :course_neighborhood "
+                           " ) "
+                           " SELECT * FROM  ORDERED WHERE rn = 1  "
+                           " ORDER BY LEARNING_STANDARD_ID DESC  ")
+        #
+        # MEAS_DELTA input query:  the course's (student, learning standard) pairs with measurements now RUNNING.
+        MEAS_DELTA_QRY = ("SELECT DISTINCT em.SIHPERSON_PKID AS SIH_PERSONPK_ID_ST, em.LEARNING_STANDARD_ID "
+                          "FROM IBMSIH.EOL_MEAS em "
+                          "WHERE em.STATUS = 'RUNNING' AND em.IS_LOCK = 'S' "
+                          " AND em.TENANT_ID = :tenant_id "
+                          " AND em.SIHPERSON_PKID IN :course_enrollees "
+                          " AND ( em.LEARNING_STANDARD_ID IN :course_neighborhood "
+                          " OR em.LEARNING_STANDARD_ID IN :course_stds ) ")
+        #
+        # Default ERROR state scope in case model fails:  all RUNNING measurements.
+        EOL_ERROR_SCOPE = None
         #
         #
         # ① ACQUIRE INPUT DATA.                                                                                                #
         #
         # DATABASE CONNECTION
         #
-        conn_str = "db2+ibm_db://" + usr_name + ":" + passwrd + "@" + ip_addr + ":" + port + "/" + Database
-        dbEngine = create_engine(conn_str, convert_unicode=True)
+        conn_str = "DATABASE=" + Database + ";HOSTNAME=" + ip_addr + ";PORT=" + port + ";PROTOCOL=TCPIP;UID=" + usr_name + ";PWD=" + passwrd + ";"
+        #
+        # Input queries run through a pool of read connections, reusing prepared statements across courses.
+        READ_DAL = open_data_access(connect=lambda: ibm_db.connect(conn_str, "", ""),
+                                    driver='IBM_DB',
+                                    pool_size=read_pool_size)
+        #
+        # CPT_LONG, MASTERY_COLOR_LIST, the progression hierarchy, and sc_map.json are held per tenant in a reference
+        # cache, and re-read only when changed.
+        REFERENCE_CACHE = open_reference_cache(dal=READ_DAL,
+                                               ttl=reference_cache_ttl)
         #
         ##----- IBM_DB CONNECTIVITY TO CATER TO REQUIREMENTS OF RUNNGIN SQL UPDATE STATEMENTS -----##
         #
-        ibm_db_conn = ibm_db.connect("DATABASE=" + Database + ";HOSTNAME=" + ip_addr + ";PORT=" + port + ";PROTOCOL=TCPIP;UID=" + usr_name + ";PWD=" + passwrd + ";","", "")
+        ibm_db_conn = ibm_db.connect(conn_str, "", "")
         dbEngine_upd = ibm_db_dbi.Connection(ibm_db_conn)
+        #
+        # STUDENT_KNOWLEDGE_LEVEL is written through an array-bound bulk sink on the ibm_db connection.
+        KNOW_STATE_SINK = open_bulk_sink(connection=ibm_db_conn,
+                                         sink_type='DB2_ARRAY',
+                                         schema_name='IBMSIH',
+                                         batch_rows=sink_batch_rows)
+        #
+        # EOL_MEAS status transitions are set-based UPDATEs joined to keys staged in a session temporary table.
+        EOL_TRANSITIONER = open_eol_status_transitioner(connection=ibm_db_conn,
+                                                        connection_type='DB2',
+                                                        batch_rows=sink_batch_rows)
     #
     except Exception as e:
         # raise
@@ -2194,7 +2467,9 @@ def worker(lock):
                 # |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|         #
                 #  Evidence of Learning Table
                 print (EOL_MEAS_QRY)
-                EVIDENCE_OF_LEARNING = pd.read_sql(EOL_MEAS_QRY, dbEngine)
+                EVIDENCE_OF_LEARNING = dal_query(dal=READ_DAL,
+                                                 query_name='EVIDENCE_OF_LEARNING',
+                                                 sql=EOL_MEAS_QRY)
                 EVIDENCE_OF_LEARNING.columns = [x.upper() for x in EVIDENCE_OF_LEARNING.columns]
                 # |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|         #
                 #########################################################################################################################
@@ -2224,15 +2499,10 @@ def worker(lock):
                 #EVIDENCE_OF_LEARNING.astype(str)
                 ################################### Read from JSON file ####################################
                 #
-                input_dict = json.load(open('sc_map.json'))
+                SC_MAP = sc_map_courses(cache=REFERENCE_CACHE)
+                input_dict = SC_MAP.get('SC_MAP')
                 #input_dict = json.load(open(os.path.abspath(os.path.join(prov_dir, '180202_1445Z_CUSA_Math6_sc_map.json'))))
-                TENANT_SUBJ_COURSE = dict([(str(list_dict.get(u'tenantId')) + '_' + str(list_dict.get(u'Subject')),
-                                            {'SihCoursePk': list_dict.get(u'SihCoursePk'),
-                                             'tenantId': str(list_dict.get(u'tenantId')),
-                                             'Subject': str(list_dict.get(u'Subject')),
-											 'CurrentAcademicYear': str(list_dict.get(u'CurrentAcademicYear'))
-											 })
-                                           for list_dict in json.load(open('sc_map.json'))])
+                TENANT_SUBJ_COURSE = SC_MAP.get('TENANT_SUBJ_COURSE')
 
                 print (TENANT_SUBJ_COURSE)
 
@@ -2309,24 +2579,16 @@ def worker(lock):
                         print ("################### COURSE_LEARNING_STANDARD #######################")
                         #
                         # GetLearningStandardForCourse
-                        COURSE_LEARNING_STANDARD = pd.read_sql(
-                                                    "SELECT DISTINCT cls.TENANT_ID,cls.SIH_COURSEPK_ID,cls.LEARNING_STANDARD_ID "
-                                                    "FROM IBMSIH.COURSE_LEARNING_STD_MAP cls "
-                                                    "JOIN IBMSIH.SIHLEARNING_STANDARD sls ON cls.LEARNING_STANDARD_ID=sls.LEARNING_STANDARD_ID "
-                                                    "WHERE cls.TENANT_ID = " + T_ID +
-                                                    " AND cls.SIH_COURSEPK_ID = " + TENANT_COURSE_LIST.get(cr) +
-                                                    "AND sls.CLUSTER_YN=0 AND sls.DOMAIN_YN=0"
-                                                , dbEngine).rename(columns={'learning_standard_id': 'LEARNING_STANDARD_ID'})['LEARNING_STANDARD_ID']
+                        COURSE_LEARNING_STANDARD = dal_query(dal=READ_DAL,
+                                                             query_name='COURSE_LEARNING_STANDARD',
+                                                             sql=COURSE_LS_QRY,
+                                                             params={'tenant_id': t,
+                                                                     'course_id': cr})['LEARNING_STANDARD_ID']
                         #
                         #
                         CLS = COURSE_LEARNING_STANDARD.empty
+                        COURSE_LEARNING_STANDARD_IDS = COURSE_LEARNING_STANDARD.tolist()
                         #
-                        if COURSE_LEARNING_STANDARD.size == 0:
-                            COURSE_LEARNING_STANDARD = str("(NULL)")
-                        else:
-                            COURSE_LEARNING_STANDARD = str(tuple(COURSE_LEARNING_STANDARD))
-                            COURSE_LEARNING_STANDARD = COURSE_LEARNING_STANDARD.replace("()", "('')")
-                            COURSE_LEARNING_STANDARD = COURSE_LEARNING_STANDARD.replace(",)", ")")
                         if CLS:
                             logger.error(str(datetime.utcnow().strftime('%Y-%m-%d %H.%M.%S')) + " GetLearningStandardForCourse DataFrame is empty for Tenant: " + T_ID + " & Course : " + TENANT_COURSE_LIST.get(cr))
                             print("GetLearningStandardForCourse DataFrame is empty for Tenant: " + T_ID + " & Course : " + TENANT_COURSE_LIST.get(cr))
@@ -2350,30 +2612,16 @@ def worker(lock):
                         print ("################### COURSE_ENROLLEES #######################")
                         # NEEDS to be Updated
                         # if a student is DONE for 1 Course and is Pending for other in same SUBJECT - the record will NOT be picked for that student.
-                        COURSE_ENROLLEES = pd.read_sql(
-                            "SELECT DISTINCT spr.SIH_PERSONPK_ID "
-                            "FROM IBMSIH.SIHCOURSE sc  "
-                            "JOIN IBMSIH.COURSE_SECTION cs ON sc.SIH_COURSEPK_ID=cs.SIH_COURSEPK_ID AND sc.TENANT_ID=cs.TENANT_ID "
-                            "JOIN IBMSIH.COURSE_SECTION_STUDENT cs2 ON cs.COURSE_SECTION_SID=cs2.COURSE_SECTION_SID "
-                            "JOIN IBMSIH.SIHORGPERSONROLE spr ON cs2.SIH_ORG_PERSON_ROLEPK_ID=spr.SIH_ORG_PERSON_ROLEPK_ID "
-                            "WHERE sc.TENANT_ID = " + T_ID +
-                            " AND sc.SIH_COURSEPK_ID = " + TENANT_COURSE_LIST.get(cr) +
-                            " AND cs.IS_ACTIVE_YN=1 AND cs2.IS_ACTIVE_YN=1 "
-                            " AND spr.SIH_PERSONPK_ID IN "
-                            " ( SELECT DISTINCT em.SIHPERSON_PKID FROM IBMSIH.EOL_MEAS em "
-                            "  WHERE em.TENANT_ID = " + T_ID +
-                            "  AND em.SUBJECT_TITLE =  " + SBJ +
-                            "  AND em.STATUS ='PENDING' ) "
-                            , dbEngine).rename(columns={'sih_personpk_id': 'SIH_PERSONPK_ID'})['SIH_PERSONPK_ID']
+                        COURSE_ENROLLEES = dal_query(dal=READ_DAL,
+                                                     query_name='COURSE_ENROLLEES',
+                                                     sql=COURSE_ENROLLEES_QRY,
+                                                     params={'tenant_id': t,
+                                                             'course_id': cr,
+                                                             'subject_title': eolsub})['SIH_PERSONPK_ID']
                         #
                         #
                         CE = COURSE_ENROLLEES.empty
-                        if COURSE_ENROLLEES.size == 0:
-                            COURSE_ENROLLEES = str("(NULL)")
-                        else:
-                            COURSE_ENROLLEES = str(tuple(COURSE_ENROLLEES))
-                            COURSE_ENROLLEES = COURSE_ENROLLEES.replace("()", "('')")
-                            COURSE_ENROLLEES = COURSE_ENROLLEES.replace(",)", ")")
+                        COURSE_ENROLLEE_IDS = COURSE_ENROLLEES.tolist()
                         if CE:
                             logger.error(str(datetime.utcnow().strftime('%Y-%m-%d %H.%M.%S')) + " GetStudentsForCourse DataFrame is empty for Tenant: " + T_ID + " & Course : " + TENANT_COURSE_LIST.get(cr))
                             print("GetStudentsForCourse DataFrame is empty for Tenant: " + T_ID + " & Course : " + TENANT_COURSE_LIST.get(cr))
@@ -2391,108 +2639,25 @@ def worker(lock):
 
                             continue
                         #
-                        #
-                        # EOL_MEAS Update set Status = DONE
-                        EOL_UPD_DONE_QRY_1 = "UPDATE IBMSIH.EOL_MEAS em SET STATUS ='DONE' WHERE STATUS = 'RUNNING' " \
-                                             " AND em.TENANT_ID = " + T_ID + \
-                                             " AND em.SIHPERSON_PKID IN " + COURSE_ENROLLEES + \
-                                             " AND em.LEARNING_STANDARD_ID IN " + COURSE_LEARNING_STANDARD
-
-                        #
-                        # EOL_MEAS Update set Status = ERROR
-                        EOL_UPD_ERR_QRY_1 = "UPDATE IBMSIH.EOL_MEAS em SET STATUS ='ERROR' WHERE STATUS = 'RUNNING' " \
-                                            " AND em.TENANT_ID = " + T_ID + \
-                                            " AND em.SIHPERSON_PKID IN " + COURSE_ENROLLEES + \
-                                            " AND em.LEARNING_STANDARD_ID IN " + COURSE_LEARNING_STANDARD
-                        #
-
-                        #
-
                         #
                         print ("##########################################")
 
                         #
                         print ("################### EDGE_LIST #######################")
-
-                        COURSE_MAP_EDGE = pd.read_sql(
-                                        "WITH firstlevel_predecessor AS "
-                                        "( "
-                                        "SELECT DISTINCT  "
-                                        "t1.TENANT_ID AS TENANT_ID , sc.SUBJECT_TITLE,  "
-                                        "t1.CONSTITUENT_LEARNING_STD_ID AS LEARNING_STANDARD_FROM , t2.LEARNING_STANDARD_CD AS FROM_CODE, "
-                                        "t0.LEARNING_STANDARD_ID AS LEARNING_STANDARD_TO , t0.LEARNING_STANDARD_CD AS TO_CODE "
-                                        "FROM IBMSIH.SIHLEARNING_STANDARD t0 "
-                                        "LEFT JOIN IBMSIH.SIHLEARNING_STANDARD_HIERARCHY t1 ON t0.LEARNING_STANDARD_ID=t1.LEARNING_STANDARD_ID "
-                                        "LEFT JOIN IBMSIH.SIHLEARNING_STANDARD t2 ON t1.CONSTITUENT_LEARNING_STD_ID=t2.LEARNING_STANDARD_ID "
-                                        "LEFT JOIN IBMSIH.SIHSTANDARD_CONTENT sc ON sc.STANDARD_CONTENT_ID = t0.STANDARD_CONTENT_ID "
-                                        "										AND t2.CLUSTER_YN=0 AND t2.DOMAIN_YN=0 "
-                                        "WHERE t0.CLUSTER_YN=0 AND t0.DOMAIN_YN=0 AND t1.GRAPH_TYPE='PROGRESSION' "
-                                        "AND t0.LEARNING_STANDARD_ID IN " + COURSE_LEARNING_STANDARD +
-                                        "AND t1.TENANT_ID = " + T_ID +
-                                        "AND sc.SUBJECT_TITLE = " + SBJ +
-                                        " ), "
-                                        "secondlevel_predecessor AS "
-                                        "( "
-                                        "SELECT DISTINCT t1.TENANT_ID AS TENANT_ID , sc.SUBJECT_TITLE, "
-                                        "t1.CONSTITUENT_LEARNING_STD_ID AS LEARNING_STANDARD_FROM , t2.LEARNING_STANDARD_CD AS FROM_CODE, "
-                                        "t0.LEARNING_STANDARD_ID AS LEARNING_STANDARD_TO , t0.LEARNING_STANDARD_CD AS TO_CODE "
-                                        "FROM IBMSIH.SIHLEARNING_STANDARD t0 "
-                                        "LEFT JOIN IBMSIH.SIHLEARNING_STANDARD_HIERARCHY t1 ON t0.LEARNING_STANDARD_ID=t1.LEARNING_STANDARD_ID "
-                                        "LEFT JOIN IBMSIH.SIHLEARNING_STANDARD t2 ON t1.CONSTITUENT_LEARNING_STD_ID=t2.LEARNING_STANDARD_ID AND t2.CLUSTER_YN=0 AND t2.DOMAIN_YN=0 "
-                                        "LEFT JOIN IBMSIH.SIHSTANDARD_CONTENT sc ON sc.STANDARD_CONTENT_ID = t0.STANDARD_CONTENT_ID "
-                                        "WHERE t0.CLUSTER_YN=0 AND t0.DOMAIN_YN=0 AND t2.CLUSTER_YN=0 AND t2.DOMAIN_YN=0 "
-                                        "AND t1.GRAPH_TYPE='PROGRESSION' "
-                                        "AND t0.LEARNING_STANDARD_ID IN (SELECT DISTINCT LEARNING_STANDARD_FROM FROM firstlevel_predecessor) "
-                                        "AND t1.TENANT_ID = " + T_ID +
-                                        "AND sc.SUBJECT_TITLE = " + SBJ +
-                                        " ), "
-                                        "firstlevel_successor AS "
-                                        "( "
-                                        "SELECT DISTINCT "
-                                        "t1.TENANT_ID AS TENANT_ID , sc.SUBJECT_TITLE, "
-                                        "t0.LEARNING_STANDARD_ID AS LEARNING_STANDARD_FROM ,t0.LEARNING_STANDARD_CD AS FROM_CODE, "
-                                        "t1.LEARNING_STANDARD_ID AS LEARNING_STANDARD_TO,t2.LEARNING_STANDARD_CD AS TO_CODE "
-                                        "FROM IBMSIH.SIHLEARNING_STANDARD t0 "
-                                        "LEFT JOIN IBMSIH.SIHLEARNING_STANDARD_HIERARCHY t1 ON t0.LEARNING_STANDARD_ID=t1.CONSTITUENT_LEARNING_STD_ID "
-                                        "LEFT JOIN IBMSIH.SIHLEARNING_STANDARD t2 ON t1.LEARNING_STANDARD_ID=t2.LEARNING_STANDARD_ID "
-                                        "LEFT JOIN IBMSIH.SIHSTANDARD_CONTENT sc ON sc.STANDARD_CONTENT_ID = t0.STANDARD_CONTENT_ID "
-                                        "WHERE t0.CLUSTER_YN=0 AND t0.DOMAIN_YN=0 AND t2.CLUSTER_YN=0 AND t2.DOMAIN_YN=0 AND t1.GRAPH_TYPE='PROGRESSION' "
-                                        "AND t0.LEARNING_STANDARD_ID IN  " + COURSE_LEARNING_STANDARD +
-                                        "AND t2.LEARNING_STANDARD_ID NOT IN  " + COURSE_LEARNING_STANDARD +
-                                        #"AND t2.LEARNING_STANDARD_ID IN  " + COURSE_LEARNING_STANDARD +
-                                        "AND t1.TENANT_ID = " + T_ID +
-                                        "AND sc.SUBJECT_TITLE = " + SBJ +
-                                        " ), "
-                                        "secondlevel_successor AS "
-                                        "( "
-                                        "SELECT DISTINCT "
-                                        "t1.TENANT_ID AS TENANT_ID , sc.SUBJECT_TITLE, "
-                                        "t0.LEARNING_STANDARD_ID AS LEARNING_STANDARD_FROM ,t0.LEARNING_STANDARD_CD AS FROM_CODE, "
-                                        "t1.LEARNING_STANDARD_ID AS LEARNING_STANDARD_TO,t2.LEARNING_STANDARD_CD AS TO_CODE "
-                                        "FROM IBMSIH.SIHLEARNING_STANDARD t0 "
-                                        "LEFT JOIN IBMSIH.SIHLEARNING_STANDARD_HIERARCHY t1 ON t0.LEARNING_STANDARD_ID=t1.CONSTITUENT_LEARNING_STD_ID "
-                                        "LEFT JOIN IBMSIH.SIHLEARNING_STANDARD t2 ON t1.LEARNING_STANDARD_ID=t2.LEARNING_STANDARD_ID "
-                                        "LEFT JOIN IBMSIH.SIHSTANDARD_CONTENT sc ON sc.STANDARD_CONTENT_ID = t0.STANDARD_CONTENT_ID "
-                                        "WHERE t0.CLUSTER_YN=0 AND t0.DOMAIN_YN=0 AND t2.CLUSTER_YN=0 AND t2.DOMAIN_YN=0 AND t1.GRAPH_TYPE='PROGRESSION' "
-                                        "AND t0.LEARNING_STANDARD_ID IN (SELECT DISTINCT LEARNING_STANDARD_TO FROM firstlevel_successor) "
-                                        "AND t2.LEARNING_STANDARD_ID NOT IN (SELECT DISTINCT LEARNING_STANDARD_TO FROM firstlevel_successor) "
-                                        #"AND t2.LEARNING_STANDARD_ID IN " + COURSE_LEARNING_STANDARD +
-                                        "AND t1.TENANT_ID = " + T_ID +
-                                        "AND sc.SUBJECT_TITLE = " + SBJ +
-                                        " ), "
-                                        "overall_neigbourhood AS "
-                                        "( "
-                                        "SELECT * FROM firstlevel_predecessor UNION "
-                                        "SELECT * FROM firstlevel_successor UNION "
-                                        "SELECT * FROM secondlevel_predecessor UNION "
-                                        "select * from secondlevel_successor) "
-                                        "SELECT * FROM overall_neigbourhood  ORDER BY FROM_CODE DESC "
-                            , dbEngine).rename(columns={'tenant_id': 'TENANT_ID',
-                                                        'subject_title': 'SUBJECT_TITLE',
-                                                        'learning_standard_from': 'CONSTITUENT_LEARNING_STD_ID',
-                                                        'from_code': 'CONSTITUENT_LEARNING_STD_CD',
-                                                        'learning_standard_to': 'LEARNING_STANDARD_ID',
-                                                        'to_code': 'LEARNING_STANDARD_CD'}).applymap(str)
+                        #
+                        # The tenant's reference data — CPT_LONG, MASTERY_COLOR_LIST, progression hierarchy — from the cache.
+                        TENANT_REFERENCE = tenant_reference(cache=REFERENCE_CACHE,
+                                                            tenant_id=t)
+                        #
+                        # Edges within two progression hops of the course's learning standards.
+                        COURSE_MAP_EDGE = course_neighborhood_edges(tenant_entry=TENANT_REFERENCE,
+                                                                    course_stds=COURSE_LEARNING_STANDARD_IDS,
+                                                                    subject_title=eolsub,
+                                                                    tenant_id=t)\
+                                          .rename(columns={'LEARNING_STANDARD_FROM': 'CONSTITUENT_LEARNING_STD_ID',
+                                                           'FROM_CODE': 'CONSTITUENT_LEARNING_STD_CD',
+                                                           'LEARNING_STANDARD_TO': 'LEARNING_STANDARD_ID',
+                                                           'TO_CODE': 'LEARNING_STANDARD_CD'}).applymap(str)
 
                         #
                         CME_1 = COURSE_MAP_EDGE['LEARNING_STANDARD_ID']
@@ -2507,8 +2672,8 @@ def worker(lock):
                         COURSE_MAP_GRAPH_IS_NOT_DAG = not nx.is_directed_acyclic_graph(G=COURSE_MAP_GRAPH)
                         #
                         # Derive from COURSE_MAP_EDGE the course graphical neighborhood.
-                        COURSE_GRAPHICAL_NEIGHBORHOOD = str(tuple(set(COURSE_MAP_EDGE['CONSTITUENT_LEARNING_STD_ID']) \
-                                                                  .union(set(set(COURSE_MAP_EDGE['LEARNING_STANDARD_ID'])))))
+                        COURSE_GRAPHICAL_NEIGHBORHOOD = sorted(set(COURSE_MAP_EDGE['CONSTITUENT_LEARNING_STD_ID']) \
+                                                               .union(set(COURSE_MAP_EDGE['LEARNING_STANDARD_ID'])))
                         print ('COURSE_GRAPHICAL_NEIGHBORHOOD : ')
                         print (COURSE_GRAPHICAL_NEIGHBORHOOD)
                         #
@@ -2522,67 +2687,41 @@ def worker(lock):
                         if CME:
                             print("COURSE_MAP_EDGE DataFrame is empty for Tenant: " + T_ID + " & Course : " + TENANT_COURSE_LIST.get(cr))
                         #
-                        print ("################### Update EOL_MEAS to DONE/ERROR #######################")
-                        # UPDATE RECORDS TAKEN FROM EOL_MEAS TO HAVE STATUS OF RUNNING & IS_LOCK OF S
-                        # Used COURSE_GRAPHICAL_NEIGHBORHOOD instead of COURSE_LEARNING_STANDARD to update status
+                        print ("################### Stage EOL_MEAS course keys #######################")
+                        # Stage the course's enrollees and learning standards.  Every EOL_MEAS status transition for
+                        # this course is a set-based UPDATE over the COURSE scope — enrollees × learning standards.
+                        # Used COURSE_GRAPHICAL_NEIGHBORHOOD in addition to COURSE_LEARNING_STANDARD to update status
                         # this is done in case neighborhood Learning_Std does not exist in CLS_MAP but is in EOL_MEAS
-
-                        # EOL_MEAS Update set Status = DONE
-                        EOL_UPD_DONE_QRY_1 = "UPDATE IBMSIH.EOL_MEAS em SET STATUS ='DONE' WHERE STATUS = 'RUNNING' " \
-                                             " AND em.TENANT_ID = " + T_ID + \
-                                             " AND em.SIHPERSON_PKID IN " + COURSE_ENROLLEES + \
-                                             " AND ( em.LEARNING_STANDARD_ID IN " + COURSE_GRAPHICAL_NEIGHBORHOOD + \
-                                             " OR em.LEARNING_STANDARD_ID IN " + COURSE_LEARNING_STANDARD + " ) "
-
-                        #
-                        # EOL_MEAS Update set Status = ERROR
-                        EOL_UPD_ERR_QRY_1 = "UPDATE IBMSIH.EOL_MEAS em SET STATUS ='ERROR' WHERE STATUS = 'RUNNING' " \
-                                            " AND em.TENANT_ID = " + T_ID + \
-                                            " AND em.SIHPERSON_PKID IN " + COURSE_ENROLLEES + \
-                                            " AND ( em.LEARNING_STANDARD_ID IN " + COURSE_GRAPHICAL_NEIGHBORHOOD + \
-                                            " OR em.LEARNING_STANDARD_ID IN " + COURSE_LEARNING_STANDARD + " ) "
+                        stage_eol_keys(transitioner=EOL_TRANSITIONER,
+                                       key_set='COURSE_STUDENT',
+                                       key_values=COURSE_ENROLLEE_IDS)
+                        stage_eol_keys(transitioner=EOL_TRANSITIONER,
+                                       key_set='COURSE_STANDARD',
+                                       key_values=set(COURSE_GRAPHICAL_NEIGHBORHOOD) \
+                                                  .union(set(COURSE_LEARNING_STANDARD_IDS)))
                         #
                         #
                         print ("################### Update EOL_MEAS to RUNNING #######################")
                         # UPDATE RECORDS TAKEN FROM EOL_MEAS TO HAVE STATUS OF RUNNING & IS_LOCK OF S
-                        # Used COURSE_GRAPHICAL_NEIGHBORHOOD instead of COURSE_LEARNING_STANDARD to update status
-                        # this is done in case neighborhood Learning_Std does not exist in CLS_MAP but is in EOL_MEAS
-                        mid_level_flg = "UPDATE IBMSIH.EOL_MEAS em SET STATUS ='RUNNING' , IS_LOCK='S' " \
-                                        " WHERE em.STATUS='PENDING' AND em.IS_LOCK='N' " \
-                                        " AND em.TENANT_ID = " + T_ID + \
-                                        " AND em.SIHPERSON_PKID IN " + COURSE_ENROLLEES + \
-                                        " AND ( em.LEARNING_STANDARD_ID IN " + COURSE_GRAPHICAL_NEIGHBORHOOD + \
-                                        " OR em.LEARNING_STANDARD_ID IN " + COURSE_LEARNING_STANDARD + " ) "
-                        print mid_level_flg
-                        MID_LVL_FLG_QRY = ibm_db.exec_immediate(ibm_db_conn, mid_level_flg)
+                        transition_eol_status(transitioner=EOL_TRANSITIONER,
+                                              from_status='PENDING',
+                                              to_status='RUNNING',
+                                              tenant_id=t,
+                                              scope='COURSE',
+                                              from_lock='N',
+                                              to_lock='S')
                         #
                         #
                         print ("##########################################")
                         #
                         print ("################### VERTEX_LIST #######################")
 
-                        VERTEX_LIST = pd.read_sql(
-                                   "WITH ORDERED AS "
-                                    " (SELECT lcb.TENANT_ID, sc.SUBJECT_TITLE, lcb.JURISDICTION_ID, lcb.LEARNING_STANDARD_ID, lcb.VERT_CPT_BRIDGE_IDX,  "
-                                    " x.SIH_PERSONPK_ID_ST as SIH_PERSONPK_ID_ST, x.RAW_SCORE,  "
-                                    " (case WHEN x.RAW_SCORE IS NULL THEN 'Yes' ELSE 'No' END ) AS IS_ESTIMATED ,  "
-                                    " x.ASSESSMENT_DATE as ASSESSMENT_DATE, x.EVIDENCE_OF_LEARNING_SID as EVIDENCE_OF_LEARNING_SID,  "
-                                    " ROW_NUMBER() OVER (PARTITION BY x.SIH_PERSONPK_ID_ST,lcb.LEARNING_STANDARD_ID ORDER BY  x.ASSESSMENT_DATE  DESC) AS rn  "
-                                    " FROM IBMSIH.LEARN_STD_CPT_BRIDGE lcb  "
-                                    " JOIN IBMSIH.SIHLEARNING_STANDARD sls ON sls.LEARNING_STANDARD_ID = lcb.LEARNING_STANDARD_ID  "
-                                    " JOIN IBMSIH.SIHORGPERSONROLE spr ON 1=1  "
-                                    " AND spr.SIH_PERSONPK_ID IN " + COURSE_ENROLLEES +
-                                    " JOIN IBMSIH.SIHSTANDARD_CONTENT sc ON sc.STANDARD_CONTENT_ID = sls.STANDARD_CONTENT_ID  "
-                                    " LEFT JOIN "
-                                    " (SELECT * FROM IBMSIH.EVIDENCE_OF_LEARNING eol  "
-                                    " JOIN IBMSIH.WRK_PRDCT_LRNG_STD  wp ON  wp.WORK_PRODUCT_SID=eol.WORK_PRODUCT_SID) x  "
-                                    " ON  spr.SIH_PERSONPK_ID=x.SIH_PERSONPK_ID_ST  AND sls.LEARNING_STANDARD_ID=x.LEARNING_STANDARD_ID  "
-                                    " WHERE lcb.TENANT_ID = " + T_ID +
-                                    " AND sls.LEARNING_STANDARD_ID IN " + COURSE_GRAPHICAL_NEIGHBORHOOD +
-                                    " ) "
-                                    " SELECT * FROM  ORDERED WHERE rn = 1  "
-                                    " ORDER BY LEARNING_STANDARD_ID DESC  "
-                                    , dbEngine)
+                        VERTEX_LIST = dal_query(dal=READ_DAL,
+                                                query_name='VERTEX_LIST',
+                                                sql=VERTEX_LIST_QRY,
+                                                params={'tenant_id': t,
+                                                        'course_enrollees': COURSE_ENROLLEE_IDS,
+                                                        'course_neighborhood': COURSE_GRAPHICAL_NEIGHBORHOOD})
                         VERTEX_LIST.columns = [x.upper() for x in VERTEX_LIST.columns]
                         VERTEX_LIST_unmeasured = VERTEX_LIST.loc[np.logical_and(np.isnan(VERTEX_LIST['RAW_SCORE']),
                                                                                 np.isfinite(VERTEX_LIST[
@@ -2613,13 +2752,7 @@ def worker(lock):
                         print (VERTEX_LIST_measured)
                         print "##########################################"
                         # Check if Thresholds differ in CPT_LONG & Mastery_Color_List
-                        THRES_CHECK = pd.read_sql(" SELECT (CASE WHEN cpt_cnt=COALESCE(mcl_cnt,0) THEN 1 ELSE 0 END) "
-                                                    " FROM (SELECT c1.TENANT_ID,Count(*)  mcl_cnt FROM IBMSIH.MASTERY_COLOR_LIST c1 WHERE c1.TENANT_ID IN " + T_ID +
-                                                    " GROUP BY c1.TENANT_ID) y "
-                                                    " LEFT JOIN (SELECT c1.TENANT_ID,Count(*) cpt_cnt FROM IBMSIH.CPT_LONG c1 WHERE c1.TENANT_ID IN " + T_ID +
-                                                    " AND c1.CONSTITUENT_COUNT=0 GROUP BY c1.TENANT_ID,c1.CONSTITUENT_COUNT) x ON x.TENANT_ID=y.TENANT_ID "
-                                                    , dbEngine)
-                        THRES_CHECK = int(THRES_CHECK.iloc[0])
+                        THRES_CHECK = TENANT_REFERENCE.get('THRES_CHECK')
                         if THRES_CHECK==1:
                             print 'Mastery Thresholds matches for CPT_LONG & Mastery_Color_List'
                         else:
@@ -2627,50 +2760,32 @@ def worker(lock):
                             logger.error(str(datetime.utcnow().strftime('%Y-%m-%d %H.%M.%S')) + ' : ####################### ERROR!! #######################')
                             logger.error(str(datetime.utcnow().strftime(
                                 '%Y-%m-%d %H.%M.%S')) + 'Mastery Thresholds DO NOT match for CPT_LONG & Mastery_Color_List for Tenant : ' + T_ID + ' & Course : ' + TENANT_COURSE_LIST.get(cr) )
-                            EOL_UPDATE_ERR_1 = EOL_UPD_ERR_QRY_1
-                            print EOL_UPDATE_ERR_1
                             logger.error(str(datetime.utcnow().strftime('%Y-%m-%d %H.%M.%S')) + ' : Exiting from loop for Tenant : ' + T_ID + ' & Course : ' + TENANT_COURSE_LIST.get(cr) + ' due to missing input data')
-                            logger.error(str(datetime.utcnow().strftime('%Y-%m-%d %H.%M.%S')) + ' : Query : ' + EOL_UPDATE_ERR_1)
-                            EOL_UPDATE_QRY = ibm_db.exec_immediate(ibm_db_conn, EOL_UPDATE_ERR_1)
+                            EOL_UPDATE_ROWS = transition_eol_status(transitioner=EOL_TRANSITIONER,
+                                                                    from_status='RUNNING',
+                                                                    to_status='ERROR',
+                                                                    tenant_id=t,
+                                                                    scope='COURSE')
                             continue
                         #
                         if not VL:
-                            CONSTITUENT_COUNT = str(tuple(range(int(
+                            CONSTITUENT_COUNT = list(range(int(
                                 COURSE_MAP_EDGE.groupby(by='LEARNING_STANDARD_ID', as_index=True)[
                                     'CONSTITUENT_LEARNING_STD_ID'].agg(
-                                    'count').max() + 1))))
-                            print ("Constituent Count : " + CONSTITUENT_COUNT)
-                            CPT_LIST = pd.read_sql("SELECT * FROM IBMSIH.CPT_LONG cpt "
-                                                   "WHERE cpt.CONSTITUENT_COUNT IN " + CONSTITUENT_COUNT +
-                                                   "AND cpt.TENANT_ID IN " + T_ID +
-                                                   "ORDER BY CONSTITUENT_COUNT ASC, CPT_CELL_IDX ASC"
-                                                   , dbEngine)
-                            CPT_LIST.columns = [x.upper() for x in CPT_LIST.columns]
-                            CPT_LIST['CPT_CELL_IDX'] = CPT_LIST['CPT_CELL_IDX'].astype(str)
-                            CPT_LIST['IS_ROOT'] = CPT_LIST['IS_ROOT'].astype(str)
-                            CPT_LIST['CONSTITUENT_COUNT'] = CPT_LIST['CONSTITUENT_COUNT'].astype(str)
-                            # CPT_LIST = CPT_LIST.sort_values(by = ['CPT_CELL_IDX'],axis = 0)
-                            CPTL = CPT_LIST.empty
+                                    'count').max() + 1)))
+                            print ("Constituent Count : " + str(CONSTITUENT_COUNT))
+                            # The tenant's complete CPT_LONG.  It must hold the tables of every in-degree in the course.
+                            CPT_LIST = TENANT_REFERENCE.get('CPT_LIST')
+                            CPT_FINGERPRINT = TENANT_REFERENCE.get('CPT_FINGERPRINT')
+                            CPT_ARRAYS = TENANT_REFERENCE.get('CPT_ARRAYS')
+                            CPTL = not set(str(const_count) for const_count in CONSTITUENT_COUNT) \
+                                .issubset(set(CPT_ARRAYS.keys()))
                             if CPTL:
                                 print("CPT_LIST DataFrame is empty for Tenant: " + T_ID + " & Course : " + TENANT_COURSE_LIST.get(cr))
                                 #
                                 #
-                        ML = MLC_QRY + T_ID + " ORDER BY FROM_THRESHOLD ASC"
-                        MASTERY_LEVEL_CAT = pd.read_sql(ML, dbEngine).sort_values(by='from_threshold', axis=0)
-                        MASTERY_LEVEL_CAT.columns = [x.upper() for x in MASTERY_LEVEL_CAT.columns]
-                        #       We need to account for an UNMEASURED knowledge state. Add a corresponding row to MASTERY_LEVEL_CAT.
-                        MASTERY_LEVEL_CAT = pd.concat([MASTERY_LEVEL_CAT[['MASTERY_LEVEL_NAME',
-                                                                          'FROM_THRESHOLD',
-                                                                          'TO_THRESHOLD']],
-                                                       pd.DataFrame(data=[['UNMEASURED',
-                                                                           np.nan,
-                                                                           np.nan]],
-                                                                    columns=['MASTERY_LEVEL_NAME',
-                                                                             'FROM_THRESHOLD',
-                                                                             'TO_THRESHOLD'])])
-                        MASTERY_LEVEL_CAT = MASTERY_LEVEL_CAT.set_index(MASTERY_LEVEL_CAT['MASTERY_LEVEL_NAME'])
-                        MASTERY_LEVEL_CAT.columns = ["MASTERY_LEVEL_CAT", "LOW_BOUND", "UP_BOUND"]
-                        MASTERY_LEVEL_CAT['CAT_LEVEL_IDX'] = range(len(MASTERY_LEVEL_CAT))
+                        #       MASTERY_LEVEL_CAT, from MASTERY_COLOR_LIST, includes the UNMEASURED knowledge state.
+                        MASTERY_LEVEL_CAT = TENANT_REFERENCE.get('MASTERY_LEVEL_CAT')
                         MLC = MASTERY_LEVEL_CAT.empty
                         if MLC:
                             print("MASTERY_LEVEL_CAT DataFrame is empty for Tenant: " + T_ID + " & Course : " + TENANT_COURSE_LIST.get(cr))
@@ -2693,29 +2808,34 @@ def worker(lock):
                             logger.error(str(datetime.utcnow().strftime('%Y-%m-%d %H.%M.%S')) + ' : ####################### ERROR!! #######################')
                             print ("Exiting from loop for Tenant : " + T_ID + " & Course : " + TENANT_COURSE_LIST.get(cr) + " due to missing input data")
                             # UPDATE RECORDS TAKEN FROM EOL_MEAS TO HAVE STATUS OF RUNNING.
-                            EOL_UPDATE_ERR_1 = EOL_UPD_ERR_QRY_1
-                            print EOL_UPDATE_ERR_1
                             logger.error(str(datetime.utcnow().strftime('%Y-%m-%d %H.%M.%S')) + ' : Exiting from loop for Tenant : ' + T_ID + ' & Course : ' + TENANT_COURSE_LIST.get(cr) + ' due to missing input data')
-                            logger.error(str(datetime.utcnow().strftime('%Y-%m-%d %H.%M.%S')) + ' : Query : ' + EOL_UPDATE_ERR_1)
-                            EOL_UPDATE_QRY = ibm_db.exec_immediate(ibm_db_conn, EOL_UPDATE_ERR_1)
+                            EOL_UPDATE_ROWS = transition_eol_status(transitioner=EOL_TRANSITIONER,
+                                                                    from_status='RUNNING',
+                                                                    to_status='ERROR',
+                                                                    tenant_id=t,
+                                                                    scope='COURSE')
                             #continue
                         #
                         if CME:
                             ERR_CHK = True
                             print ("SINGLETON VERTEX for Tenant : " + T_ID + " & Course : " + TENANT_COURSE_LIST.get(cr) + " due to missing EDGE_LIST data.")
                             logger.error(str(datetime.utcnow().strftime('%Y-%m-%d %H.%M.%S')) + ' : SINGLETON VERTEX for Tenant : ' + T_ID + ' & Course : ' + TENANT_COURSE_LIST.get(cr) + ' due to missing EDGE_LIST data.')
-                            EOL_UPDATE_UPD_1 = EOL_UPD_DONE_QRY_1
-                            print EOL_UPDATE_UPD_1
-                            EOL_UPDATE_QRY1 = ibm_db.exec_immediate(ibm_db_conn, EOL_UPDATE_UPD_1)
+                            EOL_UPDATE_ROWS = transition_eol_status(transitioner=EOL_TRANSITIONER,
+                                                                    from_status='RUNNING',
+                                                                    to_status='DONE',
+                                                                    tenant_id=t,
+                                                                    scope='COURSE')
                             #continue
                         #
                         if COURSE_MAP_GRAPH_IS_NOT_DAG:
                             ERR_CHK = True
                             print ("COURSE_MAP_EDGE has cycles : " + T_ID + " & Course : " + TENANT_COURSE_LIST.get(cr))
                             logger.error(str(datetime.utcnow().strftime('%Y-%m-%d %H.%M.%S')) + 'COURSE_MAP_EDGE has cycles : ' + T_ID + ' & Course : ' + TENANT_COURSE_LIST.get(cr))
-                            EOL_UPDATE_UPD_1 = EOL_UPD_ERR_QRY_1
-                            print EOL_UPDATE_UPD_1
-                            EOL_UPDATE_QRY1 = ibm_db.exec_immediate(ibm_db_conn, EOL_UPDATE_UPD_1)
+                            EOL_UPDATE_ROWS = transition_eol_status(transitioner=EOL_TRANSITIONER,
+                                                                    from_status='RUNNING',
+                                                                    to_status='ERROR',
+                                                                    tenant_id=t,
+                                                                    scope='COURSE')
                             #continue
                         #########################################################################################################################
                         #
@@ -2743,13 +2863,47 @@ def worker(lock):
                             #continue
 
                         elif ERR_CHK == False:
-                            #Default ERROR state query in case model fails.
-                            EOL_UPD_ERR_QRY = "UPDATE IBMSIH.EOL_MEAS SET STATUS ='ERROR' WHERE  STATUS = 'RUNNING' "
-
-                            KNOWLEDGE_STATE = onboard_initialize_student_know_state(vert_list=VERTEX_LIST,
-                                                                                digraph_edge_list=COURSE_MAP_EDGE,
-                                                                                var_states=MASTERY_LEVEL_CAT,
-                                                                                analysis_case_parameters=SESSION_ATTRIBUTES)
+                            #Default ERROR state scope in case model fails.
+                            EOL_ERROR_SCOPE = None
+
+                            # Open the tenant's posterior memo.  Remembered posteriors are discarded if CPT_LONG or
+                            # MASTERY_COLOR_LIST changed since they were computed.
+                            POSTERIOR_MEMO = open_posterior_memo(tenant_id=t,
+                                                                 ref_fingerprints={'CPT_LONG': CPT_FINGERPRINT,
+                                                                                   'MASTERY_COLOR_LIST': var_states_fingerprint(MASTERY_LEVEL_CAT)})
+
+                            if INCREMENTAL_KNOW_STATE:
+                                # Re-estimate only the knowledge states within evidentiary range of the measurements
+                                # now RUNNING — those picked up from PENDING for this course — and write only those.
+                                MEAS_DELTA = dal_query(dal=READ_DAL,
+                                                       query_name='MEAS_DELTA',
+                                                       sql=MEAS_DELTA_QRY,
+                                                       params={'tenant_id': t,
+                                                               'course_enrollees': COURSE_ENROLLEE_IDS,
+                                                               'course_neighborhood': COURSE_GRAPHICAL_NEIGHBORHOOD,
+                                                               'course_stds': COURSE_LEARNING_STANDARD_IDS})
+                                MEAS_DELTA.columns = [x.upper() for x in MEAS_DELTA.columns]
+                                MEAS_DELTA = MEAS_DELTA.astype(str)
+                                print ('MEAS_DELTA : ' + str(len(MEAS_DELTA)) + ' new measurements')
+                                # Code learning standards from the tenant's STANDARD_CODES, extended by any met only in
+                                # the course's evidence.
+                                STANDARD_CODES = tenant_standard_codes(tenant_entry=TENANT_REFERENCE,
+                                                                       learning_stds=pd.concat([VERTEX_LIST['LEARNING_STANDARD_ID'],
+                                                                                                MEAS_DELTA['LEARNING_STANDARD_ID']]))
+                                KNOWLEDGE_STATE = onboard_update_student_know_state(vert_list=VERTEX_LIST,
+                                                                                    meas_delta=MEAS_DELTA,
+                                                                                    digraph_edge_list=COURSE_MAP_EDGE,
+                                                                                    var_states=MASTERY_LEVEL_CAT,
+                                                                                    analysis_case_parameters=SESSION_ATTRIBUTES,
+                                                                                    standard_codes=STANDARD_CODES)
+                            else:
+                                STANDARD_CODES = tenant_standard_codes(tenant_entry=TENANT_REFERENCE,
+                                                                       learning_stds=VERTEX_LIST['LEARNING_STANDARD_ID'])
+                                KNOWLEDGE_STATE = onboard_initialize_student_know_state(vert_list=VERTEX_LIST,
+                                                                                    digraph_edge_list=COURSE_MAP_EDGE,
+                                                                                    var_states=MASTERY_LEVEL_CAT,
+                                                                                    analysis_case_parameters=SESSION_ATTRIBUTES,
+                                                                                    standard_codes=STANDARD_CODES)
 
                             KNOWLEDGE_STATE = KNOWLEDGE_STATE.assign(LAST_UPDATE_USER=Last_Upd_Usr) \
                                                             .assign(LAST_UPDATE_TX_ID=Last_Upd_Trans)
@@ -2780,54 +2934,20 @@ def worker(lock):
                             print NOT_PROCESSED_EOL_RECORDS
                             print '############################'
                             #
-                            # Data from PROCESSED_EOL
-                            R_SIHPERSONID = str(tuple(PROCESSED_EOL_RECORDS['SIH_PERSONPK_ID_ST'].drop_duplicates().values.tolist()))
-                            R_SIHPERSONID = R_SIHPERSONID.replace("'", "")
-                            R_SIHPERSONID = R_SIHPERSONID.replace(",)", ")")
-
-                            R_LSID = str(tuple(PROCESSED_EOL_RECORDS['LEARNING_STANDARD_ID'].drop_duplicates().values.tolist()))
-                            R_LSID = R_LSID.replace("'", "")
-                            R_LSID = R_LSID.replace(",)", ")")
-
-                            R_EOLSID = str(tuple(PROCESSED_EOL_RECORDS['EVIDENCE_OF_LEARNING_SID'].drop_duplicates().values.tolist()))
-                            R_EOLSID = R_EOLSID.replace("'", "")
-                            R_EOLSID = R_EOLSID.replace(",)", ")")
-
-                            # Data from NOTPROCESSED_EOL
-                            R1_SIHPERSONID = str(tuple(NOT_PROCESSED_EOL_RECORDS['SIH_PERSONPK_ID_ST'].drop_duplicates().values.tolist()))
-                            R1_SIHPERSONID = R1_SIHPERSONID.replace("'", "")
-                            R1_SIHPERSONID = R1_SIHPERSONID.replace(",)", ")")
-
-                            R1_LSID = str(tuple(NOT_PROCESSED_EOL_RECORDS['LEARNING_STANDARD_ID'].drop_duplicates().values.tolist()))
-                            R1_LSID = R1_LSID.replace("'", "")
-                            R1_LSID = R1_LSID.replace(",)", ")")
-
-                            R1_EOLSID = str(tuple(NOT_PROCESSED_EOL_RECORDS['EVIDENCE_OF_LEARNING_SID'].drop_duplicates().values.tolist()))
-                            R1_EOLSID = R1_EOLSID.replace("'", "")
-                            R1_EOLSID = R1_EOLSID.replace(",)", ")")
-                            #
-                            # EOL_MEAS Update set Status = DONE
-                            #EOL_UPD_DONE_QRY = "UPDATE IBMSIH.EOL_MEAS SET STATUS ='DONE' WHERE STATUS = 'RUNNING' " \
-                            #                   " AND SIHPERSON_PKID IN " + R_SIHPERSONID + \
-                            #                   " AND LEARNING_STANDARD_ID IN " + R_LSID
-                            #
-                            # EOL_MEAS Update set Status = ERROR
-                            #EOL_UPD_ERR_QRY = "UPDATE IBMSIH.EOL_MEAS SET STATUS ='ERROR' WHERE  STATUS = 'RUNNING' " \
-                            #                  " AND SIHPERSON_PKID IN " + R_SIHPERSONID + \
-                            #                  " AND LEARNING_STANDARD_ID IN " + R_LSID
-                            #
-                            # EOL_MEAS Update set Status = DONE
-                            EOL_UPD_DONE_QRY = "UPDATE IBMSIH.EOL_MEAS SET STATUS ='DONE' WHERE STATUS = 'RUNNING' " \
-                                               " AND SIHPERSON_PKID IN " + R_SIHPERSONID + \
-                                               " AND LEARNING_STANDARD_ID IN " + R_LSID
+                            # Stage the students and learning standards of the processed and not-processed measurements.
+                            # The PROCESSED scope marks DONE the measurements of processed students in processed learning
+                            # standards.  The PROCESSED_ERROR scope marks ERROR, should the model fail, the measurements
+                            # of processed or not-processed students in learning standards both processed and not.
+                            for (key_set, eol_records, key_col) in [('PROCESSED_STUDENT', PROCESSED_EOL_RECORDS, 'SIH_PERSONPK_ID_ST'),
+                                                                    ('PROCESSED_STANDARD', PROCESSED_EOL_RECORDS, 'LEARNING_STANDARD_ID'),
+                                                                    ('UNPROCESSED_STUDENT', NOT_PROCESSED_EOL_RECORDS, 'SIH_PERSONPK_ID_ST'),
+                                                                    ('UNPROCESSED_STANDARD', NOT_PROCESSED_EOL_RECORDS, 'LEARNING_STANDARD_ID')]:
+                                stage_eol_keys(transitioner=EOL_TRANSITIONER,
+                                               key_set=key_set,
+                                               key_values=eol_records[key_col].drop_duplicates().tolist())
                             #
                             # EOL_MEAS Update set Status = ERROR
-                            EOL_UPD_ERR_QRY = "UPDATE IBMSIH.EOL_MEAS SET STATUS ='ERROR' WHERE  STATUS = 'RUNNING' " \
-                                              " AND ( SIHPERSON_PKID IN " + R_SIHPERSONID + \
-                                              " OR SIHPERSON_PKID IN " + R1_SIHPERSONID + \
-                                              " ) AND ( LEARNING_STANDARD_ID IN " + R_LSID + \
-                                              " AND LEARNING_STANDARD_ID IN " + R1_LSID + \
-                                              " ) "
+                            EOL_ERROR_SCOPE = 'PROCESSED_ERROR'
                             #
                             KNOWLEDGE_STATE = KNOWLEDGE_STATE.loc[KNOWLEDGE_STATE['KNOWLEDGE_LVL_TYPE'] == 'ESTIMATED']
                             #   ⛔⛔⛔⛔⛔⛔⛔⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆ REAL WORK OCCURS HERE! ⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⬆⛔⛔⛔⛔⛔⛔⛔
@@ -2861,23 +2981,24 @@ def worker(lock):
                                 del SKL_DF['STUDENT_KNOWLEDGE_LVL_SID']
 
                                 print SKL_DF
-                                # BULK-INSERT all records into database table STUDENT_KNOWLEDGE_LEVEL
-                                SKL_DF.to_sql(name="STUDENT_KNOWLEDGE_LEVEL", schema="IBMSIH", con=dbEngine,if_exists='append', chunksize=1000, index=False)
+                                # BULK-INSERT all records into database table STUDENT_KNOWLEDGE_LEVEL, in one transaction per course.
+                                bulk_write_frame(sink=KNOW_STATE_SINK,
+                                                 frame=SKL_DF,
+                                                 table_name='STUDENT_KNOWLEDGE_LEVEL')
 
                                 # UPDATE records in EOL_MEAS to have STATUS of DONE which were processed in this run.
-                                EOL_UPDATE_DONE = EOL_UPD_DONE_QRY
-                                print EOL_UPDATE_DONE
-                                EOL_UPDATE_QRY = ibm_db.exec_immediate(ibm_db_conn, EOL_UPDATE_DONE)
+                                EOL_UPDATE_ROWS = transition_eol_status(transitioner=EOL_TRANSITIONER,
+                                                                        from_status='RUNNING',
+                                                                        to_status='DONE',
+                                                                        scope='PROCESSED')
 
                                 # Set NOT PROCESSED records in EOL_MEAS for records which are left and did not get picked.
                                 # Cases like missing Vertex List for a sub-cluster in course where other cluster had Vertex List will be updated
-                                EOL_UPD_NOTPR_QRY_1 = "UPDATE IBMSIH.EOL_MEAS em SET STATUS ='NOTPROCESSED' WHERE STATUS = 'RUNNING' " \
-                                                     " AND em.TENANT_ID = " + T_ID + \
-                                                     " AND em.SIHPERSON_PKID IN " + COURSE_ENROLLEES + \
-                                                     " AND ( em.LEARNING_STANDARD_ID IN " + COURSE_GRAPHICAL_NEIGHBORHOOD + \
-                                                     " OR em.LEARNING_STANDARD_ID IN " + COURSE_LEARNING_STANDARD + " ) "
-                                print EOL_UPD_NOTPR_QRY_1
-                                EOL_NOTPROCESS_QRY = ibm_db.exec_immediate(ibm_db_conn, EOL_UPD_NOTPR_QRY_1)
+                                EOL_UPDATE_ROWS = transition_eol_status(transitioner=EOL_TRANSITIONER,
+                                                                        from_status='RUNNING',
+                                                                        to_status='NOTPROCESSED',
+                                                                        tenant_id=t,
+                                                                        scope='COURSE')
 
                                 eol_updatetime = "'" + str(datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')) + "'"
                                 print eol_updatetime
@@ -2892,13 +3013,17 @@ def worker(lock):
 
                                 print "################### TOTAL EXECUTION TIME #######################"
                                 print 'Elapsed Execution Time: ', time.time() - start, 'seconds.'
+                                print 'Input-query latencies : '
+                                print dal_latency_summary(dal=READ_DAL)
+                                print 'Reference cache : ' + str(reference_cache_stats(cache=REFERENCE_CACHE))
                                 print "################################################################"
 
                             else:
                                 print(str(datetime.utcnow().strftime('%Y-%m-%d %H.%M.%S')) + " : KNOWLEDGE_STATE Dataframe empty for COURSE:" + CRS)
-                                EOL_UPDATE_DONE = EOL_UPD_DONE_QRY
-                                print EOL_UPDATE_DONE
-                                EOL_UPDATE_QRY = ibm_db.exec_immediate(ibm_db_conn, EOL_UPDATE_DONE)
+                                EOL_UPDATE_ROWS = transition_eol_status(transitioner=EOL_TRANSITIONER,
+                                                                        from_status='RUNNING',
+                                                                        to_status='DONE',
+                                                                        scope='PROCESSED')
 
 
             except Exception as err:
@@ -2911,12 +3036,13 @@ def worker(lock):
                 logger.error(str(datetime.utcnow().strftime('%Y-%m-%d %H.%M.%S')) + ' : Error : ' + str(err))
                 logger.error(str(datetime.utcnow().strftime('%Y-%m-%d %H.%M.%S')) + ' : Elapsed Execution Time: ' + str(time.time() - start) + 'seconds.')
                 # UPDATE RECORDS TAKEN FROM EOL_MEAS TO HAVE STATUS OF RUNNING.
-                EOL_UPDATE_ERR = EOL_UPD_ERR_QRY
-                print EOL_UPDATE_ERR
                 logger.error(str(datetime.utcnow().strftime('%Y-%m-%d %H.%M.%S')) + ' : TENANT_ID : ' + T_ID)
                 logger.error(str(datetime.utcnow().strftime('%Y-%m-%d %H.%M.%S')) + ' : Course : ' + TENANT_COURSE_LIST.get(cr))
-                logger.error(str(datetime.utcnow().strftime('%Y-%m-%d %H.%M.%S')) + ' : Query : ' + EOL_UPDATE_ERR)
-                EOL_UPDATE_QRY = ibm_db.exec_immediate(ibm_db_conn, EOL_UPDATE_ERR)
+                logger.error(str(datetime.utcnow().strftime('%Y-%m-%d %H.%M.%S')) + ' : EOL_MEAS RUNNING → ERROR in scope : ' + str(EOL_ERROR_SCOPE))
+                EOL_UPDATE_ROWS = transition_eol_status(transitioner=EOL_TRANSITIONER,
+                                                        from_status='RUNNING',
+                                                        to_status='ERROR',
+                                                        scope=EOL_ERROR_SCOPE)
                 logger.error(str(datetime.utcnow().strftime('%Y-%m-%d %H.%M.%S')) + ' : ####################### ERROR!! #######################')
 
                 eol_updatetime = "'" + str(datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')) + "'"
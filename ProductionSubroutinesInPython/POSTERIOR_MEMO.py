@@ -0,0 +1,170 @@
+# coding: utf-8
+## PURPOSE:  REMEMBER BAYESIAN-NETWORK POSTERIORS ACROSS EVIDENTIARY PROFILES, COURSES, AND RUNS.  The posterior
+## marginals for an evidentiary state depend only on the spanning subgraph, the conditional-probability tables, the
+## knowledge-level categories, and the evidence assignment itself.  Subgraphs and evidence assignments recur heavily
+## across the students of a course, across the courses of a tenant, and from one scheduled run to the next.  We
+## therefore keep the posteriors we compute in a two-level memo:
+##      ⪧ An in-process, size-bounded least-recently-used (LRU) dictionary; backed by
+##      ⪧ An on-disk SQLite table, which survives the process and is shared by worker processes.
+##
+## MAJOR STEPS IN THE ALGORITHM LOGIC.
+## ① Open.  Connect to the SQLite store for a tenant.  We record for each tenant fingerprints of the reference data
+##    — CPT_LONG and MASTERY_COLOR_LIST — from which posteriors are computed.  When either fingerprint differs from
+##    the one recorded, all of the tenant's stored posteriors are stale; we delete them and record the new ones.
+## ② Look up.  Callers present a list of memo keys — digests of (subgraph signature, reference fingerprints,
+##    evidence assignment).  We answer from the LRU dictionary first and from SQLite for the remainder.
+## ③ Store.  Callers insert the posteriors they had to compute into both levels.
+##
+import sqlite3
+import hashlib
+from collections import OrderedDict
+from datetime import datetime
+import numpy as np
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓐ MEMO LIMITS.  The LRU dictionary holds at most POSTERIOR_MEMO_LRU_SIZE posteriors.  It is process-wide.  Memo
+#    keys embed the reference-data fingerprints, so entries for superseded reference data are never hit and simply
+#    age out.  SQLite limits the number of host parameters in a statement, so we look up keys in chunks of
+#    SQLITE_KEY_CHUNK.  We keep one connection per database file.
+POSTERIOR_MEMO_DB_PATH = 'POSTERIOR_MEMO.sqlite'
+POSTERIOR_MEMO_LRU_SIZE = 2 ** 16
+SQLITE_KEY_CHUNK = 500
+POSTERIOR_MEMO_LRU = OrderedDict()
+POSTERIOR_MEMO_CONNECTIONS = dict()
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓑ OPEN A TENANT'S POSTERIOR MEMO.  Our inputs are:
+#    ⧐ tenant_id, the tenant whose posteriors we remember;
+#    ⧐ ref_fingerprints, a dictionary of reference-table name — e.g., CPT_LONG, MASTERY_COLOR_LIST — to fingerprint; and
+#    ⧐ db_path, the SQLite database file.
+#    We return a dictionary containing the connection, the tenant, the reference fingerprints and db_path from which
+#    it was opened, a REF_DIGEST combining the reference fingerprints for use in memo keys, and hit/miss counters.
+def open_posterior_memo(tenant_id, ref_fingerprints, db_path=POSTERIOR_MEMO_DB_PATH):
+    #    ⑴ Connect, reusing any existing connection to db_path, and create the tables if needed.
+    if db_path not in POSTERIOR_MEMO_CONNECTIONS:
+        memo_conn = sqlite3.connect(db_path, timeout=60)
+        memo_conn.execute('CREATE TABLE IF NOT EXISTS POSTERIOR_MEMO ('
+                          'TENANT_ID TEXT NOT NULL, '
+                          'MEMO_KEY TEXT NOT NULL, '
+                          'POSTERIOR BLOB NOT NULL, '
+                          'PRIMARY KEY (TENANT_ID, MEMO_KEY))')
+        memo_conn.execute('CREATE TABLE IF NOT EXISTS POSTERIOR_MEMO_REF_FINGERPRINT ('
+                          'TENANT_ID TEXT NOT NULL, '
+                          'REF_TABLE TEXT NOT NULL, '
+                          'FINGERPRINT TEXT NOT NULL, '
+                          'LAST_UPDATE_DT TEXT, '
+                          'PRIMARY KEY (TENANT_ID, REF_TABLE))')
+        memo_conn.commit()
+        POSTERIOR_MEMO_CONNECTIONS[db_path] = memo_conn
+    memo_conn = POSTERIOR_MEMO_CONNECTIONS.get(db_path)
+    tenant_id = str(tenant_id)
+    #
+    #    ⑵ Compare the recorded reference fingerprints with the presented ones.  Any difference invalidates all of
+    #       the tenant's stored posteriors.
+    recorded_fingerprints = dict(memo_conn.execute('SELECT REF_TABLE, FINGERPRINT '
+                                                   'FROM POSTERIOR_MEMO_REF_FINGERPRINT WHERE TENANT_ID = ?',
+                                                   (tenant_id,)).fetchall())
+    if recorded_fingerprints != dict(ref_fingerprints):
+        memo_conn.execute('DELETE FROM POSTERIOR_MEMO WHERE TENANT_ID = ?', (tenant_id,))
+        memo_conn.execute('DELETE FROM POSTERIOR_MEMO_REF_FINGERPRINT WHERE TENANT_ID = ?', (tenant_id,))
+        memo_conn.executemany('INSERT INTO POSTERIOR_MEMO_REF_FINGERPRINT VALUES (?, ?, ?, ?)',
+                              [(tenant_id, ref_table, fingerprint, str(datetime.utcnow()))
+                               for (ref_table, fingerprint) in sorted(ref_fingerprints.items())])
+        memo_conn.commit()
+        if len(recorded_fingerprints) > 0:
+            print('Posterior memo invalidated for tenant ' + tenant_id + ' at time ' + str(datetime.now().time()))
+    #
+    return {'CONNECTION': memo_conn,
+            'TENANT_ID': tenant_id,
+            'REF_FINGERPRINTS': dict(ref_fingerprints),
+            'DB_PATH': db_path,
+            'REF_DIGEST': hashlib.sha1(repr(sorted(ref_fingerprints.items())).encode('utf-8')).hexdigest(),
+            'COUNTS': {'LRU_HITS': 0, 'DB_HITS': 0, 'MISSES': 0}}
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓒ LRU INSERTION.  Insert or refresh a posterior in the process-wide LRU dictionary, evicting the least-recently-used
+#    entries beyond POSTERIOR_MEMO_LRU_SIZE.
+def lru_insert(memo_key, posterior):
+    POSTERIOR_MEMO_LRU.pop(memo_key, None)
+    POSTERIOR_MEMO_LRU[memo_key] = posterior
+    while len(POSTERIOR_MEMO_LRU) > POSTERIOR_MEMO_LRU_SIZE:
+        POSTERIOR_MEMO_LRU.popitem(last=False)
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓓ LOOK UP POSTERIORS.  We return a dictionary from memo key to flat float64 posterior array for each of memo_keys
+#    that either level of the memo holds.  Keys found only in SQLite are promoted into the LRU dictionary.
+def lookup_posterior_memo(posterior_memo, memo_keys):
+    memo_hits = dict()
+    db_keys = list()
+    for memo_key in memo_keys:
+        if memo_key in POSTERIOR_MEMO_LRU:
+            memo_hits[memo_key] = POSTERIOR_MEMO_LRU.pop(memo_key)
+            POSTERIOR_MEMO_LRU[memo_key] = memo_hits.get(memo_key)
+        else:
+            db_keys.append(memo_key)
+    posterior_memo.get('COUNTS')['LRU_HITS'] += len(memo_hits)
+    #
+    for chunk_start in range(0, len(db_keys), SQLITE_KEY_CHUNK):
+        key_chunk = db_keys[chunk_start:chunk_start + SQLITE_KEY_CHUNK]
+        for (memo_key, posterior_blob) in posterior_memo.get('CONNECTION').execute(
+                'SELECT MEMO_KEY, POSTERIOR FROM POSTERIOR_MEMO WHERE TENANT_ID = ? AND MEMO_KEY IN (' +
+                ', '.join(['?'] * len(key_chunk)) + ')',
+                [posterior_memo.get('TENANT_ID')] + key_chunk).fetchall():
+            memo_hits[memo_key] = np.frombuffer(bytes(posterior_blob), dtype=np.float64)
+            lru_insert(memo_key=memo_key,
+                       posterior=memo_hits.get(memo_key))
+            posterior_memo.get('COUNTS')['DB_HITS'] += 1
+    posterior_memo.get('COUNTS')['MISSES'] += len(set(memo_keys) - set(memo_hits.keys()))
+    return memo_hits
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓔ STORE POSTERIORS.  Insert newly-computed posteriors — one flattenable array per memo key — into both levels of the
+#    memo.  We commit once per call, so that a batch of states costs one SQLite transaction.
+def store_posterior_memo(posterior_memo, memo_keys, posteriors):
+    memo_rows = list()
+    for (memo_key, posterior) in zip(memo_keys, posteriors):
+        posterior = np.ascontiguousarray(posterior, dtype=np.float64).ravel()
+        lru_insert(memo_key=memo_key,
+                   posterior=posterior)
+        memo_rows.append((posterior_memo.get('TENANT_ID'), memo_key, sqlite3.Binary(posterior.tobytes())))
+    posterior_memo.get('CONNECTION').executemany('INSERT OR REPLACE INTO POSTERIOR_MEMO VALUES (?, ?, ?)', memo_rows)
+    posterior_memo.get('CONNECTION').commit()
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓕ POSTERIOR-MEMO STATISTICS.  Report the LRU-hit, SQLite-hit, and miss counts of a tenant's memo, and the current
+#    size of the LRU dictionary.
+def posterior_memo_stats(posterior_memo):
+    memo_stats = dict(posterior_memo.get('COUNTS'))
+    memo_stats.update({'LRU_SIZE': len(POSTERIOR_MEMO_LRU)})
+    return memo_stats
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓖ HAND A POSTERIOR MEMO TO A WORKER PROCESS.  A SQLite connection can neither be pickled nor safely used on both
+#    sides of a fork.  posterior_memo_spec strips the connection from a memo, leaving what is needed to reopen it.
+#    reopen_posterior_memo — invoked within the worker process — discards any connections inherited from the parent
+#    and opens the memo afresh.  The reference fingerprints are unchanged, so nothing is invalidated.
+def posterior_memo_spec(posterior_memo):
+    if posterior_memo is None:
+        return None
+    return dict((memo_item, posterior_memo.get(memo_item)) for memo_item in ['TENANT_ID', 'REF_FINGERPRINTS', 'DB_PATH'])
+
+
+def reopen_posterior_memo(posterior_memo):
+    POSTERIOR_MEMO_CONNECTIONS.clear()
+    return open_posterior_memo(tenant_id=posterior_memo.get('TENANT_ID'),
+                               ref_fingerprints=posterior_memo.get('REF_FINGERPRINTS'),
+                               db_path=posterior_memo.get('DB_PATH'))
@@ -0,0 +1,458 @@
+# coding: utf-8
+## PURPOSE:  HOLD EACH TENANT'S REFERENCE DATA IN MEMORY, PREPROCESSED, FOR AS LONG AS IT IS UNCHANGED.  worker formerly
+## queried CPT_LONG, MASTERY_COLOR_LIST, the THRES_CHECK comparison of the two, and the two-level progression hierarchy
+## for every course of every tenant, and re-read sc_map.json twice for every EVIDENCE_OF_LEARNING row.  These change
+## rarely — CPT_LONG and MASTERY_COLOR_LIST when a tenant is configured, the hierarchy when standards are curated.
+##
+## The reference cache is a dictionary holding, for each tenant, an entry of ready-to-use structures:
+## ⧐ CPT_LIST, the tenant's complete CPT_LONG in the form worker uses — upper-case attributes, string-valued
+##   CPT_CELL_IDX, IS_ROOT, and CONSTITUENT_COUNT, float MEAS — together with CPT_ARRAYS, its MEAS column parsed into one
+##   float array per CONSTITUENT_COUNT, and CPT_FINGERPRINT, its cpt_list_fingerprint;
+## ⧐ MASTERY_LEVEL_CAT, the knowledge-level partitions with their UNMEASURED row, together with MASTERY_BINS, the
+##   partition boundaries as a NumPy bins array for np.searchsorted;
+## ⧐ THRES_CHECK, whether CPT_LONG and MASTERY_COLOR_LIST have the same number of mastery levels;
+## ⧐ HIERARCHY, the tenant's PROGRESSION edges between learning standards that are neither clusters nor domains,
+##   together with HIERARCHY_INDEX, their STANDARD_GRAPH_INDEX CSR index — edge identities are HIERARCHY row positions —
+##   and VERT_SUBJECT, the SUBJECT_TITLE of each indexed learning standard.  Each course's two-level neighborhood is
+##   extracted from the index by course_neighborhood_edges; and
+## ⧐ STANDARD_CODES, the tenant's learning-standard identifier codes for IDENTIFIER_CODES.  It begins as the sorted
+##   learning standards of HIERARCHY.  Standards first met in a later hierarchy refresh, or only in a course's evidence,
+##   are appended, so that a standard keeps its code across courses and runs.  It survives hierarchy reloads.
+##
+## An entry is served without touching the database for TTL seconds after it is validated.  Thereafter we validate it
+## with one round trip reading, for each of CPT_LONG, MASTERY_COLOR_LIST, and SIHLEARNING_STANDARD_HIERARCHY, the
+## tenant's row count and latest LAST_UPDATE_DT.  Only the parts whose tables changed are refreshed.  A hierarchy
+## change consisting only of inserted rows — the row count grew by exactly the number of rows updated since the prior
+## LAST_UPDATE_DT — is applied incrementally, by reading those rows and extending the index.  Any other change reloads the
+## hierarchy.  Deployments whose reference tables carry no LAST_UPDATE_DT fall back to row counts alone, and reload on
+## every change.  sc_map.json is likewise re-read only when its modification time changes.
+##
+## Because an unchanged tenant's CPT_LIST, CPT_FINGERPRINT, and MASTERY_LEVEL_CAT are the same course after course, the
+## compiled-network cache of NUMPY_SUM_PRODUCT_INFERENCE and the posterior memo stay warm.  Callers must not modify
+## them.  A CPT_LIST modified in place would no longer match its CPT_FINGERPRINT.
+##
+## MAJOR STEPS IN THE ALGORITHM LOGIC.
+## ① Open.  open_reference_cache returns the cache dictionary, bound to a data-access layer.
+## ② Serve.  tenant_reference returns a tenant's entry — from memory while fresh, after validation once stale, or
+##    loaded anew when absent or changed.
+## ③ Derive.  course_neighborhood_edges extracts a course's COURSE_MAP_EDGE from the cached hierarchy index.
+##    tenant_standard_codes extends STANDARD_CODES by a course's learning standards.  sc_map_courses returns the parsed
+##    sc_map.json.
+##
+import os
+import time
+import json
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from DATA_ACCESS_LAYER import dal_query
+from NUMPY_SUM_PRODUCT_INFERENCE import cpt_meas_by_count, cpt_list_fingerprint, var_states_fingerprint
+from STANDARD_GRAPH_INDEX import build_graph_index, extend_graph_index, adjacent_edges
+from IDENTIFIER_CODES import extend_code_index
+
+
+#
+#    REF_CACHE_TTL is the number of seconds an entry is served before it is validated.  The optional
+#    Reference_cache_ttl item of Mastery_config.txt overrides it in worker.
+REF_CACHE_TTL = 900
+#
+#    Change-detection signature of a tenant's reference data.  REF_COUNT_SIGNATURE_QRY is the fallback for tables
+#    lacking LAST_UPDATE_DT.
+REF_SIGNATURE_QRY = ("SELECT 'CPT_LONG' AS REF_TABLE, COUNT(*) AS ROW_COUNT, MAX(LAST_UPDATE_DT) AS LAST_UPDATE_DT "
+                     "FROM IBMSIH.CPT_LONG WHERE TENANT_ID = :tenant_id "
+                     "UNION ALL "
+                     "SELECT 'MASTERY_COLOR_LIST', COUNT(*), MAX(LAST_UPDATE_DT) "
+                     "FROM IBMSIH.MASTERY_COLOR_LIST WHERE TENANT_ID = :tenant_id "
+                     "UNION ALL "
+                     "SELECT 'SIHLEARNING_STANDARD_HIERARCHY', COUNT(*), MAX(LAST_UPDATE_DT) "
+                     "FROM IBMSIH.SIHLEARNING_STANDARD_HIERARCHY WHERE TENANT_ID = :tenant_id ")
+REF_COUNT_SIGNATURE_QRY = ("SELECT 'CPT_LONG' AS REF_TABLE, COUNT(*) AS ROW_COUNT "
+                           "FROM IBMSIH.CPT_LONG WHERE TENANT_ID = :tenant_id "
+                           "UNION ALL "
+                           "SELECT 'MASTERY_COLOR_LIST', COUNT(*) "
+                           "FROM IBMSIH.MASTERY_COLOR_LIST WHERE TENANT_ID = :tenant_id "
+                           "UNION ALL "
+                           "SELECT 'SIHLEARNING_STANDARD_HIERARCHY', COUNT(*) "
+                           "FROM IBMSIH.SIHLEARNING_STANDARD_HIERARCHY WHERE TENANT_ID = :tenant_id ")
+#
+#    The SQL code and SQLSTATE by which DB2 reports an undefined column — here, a missing LAST_UPDATE_DT.
+REF_UNDEFINED_COLUMN_CODES = ['SQL0206N', '42703']
+#
+#    Reference-data load queries.
+REF_CPT_QRY = ("SELECT * FROM IBMSIH.CPT_LONG cpt "
+               "WHERE cpt.TENANT_ID = :tenant_id "
+               "ORDER BY CONSTITUENT_COUNT ASC, CPT_CELL_IDX ASC")
+REF_MLC_QRY = ("SELECT TENANT_ID, MASTERY_LEVEL_NAME, FROM_THRESHOLD, TO_THRESHOLD FROM IBMSIH.MASTERY_COLOR_LIST "
+               "WHERE TENANT_ID = :tenant_id "
+               "ORDER BY FROM_THRESHOLD ASC")
+#
+#    The tenant's PROGRESSION edges.  Both endpoints must be neither clusters nor domains — as the course-neighborhood
+#    common-table expression formerly required, through its joins — and each endpoint carries its SUBJECT_TITLE.
+REF_HIERARCHY_QRY = ("SELECT h.TENANT_ID, "
+                     "h.CONSTITUENT_LEARNING_STD_ID AS LEARNING_STANDARD_FROM, f.LEARNING_STANDARD_CD AS FROM_CODE, "
+                     "fsc.SUBJECT_TITLE AS FROM_SUBJECT, "
+                     "h.LEARNING_STANDARD_ID AS LEARNING_STANDARD_TO, t.LEARNING_STANDARD_CD AS TO_CODE, "
+                     "tsc.SUBJECT_TITLE AS TO_SUBJECT "
+                     "FROM IBMSIH.SIHLEARNING_STANDARD_HIERARCHY h "
+                     "JOIN IBMSIH.SIHLEARNING_STANDARD f ON f.LEARNING_STANDARD_ID = h.CONSTITUENT_LEARNING_STD_ID "
+                     "JOIN IBMSIH.SIHLEARNING_STANDARD t ON t.LEARNING_STANDARD_ID = h.LEARNING_STANDARD_ID "
+                     "LEFT JOIN IBMSIH.SIHSTANDARD_CONTENT fsc ON fsc.STANDARD_CONTENT_ID = f.STANDARD_CONTENT_ID "
+                     "LEFT JOIN IBMSIH.SIHSTANDARD_CONTENT tsc ON tsc.STANDARD_CONTENT_ID = t.STANDARD_CONTENT_ID "
+                     "WHERE h.GRAPH_TYPE = 'PROGRESSION' "
+                     "AND h.TENANT_ID = :tenant_id "
+                     "AND f.CLUSTER_YN=0 AND f.DOMAIN_YN=0 AND t.CLUSTER_YN=0 AND t.DOMAIN_YN=0")
+#
+#    Hierarchy rows updated since a prior LAST_UPDATE_DT — all of them, and those of REF_HIERARCHY_QRY.
+REF_HIERARCHY_DELTA_COUNT_QRY = ("SELECT COUNT(*) AS ROW_COUNT FROM IBMSIH.SIHLEARNING_STANDARD_HIERARCHY "
+                                 "WHERE TENANT_ID = :tenant_id AND LAST_UPDATE_DT > :since")
+REF_HIERARCHY_DELTA_QRY = REF_HIERARCHY_QRY + " AND h.LAST_UPDATE_DT > :since"
+#
+#    The reference tables from which each part of a tenant entry is loaded.
+REF_MEASURE_TABLES = ['CPT_LONG', 'MASTERY_COLOR_LIST']
+REF_HIERARCHY_TABLE = 'SIHLEARNING_STANDARD_HIERARCHY'
+#
+#    COURSE_MAP_EDGE attributes, as the course-neighborhood query returned them.
+COURSE_MAP_EDGE_COLUMNS = ['TENANT_ID',
+                           'SUBJECT_TITLE',
+                           'LEARNING_STANDARD_FROM',
+                           'FROM_CODE',
+                           'LEARNING_STANDARD_TO',
+                           'TO_CODE']
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓐ OPEN A REFERENCE CACHE.  Our inputs are:
+#    ⧐ dal, the data-access layer through which reference data are read;
+#    ⧐ ttl, the number of seconds an entry is served before it is validated; and
+#    ⧐ sc_map_path, the location of sc_map.json.
+#    We return the cache dictionary.  Nothing is read until first requested.
+def open_reference_cache(dal, ttl=REF_CACHE_TTL, sc_map_path='sc_map.json'):
+    return {'DAL': dal,
+            'TTL': float(ttl),
+            'SIGNATURE_QRY': REF_SIGNATURE_QRY,
+            'TENANTS': dict(),
+            'SC_MAP_PATH': sc_map_path,
+            'SC_MAP': None,
+            'SC_MAP_MTIME': None,
+            'CACHE_STATS': {'HITS': 0, 'VALIDATIONS': 0, 'LOADS': 0}}
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓑ READ A TENANT'S REFERENCE-DATA SIGNATURE.  If the reference tables lack LAST_UPDATE_DT, the first attempt fails with
+#    an undefined-column error — one of REF_UNDEFINED_COLUMN_CODES.  We then switch the cache to row-count signatures for
+#    good.  Any other failure — e.g., a dropped connection — is raised, leaving the signature query unchanged.  We
+#    return a dictionary keyed by REF_TABLE of (ROW_COUNT, LAST_UPDATE_DT) tuples.  LAST_UPDATE_DT is None for row-count
+#    signatures.
+def reference_signature(cache, tenant_id):
+    try:
+        signature = dal_query(dal=cache.get('DAL'),
+                              query_name='REF_SIGNATURE',
+                              sql=cache.get('SIGNATURE_QRY'),
+                              params={'tenant_id': tenant_id},
+                              coerce_numeric=False)
+    except Exception as e:
+        if cache.get('SIGNATURE_QRY') == REF_COUNT_SIGNATURE_QRY or \
+                not any(error_code in str(e) for error_code in REF_UNDEFINED_COLUMN_CODES):
+            raise
+        print('Reference-data signature by LAST_UPDATE_DT unavailable, ' + str(e) +
+              '; validating by row counts at time ' + str(datetime.now().time()))
+        cache.update({'SIGNATURE_QRY': REF_COUNT_SIGNATURE_QRY})
+        return reference_signature(cache=cache,
+                                   tenant_id=tenant_id)
+    return dict((str(sig_row[0]).strip(), (int(sig_row[1]), sig_row[2] if len(sig_row) > 2 else None))
+                for sig_row in signature.itertuples(index=False))
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓒ MASTERY-PARTITION BINS.  The boundaries by which numeric0_100_to_cat and stream_wide_evid_state map RAW_SCOREs to
+#    knowledge-level categories:  left-closed intervals between successive LOW_BOUNDs, the last closed just above the
+#    final UP_BOUND.  var_states is MASTERY_LEVEL_CAT, whose final row is UNMEASURED.  We remember the bins by
+#    var_states_fingerprint, so that MASTERY_BINS holds one entry per distinct set of knowledge levels and thresholds,
+#    however many MASTERY_LEVEL_CAT objects carry it, and retains none of those objects.
+MASTERY_BINS = dict()
+
+
+def mastery_partition_bins(var_states):
+    mastery_fingerprint = var_states_fingerprint(var_states)
+    if mastery_fingerprint not in MASTERY_BINS:
+        MASTERY_BINS[mastery_fingerprint] = np.array(list(var_states['LOW_BOUND'])[0:-1] +
+                                                     [list(var_states['UP_BOUND'])[-2] + 1. / 10 ** 12], dtype=float)
+    return MASTERY_BINS.get(mastery_fingerprint)
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓓ LOAD A TENANT'S REFERENCE DATA.  Each part of an entry is loaded by its own function, so that a change to one
+#    table refreshes only its part.
+#    ⑴ load_tenant_measures reads CPT_LONG — coercing its attributes as worker did, parsing its MEAS arrays per
+#       CONSTITUENT_COUNT, and fingerprinting it — and MASTERY_COLOR_LIST — adding the UNMEASURED row, indexing by MASTERY_LEVEL_NAME, and
+#       computing the bins.  It compares the mastery-level counts of CPT_LONG — its root-vertex cells — and
+#       MASTERY_COLOR_LIST.
+#    ⑵ load_tenant_hierarchy reads the PROGRESSION hierarchy and indexes it.
+#    Each returns a dictionary of the entry items it produces.
+def load_tenant_measures(cache, tenant_id):
+    #
+    #    ⑴ Read CPT_LONG.
+    cpt_list = dal_query(dal=cache.get('DAL'),
+                         query_name='REF_CPT_LONG',
+                         sql=REF_CPT_QRY,
+                         params={'tenant_id': tenant_id})
+    cpt_list.columns = [x.upper() for x in cpt_list.columns]
+    if len(cpt_list) > 0:
+        cpt_list['CONSTITUENT_COUNT'] = cpt_list['CONSTITUENT_COUNT'].astype(int)
+    for cpt_attr in ['CPT_CELL_IDX', 'IS_ROOT', 'CONSTITUENT_COUNT']:
+        cpt_list[cpt_attr] = cpt_list[cpt_attr].astype(str)
+    cpt_list['MEAS'] = cpt_list['MEAS'].astype(float)
+    #
+    #        Read MASTERY_COLOR_LIST.
+    mastery_level_cat = dal_query(dal=cache.get('DAL'),
+                                  query_name='REF_MASTERY_COLOR_LIST',
+                                  sql=REF_MLC_QRY,
+                                  params={'tenant_id': tenant_id}).sort_values(by='FROM_THRESHOLD', axis=0)
+    mastery_level_cat.columns = [x.upper() for x in mastery_level_cat.columns]
+    mastery_level_count = len(mastery_level_cat)
+    mastery_level_cat = pd.concat([mastery_level_cat[['MASTERY_LEVEL_NAME',
+                                                      'FROM_THRESHOLD',
+                                                      'TO_THRESHOLD']],
+                                   pd.DataFrame(data=[['UNMEASURED',
+                                                       np.nan,
+                                                       np.nan]],
+                                                columns=['MASTERY_LEVEL_NAME',
+                                                         'FROM_THRESHOLD',
+                                                         'TO_THRESHOLD'])])
+    mastery_level_cat = mastery_level_cat.set_index(mastery_level_cat['MASTERY_LEVEL_NAME'])
+    mastery_level_cat.columns = ["MASTERY_LEVEL_CAT", "LOW_BOUND", "UP_BOUND"]
+    mastery_level_cat['CAT_LEVEL_IDX'] = range(len(mastery_level_cat))
+    #
+    #        Compare the mastery-level counts.
+    thres_check = int((mastery_level_count > 0) and
+                      (int((cpt_list['CONSTITUENT_COUNT'] == '0').sum()) == mastery_level_count))
+    print('Loaded reference data for tenant ' + str(tenant_id) + ' — ' + str(len(cpt_list)) + ' CPT_LONG rows, ' +
+          str(mastery_level_count) + ' mastery levels — at time ' + str(datetime.now().time()))
+    return {'CPT_LIST': cpt_list,
+            'CPT_ARRAYS': cpt_meas_by_count(cpt_list),
+            'CPT_FINGERPRINT': cpt_list_fingerprint(cpt_list),
+            'MASTERY_LEVEL_CAT': mastery_level_cat,
+            'MASTERY_BINS': mastery_partition_bins(mastery_level_cat) if mastery_level_count > 0 else np.zeros(shape=0),
+            'THRES_CHECK': thres_check}
+
+
+#
+#    ⑵ Index the hierarchy.  A learning standard's SUBJECT_TITLE is read from whichever end of its edges it occupies.
+def index_tenant_hierarchy(hierarchy, hierarchy_index=None, prior_edge_count=0):
+    if hierarchy_index is None:
+        hierarchy_index = build_graph_index(edge_from=hierarchy['LEARNING_STANDARD_FROM'],
+                                            edge_to=hierarchy['LEARNING_STANDARD_TO'])
+    else:
+        hierarchy_index = extend_graph_index(graph_index=hierarchy_index,
+                                             edge_from=hierarchy['LEARNING_STANDARD_FROM'].iloc[prior_edge_count:],
+                                             edge_to=hierarchy['LEARNING_STANDARD_TO'].iloc[prior_edge_count:])
+    vert_subject = pd.concat([pd.Series(data=hierarchy['FROM_SUBJECT'].values,
+                                        index=hierarchy['LEARNING_STANDARD_FROM'].values),
+                              pd.Series(data=hierarchy['TO_SUBJECT'].values,
+                                        index=hierarchy['LEARNING_STANDARD_TO'].values)])
+    vert_subject = vert_subject.loc[~vert_subject.index.duplicated(keep='first')]
+    return {'HIERARCHY': hierarchy,
+            'HIERARCHY_INDEX': hierarchy_index,
+            'VERT_SUBJECT': vert_subject.reindex(hierarchy_index.get('VERTICES')).values}
+
+
+def load_tenant_hierarchy(cache, tenant_id):
+    hierarchy = dal_query(dal=cache.get('DAL'),
+                          query_name='REF_HIERARCHY',
+                          sql=REF_HIERARCHY_QRY,
+                          params={'tenant_id': tenant_id})
+    hierarchy.columns = [x.upper() for x in hierarchy.columns]
+    print('Loaded progression hierarchy for tenant ' + str(tenant_id) + ' — ' + str(len(hierarchy)) +
+          ' edges — at time ' + str(datetime.now().time()))
+    return index_tenant_hierarchy(hierarchy=hierarchy.reset_index(drop=True))
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓔ REFRESH A TENANT'S HIERARCHY after its signature changed from prior_sig to current_sig, each a
+#    (ROW_COUNT, LAST_UPDATE_DT) tuple.  If the change consists only of rows inserted since the prior LAST_UPDATE_DT, we
+#    read those rows and extend the index.  Otherwise we reload.  We return a dictionary of the refreshed entry items.
+def refresh_tenant_hierarchy(cache, tenant_id, tenant_entry, prior_sig, current_sig):
+    if (prior_sig[1] is not None) and (current_sig[1] is not None) and (current_sig[0] > prior_sig[0]):
+        delta_count = dal_query(dal=cache.get('DAL'),
+                                query_name='REF_HIERARCHY_DELTA_COUNT',
+                                sql=REF_HIERARCHY_DELTA_COUNT_QRY,
+                                params={'tenant_id': tenant_id,
+                                        'since': prior_sig[1]})
+        if int(delta_count.iloc[0, 0]) == current_sig[0] - prior_sig[0]:
+            hierarchy_delta = dal_query(dal=cache.get('DAL'),
+                                        query_name='REF_HIERARCHY_DELTA',
+                                        sql=REF_HIERARCHY_DELTA_QRY,
+                                        params={'tenant_id': tenant_id,
+                                                'since': prior_sig[1]})
+            hierarchy_delta.columns = [x.upper() for x in hierarchy_delta.columns]
+            print('Extending progression hierarchy for tenant ' + str(tenant_id) + ' by ' + str(len(hierarchy_delta)) +
+                  ' edges at time ' + str(datetime.now().time()))
+            return index_tenant_hierarchy(hierarchy=pd.concat([tenant_entry.get('HIERARCHY'),
+                                                               hierarchy_delta[tenant_entry.get('HIERARCHY').columns]],
+                                                              ignore_index=True),
+                                          hierarchy_index=tenant_entry.get('HIERARCHY_INDEX'),
+                                          prior_edge_count=len(tenant_entry.get('HIERARCHY')))
+    return load_tenant_hierarchy(cache=cache,
+                                 tenant_id=tenant_id)
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓕ SERVE A TENANT'S REFERENCE DATA.  A fresh entry — validated within TTL seconds — is served as is.  A stale entry
+#    is validated against the tenant's signature.  Its parts whose tables changed are refreshed.  An absent entry is
+#    loaded.  The signature is read before the data, so that a change landing during a load is detected at the next
+#    validation.  STANDARD_CODES is extended by the learning standards of a loaded or refreshed hierarchy.  We return
+#    the tenant's entry.
+def tenant_reference(cache, tenant_id):
+    tenant_entry = cache.get('TENANTS').get(tenant_id)
+    if (tenant_entry is not None) and (time.time() - tenant_entry.get('VALIDATED_AT') < cache.get('TTL')):
+        cache.get('CACHE_STATS')['HITS'] += 1
+        return tenant_entry
+    signature = reference_signature(cache=cache,
+                                    tenant_id=tenant_id)
+    if tenant_entry is None:
+        cache.get('CACHE_STATS')['LOADS'] += 1
+        tenant_entry = dict()
+        tenant_entry.update(load_tenant_measures(cache=cache,
+                                                 tenant_id=tenant_id))
+        tenant_entry.update(load_tenant_hierarchy(cache=cache,
+                                                  tenant_id=tenant_id))
+        cache.get('TENANTS').update({tenant_id: tenant_entry})
+    else:
+        cache.get('CACHE_STATS')['VALIDATIONS'] += 1
+        prior_signature = tenant_entry.get('SIGNATURE')
+        changed_tables = [ref_table for ref_table in sorted(set(signature).union(set(prior_signature)))
+                          if signature.get(ref_table) != prior_signature.get(ref_table)]
+        if len(changed_tables) > 0:
+            cache.get('CACHE_STATS')['LOADS'] += 1
+            print('Reference data changed for tenant ' + str(tenant_id) + ' in ' + ', '.join(changed_tables) +
+                  ' at time ' + str(datetime.now().time()))
+        if len(set(changed_tables).intersection(set(REF_MEASURE_TABLES))) > 0:
+            tenant_entry.update(load_tenant_measures(cache=cache,
+                                                     tenant_id=tenant_id))
+        if REF_HIERARCHY_TABLE in changed_tables:
+            tenant_entry.update(refresh_tenant_hierarchy(cache=cache,
+                                                         tenant_id=tenant_id,
+                                                         tenant_entry=tenant_entry,
+                                                         prior_sig=prior_signature.get(REF_HIERARCHY_TABLE,
+                                                                                       (0, None)),
+                                                         current_sig=signature.get(REF_HIERARCHY_TABLE)))
+    tenant_entry.update({'STANDARD_CODES': extend_code_index(code_index=tenant_entry.get('STANDARD_CODES'),
+                                                             identifiers=tenant_entry.get('HIERARCHY_INDEX')
+                                                             .get('VERTICES')),
+                         'SIGNATURE': signature,
+                         'VALIDATED_AT': time.time()})
+    return tenant_entry
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓖ EXTRACT A COURSE'S TWO-LEVEL NEIGHBORHOOD from a tenant's hierarchy index.  This reproduces the course-neighborhood
+#    common-table expression.  Our inputs are:
+#    ⧐ tenant_entry, the tenant's reference-cache entry;
+#    ⧐ course_stds, the course's learning standards;
+#    ⧐ subject_title, the subject whose learning standards are in scope; and
+#    ⧐ tenant_id.
+#    Each level is one vectorized CSR gather.  Our procedure:
+#    ⑴ First-level predecessors.  Edges into the course's learning standards of the subject.
+#    ⑵ Second-level predecessors.  Edges into the first-level predecessors of the subject.
+#    ⑶ First-level successors.  Edges out of the course's learning standards of the subject, into learning standards
+#       outside the course.
+#    ⑷ Second-level successors.  Edges out of the first-level successors of the subject, into learning standards other
+#       than first-level successors.
+#    ⑸ Take the distinct union of the edges' HIERARCHY rows, ordered by FROM_CODE descending.
+#    We return a dataframe of COURSE_MAP_EDGE_COLUMNS.
+def course_neighborhood_edges(tenant_entry, course_stds, subject_title, tenant_id):
+    hierarchy_index = tenant_entry.get('HIERARCHY_INDEX')
+    in_subject = tenant_entry.get('VERT_SUBJECT') == subject_title
+    course_pos = hierarchy_index.get('VERTICES').get_indexer(list(course_stds))
+    course_pos = np.unique(course_pos[course_pos >= 0])
+    course_subject_pos = course_pos[in_subject[course_pos]]
+    #
+    #    ⑴ First-level predecessors.
+    firstlevel_predecessor, firstlevel_predecessor_pos = adjacent_edges(graph_index=hierarchy_index,
+                                                                        vert_pos=course_subject_pos,
+                                                                        direction='PREDECESSORS')
+    #
+    #    ⑵ Second-level predecessors.
+    firstlevel_predecessor_pos = np.unique(firstlevel_predecessor_pos)
+    secondlevel_predecessor = adjacent_edges(graph_index=hierarchy_index,
+                                             vert_pos=firstlevel_predecessor_pos[
+                                                 in_subject[firstlevel_predecessor_pos]],
+                                             direction='PREDECESSORS')[0]
+    #
+    #    ⑶ First-level successors.
+    firstlevel_successor, firstlevel_successor_pos = adjacent_edges(graph_index=hierarchy_index,
+                                                                    vert_pos=course_subject_pos,
+                                                                    direction='SUCCESSORS')
+    outside_course = ~np.isin(firstlevel_successor_pos, course_pos)
+    firstlevel_successor = firstlevel_successor[outside_course]
+    firstlevel_successor_pos = np.unique(firstlevel_successor_pos[outside_course])
+    #
+    #    ⑷ Second-level successors.
+    secondlevel_successor, secondlevel_successor_pos = adjacent_edges(graph_index=hierarchy_index,
+                                                                      vert_pos=firstlevel_successor_pos[
+                                                                          in_subject[firstlevel_successor_pos]],
+                                                                      direction='SUCCESSORS')
+    secondlevel_successor = secondlevel_successor[~np.isin(secondlevel_successor_pos, firstlevel_successor_pos)]
+    #
+    #    ⑸ Take the distinct union.
+    return tenant_entry.get('HIERARCHY').iloc[np.unique(np.concatenate([firstlevel_predecessor,
+                                                                        firstlevel_successor,
+                                                                        secondlevel_predecessor,
+                                                                        secondlevel_successor]))]\
+        .assign(TENANT_ID=tenant_id,
+                SUBJECT_TITLE=subject_title)[COURSE_MAP_EDGE_COLUMNS]\
+        .drop_duplicates()\
+        .sort_values(by=['FROM_CODE', 'LEARNING_STANDARD_FROM', 'LEARNING_STANDARD_TO'],
+                     ascending=[False, True, True],
+                     kind='mergesort')\
+        .reset_index(drop=True)
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓗ EXTEND A TENANT'S LEARNING-STANDARD CODES by learning_stds, e.g., a course's evidence.  Standards not yet coded are
+#    appended to STANDARD_CODES, which is stored back in tenant_entry.  We return the extended STANDARD_CODES, for
+#    identifier_code_book.
+def tenant_standard_codes(tenant_entry, learning_stds):
+    tenant_entry.update({'STANDARD_CODES': extend_code_index(code_index=tenant_entry.get('STANDARD_CODES'),
+                                                             identifiers=pd.Series(list(learning_stds)).dropna().astype(str))})
+    return tenant_entry.get('STANDARD_CODES')
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓘ SERVE sc_map.json, re-reading it only when its modification time changes.  We return a dictionary of:
+#    ⧐ SC_MAP, the parsed list of tenant × subject course mappings; and
+#    ⧐ TENANT_SUBJ_COURSE, those mappings keyed by "<tenantId>_<Subject>".
+def sc_map_courses(cache):
+    sc_map_mtime = os.path.getmtime(cache.get('SC_MAP_PATH'))
+    if (cache.get('SC_MAP') is None) or (sc_map_mtime != cache.get('SC_MAP_MTIME')):
+        with open(cache.get('SC_MAP_PATH')) as sc_map_file:
+            sc_map = json.load(sc_map_file)
+        cache.update({'SC_MAP': {'SC_MAP': sc_map,
+                                 'TENANT_SUBJ_COURSE': dict([(str(list_dict.get(u'tenantId')) + '_' +
+                                                              str(list_dict.get(u'Subject')),
+                                                              {'SihCoursePk': list_dict.get(u'SihCoursePk'),
+                                                               'tenantId': str(list_dict.get(u'tenantId')),
+                                                               'Subject': str(list_dict.get(u'Subject')),
+                                                               'CurrentAcademicYear': str(
+                                                                   list_dict.get(u'CurrentAcademicYear'))})
+                                                             for list_dict in sc_map])},
+                      'SC_MAP_MTIME': sc_map_mtime})
+    return cache.get('SC_MAP')
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓙ REFERENCE-CACHE STATISTICS.  Report the hit, validation, and load counts and the number of tenants held.
+def reference_cache_stats(cache):
+    cache_stats = dict(cache.get('CACHE_STATS'))
+    cache_stats.update({'TENANTS': len(cache.get('TENANTS'))})
+    return cache_stats
@@ -0,0 +1,124 @@
+# coding: utf-8
+## PURPOSE:  ACCUMULATE QUERY RESULTS COLUMN-WISE AND MATERIALIZE ONE DATAFRAME ON DEMAND.  Our inference loops formerly
+## grew dataframes by pd.concat([accumulated, new]) once per subgraph, per evidentiary profile, or per evidentiary
+## state.  Each such concatenation copies everything accumulated so far, so the cost is quadratic in the size of the
+## result.  Per-state bookkeeping — clust_exec_time.loc[state_idx, [...]] = ... — is slower still.  We instead keep,
+## for each column, a list of NumPy arrays.  Appending costs only the new rows.  We concatenate each column once, when
+## the caller asks for the dataframe.
+##
+## MAJOR STEPS IN THE ALGORITHM LOGIC.
+## ① Open.  result_accumulator returns a dictionary holding the column order, a list of array chunks per column, a
+##    list of index chunks, and the accumulated row count.  Columns declared when opening appear — empty — even if
+##    nothing is ever accumulated.
+## ② Append.  accumulate_columns takes a dictionary of column arrays or scalars, accumulate_frame a dataframe, and
+##    accumulate_row a single record.  A column first seen after rows have accumulated is back-filled with NaN, and a
+##    column missing from an append is filled with NaN, as pd.concat would.
+## ③ Materialize.  accumulated_dataframe concatenates each column's chunks once.
+##
+import numpy as np
+import pandas as pd
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓐ OPEN A RESULT ACCUMULATOR.  columns optionally declares the leading columns, in order.
+def result_accumulator(columns=None):
+    columns = list(columns) if columns is not None else list()
+    return {'COLUMNS': columns,
+            'BUFFERS': dict((col_idx, list()) for col_idx in columns),
+            'INDEX': list(),
+            'ROW_COUNT': 0}
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓑ APPEND COLUMNS.  Our inputs are:
+#    ⧐ accumulator, the dictionary from result_accumulator;
+#    ⧐ column_values, a dictionary of column name to an array of row_count values, or to a scalar repeated row_count
+#      times;
+#    ⧐ row_count, the number of rows appended; and
+#    ⧐ index, optionally the row labels.  Rows without labels are labeled by position, as with pd.concat of
+#      default-indexed dataframes.
+#    We return the accumulator.
+def accumulate_columns(accumulator, column_values, row_count, index=None):
+    #    ⑴ Back-fill columns seen for the first time.
+    for col_idx in column_values.keys():
+        if col_idx not in accumulator.get('BUFFERS'):
+            accumulator.get('COLUMNS').append(col_idx)
+            accumulator.get('BUFFERS')[col_idx] = [np.full(accumulator.get('ROW_COUNT'), np.nan)] \
+                if accumulator.get('ROW_COUNT') > 0 else list()
+    #
+    #    ⑵ Append each column's values, broadcasting scalars.  Columns absent from column_values get NaN.
+    for col_idx in accumulator.get('COLUMNS'):
+        if col_idx in column_values:
+            col_values = np.asarray(column_values.get(col_idx))
+            if col_values.ndim == 0:
+                col_values = np.repeat(col_values, row_count)
+        else:
+            col_values = np.full(row_count, np.nan)
+        accumulator.get('BUFFERS').get(col_idx).append(col_values)
+    #
+    #    ⑶ Append the row labels, and count the rows.
+    accumulator.get('INDEX').append(np.asarray(index) if index is not None else np.arange(row_count))
+    accumulator['ROW_COUNT'] = accumulator.get('ROW_COUNT') + row_count
+    return accumulator
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓒ APPEND A DATAFRAME.  const_columns optionally adds columns holding one value for all of the frame's rows — e.g.,
+#    the evidentiary-profile index.  The frame itself is not modified.
+def accumulate_frame(accumulator, frame, const_columns=None):
+    column_values = dict((col_idx, frame[col_idx].values) for col_idx in frame.columns)
+    if const_columns is not None:
+        column_values.update(const_columns)
+    return accumulate_columns(accumulator=accumulator,
+                              column_values=column_values,
+                              row_count=len(frame),
+                              index=frame.index.values)
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓓ APPEND A SINGLE RECORD.  row is a dictionary of column name to value.  This replaces per-state bookkeeping of the
+#    form frame.loc[state_idx, [...]] = [...].
+def accumulate_row(accumulator, row, index=None):
+    return accumulate_columns(accumulator=accumulator,
+                              column_values=dict((col_idx, [value]) for (col_idx, value) in row.items()),
+                              row_count=1,
+                              index=[index] if index is not None else None)
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓔ CONCATENATE A COLUMN'S CHUNKS.  Chunks of differing dtypes — e.g., strings and NaN fill — are combined as objects,
+#    so that NumPy does not coerce NaN to the string 'nan'.
+def concatenate_chunks(chunks):
+    if len(chunks) == 0:
+        return np.array([], dtype=object)
+    if len(set(chunk.dtype for chunk in chunks)) > 1:
+        chunks = [chunk.astype(object) for chunk in chunks]
+    return np.concatenate(chunks)
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓕ MATERIALIZE THE ACCUMULATED DATAFRAME.  columns optionally selects and orders the returned columns.  Otherwise
+#    columns appear in the order in which they were first declared or accumulated.
+def accumulated_dataframe(accumulator, columns=None):
+    columns = list(columns) if columns is not None else accumulator.get('COLUMNS')
+    return pd.DataFrame(data=dict((col_idx, concatenate_chunks(accumulator.get('BUFFERS').get(col_idx, list())))
+                                  for col_idx in columns),
+                        index=concatenate_chunks(accumulator.get('INDEX')),
+                        columns=columns)
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓖ ACCUMULATE AND MATERIALIZE A LIST OF DATAFRAMES.  A convenience for loops that collect whole dataframes.
+def concatenate_frames(frames, columns=None):
+    accumulator = result_accumulator(columns=columns)
+    for frame in frames:
+        accumulate_frame(accumulator=accumulator,
+                         frame=frame)
+    return accumulated_dataframe(accumulator=accumulator)
@@ -0,0 +1,139 @@
+# coding: utf-8
+## PURPOSE:  ANSWER NEIGHBORHOOD QUERIES OVER A LEARNING-STANDARD GRAPH FROM A COMPACT IN-MEMORY INDEX.  A course's
+## neighborhood — the learning standards within two progression hops of its own — was formerly computed by a
+## common-table expression walking SIHLEARNING_STANDARD_HIERARCHY with repeated self-joins, once per course.  We instead
+## load a tenant's PROGRESSION hierarchy once and index it in compressed-sparse-row (CSR) form, in both directions.
+##
+## The graph index is a dictionary holding:
+## ⧐ VERTICES, a pd.Index of the vertex labels.  A vertex's position in VERTICES is its integer identity in the index;
+## ⧐ EDGE_FROM and EDGE_TO, int32 arrays of the positions of each edge's endpoints, in edge order;
+## ⧐ SUCC_PTR, SUCC_VERT, and SUCC_EDGE, the forward adjacency.  The successors of vertex v are
+##   SUCC_VERT[SUCC_PTR[v]:SUCC_PTR[v + 1]], reached by edges SUCC_EDGE[SUCC_PTR[v]:SUCC_PTR[v + 1]]; and
+## ⧐ PRED_PTR, PRED_VERT, and PRED_EDGE, the reverse adjacency, likewise.
+## Edge identities are positions in the edge order in which the index was built, so that callers may keep per-edge
+## attributes — e.g., the rows of the hierarchy dataframe — alongside it.
+##
+## MAJOR STEPS IN THE ALGORITHM LOGIC.
+## ① Build.  build_graph_index indexes an edge list.  extend_graph_index appends edges — e.g., hierarchy rows inserted
+##    since the index was built — keeping existing vertex and edge positions.
+## ② Gather.  adjacent_edges returns, for a set of vertices, the edges incident in a given direction, by vectorized
+##    CSR slicing.
+## ③ Expand.  khop_vertices returns the vertices within k hops of a seed set — along successors, predecessors, or
+##    both — with their hop distances, by frontier-at-a-time breadth-first search.
+##
+import numpy as np
+import pandas as pd
+
+
+#
+#    Directions in which adjacency is followed.
+GRAPH_DIRECTIONS = ['SUCCESSORS', 'PREDECESSORS', 'BOTH']
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓐ COMPRESSED-SPARSE-ROW ADJACENCY.  Group edges by their source position, preserving edge order within each group.
+#    We return (ptr, vert, edge) arrays:  the edges leaving position v are edge[ptr[v]:ptr[v + 1]], and their far
+#    endpoints vert[ptr[v]:ptr[v + 1]].
+def csr_adjacency(src_pos, dst_pos, vert_count):
+    edge_order = np.argsort(src_pos, kind='mergesort')
+    csr_ptr = np.zeros(shape=vert_count + 1, dtype=np.int64)
+    csr_ptr[1:] = np.cumsum(np.bincount(src_pos, minlength=vert_count))
+    return csr_ptr, dst_pos[edge_order].astype(np.int32), edge_order.astype(np.int64)
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓑ BUILD A GRAPH INDEX.  Our inputs are:
+#    ⧐ edge_from and edge_to, equal-length sequences of the edges' endpoint labels; and
+#    ⧐ vertices, optionally, labels of vertices to index whether or not they have edges.
+#    Vertex positions follow the sorted distinct labels.  We return the graph-index dictionary.
+def build_graph_index(edge_from, edge_to, vertices=()):
+    edge_from = pd.Index(list(edge_from))
+    edge_to = pd.Index(list(edge_to))
+    vert_labels = pd.Index(sorted(set(edge_from).union(set(edge_to)).union(set(vertices))))
+    return index_edge_positions(vert_labels=vert_labels,
+                                from_pos=vert_labels.get_indexer(edge_from).astype(np.int32),
+                                to_pos=vert_labels.get_indexer(edge_to).astype(np.int32))
+
+
+def index_edge_positions(vert_labels, from_pos, to_pos):
+    succ_ptr, succ_vert, succ_edge = csr_adjacency(src_pos=from_pos,
+                                                   dst_pos=to_pos,
+                                                   vert_count=len(vert_labels))
+    pred_ptr, pred_vert, pred_edge = csr_adjacency(src_pos=to_pos,
+                                                   dst_pos=from_pos,
+                                                   vert_count=len(vert_labels))
+    return {'VERTICES': vert_labels,
+            'EDGE_FROM': from_pos,
+            'EDGE_TO': to_pos,
+            'SUCC_PTR': succ_ptr,
+            'SUCC_VERT': succ_vert,
+            'SUCC_EDGE': succ_edge,
+            'PRED_PTR': pred_ptr,
+            'PRED_VERT': pred_vert,
+            'PRED_EDGE': pred_edge}
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓒ EXTEND A GRAPH INDEX with additional edges.  Vertices not yet indexed are appended after the existing ones, and the
+#    new edges after the existing edges, so that positions held by callers remain valid.  Only the CSR arrays are
+#    rebuilt.  We return a new graph-index dictionary; the one extended is unchanged.
+def extend_graph_index(graph_index, edge_from, edge_to):
+    edge_from = pd.Index(list(edge_from))
+    edge_to = pd.Index(list(edge_to))
+    new_labels = sorted(set(edge_from).union(set(edge_to)).difference(set(graph_index.get('VERTICES'))))
+    vert_labels = graph_index.get('VERTICES').append(pd.Index(new_labels, dtype=graph_index.get('VERTICES').dtype))
+    return index_edge_positions(vert_labels=vert_labels,
+                                from_pos=np.concatenate([graph_index.get('EDGE_FROM'),
+                                                         vert_labels.get_indexer(edge_from).astype(np.int32)]),
+                                to_pos=np.concatenate([graph_index.get('EDGE_TO'),
+                                                       vert_labels.get_indexer(edge_to).astype(np.int32)]))
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓓ GATHER ADJACENT EDGES.  Our inputs are:
+#    ⧐ graph_index;
+#    ⧐ vert_pos, an array of vertex positions; and
+#    ⧐ direction, 'SUCCESSORS' for edges leaving vert_pos, or 'PREDECESSORS' for edges entering it.
+#    We slice all of the vertices' CSR rows at once:  each row's offsets are a run of consecutive integers starting at
+#    its ptr entry.  We return (edge identities, far-endpoint positions).
+def adjacent_edges(graph_index, vert_pos, direction):
+    csr_prefix = 'SUCC_' if direction == 'SUCCESSORS' else 'PRED_'
+    csr_ptr = graph_index.get(csr_prefix + 'PTR')
+    vert_pos = np.asarray(vert_pos, dtype=np.int64)
+    row_start = csr_ptr[vert_pos]
+    row_len = csr_ptr[vert_pos + 1] - row_start
+    row_offsets = np.repeat(row_start - np.concatenate([[0], np.cumsum(row_len)[:-1]]), row_len) + \
+                  np.arange(row_len.sum())
+    return graph_index.get(csr_prefix + 'EDGE')[row_offsets], graph_index.get(csr_prefix + 'VERT')[row_offsets]
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓔ K-HOP NEIGHBORHOOD.  Our inputs are:
+#    ⧐ graph_index;
+#    ⧐ seed_pos, an array of seed-vertex positions;
+#    ⧐ hops, the largest hop distance retained; and
+#    ⧐ direction, one of GRAPH_DIRECTIONS.  'BOTH' follows edges irrespective of their orientation.
+#    Each breadth-first step gathers the whole frontier's adjacency at once and keeps the vertices not yet reached.  We
+#    return (vertex positions, hop distances), in order of discovery.
+def khop_vertices(graph_index, seed_pos, hops, direction='BOTH'):
+    hop_dist = np.full(shape=len(graph_index.get('VERTICES')), fill_value=-1, dtype=np.int32)
+    frontier = np.unique(np.asarray(seed_pos, dtype=np.int64))
+    hop_dist[frontier] = 0
+    reached = [frontier]
+    for hop_idx in range(1, int(hops) + 1):
+        if len(frontier) == 0: break
+        far_pos = [adjacent_edges(graph_index=graph_index,
+                                  vert_pos=frontier,
+                                  direction=adj_direction)[1]
+                   for adj_direction in (['SUCCESSORS', 'PREDECESSORS'] if direction == 'BOTH' else [direction])]
+        frontier = np.unique(np.concatenate(far_pos)).astype(np.int64)
+        frontier = frontier[hop_dist[frontier] < 0]
+        hop_dist[frontier] = hop_idx
+        reached.append(frontier)
+    reached = np.concatenate(reached)
+    return reached, hop_dist[reached]
@@ -0,0 +1,430 @@
+# coding: utf-8
+## PURPOSE:  DECOMPOSE AN IN-RANGE DIGRAPH INTO "BITE-SIZED" ESTIMATION SUBGRAPHS.  decompose_digraph formerly copied the
+## composite digraph, removed its high-valency vertices, and took connected components.  It then called
+## measurement_extend_subgraph for every component, which composed a radius-one ego graph for each boundary vertex, built
+## two edge dataframes for graph_vert_class, and computed the component's diameter by all-pairs breadth-first search.
+## We instead index the composite digraph once, in CSR form, and derive every step from that one index.  The
+## subgraphs — their keys, vertex sets, and edge sets — are those the former logic produced.
+##
+## MAJOR STEPS IN THE ALGORITHM LOGIC.
+## ① Index.  decomposition_index translates the composite digraph into a STANDARD_GRAPH_INDEX graph index whose vertex
+##    positions follow the digraph's vertex order, and adds each vertex's undirected neighbor set.
+## ② Separate.  We formerly removed every vertex of degree six or more, and flagged subgraphs of twelve vertices or fewer
+##    as not complex.  Neither tracks the cost of inference, which grows exponentially with the largest clique of the
+##    moral graph.  separator_vertices instead estimates each component's treewidth by a min-degree — or min-fill —
+##    elimination, and removes a vertex of the widest elimination clique only while that clique exceeds
+##    CLIQUE_SIZE_BUDGET vertices.  Removed vertices are the centers of star graphs.
+## ③ Decompose.  Connected components of the reduced graph are computed over the edge arrays.  Boundary vertices —
+##    roots and leaves within their components — come from component-local in- and out-degree counts.
+##    measurement_extend_subgraph extends each component with set operations over the neighbor sets, and bounds its
+##    diameter test with breadth-first searches that stop at depth three.  Each subgraph records its moral-graph treewidth
+##    and the estimated cost of a query.
+## ④ Memoize.  A decomposition depends only on the composite digraph and the measured vertices within it.  We keep a
+##    process-wide, size-bounded LRU memo keyed by the digraph's canonical signature, its measured vertices, and the
+##    clique budget, knowledge-level count, and elimination heuristic.
+##
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+import networkx as nx
+from networkx.algorithms.approximation import treewidth_min_degree, treewidth_min_fill_in
+from STANDARD_GRAPH_INDEX import index_edge_positions
+from NUMPY_SUM_PRODUCT_INFERENCE import canonical_graph_signature, moral_graph_treewidth, BATCH_LABEL
+
+
+#
+#    Components are separated until the largest clique of a min-degree elimination of their moral graph holds at most
+#    CLIQUE_SIZE_BUDGET vertices — var_card ** CLIQUE_SIZE_BUDGET cells — and they hold at most SUBGRAPH_ORDER_LIMIT
+#    vertices, the most the exact engines can contract.  ELIMINATION_HEURISTICS are the admissible elimination orders.
+#    Spanning subgraphs within the clique budget are flagged NOT_COMPLEX_GRAPH.  Query costs are estimated for
+#    DECOMPOSITION_VAR_CARD knowledge levels unless the caller supplies its own count.  Unmeasured vertices on the
+#    extended boundary are dropped from spanning subgraphs whose diameter is at least EXTENDED_DIAMETER_LIMIT.
+CLIQUE_SIZE_BUDGET = 8
+SUBGRAPH_ORDER_LIMIT = BATCH_LABEL
+ELIMINATION_HEURISTICS = {'MIN_DEGREE': treewidth_min_degree,
+                          'MIN_FILL': treewidth_min_fill_in}
+DECOMPOSITION_VAR_CARD = 4
+EXTENDED_DIAMETER_LIMIT = 4
+#
+#    The decomposition memo holds at most DECOMPOSITION_MEMO_SIZE decompositions.  Its hit, miss, and eviction counters
+#    are reported by decomposition_memo_stats.
+DECOMPOSITION_MEMO_SIZE = 1024
+DECOMPOSITION_MEMO = OrderedDict()
+DECOMPOSITION_MEMO_COUNTS = {'HITS': 0, 'MISSES': 0, 'EVICTIONS': 0}
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓐ INDEX A COMPOSITE DIGRAPH.  We return a graph index — see STANDARD_GRAPH_INDEX — for composite_digraph, with vertex
+#    positions in composite_digraph's vertex order, to which we add:
+#    ⧐ NEIGHBORS, a list holding for each vertex position the set of positions adjacent in either direction; and
+#    ⧐ DEGREE, an array of vertex degrees, in-degree plus out-degree, as networkx counts them.
+def decomposition_index(composite_digraph):
+    vert_labels = pd.Index(list(composite_digraph.nodes()), dtype=object)
+    digraph_edges = list(composite_digraph.edges())
+    graph_index = index_edge_positions(vert_labels=vert_labels,
+                                       from_pos=vert_labels.get_indexer([edge[0] for edge in digraph_edges]) \
+                                           .astype(np.int32),
+                                       to_pos=vert_labels.get_indexer([edge[1] for edge in digraph_edges]) \
+                                           .astype(np.int32))
+    vert_neighbors = [set() for vert_pos in range(len(vert_labels))]
+    for (from_pos, to_pos) in zip(graph_index.get('EDGE_FROM').tolist(), graph_index.get('EDGE_TO').tolist()):
+        vert_neighbors[from_pos].add(to_pos)
+        vert_neighbors[to_pos].add(from_pos)
+    graph_index.update({'NEIGHBORS': vert_neighbors,
+                        'DEGREE': np.bincount(graph_index.get('EDGE_FROM'), minlength=len(vert_labels)) +
+                                  np.bincount(graph_index.get('EDGE_TO'), minlength=len(vert_labels))})
+    return graph_index
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓑ CONNECTED-COMPONENT LABELS.  Our inputs are graph_index and vert_mask, a boolean array of the vertices retained.  We
+#    propagate the smallest vertex position along the retained edges until no label changes.  Each retained vertex ends
+#    up labeled by the first position in its component, the vertex from which networkx' connected_components would
+#    have started it.  Vertices not retained are labeled -1.
+def component_labels(graph_index, vert_mask):
+    edge_from = graph_index.get('EDGE_FROM')
+    edge_to = graph_index.get('EDGE_TO')
+    edge_mask = vert_mask[edge_from] & vert_mask[edge_to]
+    (edge_from, edge_to) = (edge_from[edge_mask], edge_to[edge_mask])
+    comp_label = np.where(vert_mask, np.arange(len(vert_mask)), -1)
+    while True:
+        edge_label = np.minimum(comp_label[edge_from], comp_label[edge_to])
+        prior_label = comp_label.copy()
+        np.minimum.at(comp_label, edge_from, edge_label)
+        np.minimum.at(comp_label, edge_to, edge_label)
+        comp_label[vert_mask] = comp_label[comp_label[vert_mask]]
+        if np.array_equal(comp_label, prior_label): break
+    return comp_label
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓒ BUILD A SUBGRAPH FROM VERTEX AND EDGE POSITIONS.  We return a networkx DiGraph whose vertices — vert_pos — and edges
+#    — edge_ids — are added in graph_index order.
+def position_subgraph(graph_index, vert_pos, edge_ids):
+    vert_labels = graph_index.get('VERTICES')
+    edge_ids = np.sort(np.asarray(edge_ids, dtype=np.int64))
+    position_digraph = nx.DiGraph()
+    position_digraph.add_nodes_from(vert_labels[np.sort(np.asarray(vert_pos, dtype=np.int64))].tolist())
+    position_digraph.add_edges_from(zip(vert_labels[graph_index.get('EDGE_FROM')[edge_ids]].tolist(),
+                                        vert_labels[graph_index.get('EDGE_TO')[edge_ids]].tolist()))
+    return position_digraph
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓓ BOUNDED DIAMETER TEST.  Our inputs are vert_neighbors, a dictionary of the undirected neighbor sets of a connected
+#    graph, and diameter_limit.  The diameter reaches diameter_limit exactly when some vertex has vertices farther than
+#    diameter_limit - 1 steps away.  We search from one vertex at a time — least-connected vertices, the likeliest to be
+#    peripheral, first — stopping each search at depth diameter_limit - 1 and returning True at the first vertex whose
+#    search leaves vertices unreached.
+def diameter_reaches(vert_neighbors, diameter_limit):
+    vert_count = len(vert_neighbors)
+    for vert_idx in sorted(vert_neighbors.keys(), key=lambda vert: len(vert_neighbors.get(vert))):
+        reached = set([vert_idx])
+        frontier = set([vert_idx])
+        for hop_idx in range(diameter_limit - 1):
+            frontier = set().union(*[vert_neighbors.get(vert) for vert in frontier]) - reached
+            if len(frontier) == 0: break
+            reached.update(frontier)
+        if len(reached) < vert_count: return True
+    return False
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓔ EXTEND GRAPHICAL SPAN OF AN INDUCED SUBGRAPH BY ADDING MEASURED VERTICES WITHIN ONE GRAPHICAL STEP OF BOUNDARY VERTICES.
+#    Our inputs are:
+#    ⧐ graph_index, the decomposition_index of the composite digraph;
+#    ⧐ comp_pos, the vertex positions of the induced subgraph;
+#    ⧐ boundary_pos, the positions of its boundary vertices, {root vertices} ∪ {leaf vertices};
+#    ⧐ comp_edge_ids, the identities of its edges; and
+#    ⧐ measured_mask, a boolean array marking the measured vertex positions.
+#
+#    The former logic composed with the induced subgraph a radius-one ego graph of the composite digraph for each boundary
+#    vertex.  An ego graph holds every edge both of whose endpoints lie within one step of its center.  So the extended
+#    subgraph holds, beyond the induced subgraph's own edges, the composite edges incident to a boundary vertex, and those
+#    whose endpoints share a boundary vertex as a common neighbor.  We select those edges with set operations.
+#
+#    Unmeasured vertices on the extended subgraph's boundary — excluding boundary vertices of the induced subgraph —
+#    are removed if its diameter is at least EXTENDED_DIAMETER_LIMIT.  We return a dictionary with the SPANNING_SUBGRAPH,
+#    SPANNING_SUBGRAPH_VERTS, and MEAS_SPANNING_SUBGRAPH_VERTS items.
+def measurement_extend_subgraph(graph_index, comp_pos, boundary_pos, comp_edge_ids, measured_mask):
+    vert_neighbors = graph_index.get('NEIGHBORS')
+    edge_from = graph_index.get('EDGE_FROM')
+    edge_to = graph_index.get('EDGE_TO')
+    boundary_set = set(boundary_pos)
+    #
+    #    ⑴ The extended vertex set adds the neighbors of the boundary vertices.
+    extended_set = set(comp_pos).union(*[vert_neighbors[vert_pos] for vert_pos in boundary_pos])
+    #
+    #    ⑵ Select the edges among the extended vertices that lie within some boundary vertex's ego graph.
+    extended_mask = np.zeros(shape=len(vert_neighbors), dtype=bool)
+    extended_mask[list(extended_set)] = True
+    candidate_ids = np.flatnonzero(extended_mask[edge_from] & extended_mask[edge_to])
+    extended_edge_ids = set(comp_edge_ids)
+    for edge_id in candidate_ids.tolist():
+        if edge_id in extended_edge_ids: continue
+        (from_pos, to_pos) = (int(edge_from[edge_id]), int(edge_to[edge_id]))
+        if from_pos in boundary_set or to_pos in boundary_set or \
+                not boundary_set.isdisjoint(vert_neighbors[from_pos] & vert_neighbors[to_pos]):
+            extended_edge_ids.add(edge_id)
+    extended_edge_ids = sorted(extended_edge_ids)
+    #
+    #    ⑶ Classify the boundary of the extended subgraph.  Every extended vertex has an extended edge.
+    extended_from = edge_from[extended_edge_ids]
+    extended_to = edge_to[extended_edge_ids]
+    extended_boundary = (set(extended_from.tolist()) ^ set(extended_to.tolist())) - boundary_set
+    unmeasured_boundary = set(vert_pos for vert_pos in extended_boundary if not measured_mask[vert_pos])
+    #
+    #    ⑷ Remove the unmeasured extended-boundary vertices if the diameter of the extended subgraph reaches
+    #       EXTENDED_DIAMETER_LIMIT.
+    #       Its adjacency is that of the extended edges, not of all composite edges among the extended vertices.
+    extended_neighbors = dict((vert_pos, set()) for vert_pos in extended_set)
+    for (from_pos, to_pos) in zip(extended_from.tolist(), extended_to.tolist()):
+        extended_neighbors.get(from_pos).add(to_pos)
+        extended_neighbors.get(to_pos).add(from_pos)
+    if len(unmeasured_boundary) > 0 and \
+            diameter_reaches(vert_neighbors=extended_neighbors,
+                             diameter_limit=EXTENDED_DIAMETER_LIMIT):
+        extended_set = extended_set - unmeasured_boundary
+        extended_edge_ids = [edge_id for (edge_id, from_pos, to_pos) in
+                             zip(extended_edge_ids, extended_from.tolist(), extended_to.tolist())
+                             if from_pos in extended_set and to_pos in extended_set]
+    #
+    #    ⑸ Construct and return our return-value dictionary item.
+    spanning_subgraph = position_subgraph(graph_index=graph_index,
+                                          vert_pos=list(extended_set),
+                                          edge_ids=extended_edge_ids)
+    return {'SPANNING_SUBGRAPH': spanning_subgraph,
+            'MEAS_SPANNING_SUBGRAPH_VERTS': graph_index.get('VERTICES')[sorted(vert_pos for vert_pos in extended_set
+                                                                              if measured_mask[vert_pos])].tolist(),
+            'SPANNING_SUBGRAPH_VERTS': list(spanning_subgraph.nodes())}
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓕ MORAL GRAPH OF A VERTEX SET.  We return the moral graph — the undirected edges plus an edge between every two
+#    co-parents — of the subgraph of graph_index induced by comp_pos, a list of vertex positions, as a networkx Graph
+#    on those positions.
+def position_moral_graph(graph_index, comp_pos):
+    vert_neighbors = graph_index.get('NEIGHBORS')
+    pred_ptr = graph_index.get('PRED_PTR')
+    pred_vert = graph_index.get('PRED_VERT')
+    comp_set = set(comp_pos)
+    moral_graph = nx.Graph()
+    moral_graph.add_nodes_from(comp_pos)
+    moral_graph.add_edges_from((vert_pos, nbr_pos) for vert_pos in comp_pos
+                               for nbr_pos in vert_neighbors[vert_pos] & comp_set)
+    for vert_pos in comp_pos:
+        parent_pos = [pred_pos for pred_pos in pred_vert[pred_ptr[vert_pos]:pred_ptr[vert_pos + 1]].tolist()
+                      if pred_pos in comp_set]
+        moral_graph.add_edges_from((parent_pos[first_idx], parent_pos[second_idx])
+                                   for first_idx in range(len(parent_pos))
+                                   for second_idx in range(first_idx + 1, len(parent_pos)))
+    return moral_graph
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓖ FIND SEPARATOR VERTICES.  Our inputs are:
+#    ⧐ graph_index, the decomposition_index of the composite digraph;
+#    ⧐ clique_budget, the largest admissible elimination clique, in vertices;
+#    ⧐ order_limit, the largest admissible component, in vertices; and
+#    ⧐ heuristic, one of the ELIMINATION_HEURISTICS keys.
+#
+#    We keep a work list of vertex sets, initially the connected components of the composite digraph.  For each set we
+#    ⑴ cut at its highest-degree vertex if it holds more than order_limit vertices; otherwise
+#    ⑵ build its moral graph with position_moral_graph and eliminate it by the heuristic.  If the widest elimination
+#       clique — a bag of the resulting tree decomposition — exceeds clique_budget, we cut at the vertex of that bag
+#       with the most moral-graph neighbors.
+#    Cutting a vertex separates the set into the components of its remainder, which rejoin the work list.  Sets within
+#    both limits are final.  Degree ties go to the earlier vertex.  We return a boolean array marking the separators.
+def separator_vertices(graph_index, clique_budget, order_limit, heuristic='MIN_DEGREE'):
+    vert_neighbors = graph_index.get('NEIGHBORS')
+    separator_mask = np.zeros(shape=len(vert_neighbors), dtype=bool)
+    comp_label = component_labels(graph_index=graph_index,
+                                  vert_mask=~separator_mask)
+    work_list = [np.flatnonzero(comp_label == comp_first).tolist() for comp_first in np.unique(comp_label).tolist()]
+    while len(work_list) > 0:
+        comp_pos = work_list.pop()
+        if len(comp_pos) <= 2: continue
+        comp_set = set(comp_pos)
+        if len(comp_pos) > order_limit:
+            cut_pos = max(comp_pos, key=lambda vert_pos: (len(vert_neighbors[vert_pos] & comp_set), -vert_pos))
+        else:
+            moral_graph = position_moral_graph(graph_index=graph_index,
+                                               comp_pos=comp_pos)
+            if len(moral_graph.edges()) == 0: continue
+            widest_bag = max(ELIMINATION_HEURISTICS.get(heuristic)(moral_graph)[1].nodes(), key=len)
+            if len(widest_bag) <= clique_budget: continue
+            cut_pos = max(widest_bag, key=lambda vert_pos: (moral_graph.degree(vert_pos), -vert_pos))
+        separator_mask[cut_pos] = True
+        remainder_mask = np.zeros(shape=len(vert_neighbors), dtype=bool)
+        remainder_mask[list(comp_set - set([cut_pos]))] = True
+        comp_label = component_labels(graph_index=graph_index,
+                                      vert_mask=remainder_mask)
+        work_list.extend(np.flatnonzero(comp_label == comp_first).tolist()
+                         for comp_first in np.unique(comp_label[comp_label >= 0]).tolist())
+    return separator_mask
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓗ ESTIMATE SUBGRAPH QUERY COST.  We return the moral-graph treewidth of a spanning subgraph — by the min-fill-in
+#    heuristic the inference engines use — its largest-clique cell count, and ESTIMATED_COST, the graph order times
+#    that cell count.  This is the junction-tree cost feature of INFERENCE_ROUTER:  cells touched per evidentiary state.
+def subgraph_cost_estimate(spanning_subgraph, var_card):
+    treewidth = moral_graph_treewidth(spanning_subgraph)
+    return {'TREEWIDTH': treewidth,
+            'CLIQUE_CELL_COUNT': var_card ** (treewidth + 1),
+            'ESTIMATED_COST': len(spanning_subgraph.nodes()) * var_card ** (treewidth + 1)}
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓘ DECOMPOSE GRAPH INTO SUBGRAPHS.  We must manage computational complexity associated with large graphs. We decompose
+#    them into overlapping subgraphs:
+#    ⧐ Ego-one subgraphs — star graphs — centered on the separator vertices found by separator_vertices; and
+#    ⧐ Connected-component subgraphs from the composite graph once the separator vertices are removed, each extended
+#      by measurement_extend_subgraph.
+#
+#    Our function inputs include:
+#    ⧐ composite_digraph, the networkx digraph produced by build_induced_inrange_graph;
+#    ⧐ measured_verts, the vertices for which evidentiary measurements are available;
+#    ⧐ prof_idx, the evidentiary profile, retained for the callers' convenience;
+#    ⧐ clique_budget, the largest admissible elimination clique, in vertices;
+#    ⧐ var_card, the number of knowledge levels, by which query costs are estimated; and
+#    ⧐ heuristic, the elimination heuristic by which separator_vertices estimates treewidth.
+#
+#    We return a dictionary of subgraph dictionaries.  A component's key is SUBGRAPH_ followed by its ordinal among the
+#    components of the reduced graph, and a star graph's SUBGRAPH_VERT_ followed by its center vertex.  We discard
+#    singleton components, subgraphs whose vertices are all measured, subgraphs with no measured vertex, and subgraphs
+#    that are not directed acyclic.  Each returned subgraph dictionary holds INDUCED_SUBGRAPH, INDUCED_SUBGRAPH_VERTS,
+#    MEAS_INDUCED_SUBGRAPH_VERTS, SPANNING_SUBGRAPH, SPANNING_SUBGRAPH_VERTS, MEAS_SPANNING_SUBGRAPH_VERTS,
+#    IS_STAR_GRAPH, and NOT_COMPLEX_GRAPH items, and the TREEWIDTH, CLIQUE_CELL_COUNT, and ESTIMATED_COST items of
+#    subgraph_cost_estimate.
+#
+#    Identical composite digraphs and measured vertices recur across evidentiary profiles and courses.  We look each
+#    decomposition up in DECOMPOSITION_MEMO before computing it.  The subgraph dictionaries are shared with
+#    other callers and must not be modified.
+def decompose_digraph(composite_digraph, measured_verts, prof_idx=None, clique_budget=CLIQUE_SIZE_BUDGET,
+                      var_card=DECOMPOSITION_VAR_CARD, heuristic='MIN_DEGREE'):
+    measured_set = set(measured_verts).intersection(set(composite_digraph.nodes()))
+    memo_key = (canonical_graph_signature(composite_digraph),
+                tuple(sorted(str(vert_idx) for vert_idx in measured_set)),
+                clique_budget,
+                var_card,
+                heuristic)
+    if memo_key in DECOMPOSITION_MEMO:
+        DECOMPOSITION_MEMO_COUNTS['HITS'] += 1
+        DECOMPOSITION_MEMO[memo_key] = DECOMPOSITION_MEMO.pop(memo_key)
+    else:
+        DECOMPOSITION_MEMO_COUNTS['MISSES'] += 1
+        DECOMPOSITION_MEMO[memo_key] = compute_digraph_decomposition(composite_digraph=composite_digraph,
+                                                                     measured_set=measured_set,
+                                                                     clique_budget=clique_budget,
+                                                                     var_card=var_card,
+                                                                     heuristic=heuristic)
+        while len(DECOMPOSITION_MEMO) > DECOMPOSITION_MEMO_SIZE:
+            DECOMPOSITION_MEMO.popitem(last=False)
+            DECOMPOSITION_MEMO_COUNTS['EVICTIONS'] += 1
+    return OrderedDict(DECOMPOSITION_MEMO.get(memo_key))
+
+
+def compute_digraph_decomposition(composite_digraph, measured_set, clique_budget, var_card, heuristic):
+    #    🄰 Index composite_digraph.  Identify the separator vertices.
+    graph_index = decomposition_index(composite_digraph=composite_digraph)
+    vert_labels = graph_index.get('VERTICES')
+    edge_from = graph_index.get('EDGE_FROM')
+    edge_to = graph_index.get('EDGE_TO')
+    measured_mask = np.asarray(vert_labels.isin(list(measured_set)))
+    separator_mask = separator_vertices(graph_index=graph_index,
+                                          clique_budget=clique_budget,
+                                          order_limit=SUBGRAPH_ORDER_LIMIT,
+                                          heuristic=heuristic)
+    #
+    #    🄱 Label the connected components of the graph reduced by the separator vertices.  Components are numbered in
+    #       order of their first vertex, singletons included.
+    comp_label = component_labels(graph_index=graph_index,
+                                  vert_mask=~separator_mask)
+    comp_firsts = np.unique(comp_label[comp_label >= 0])
+    comp_sizes = np.bincount(comp_label[comp_label >= 0], minlength=len(vert_labels))
+    #
+    #    🄲 Count each vertex's in- and out-edges within its own component.  Roots and leaves of a component are the
+    #       boundary vertices lacking one or the other.
+    comp_edge_mask = (comp_label[edge_from] >= 0) & (comp_label[edge_from] == comp_label[edge_to])
+    comp_in_degree = np.bincount(edge_to[comp_edge_mask], minlength=len(vert_labels))
+    comp_out_degree = np.bincount(edge_from[comp_edge_mask], minlength=len(vert_labels))
+    boundary_mask = (comp_label >= 0) & ((comp_in_degree == 0) | (comp_out_degree == 0))
+    comp_edge_ids = np.flatnonzero(comp_edge_mask)
+    comp_edge_groups = pd.Series(comp_edge_ids).groupby(comp_label[edge_from[comp_edge_ids]]).apply(list).to_dict() \
+        if len(comp_edge_ids) > 0 else dict()
+    #
+    #    🄳 Build and extend each component of more than one vertex.
+    digraph_subgraphs = OrderedDict()
+    for (comp_ordinal, comp_first) in enumerate(comp_firsts.tolist()):
+        if comp_sizes[comp_first] <= 1: continue
+        comp_pos = np.flatnonzero(comp_label == comp_first)
+        induced_subgraph = composite_digraph.subgraph(vert_labels[comp_pos].tolist())
+        subgraph_dict_item = {'INDUCED_SUBGRAPH': induced_subgraph,
+                              'INDUCED_SUBGRAPH_VERTS': vert_labels[comp_pos].tolist(),
+                              'MEAS_INDUCED_SUBGRAPH_VERTS': set(vert_labels[comp_pos[measured_mask[comp_pos]]].tolist()),
+                              'IS_STAR_GRAPH': False}
+        subgraph_dict_item.update(measurement_extend_subgraph(graph_index=graph_index,
+                                                              comp_pos=comp_pos.tolist(),
+                                                              boundary_pos=comp_pos[boundary_mask[comp_pos]].tolist(),
+                                                              comp_edge_ids=comp_edge_groups.get(comp_first, []),
+                                                              measured_mask=measured_mask))
+        digraph_subgraphs['SUBGRAPH_' + str(comp_ordinal)] = subgraph_dict_item
+    #
+    #    🄴 Add the ego-one subgraph of composite_digraph centered on each separator vertex.
+    for center_pos in np.flatnonzero(separator_mask).tolist():
+        ego_pos = sorted(graph_index.get('NEIGHBORS')[center_pos] | set([center_pos]))
+        ego_mask = np.zeros(shape=len(vert_labels), dtype=bool)
+        ego_mask[ego_pos] = True
+        ego_subgraph = position_subgraph(graph_index=graph_index,
+                                         vert_pos=ego_pos,
+                                         edge_ids=np.flatnonzero(ego_mask[edge_from] & ego_mask[edge_to]))
+        ego_measured = set(vert_labels[[vert_pos for vert_pos in ego_pos if measured_mask[vert_pos]]].tolist())
+        digraph_subgraphs['SUBGRAPH_VERT_' + str(vert_labels[center_pos])] = {
+            'SPANNING_SUBGRAPH': ego_subgraph,
+            'SPANNING_SUBGRAPH_VERTS': list(ego_subgraph.nodes()),
+            'INDUCED_SUBGRAPH': ego_subgraph,
+            'INDUCED_SUBGRAPH_VERTS': list(ego_subgraph.nodes()),
+            'MEAS_INDUCED_SUBGRAPH_VERTS': ego_measured,
+            'MEAS_SPANNING_SUBGRAPH_VERTS': ego_measured,
+            'IS_STAR_GRAPH': True}
+    #
+    #    🄵 Discard degenerate subgraphs:  those whose vertices are all measured, those with no measured vertex, and
+    #       those that are not directed acyclic.  Estimate the query cost of the rest, and flag those within the clique
+    #       budget as not complex.
+    for subgraph_key in list(digraph_subgraphs.keys()):
+        subgraph_dict_item = digraph_subgraphs.get(subgraph_key)
+        if len(subgraph_dict_item.get('MEAS_INDUCED_SUBGRAPH_VERTS')) == \
+                len(subgraph_dict_item.get('INDUCED_SUBGRAPH_VERTS')) or \
+                len(subgraph_dict_item.get('MEAS_SPANNING_SUBGRAPH_VERTS')) == 0 or \
+                not nx.is_directed_acyclic_graph(G=subgraph_dict_item.get('SPANNING_SUBGRAPH')):
+            del digraph_subgraphs[subgraph_key]
+            continue
+        subgraph_dict_item.update(subgraph_cost_estimate(spanning_subgraph=subgraph_dict_item.get('SPANNING_SUBGRAPH'),
+                                                         var_card=var_card))
+        subgraph_dict_item.update({'NOT_COMPLEX_GRAPH': subgraph_dict_item.get('TREEWIDTH') + 1 <= clique_budget})
+    return digraph_subgraphs
+
+
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓙ REPORT AND CLEAR THE DECOMPOSITION MEMO.
+def decomposition_memo_stats():
+    memo_stats = dict(DECOMPOSITION_MEMO_COUNTS)
+    memo_stats.update({'SIZE': len(DECOMPOSITION_MEMO)})
+    return memo_stats
+
+
+def clear_decomposition_memo():
+    DECOMPOSITION_MEMO.clear()
+    for count_key in list(DECOMPOSITION_MEMO_COUNTS.keys()):
+        DECOMPOSITION_MEMO_COUNTS[count_key] = 0
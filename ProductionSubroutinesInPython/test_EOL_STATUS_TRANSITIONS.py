@@ -0,0 +1,127 @@
+# coding: utf-8
+## PURPOSE:  EXERCISE EOL_STATUS_TRANSITIONS AGAINST SQLITE.  We build a small EOL_MEAS table in an in-memory SQLite
+## database, and move its measurements PENDING → RUNNING → DONE, NOTPROCESSED, and ERROR through stage_eol_keys and
+## transition_eol_status, as worker does, checking the status of every row after each step.
+##
+import sqlite3
+import pytest
+from EOL_STATUS_TRANSITIONS import open_eol_status_transitioner, stage_eol_keys, transition_eol_status
+
+
+#
+#    (EOL_MEAS_ID, TENANT_ID, SIHPERSON_PKID, LEARNING_STANDARD_ID).  Tenant 1's course enrolls students 11 and 12 in
+#    learning standards 101 and 102.  Student 13 and learning standard 103 lie outside the course, and tenant 2 shares
+#    its identifiers.
+EOL_MEAS_ROWS = [(1, 1, 11, 101),
+                 (2, 1, 11, 102),
+                 (3, 1, 12, 101),
+                 (4, 1, 12, 102),
+                 (5, 1, 13, 101),
+                 (6, 1, 11, 103),
+                 (7, 2, 11, 101)]
+
+
+def eol_transitioner():
+    connection = sqlite3.connect(':memory:')
+    connection.execute('CREATE TABLE EOL_MEAS (EOL_MEAS_ID INTEGER PRIMARY KEY, TENANT_ID INTEGER, '
+                       'SIHPERSON_PKID BIGINT, LEARNING_STANDARD_ID BIGINT, STATUS VARCHAR(16), IS_LOCK CHAR(1))')
+    connection.executemany("INSERT INTO EOL_MEAS VALUES (?, ?, ?, ?, 'PENDING', 'N')", EOL_MEAS_ROWS)
+    connection.commit()
+    return open_eol_status_transitioner(connection=connection,
+                                        connection_type='DBAPI',
+                                        eol_table='EOL_MEAS')
+
+
+def eol_statuses(transitioner):
+    return dict(transitioner.get('CONNECTION').execute('SELECT EOL_MEAS_ID, STATUS || IS_LOCK FROM EOL_MEAS'))
+
+
+def start_course(transitioner):
+    stage_eol_keys(transitioner=transitioner,
+                   key_set='COURSE_STUDENT',
+                   key_values=['11', '12', '11'])
+    stage_eol_keys(transitioner=transitioner,
+                   key_set='COURSE_STANDARD',
+                   key_values=['101', '102', None])
+    return transition_eol_status(transitioner=transitioner,
+                                 from_status='PENDING',
+                                 to_status='RUNNING',
+                                 tenant_id=1,
+                                 scope='COURSE',
+                                 from_lock='N',
+                                 to_lock='S')
+
+
+def test_pending_to_running_in_course():
+    transitioner = eol_transitioner()
+    assert start_course(transitioner) == 4
+    assert eol_statuses(transitioner) == {1: 'RUNNINGS', 2: 'RUNNINGS', 3: 'RUNNINGS', 4: 'RUNNINGS',
+                                          5: 'PENDINGN', 6: 'PENDINGN', 7: 'PENDINGN'}
+
+
+def test_running_to_done_and_notprocessed():
+    transitioner = eol_transitioner()
+    start_course(transitioner)
+    stage_eol_keys(transitioner=transitioner,
+                   key_set='PROCESSED_STUDENT',
+                   key_values=['11'])
+    stage_eol_keys(transitioner=transitioner,
+                   key_set='PROCESSED_STANDARD',
+                   key_values=['101', '102'])
+    assert transition_eol_status(transitioner=transitioner,
+                                 from_status='RUNNING',
+                                 to_status='DONE',
+                                 tenant_id=1,
+                                 scope='PROCESSED') == 2
+    assert transition_eol_status(transitioner=transitioner,
+                                 from_status='RUNNING',
+                                 to_status='NOTPROCESSED',
+                                 tenant_id=1,
+                                 scope='COURSE') == 2
+    assert eol_statuses(transitioner) == {1: 'DONES', 2: 'DONES', 3: 'NOTPROCESSEDS', 4: 'NOTPROCESSEDS',
+                                          5: 'PENDINGN', 6: 'PENDINGN', 7: 'PENDINGN'}
+
+
+def test_running_to_error_in_processed_error_scope():
+    transitioner = eol_transitioner()
+    start_course(transitioner)
+    for (key_set, key_values) in [('PROCESSED_STUDENT', ['11']),
+                                  ('PROCESSED_STANDARD', ['101', '102']),
+                                  ('UNPROCESSED_STUDENT', ['12']),
+                                  ('UNPROCESSED_STANDARD', ['102'])]:
+        stage_eol_keys(transitioner=transitioner,
+                       key_set=key_set,
+                       key_values=key_values)
+    assert transition_eol_status(transitioner=transitioner,
+                                 from_status='RUNNING',
+                                 to_status='ERROR',
+                                 tenant_id=1,
+                                 scope='PROCESSED_ERROR') == 2
+    assert eol_statuses(transitioner) == {1: 'RUNNINGS', 2: 'ERRORS', 3: 'RUNNINGS', 4: 'ERRORS',
+                                          5: 'PENDINGN', 6: 'PENDINGN', 7: 'PENDINGN'}
+
+
+def test_restaging_replaces_key_set():
+    transitioner = eol_transitioner()
+    stage_eol_keys(transitioner=transitioner,
+                   key_set='COURSE_STUDENT',
+                   key_values=['13'])
+    assert start_course(transitioner) == 4
+    assert eol_statuses(transitioner).get(5) == 'PENDINGN'
+
+
+def test_non_integer_keys_are_rejected():
+    transitioner = eol_transitioner()
+    stage_eol_keys(transitioner=transitioner,
+                   key_set='COURSE_STUDENT',
+                   key_values=['11'])
+    with pytest.raises(ValueError):
+        stage_eol_keys(transitioner=transitioner,
+                       key_set='COURSE_STUDENT',
+                       key_values=['12', 'S-12'])
+    with pytest.raises(ValueError):
+        stage_eol_keys(transitioner=transitioner,
+                       key_set='COURSE_STUDENT',
+                       key_values=['12.5'])
+    assert transitioner.get('CONNECTION').execute("SELECT KEY_VALUE FROM EOL_KEY_STAGE "
+                                                  "WHERE KEY_SET = 'COURSE_STUDENT'").fetchall() == [(11,)]
@@ -1,70 +1,61 @@
+import numpy as np
 #
 #
 # |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
-# ⓖ REDUCE CONDITIONAL PROBABILITY DISTRIBUTION. Start with a 'quiescent' conditional-probability distribution. Marginalize out 
+# ⓖ REDUCE CONDITIONAL PROBABILITY DISTRIBUTION. Start with a 'quiescent' conditional-probability distribution. Marginalize out
 #    a specified conditioning variable with a specified distribution.  Return the reduced probability distribution.
 #
 #    Our inputs are:
+#    ⧐ parent_verts, the predecessors of the target vertex, in the order of the axes of its conditional-probability table;
+#    ⧐ vertex, The target vertex for which the reduced conditional probability is desired;
+#    ⧐ cond_dist, A dictionary object containing baseline conditional-probability distributions — flat lists or
+#                 arrays — for the target vertex and its conditioning variables; and
+#    ⧐ var_card, the number of variable states.
+#
+#    We formerly built the cartesian product of the variable states as a dataframe by recursive merges, multiplied the
+#    factors row by row, and marginalized by groupby-sum.  We now hold the factors as dense arrays, and a single einsum
+#    performs the factor multiplication and the marginalization.
+#    Ⓐ Label the axes.  The conditional-probability table of vertex has one axis per predecessor, followed by its own.
+#       Its baseline distribution reshapes to that table:  the last axis varies fastest.
+#    Ⓑ Contract the table with the distributions of the conditioning variables to be marginalized out.  Conditioning
+#       variables in cond_dist that are not predecessors of vertex do not affect it, and are ignored.
+#    Ⓒ Return the retained predecessors and the ID-root-reduced probability-distribution array.  Its axes are the
+#       retained predecessors, in predecessor order, followed by vertex.
+#
+def reduce_cpd_array(parent_verts, vertex, cond_dist, var_card):
+#
+#    Ⓐ Label the axes.
+	axis_labels = dict((vert, axis_idx) for (axis_idx, vert) in enumerate(list(parent_verts) + [vertex]))
+	retained_verts = [vert for vert in parent_verts if vert not in cond_dist]
+	base_cpt = np.asarray(cond_dist.get(vertex), dtype = float)\
+					.reshape(tuple(np.repeat(a = var_card,
+											repeats = len(parent_verts) + 1)))
+#
+#    Ⓑ Contract the table with the distributions of the conditioning variables.
+	factor_operands = [base_cpt, list(range(len(parent_verts) + 1))]
+	for vert in parent_verts:
+		if vert in cond_dist:
+			factor_operands.extend([np.asarray(cond_dist.get(vert), dtype = float), [axis_labels.get(vert)]])
+#
+#    Ⓒ Return the retained predecessors and the reduced array.
+	return retained_verts, np.einsum(*(factor_operands +
+										[[axis_labels.get(vert) for vert in retained_verts + [vertex]]]))
+#
+#
+# |∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕—\|∕
+# ⓗ REDUCE CONDITIONAL PROBABILITY DISTRIBUTION TO A LIST.  This retains the interface of our earlier dataframe-based
+#    reduce_cpd.  Our inputs are:
 #    ⧐ digraph, A Networkx digraph object containing the vertex and its predecessors;
 #    ⧐ var_states, the variable state;
-#    ⧐ vertex, The target vertex for which the reduced conditional probability is desired; and 
+#    ⧐ vertex, The target vertex for which the reduced conditional probability is desired; and
 #    ⧐ cond_dist, A dictionary object containing baseline conditional-probability distributions for the target
 #                 vertex and its conditioning variables.
-#
-#    Our logic performs the following steps.
-#    Ⓐ Create a list of predecessors to vertex.
-#    Ⓑ Build the conditional-probability table for vertex and for its predecessors for which probability distributions
-#       are specified.
-#    Ⓒ Merge the CPTs to perform factor multiplication.
-#    Ⓓ Perform the factor multiplication. 
-#    Ⓔ Marginalize out the specified vertices.  Use groupby-sum.
-#    Ⓕ Return the ID-root-reduced probability-distribution as a list.
-#
-#    Ⓐ Create a list of predecessors to vertex.
+#    We return the ID-root-reduced probability-distribution as a flat list, the last variable varying fastest.  The
+#    retained predecessors appear in predecessor order.
 #
 def reduce_cpd(digraph, var_states, vertex, cond_dist):
-	parent_verts = digraph.predecessors(vertex)
-#
-#    Ⓑ Build the conditional-probability table for vertex. Use internally-defined function state_df
-#       to build the variable states for each variable. We then use a constant-unit-valued join key
-#       to make our merge perform like a cartesian product.  We drop unneded attributes from the colum.
-	base_cpt = fct.reduce(lambda x, y: pd.merge(left = x, right = y),
-									[state_df(state_var = vert,
-											var_states = var_states.drop('UNMEASURED',axis = 0)['CAT_LEVEL_IDX'])
-									for vert in digraph.predecessors(vertex) + [vertex]])\
-					.assign(MEAS = cond_dist.get(vertex))\
-					.drop(labels = 'join_key',
-						axis = 1)\
-					.rename(columns = {'MEAS' : 'P_' + vertex})
-#
-#    Ⓒ Merge the CPTs to perform factor multiplication. We simultaneously build the CPTs for the ID-root vertices.
-	factor_prod = fct.reduce(lambda x, y: pd.merge(left = x, right = y),
-							[base_cpt] +\
-							[state_df(state_var = vert,
-										var_states = var_states.drop('UNMEASURED',axis = 0)['CAT_LEVEL_IDX'])\
-									.assign(MEAS = cond_dist.get(vert))\
-									.drop(labels = 'join_key',
-											axis = 1)\
-									.rename(columns = {'MEAS' : 'P_' + vert})
-							for vert in list(cond_dist.keys())
-							if vert != vertex] )
-#
-#    Ⓓ Perform the factor multiplication. 
-	factor_prod = factor_prod.assign(factor_prod = factor_prod[[fact_col for fact_col in factor_prod.columns.tolist()
-																if 'P_' in fact_col]].product(axis = 1).tolist())\
-							.drop(labels = [fact_col for fact_col in factor_prod.columns.tolist()
-											if 'P_' in fact_col],
-								axis = 1)\
-							.rename(columns = {'factor_prod' : 'P_' + vertex})
-#
-#    Ⓔ Marginalize out the ID-root vertices.
-	red_cpt = factor_prod.groupby(by = list(set(parent_verts) - set(list(cond_dist.keys()))) + [vertex],
-								axis = 0,
-								as_index = False)['P_' + vertex].sum()\
-							[list(set(parent_verts) - set(list(cond_dist.keys()))) + [vertex] + ['P_'+ vertex]]\
-							.sort_values(by = list(set(parent_verts) - set(list(cond_dist.keys()))) + [vertex],
-										axis = 0)
+	return reduce_cpd_array(parent_verts = list(digraph.predecessors(vertex)),
+							vertex = vertex,
+							cond_dist = cond_dist,
+							var_card = len(var_states.drop('UNMEASURED', axis = 0)))[1].ravel().tolist()
 #
-#    Ⓕ Return the ID-root-reduced probability-distribution as a list.
-	return red_cpt['P_' + vertex].tolist()
-#
\ No newline at end of file